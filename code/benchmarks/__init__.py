@@ -0,0 +1,6 @@
+"""
+Micro-benchmarks for the log analyzer. Run them from the code directory, e.g. python -m benchmarks.bench_gzip.
+
+synthetic generates deterministic logs of any size and shape; bench_pipeline times every analysis stage on them
+and writes machine-readable results that later runs can be compared against (--baseline).
+"""
@@ -0,0 +1,88 @@
+"""
+Benchmark of the console output of LogAnalyzer.run: the previous print(f"  {entry}") per matched entry against
+the buffered ConsoleWriter, for a list of entries (default mode) and an EntryBatch (columnar mode).
+
+The output goes to a pipe read by a child process, like a collector reading our stdout, once block buffered (as
+Python buffers a pipe) and once line buffered (as for a terminal, or python -u). Both variants are first checked
+to write the same text.
+
+Usage:
+    python -m benchmarks.bench_console [--entries <n>] [--repeat <n>]
+"""
+
+import argparse
+import io
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from log_analyzer.analyzer import DEFAULT_LOCAL_TIME
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.console import ConsoleWriter
+from log_analyzer.log_entry import LogEntry
+
+_DRAIN = "import sys\nwhile sys.stdin.buffer.read1(1 << 16):\n    pass"   # The reading end of the pipe
+
+
+def _make_entries(n: int) -> list[LogEntry]:
+    """ Builds n matches, 50 per second sharing one datetime object like parsed entries."""
+    start = datetime(2025, 7, 18, tzinfo=ZoneInfo(DEFAULT_LOCAL_TIME))
+    stamps = [start + timedelta(seconds=i) for i in range(n // 50 + 1)]
+    return [LogEntry(stamps[i // 50], "ERROR", "EVENT", f"request {i} failed after {i % 997} ms") for i in range(n)]
+
+
+def _previous_print(matched, stream) -> None:
+    """ The per-entry print loop ConsoleWriter replaced."""
+    with redirect_stdout(stream):
+        for entry in matched:
+            print(f"  {entry}")
+    stream.flush()
+
+
+def _buffered(matched, stream) -> None:
+    """ Writes the entries through a ConsoleWriter."""
+    with ConsoleWriter(stream) as out:
+        out.entries(matched)
+
+
+def _best(fn, matched, line_buffering: bool, repeat: int) -> float:
+    """ Returns the best wall time of fn writing matched into a pipe, over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        reader = subprocess.Popen([sys.executable, "-c", _DRAIN], stdin=subprocess.PIPE)
+        stream = io.TextIOWrapper(reader.stdin, encoding="utf-8", line_buffering=line_buffering)
+        start = time.perf_counter()
+        fn(matched, stream)
+        best = min(best, time.perf_counter() - start)
+        stream.close()
+        reader.wait()
+    return best
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--entries", type=int, default=200_000, help="Number of printed entries")
+    p.add_argument("--repeat", type=int, default=3, help="Runs per variant (the best one is reported)")
+    args = p.parse_args()
+
+    entries = _make_entries(args.entries)
+    batch = EntryBatch.from_entries(entries, ZoneInfo(DEFAULT_LOCAL_TIME))
+    for matched in (entries, batch):
+        expected, actual = io.StringIO(), io.StringIO()
+        _previous_print(matched, expected)
+        _buffered(matched, actual)
+        assert actual.getvalue() == expected.getvalue()
+
+    print(f"{args.entries} entries")
+    for name, matched in (("list", entries), ("batch", batch)):
+        for line_buffering in (False, True):
+            old = _best(_previous_print, matched, line_buffering, args.repeat)
+            new = _best(_buffered, matched, line_buffering, args.repeat)
+            mode = "line buffered" if line_buffering else "block buffered"
+            print(f"  {name:5}  {mode:14}  print: {old:.3f}s  ConsoleWriter: {new:.3f}s  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark of the export formats: the streaming exporter against the previous json.dump of a list of dicts, and
+reloading a columnar export against json.load of the JSON one.
+
+A synthetic set of matches (many entries per second, as in real logs) is exported every way; the JSON files are
+checked to hold the same document and the columnar file to reload the same entries.
+
+Usage:
+    python -m benchmarks.bench_export [--entries <n>] [--repeat <n>]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from log_analyzer.analyzer import DEFAULT_LOCAL_TIME
+from log_analyzer.columnar_file import load_columnar
+from log_analyzer.event_config import EventConfig
+from log_analyzer.exporter import export_results
+from log_analyzer.log_entry import LogEntry
+
+
+def _make_results(n: int) -> list[tuple[EventConfig, list[LogEntry]]]:
+    """ Builds one rule's worth of n matches, 50 per second sharing one datetime object like parsed entries."""
+    tz = ZoneInfo(DEFAULT_LOCAL_TIME)
+    start = datetime(2025, 7, 18, tzinfo=tz)
+    stamps = [start + timedelta(seconds=i) for i in range(n // 50 + 1)]
+    entries = [LogEntry(stamps[i // 50], "ERROR", "EVENT", f"request {i} failed: \"timeout\" after {i % 997} ms")
+               for i in range(n)]
+    return [(EventConfig("EVENT", count=False, level="ERROR", pattern=None), entries)]
+
+
+def _previous_export(results: list[tuple[EventConfig, list[LogEntry]]], path: str) -> None:
+    """ The export_to_json implementation the exporter replaced."""
+    document = [{
+        "event_type": ev_config.event_type,
+        "filters": {"count": ev_config.count, "level": ev_config.level, "pattern": None},
+        "entries": [{"timestamp": e.timestamp.isoformat(), "level": e.level, "message": e.message} for e in matched],
+    } for ev_config, matched in results]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+
+
+def _best(fn, repeat: int) -> float:
+    """ Returns the best wall time of fn over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--entries", type=int, default=500_000, help="Number of exported entries")
+    p.add_argument("--repeat", type=int, default=3, help="Runs per variant (the best one is reported)")
+    args = p.parse_args()
+
+    results = _make_results(args.entries)
+    tz = ZoneInfo(DEFAULT_LOCAL_TIME)
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path, new_path, nd_path, col_path = (os.path.join(tmp, name) for name in
+                                                 ("old.json", "new.json", "new.ndjson", "new.columnar"))
+        old = _best(lambda: _previous_export(results, old_path), args.repeat)
+        new = _best(lambda: export_results(results, new_path, tz, "json"), args.repeat)
+        nd = _best(lambda: export_results(results, nd_path, tz, "ndjson"), args.repeat)
+        col = _best(lambda: export_results(results, col_path, tz, "columnar"), args.repeat)
+        with open(old_path, encoding="utf-8") as f_old, open(new_path, encoding="utf-8") as f_new:
+            assert json.load(f_old) == json.load(f_new)
+
+        def _json_load():
+            with open(new_path, encoding="utf-8") as f:
+                return json.load(f)
+        json_load = _best(_json_load, args.repeat)
+        col_load = _best(lambda: load_columnar(col_path), args.repeat)
+        assert [e.message for e in load_columnar(col_path)[0][1]] == [e.message for e in results[0][1]]
+
+    print(f"{args.entries} entries")
+    print(f"  json.dump (previous):  {old:.3f}s")
+    print(f"  streaming json:        {new:.3f}s  ({old / new:.1f}x)")
+    print(f"  streaming ndjson:      {nd:.3f}s  ({old / nd:.1f}x)")
+    print(f"  columnar:              {col:.3f}s  ({old / col:.1f}x)")
+    print("reload")
+    print(f"  json.load:             {json_load:.3f}s")
+    print(f"  load_columnar:         {col_load:.3f}s  ({json_load / col_load:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark of the .log.gz read path: gzip.open(..., "rt") line iteration (the previous path) against
+gzip_reader.iter_gzip_lines, with and without the raw candidate filter. Each reader is timed reading the lines
+only, and reading plus parsing them into LogEntry objects.
+
+The sample data (Logs/NvidiaAndInvalidLogs/sample.log.gz) is repeated up to --size-mb of text and written twice
+to a temporary directory: as a single gzip member (plain gzip output) and as one member per MiB (cat-joined
+rotations, pigz / bgzip output).
+
+Usage:
+    python -m benchmarks.bench_gzip [--sample <path>] [--size-mb <n>] [--repeat <n>] [--workers <n>]
+"""
+
+import argparse
+import gzip
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator
+from zoneinfo import ZoneInfo
+from log_analyzer.analyzer import DEFAULT_LOCAL_TIME
+from log_analyzer.gzip_reader import iter_gzip_lines
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.timestamps import TimestampParser
+
+SAMPLE = Path(__file__).resolve().parents[2] / "Logs" / "NvidiaAndInvalidLogs" / "sample.log.gz"
+RULES = [("TELEMETRY", None), ("DEVICE", "WARNING"), ("GNMI", "ERROR")]   # The sample events.txt rules
+MEMBER_SIZE = 1024 * 1024
+
+
+def _read_sample(path: Path) -> bytes:
+    """ Returns the text of the sample file (which may or may not actually be compressed)."""
+    data = path.read_bytes()
+    return gzip.decompress(data) if data[:2] == b"\x1f\x8b" else data
+
+
+def _make_files(sample: bytes, size: int, directory: Path) -> dict[str, Path]:
+    """ Writes the single-member and multi-member benchmark files."""
+    if not sample.endswith(b"\n"):
+        sample += b"\n"
+    text = sample * (size // len(sample) + 1)
+    single = directory / "single.log.gz"
+    single.write_bytes(gzip.compress(text, compresslevel=6))
+    multi = directory / "multi.log.gz"
+    with open(multi, "wb") as f:
+        for start in range(0, len(text), MEMBER_SIZE):
+            end = text.find(b"\n", start + MEMBER_SIZE - 1) + 1 or len(text)
+            if end > start + MEMBER_SIZE:
+                end = start + MEMBER_SIZE   # Member boundaries do not need to fall on lines
+            f.write(gzip.compress(text[start:end], compresslevel=6))
+    return {"single member": single, "multi member": multi}
+
+
+def _gzip_module(path: Path, workers: int) -> Iterator[str]:
+    """ The previous read path."""
+    with gzip.open(path, "rt", encoding="utf-8", errors="ignore") as f:
+        yield from f
+
+
+def _block_reader(path: Path, workers: int) -> Iterator[str]:
+    """ gzip_reader, every line decoded."""
+    return iter_gzip_lines(path, workers=workers)
+
+
+def _block_reader_rules(path: Path, workers: int) -> Iterator[str]:
+    """ gzip_reader, only candidate lines decoded."""
+    return iter_gzip_lines(path, RULES, workers=workers)
+
+
+READERS = {"gzip.open rt": _gzip_module, "gzip_reader": _block_reader, "gzip_reader + rules": _block_reader_rules}
+
+
+def _read(reader, path: Path, workers: int) -> int:
+    """ Reads every line; returns the number of lines."""
+    return sum(1 for _ in reader(path, workers))
+
+
+def _read_and_parse(reader, path: Path, workers: int) -> int:
+    """ Reads and parses every line, like the analyzer does; returns the number of valid entries."""
+    ts_parser = TimestampParser(ZoneInfo(DEFAULT_LOCAL_TIME))
+    entries = 0
+    for line in reader(path, workers):
+        try:
+            entries += LogEntry.parse_line(line, ts_parser=ts_parser) is not None
+        except ValueError:
+            pass
+    return entries
+
+
+def _best(stage, reader, path: Path, args) -> tuple[float, int]:
+    """ Returns the best time of args.repeat runs of a stage, with its result."""
+    best, result = float("inf"), 0
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = stage(reader, path, args.workers)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="bench_gzip")
+    parser.add_argument("--sample", type=Path, default=SAMPLE)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    sample = _read_sample(args.sample)
+    with tempfile.TemporaryDirectory() as tmp:
+        files = _make_files(sample, args.size_mb * 1024 * 1024, Path(tmp))
+        print(f"{'file':<16}{'reader':<22}{'lines':>10}{'read s':>10}{'MB/s':>10}{'entries':>10}{'parse s':>10}")
+        for file_name, path in files.items():
+            for reader_name, reader in READERS.items():
+                read_time, lines = _best(_read, reader, path, args)
+                parse_time, entries = _best(_read_and_parse, reader, path, args)
+                print(f"{file_name:<16}{reader_name:<22}{lines:>10}{read_time:>10.3f}"
+                      f"{args.size_mb / read_time:>10.1f}{entries:>10}{parse_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark of the analysis pipeline stage by stage, on a deterministic synthetic dataset (see synthetic):
+    - parse_line: LogEntry.parse_line over every line held in memory (invalid lines raise and are skipped).
+    - parse_batch: LogEntry.parse_batch over the same lines, BATCH_LINES at a time (invalid lines get a reason).
+    - matches: EventFilter.matches of every rule over every parsed entry.
+    - gather_entries: LogAnalyzer._gather_entries, reading and parsing the log files.
+    - analyze: LogAnalyzer._analyze, gathering plus dispatching the entries to the rules.
+    - export_to_json: LogAnalyzer.export_to_json of the analyzed results.
+
+Every stage reports its throughput (best of --repeat runs, in lines, checks or exported entries per second) and
+its peak traced memory (tracemalloc, measured in a separate run so tracing does not skew the timing). Results
+are written as JSON to --output; with --baseline, the throughputs are compared to a previous results file and
+the exit status is 1 if any stage is more than --threshold slower.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--lines <n>] [--files <n>] [--event-types <n>] [--invalid-ratio <r>]
+        [--ordering sorted|jittered|shuffled] [--gzip] [--seed <n>] [--repeat <n>] [--output <path>]
+        [--baseline <path>] [--threshold <r>]
+"""
+
+import argparse
+import gzip
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+from zoneinfo import ZoneInfo
+from benchmarks.synthetic import LogSpec, add_spec_arguments, spec_from_args, write_dataset
+from log_analyzer.analyzer import DEFAULT_LOCAL_TIME, LogAnalyzer
+from log_analyzer.event_config import load_configs
+from log_analyzer.event_filter import EventFilter
+from log_analyzer.log_entry import BATCH_LINES, LogEntry
+from log_analyzer.timestamps import TimestampParser
+
+RESULTS_VERSION = 1   # Bumped when the layout of the results file changes
+
+
+def _measure(name: str, fn: Callable[[], object], items: int, unit: str, repeat: int) -> dict:
+    """ Times fn (best of repeat runs), then traces the peak memory of one more run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"stage": name, "items": items, "unit": unit, "seconds": round(best, 6),
+            "per_second": round(items / best, 1), "peak_mib": round(peak / 2 ** 20, 3)}
+
+
+def _read_lines(paths: list[Path]) -> list[str]:
+    """ Returns the lines of the generated log files."""
+    lines = []
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+def _parse_all(lines: list[str], tz: ZoneInfo) -> list[LogEntry]:
+    """ Parses lines the way the readers do: one shared TimestampParser, invalid lines skipped."""
+    ts_parser = TimestampParser(tz)
+    entries = []
+    for line in lines:
+        try:
+            entry = LogEntry.parse_line(line, ts_parser=ts_parser)
+        except ValueError:
+            continue
+        if entry:
+            entries.append(entry)
+    return entries
+
+
+def _parse_batches(lines: list[str], tz: ZoneInfo) -> list[LogEntry]:
+    """ Parses lines the way _gather_entries does: BATCH_LINES at a time with one shared TimestampParser."""
+    ts_parser = TimestampParser(tz)
+    entries = []
+    for start in range(0, len(lines), BATCH_LINES):
+        entries.extend(LogEntry.parse_batch(lines[start:start + BATCH_LINES], ts_parser).entries())
+    return entries
+
+
+def _match_all(filters: list[EventFilter], entries: list[LogEntry]) -> int:
+    """ Runs every filter over every entry, returning the number of matches."""
+    matched = 0
+    for event_filter in filters:
+        matches = event_filter.matches
+        matched += sum(1 for entry in entries if matches(entry))
+    return matched
+
+
+def run_stages(directory: Path, paths: list[Path], repeat: int) -> list[dict]:
+    """ Benchmarks every stage on a written dataset."""
+    tz = ZoneInfo(DEFAULT_LOCAL_TIME)
+    events_file = str(directory / "events.txt")
+    lines = _read_lines(paths)
+    entries = _parse_all(lines, tz)
+    filters = [EventFilter(ev_config) for ev_config in load_configs(events_file)]
+    analyzer = LogAnalyzer(str(directory), events_file)
+    exported = sum(len(matched) for _, matched in analyzer._cached_analysis)
+    out = str(directory / "export.json")
+
+    return [
+        _measure("parse_line", lambda: _parse_all(lines, tz), len(lines), "lines", repeat),
+        _measure("parse_batch", lambda: _parse_batches(lines, tz), len(lines), "lines", repeat),
+        _measure("matches", lambda: _match_all(filters, entries), len(entries) * len(filters), "checks", repeat),
+        _measure("gather_entries", analyzer._gather_entries, len(lines), "lines", repeat),
+        _measure("analyze", analyzer._analyze, len(lines), "lines", repeat),
+        _measure("export_to_json", lambda: analyzer.export_to_json(out), exported, "entries", repeat),
+    ]
+
+
+def compare(stages: list[dict], baseline: dict, threshold: float) -> bool:
+    """ Prints the throughput of every stage relative to a baseline results file; returns False on regression."""
+    previous = {stage["stage"]: stage for stage in baseline["stages"]}
+    ok = True
+    print(f"\nagainst baseline ({baseline['created']}):")
+    for stage in stages:
+        before = previous.get(stage["stage"])
+        if before is None:
+            continue
+        ratio = stage["per_second"] / before["per_second"]
+        regressed = ratio < 1 - threshold
+        ok = ok and not regressed
+        print(f"  {stage['stage']:<16}{ratio:>7.2f}x{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="bench_pipeline", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_spec_arguments(parser, lines=200_000)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (the best one is reported)")
+    parser.add_argument("--output", type=Path, default=Path("bench_pipeline.json"), help="Results file")
+    parser.add_argument("--baseline", type=Path, help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown reported as a regression")
+    args = parser.parse_args()
+
+    spec: LogSpec = spec_from_args(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_dataset(Path(tmp), spec, args.files, args.gzip)
+        stages = run_stages(Path(tmp), paths, args.repeat)
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": {**asdict(spec), "start": spec.start.isoformat(), "files": args.files, "gzip": args.gzip},
+        "stages": stages,
+    }
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    print(f"{spec.lines} lines, {args.files} {'.log.gz' if args.gzip else '.log'} files, "
+          f"{spec.event_types} event types, {spec.invalid_ratio:.1%} invalid, {spec.ordering}")
+    print(f"{'stage':<16}{'items':>10}{'unit':>9}{'seconds':>10}{'per second':>14}{'peak MiB':>10}")
+    for stage in stages:
+        print(f"{stage['stage']:<16}{stage['items']:>10}{stage['unit']:>9}{stage['seconds']:>10.3f}"
+              f"{stage['per_second']:>14,.0f}{stage['peak_mib']:>10.1f}")
+    print(f"results written to {args.output}")
+
+    if args.baseline and not compare(stages, json.loads(args.baseline.read_text()), args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
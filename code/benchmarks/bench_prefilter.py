@@ -0,0 +1,88 @@
+"""
+Benchmark of the --pattern literal prefilter: RuleEngine.match with and without it, on the sample configs and
+logs under Logs/.
+
+For every Logs/<case> directory holding a valid events.txt, the entries of its log files are parsed once,
+repeated up to --entries, and dispatched through both engines. The match results are checked to be identical.
+
+Usage:
+    python -m benchmarks.bench_prefilter [--logs <dir>] [--entries <n>] [--repeat <n>]
+"""
+
+import argparse
+import gzip
+import time
+from pathlib import Path
+from zoneinfo import ZoneInfo
+from log_analyzer.analyzer import DEFAULT_LOCAL_TIME
+from log_analyzer.event_config import load_configs
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.rule_engine import RuleEngine
+from log_analyzer.timestamps import TimestampParser
+
+LOGS = Path(__file__).resolve().parents[2] / "Logs"
+
+
+def _read_lines(path: Path) -> list[str]:
+    """ Returns the lines of a log file (sample .log.gz files may or may not actually be compressed)."""
+    data = path.read_bytes()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return data.decode("utf-8", errors="ignore").splitlines()
+
+
+def _load_entries(case: Path) -> list[LogEntry]:
+    """ Parses the valid entries of every log file of a case directory."""
+    ts_parser = TimestampParser(ZoneInfo(DEFAULT_LOCAL_TIME))
+    entries = []
+    for path in sorted(case.iterdir()):
+        if path.suffix not in (".log", ".gz"):
+            continue
+        for line in _read_lines(path):
+            try:
+                entry = LogEntry.parse_line(line, ts_parser=ts_parser)
+            except ValueError:
+                continue
+            if entry:
+                entries.append(entry)
+    return entries
+
+
+def _best(engine: RuleEngine, entries: list[LogEntry], repeat: int) -> tuple[float, list[list[int]]]:
+    """ Returns the best time of dispatching every entry, with the match results."""
+    best, results = float("inf"), []
+    match = engine.match
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [match(entry) for entry in entries]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="bench_prefilter")
+    parser.add_argument("--logs", type=Path, default=LOGS)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'case':<24}{'rules':>6}{'entries':>10}{'regex s':>10}{'prefilter s':>13}{'speedup':>9}")
+    for case in sorted(p for p in args.logs.iterdir() if (p / "events.txt").is_file()):
+        try:
+            configs = load_configs(str(case / "events.txt"))
+        except ValueError:
+            continue   # The invalid-config sample
+        entries = _load_entries(case)
+        if not entries:
+            continue
+        entries = (entries * (args.entries // len(entries) + 1))[:args.entries]
+
+        regex_time, expected = _best(RuleEngine(configs, use_prefilter=False), entries, args.repeat)
+        prefilter_time, results = _best(RuleEngine(configs), entries, args.repeat)
+        assert results == expected, case.name
+        print(f"{case.name:<24}{len(configs):>6}{len(entries):>10}{regex_time:>10.3f}{prefilter_time:>13.3f}"
+              f"{regex_time / prefilter_time:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
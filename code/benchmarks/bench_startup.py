@@ -0,0 +1,148 @@
+"""
+Benchmark of the cold start of cli.py, for short runs on small directories where startup dominates.
+
+Every scenario runs in fresh interpreters with -X importtime, from the directory holding cli.py:
+    - import: `import cli`, what every invocation pays before its arguments are even parsed.
+    - help: `cli.py --help`.
+    - run: `cli.py <dir> <events> --output <file>` over a small synthetic dataset (see synthetic).
+    - columnar: the same run with --columnar (the path that loads NumPy, when installed).
+
+Every scenario reports the median wall time and import time (the cumulative time of the top-level imports, as
+listed by -X importtime) of --repeat runs, and the number of modules imported; the modules costing the most
+during a run are listed too. Results are written as JSON to --output; with --baseline, they are compared to a
+previous results file and the exit status is 1 if a scenario is more than --threshold slower.
+
+Usage:
+    python -m benchmarks.bench_startup [--lines <n>] [--files <n>] [--repeat <n>] [--top <n>] [--output <path>]
+        [--baseline <path>] [--threshold <r>]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from benchmarks.synthetic import LogSpec, write_dataset
+
+RESULTS_VERSION = 1                            # Bumped when the layout of the results file changes
+CODE_DIR = Path(__file__).resolve().parent.parent   # Where cli.py lives
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """
+    Parses the -X importtime report of a run.
+
+    Returns:
+        list[tuple[str, int, int, int]]: (module, self microseconds, cumulative microseconds, nesting depth) of
+            every import, in the order the report lists them (a module after the modules it imported).
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue   # The header line
+        stripped = name.lstrip(" ")
+        imports.append((stripped, int(self_us), int(cumulative_us), (len(name) - len(stripped) - 1) // 2))
+    return imports
+
+
+def _run(args: list[str]) -> tuple[float, list[tuple[str, int, int, int]]]:
+    """ Runs python -X importtime with args from CODE_DIR; returns the wall time and the parsed import report."""
+    start = time.perf_counter()
+    done = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=CODE_DIR, stdin=subprocess.DEVNULL,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    return time.perf_counter() - start, parse_importtime(done.stderr)
+
+
+def measure(name: str, args: list[str], repeat: int) -> tuple[dict, list[tuple[str, int, int, int]]]:
+    """ Runs a scenario repeat times (after one warm-up run compiling the .pyc files); returns its medians."""
+    _run(args)
+    walls, import_times, runs = [], [], []
+    for _ in range(repeat):
+        wall, imports = _run(args)
+        walls.append(wall)
+        import_times.append(sum(cumulative for _, _, cumulative, depth in imports if depth == 0))
+        runs.append(imports)
+    median_run = runs[import_times.index(statistics.median_low(import_times))]
+    return ({"scenario": name, "wall_ms": round(statistics.median(walls) * 1000, 2),
+             "import_ms": round(statistics.median(import_times) / 1000, 2), "modules": len(median_run)}, median_run)
+
+
+def heaviest(imports: list[tuple[str, int, int, int]], top: int) -> list[tuple[str, int]]:
+    """ Returns the top project modules (log_analyzer.*, cli) and top-level imports by cumulative time."""
+    kept = [(name, cumulative) for name, _, cumulative, depth in imports
+            if depth == 0 or name == "cli" or name.startswith("log_analyzer")]
+    return sorted(kept, key=lambda item: -item[1])[:top]
+
+
+def compare(scenarios: list[dict], baseline: dict, threshold: float) -> bool:
+    """ Prints the times of every scenario relative to a baseline results file; returns False on regression."""
+    previous = {scenario["scenario"]: scenario for scenario in baseline["scenarios"]}
+    ok = True
+    print(f"\nagainst baseline ({baseline['created']}):")
+    for scenario in scenarios:
+        before = previous.get(scenario["scenario"])
+        if before is None:
+            continue
+        wall, imports = (scenario[key] / before[key] for key in ("wall_ms", "import_ms"))
+        regressed = wall > 1 + threshold or imports > 1 + threshold
+        ok = ok and not regressed
+        print(f"  {scenario['scenario']:<10}wall {wall:>5.2f}x  imports {imports:>5.2f}x"
+              f"{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="bench_startup", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=2_000, help="Number of generated lines")
+    parser.add_argument("--files", type=int, default=2, help="Number of log files the lines are split over")
+    parser.add_argument("--repeat", type=int, default=15, help="Runs per scenario (the median is reported)")
+    parser.add_argument("--top", type=int, default=12, help="Number of modules listed for the run scenario")
+    parser.add_argument("--output", type=Path, default=Path("bench_startup.json"), help="Results file")
+    parser.add_argument("--baseline", type=Path, help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown reported as a regression")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_dataset(Path(tmp), LogSpec(lines=args.lines), args.files)
+        run = ["cli.py", tmp, str(Path(tmp) / "events.txt"), "--output", str(Path(tmp) / "out.json")]
+        measured = [measure("import", ["-c", "import cli"], args.repeat),
+                    measure("help", ["cli.py", "--help"], args.repeat),
+                    measure("run", run, args.repeat),
+                    measure("columnar", [*run, "--columnar"], args.repeat)]
+    scenarios = [scenario for scenario, _ in measured]
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": {"lines": args.lines, "files": args.files},
+        "scenarios": scenarios,
+    }
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    print(f"{args.lines} lines in {args.files} files, median of {args.repeat} runs")
+    print(f"{'scenario':<10}{'wall ms':>10}{'import ms':>11}{'modules':>9}")
+    for scenario in scenarios:
+        print(f"{scenario['scenario']:<10}{scenario['wall_ms']:>10.1f}{scenario['import_ms']:>11.1f}"
+              f"{scenario['modules']:>9}")
+    print("\nheaviest imports of the run scenario (cumulative ms):")
+    for name, cumulative in heaviest(measured[2][1], args.top):
+        print(f"  {name:<40}{cumulative / 1000:>8.1f}")
+    print(f"results written to {args.output}")
+
+    if args.baseline and not compare(scenarios, json.loads(args.baseline.read_text()), args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
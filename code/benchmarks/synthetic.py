@@ -0,0 +1,196 @@
+"""
+Deterministic synthetic logs for the benchmarks.
+
+Lines follow the analyzer's <TIMESTAMP> <LEVEL> <EVENT_TYPE> <MESSAGE> format. The same LogSpec (seed included)
+always yields the same lines, so results of different runs and machines compare like for like. Tunables:
+    - event_types: number of distinct event types. Their frequencies follow a Zipf law, like real logs where a
+      few types dominate; the first ones are the sample types (TELEMETRY, DEVICE, GNMI) with their messages.
+    - invalid_ratio: share of lines the analyzer rejects (no fields, lowercase level, malformed or future
+      timestamp).
+    - ordering: "sorted" (timestamps never decrease), "jittered" (each line up to JITTER seconds off) or
+      "shuffled" (random over the whole time span).
+
+Usage:
+    python -m benchmarks.synthetic <out dir> [--lines <n>] [--files <n>] [--event-types <n>]
+        [--invalid-ratio <r>] [--ordering sorted|jittered|shuffled] [--gzip] [--seed <n>]
+
+writes <out dir>/synthetic-<i>.log[.gz] and a matching events.txt (see default_rules).
+"""
+
+import argparse
+import gzip
+import itertools
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+ORDERINGS = ("sorted", "jittered", "shuffled")
+LEVELS = ("INFO", "WARNING", "ERROR", "DEBUG")
+LEVEL_WEIGHTS = (70, 15, 10, 5)
+SAMPLE_TYPES = ("TELEMETRY", "DEVICE", "GNMI")   # The event types of the Logs/ samples
+JITTER = 5                                       # Seconds a "jittered" line may be off
+CHUNK_LINES = 10_000                             # Lines joined into a single write
+
+MESSAGES = {
+    "TELEMETRY": ("Iteration time: {f:.3f} sec", "collected {n} samples from {host}"),
+    "DEVICE": ("detected high temperature of device {host}: {p}C", "low memory warning: {p}% usage"),
+    "GNMI": ("unresponsive telemetry at endpoint http://{host}:9001/csv/xcset/low_freq_debug",
+             "subscription {n} reconnected after {f:.1f} sec"),
+}
+GENERIC_MESSAGES = ("request {n} failed: timeout after {p} ms", "user {n} logged in from {host}",
+                    "processed {n} records in {f:.2f} sec", "cache miss for key session:{n}")
+INVALID_LINES = ("This is an invalid line :(", "{ts} info {event} lowercase level", "{ts} ERROR",
+                 "2025-13-45T25:61:00 ERROR {event} malformed timestamp", "2099-01-01T00:00:00 INFO {event} future")
+
+
+@dataclass(frozen=True)
+class LogSpec:
+    """
+    Shape of a synthetic log.
+
+    Attributes:
+        lines (int): Number of lines, invalid ones included.
+        event_types (int): Number of distinct event types.
+        invalid_ratio (float): Share of invalid lines (0 to 1).
+        ordering (str): One of ORDERINGS.
+        lines_per_second (int): Average number of lines logged per second.
+        start (datetime): Naive timestamp of the first line.
+        seed (int): Seed of the random generator.
+    """
+    lines: int = 1_000_000
+    event_types: int = 20
+    invalid_ratio: float = 0.01
+    ordering: str = "sorted"
+    lines_per_second: int = 50
+    start: datetime = datetime(2025, 7, 18)
+    seed: int = 0
+
+
+def event_type_names(count: int) -> list[str]:
+    """ Returns the event types of a spec: the sample types first, then EVENT003, EVENT004, ..."""
+    return list(SAMPLE_TYPES[:count]) + [f"EVENT{i:03d}" for i in range(len(SAMPLE_TYPES), count)]
+
+
+def _message(rng: random.Random, event_type: str) -> str:
+    """ Returns a random message for an event type."""
+    template = rng.choice(MESSAGES.get(event_type, GENERIC_MESSAGES))
+    return template.format(n=rng.randrange(100_000), p=rng.randrange(100), f=rng.uniform(0.1, 2000.0),
+                           host=f"10.0.{rng.randrange(256)}.{rng.randrange(256)}")
+
+
+def generate_lines(spec: LogSpec) -> Iterator[str]:
+    """
+    Yields the lines of a synthetic log, without line terminators.
+
+    Raises:
+        ValueError: If the spec's ordering is not one of ORDERINGS.
+    """
+    if spec.ordering not in ORDERINGS:
+        raise ValueError(f"Unknown ordering '{spec.ordering}' (expected one of: {', '.join(ORDERINGS)})")
+    rng = random.Random(spec.seed)
+    names = event_type_names(spec.event_types)
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, len(names) + 1)))   # Zipf weights
+    span = spec.lines / spec.lines_per_second
+
+    for i in range(spec.lines):
+        if spec.ordering == "shuffled":
+            offset = rng.uniform(0, span)
+        else:
+            offset = i / spec.lines_per_second
+            if spec.ordering == "jittered":
+                offset = max(0.0, offset + rng.uniform(-JITTER, JITTER))
+        ts = (spec.start + timedelta(seconds=offset)).isoformat(timespec="seconds")
+        event_type = rng.choices(names, cum_weights=cumulative)[0]
+
+        if rng.random() < spec.invalid_ratio:
+            yield rng.choice(INVALID_LINES).format(ts=ts, event=event_type)
+        else:
+            level = rng.choices(LEVELS, weights=LEVEL_WEIGHTS)[0]
+            yield f"{ts} {level} {event_type} {_message(rng, event_type)}"
+
+
+def write_log(path: Path, spec: LogSpec) -> int:
+    """
+    Writes a synthetic log, gzip-compressed if path ends with .gz.
+
+    Returns:
+        int: The number of bytes of text written (before compression).
+    """
+    opener = gzip.open if path.suffix == ".gz" else open
+    written = 0
+    lines = generate_lines(spec)
+    with opener(path, "wt", encoding="utf-8") as f:
+        while chunk := list(itertools.islice(lines, CHUNK_LINES)):
+            text = "\n".join(chunk) + "\n"
+            f.write(text)
+            written += len(text.encode("utf-8"))
+    return written
+
+
+def default_rules(spec: LogSpec) -> list[str]:
+    """ Returns events-file lines exercising every rule kind on the most frequent event types of a spec."""
+    first, second, third = (event_type_names(max(spec.event_types, 3)) * 3)[:3]
+    return [
+        f"{first} --count",
+        f"{first} --count --pattern ^Iteration time:\\s\\d+\\.\\d+\\ssec$",
+        f"{second} --level WARNING",
+        f"{third} --level ERROR",
+        f"{third} --pattern \\d+ sec$",
+    ]
+
+
+def write_dataset(directory: Path, spec: LogSpec, files: int = 1, compress: bool = False) -> list[Path]:
+    """
+    Writes a spec's lines split over several log files, with an events.txt of its default_rules.
+
+    Every file gets its own seed and an equal share of the lines, starting where the previous one ended.
+
+    Returns:
+        list[Path]: The written log files.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "events.txt").write_text("\n".join(default_rules(spec)) + "\n")
+    paths = []
+    share = spec.lines // files
+    for i in range(files):
+        lines = share if i < files - 1 else spec.lines - share * (files - 1)
+        start = spec.start + timedelta(seconds=share * i / spec.lines_per_second)
+        path = directory / f"synthetic-{i:03d}.log{'.gz' if compress else ''}"
+        write_log(path, LogSpec(lines, spec.event_types, spec.invalid_ratio, spec.ordering, spec.lines_per_second,
+                                start, spec.seed + i))
+        paths.append(path)
+    return paths
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser, lines: int) -> None:
+    """ Adds the LogSpec options (and --files / --gzip) to a benchmark's argument parser."""
+    parser.add_argument("--lines", type=int, default=lines, help="Number of generated lines")
+    parser.add_argument("--files", type=int, default=4, help="Number of log files the lines are split over")
+    parser.add_argument("--event-types", type=int, default=LogSpec.event_types, help="Distinct event types")
+    parser.add_argument("--invalid-ratio", type=float, default=LogSpec.invalid_ratio, help="Share of invalid lines")
+    parser.add_argument("--ordering", choices=ORDERINGS, default=LogSpec.ordering, help="Timestamp ordering")
+    parser.add_argument("--gzip", action="store_true", help="Write .log.gz files")
+    parser.add_argument("--seed", type=int, default=LogSpec.seed, help="Random seed")
+
+
+def spec_from_args(args: argparse.Namespace) -> LogSpec:
+    """ Returns the LogSpec of parsed add_spec_arguments options."""
+    return LogSpec(lines=args.lines, event_types=args.event_types, invalid_ratio=args.invalid_ratio,
+                   ordering=args.ordering, seed=args.seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="synthetic", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out", type=Path, help="Output directory")
+    add_spec_arguments(parser, lines=LogSpec.lines)
+    args = parser.parse_args()
+
+    paths = write_dataset(args.out, spec_from_args(args), args.files, args.gzip)
+    print(f"Wrote {args.lines} lines to {len(paths)} files and events.txt in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,50 @@ This script serves as the main entry point for running the Log Analyzer, a comma
  scans log files, filters events based on user-defined rules, and reports the results.
 
 Usage:
-    python cli.py <logs_dir> <events_file> [--from <timestamp>] [--to <timestamp>]
+    python cli.py <logs_dir> <events_file> [--from <timestamp>] [--to <timestamp>] [--stream]
+                  [--backend {thread,process}] [--jobs <n>] [--columnar] [--index]
+                  [--checkpoint <file>] [--follow] [--interval <seconds>] [--cache <dir>] [--cache-size <MiB>]
+                  [--output <file>] [--format {json,ndjson,columnar}] [--stats] [--profile <file>]
 
 Arguments:
     logs_dir: (str): Path to the directory containing '.log' or '.log.gz' files.
     events_file: (str): Path to the events configuration file (e.g., events.txt).
     --from (str, optional): ISO-8601 formatted lower timestamp bound (inclusive).
-    --to (str, optional): ISO-8601 formatted upper timestamp bound (inclusive).
+    --to (str, optional): ISO-8601 formatted upper timestamp bound (inclusive). A time-sorted .log file is
+        binary-searched for the window; the proof that it is sorted is kept in its sidecar index (see --index).
+    --stream (flag, optional): Bounded-memory mode; matches are counted or spooled to disk as they are found.
+    --backend (str, optional): 'thread' (default) or 'process' to parse file chunks in worker processes.
+    --jobs (int, optional): Number of threads / worker processes, at least 1 (defaults to the CPU count).
+    --columnar (flag, optional): Memory-lean mode; keeps matches in compact columnar batches.
+    --index (flag, optional): Build/use a sidecar index next to each log file to skip irrelevant blocks.
+    --checkpoint (str, optional): Incremental mode; only bytes appended since the checkpoint file are analyzed.
+    --follow (flag, optional): Keep watching the logs and print new matches / running counts as they appear.
+    --interval (float, optional): Seconds between two passes in --follow mode (a positive number).
+    --cache (str, optional): Result cache directory; only log files whose cached per-rule results are missing or
+        stale (new size / mtime, other rules or time window) are analyzed again.
+    --cache-size (int, optional): Size bound of the result cache in MiB (at least 1); least recently used results
+        are evicted.
+    --output (str, optional): Export the results to this file without prompting.
+    --format (str, optional): Export format, 'json' (default), 'ndjson' (one record per line) or 'columnar'
+        (binary column tables, reloadable with log_analyzer.columnar_file.load_columnar).
+    --stats (flag, optional): Print run statistics: stage timers, bytes/lines read, rejected lines by reason,
+        per-worker and per-rule counters.
+    --profile (str, optional): Write the run statistics to this JSON file.
+
+    Options that no analysis mode combines are rejected: --checkpoint and --follow take none of --backend process,
+    --stream, --columnar, --cache and --index; --follow takes neither --stats nor --profile (it never finishes
+    a run to report on); --backend process and --stream take neither --columnar nor --cache.
 
 Features:
     - Supports multiple filters per event (type, log level, regex pattern).
     - Can output either raw matching entries or a count summary.
-    - Interactive option to export results as JSON.
+    - Can count matches per time bucket and/or level (--bucket / --group-by rules in the events file).
+    - Can summarize a number captured by a rule's pattern: sum, min, max, mean, percentiles (--stat rules).
+    - Can summarize noisy rules in bounded memory: first / last / sampled matches or the most frequent messages
+      (--head / --tail / --sample / --top-messages rules).
+    - Interactive or non-interactive (--output) export of the results as JSON, NDJSON or binary columnar tables.
     - Handles both plain text logs (.log) and compressed logs (.log.gz).
+    - Optional instrumentation showing where the time of a run goes (--stats / --profile).
 
 Author:
     Yehonatan Ezra - yonzra12@gmail.com
@@ -27,7 +58,8 @@ Author:
 import argparse
 from datetime import datetime
 from pathlib import Path
-from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.defaults import (BACKENDS, DEFAULT_CACHE_BYTES, EXPORT_FORMATS, FOLLOW_INTERVAL,
+                                   conflicting_options)
 import messages
 
 
@@ -36,10 +68,41 @@ import messages
 # -------------------
 
 
-def _handle_export(analyzer):
+def _positive_int(value):
+    """ argparse type of --jobs and --cache-size: a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
+def _positive_float(value):
+    """ argparse type of --interval: a positive, finite number of seconds."""
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0.0
+    if not 0 < number < float("inf"):   # Also rejects nan
+        raise argparse.ArgumentTypeError(f"must be a positive number, got {value!r}")
+    return number
+
+
+def _mode_options(args):
+    """ Returns the analysis mode options given on the command line, named as in defaults.UNSUPPORTED_OPTIONS."""
+    given = (("--checkpoint", args.checkpoint is not None), ("--follow", args.follow),
+             ("--backend process", args.backend == "process"), ("--stream", args.stream),
+             ("--columnar", args.columnar), ("--cache", args.cache_dir is not None), ("--index", args.index),
+             ("--stats", args.stats), ("--profile", args.profile is not None))
+    return {option for option, is_given in given if is_given}
+
+
+def _handle_export(analyzer, fmt="json"):
     """
     Interactively prompts the user to export the analysis results.
-    If the user selects 'json' or 'csv', the results are written to a timestamped file.
+    If the user agrees, the results are written to a timestamped file in the given format.
     """
     print(messages.EXPORT_QUESTION)
     choice = ""
@@ -48,8 +111,8 @@ def _handle_export(analyzer):
 
     if choice == "y":
         date_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filename = f"log_output_{date_str}.json"
-        analyzer.export_to_json(filename)
+        filename = f"log_output_{date_str}.{fmt}"
+        analyzer.export(filename, fmt)
         print(f"Export complete: {filename}\n")
 
 
@@ -77,9 +140,39 @@ def main():
     p.add_argument("events_file", help="Path to the events configuration file (e.g. events.txt)")
     p.add_argument("--from", dest="ts_from", help="Only include entries at or after this ISO timestamp")
     p.add_argument("--to", dest="ts_to", help="Only include entries up to this ISO timestamp (inclusive)")
+    p.add_argument("--stream", action="store_true",
+                   help="Stream entries instead of loading them all into memory (bounded memory for huge logs)")
+    p.add_argument("--backend", choices=BACKENDS, default="thread",
+                   help="Execution backend; 'process' parses file chunks in worker processes to use all cores")
+    p.add_argument("--jobs", type=_positive_int, default=None,
+                   help="Number of threads / worker processes (default: CPU count)")
+    p.add_argument("--columnar", action="store_true",
+                   help="Keep matches in compact columnar batches instead of one object per entry")
+    p.add_argument("--index", action="store_true",
+                   help="Build a sidecar index next to each log file and use it to read only relevant blocks")
+    p.add_argument("--checkpoint", default=None,
+                   help="Checkpoint file: only analyze what was appended since the previous run, keep running counts")
+    p.add_argument("--follow", action="store_true",
+                   help="Keep watching the logs (following rotations) and print new matches as they appear")
+    p.add_argument("--interval", type=_positive_float, default=FOLLOW_INTERVAL,
+                   help="Seconds between two --follow passes")
+    p.add_argument("--cache", dest="cache_dir", default=None,
+                   help="Cache per-file, per-rule results in this directory and only re-analyze changed files")
+    p.add_argument("--cache-size", type=_positive_int, default=DEFAULT_CACHE_BYTES // 2 ** 20,
+                   help="Size bound of the result cache in MiB (least recently used results are evicted)")
+    p.add_argument("--output", default=None, help="Export the results to this file instead of asking interactively")
+    p.add_argument("--format", dest="fmt", choices=EXPORT_FORMATS, default="json",
+                   help="Export format; 'ndjson' writes one JSON record per line, 'columnar' binary column tables")
+    p.add_argument("--stats", action="store_true",
+                   help="Print run statistics: stage timers, lines read / rejected, per-worker and per-rule counters")
+    p.add_argument("--profile", default=None, help="Write the run statistics to this JSON file")
 
     # Parse the command-line arguments into a namespace
     args = p.parse_args()
+    conflict = conflicting_options(_mode_options(args))
+    if conflict is not None:
+        from log_analyzer import error_messages
+        p.error(error_messages.INCOMPATIBLE_OPTIONS.format(mode=conflict[0], option=conflict[1]))
 
     # Resolve paths
     log_dir = Path(args.logs_dir)
@@ -94,11 +187,37 @@ def main():
 
     print(messages.INTRO_MSG) # welcome message
 
-    analyzer = LogAnalyzer(str(log_dir), str(events_file), ts_from=args.ts_from, ts_to=args.ts_to)
-    analyzer.run()  # Run the core analysis: read logs, apply filters, and print results
+    # Imported once the arguments are validated: --help and bad arguments never load the analysis modules
+    from log_analyzer.analyzer import LogAnalyzer
+
+    analyzer = LogAnalyzer(str(log_dir), str(events_file), ts_from=args.ts_from, ts_to=args.ts_to,
+                           streaming=args.stream, backend=args.backend, jobs=args.jobs,
+                           columnar=args.columnar, use_index=args.index, checkpoint=args.checkpoint,
+                           collect_metrics=args.stats or args.profile is not None, cache_dir=args.cache_dir,
+                           cache_size=args.cache_size * 2 ** 20)
+    if args.follow:
+        try:
+            analyzer.follow(args.interval)  # Print new matches as the logs grow, until Ctrl+C
+        except KeyboardInterrupt:
+            pass
+        print(messages.OUTRO_MSG)
+        return
 
-    # Ask the user if they want to export the results to Json
-    _handle_export(analyzer)
+    with analyzer:  # Deletes the spool files of --stream once the results are printed and exported
+        analyzer.run()  # Run the core analysis: read logs, apply filters, and print results
+
+        if args.output:
+            analyzer.export(args.output, args.fmt)  # Non-interactive export for batch jobs
+            print(f"Export complete: {args.output}\n")
+        else:
+            # Ask the user if they want to export the results
+            _handle_export(analyzer, args.fmt)
+
+    if args.stats:
+        print(analyzer.metrics.report())
+    if args.profile:
+        analyzer.metrics.write_json(args.profile)
+        print(f"Profile written: {args.profile}")
 
     print(messages.OUTRO_MSG)  # Show closing message
 
@@ -0,0 +1,244 @@
+"""
+Streaming aggregation for rules with --bucket and/or --group-by, or --stat.
+
+Such a rule keeps no entries. With --bucket / --group-by every match only increments the counter of its
+(time bucket, group) cell, so memory grows with the number of distinct cells, not with the number of matches.
+With --stat the number captured by a group of the rule's --pattern is folded into running count / sum / min /
+max and a quantile sketch, in constant memory.
+
+Every accumulator can merge another one of the same rule, so partial results of parallel workers combine into
+exactly the result of a single pass.
+
+Buckets are aligned on the naive (wall-clock) epoch, so a 1d bucket starts at local midnight and a 1h bucket on
+the hour. Columnar batches are binned in one vectorized pass over their epoch column, with NumPy when it is
+installed and a Counter over the array otherwise.
+
+The bounded summaries of --head / --tail / --sample / --top-messages rules (see summaries) are accumulators too.
+"""
+
+import math
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, Iterator, NamedTuple
+from zoneinfo import ZoneInfo
+from log_analyzer import vectorized
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.event_config import EventConfig
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.sketch import QuantileSketch
+from log_analyzer.summaries import Summary, new_summary
+from log_analyzer.timestamps import CACHE_SIZE, from_naive_epoch, naive_epoch
+
+_MICROSECONDS = 1_000_000
+PERCENTILES = (50, 90, 99)   # Percentiles reported for --stat rules
+
+Cell = tuple[int | None, str | None]   # (bucket number or None, group value or None)
+
+
+class BucketRow(NamedTuple):
+    """ One reported cell of an aggregation."""
+    start: datetime | None   # Start of the time bucket (None without --bucket)
+    group: str | None        # Value of the --group-by field (None without --group-by)
+    count: int
+
+
+class BucketCounts:
+    """
+    Result of a --bucket / --group-by rule: match counts per (time bucket, group) cell.
+
+    Like CountedMatches, it behaves like an empty sequence of entries whose len() is the total number of
+    matches, so code that only reports counts works unchanged.
+
+    Attributes:
+        bucket (int | None): Bucket width in seconds (None: no time bucketing).
+        group_by (str | None): Entry field the counts are split by ("level" or "event_type"), or None.
+        local_timezone (ZoneInfo): Timezone of the reported bucket starts.
+        counts (dict[Cell, int]): Match count per cell.
+        count (int): Total number of matches.
+    """
+    def __init__(self, bucket: int | None, group_by: str | None, local_timezone: ZoneInfo):
+        self.bucket = bucket
+        self.group_by = group_by
+        self.local_timezone = local_timezone
+        self.counts: dict[Cell, int] = {}
+        self.count: int = 0
+        self._width = bucket * _MICROSECONDS if bucket else None
+        self._bucket_of: dict[datetime, int] = {}   # Parsed entries of the same second share one datetime
+
+    def add(self, entry: LogEntry) -> None:
+        """ Counts one matched entry."""
+        key = None
+        if self._width is not None:
+            key = self._bucket_of.get(entry.timestamp)
+            if key is None:
+                if len(self._bucket_of) >= CACHE_SIZE:
+                    self._bucket_of.clear()
+                key = self._bucket_of[entry.timestamp] = naive_epoch(entry.timestamp) // self._width
+        cell = (key, getattr(entry, self.group_by) if self.group_by else None)
+        self.counts[cell] = self.counts.get(cell, 0) + 1
+        self.count += 1
+
+    def extend(self, batch: EntryBatch, indices: Iterable[int] | None = None) -> None:
+        """ Counts the rows of a columnar batch (all of them, or only those at the given indices) in one pass."""
+        indices = range(len(batch)) if indices is None else list(indices)
+        if not indices:
+            return
+        names = {"level": batch.levels, "event_type": batch.event_types}.get(self.group_by)
+        codes = {"level": batch.level_codes, "event_type": batch.event_codes}.get(self.group_by)
+
+        if vectorized.enabled():   # Optional: vectorized binning of columnar batches
+            np = vectorized.np
+            rows = np.asarray(indices, dtype=np.intp)
+            keys = (np.frombuffer(batch.timestamps, dtype=np.int64)[rows] // self._width
+                    if self._width is not None else np.zeros(len(rows), dtype=np.int64))
+            group_codes = (np.frombuffer(codes, dtype=np.uint16)[rows].astype(np.int64)
+                           if codes is not None else np.zeros(len(rows), dtype=np.int64))
+            cells, totals = np.unique(np.stack([keys, group_codes]), axis=1, return_counts=True)
+            binned = zip(map(tuple, cells.T.tolist()), totals.tolist())
+        else:
+            timestamps = batch.timestamps
+            keys = ([timestamps[i] // self._width for i in indices] if self._width is not None
+                    else [0] * len(indices))
+            group_codes = [codes[i] for i in indices] if codes is not None else [0] * len(indices)
+            binned = Counter(zip(keys, group_codes)).items()
+
+        for (key, code), total in binned:
+            cell = (key if self._width is not None else None, names[code] if names is not None else None)
+            self.counts[cell] = self.counts.get(cell, 0) + total
+        self.count += len(indices)
+
+    def merge(self, other: "BucketCounts") -> None:
+        """ Adds the counts of another aggregation of the same rule."""
+        for cell, total in other.counts.items():
+            self.counts[cell] = self.counts.get(cell, 0) + total
+        self.count += other.count
+
+    def rows(self) -> list[BucketRow]:
+        """ Returns the non-empty cells ordered by bucket start, then group."""
+        cells = sorted(self.counts, key=lambda cell: (cell[0] or 0, cell[1] or ""))
+        return [BucketRow(from_naive_epoch(key * self._width, self.local_timezone) if key is not None else None,
+                          group, self.counts[(key, group)]) for key, group in cells]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(())
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        state["_bucket_of"] = {}   # A cache only; not worth sending between processes
+        return state
+
+
+class FieldStats:
+    """
+    Result of a --stat rule: statistics of the number captured by one group of the rule's --pattern.
+
+    Matches whose group did not participate or did not capture a finite number are counted as matches but
+    not as values. Like CountedMatches, it behaves like an empty sequence of entries whose len() is the number
+    of matches.
+
+    Attributes:
+        pattern (re.Pattern): The rule's pattern.
+        field (str): Name (or number) of the captured group.
+        count (int): Number of matches.
+        values (int): Number of numeric values extracted.
+        total (float): Sum of the values.
+        minimum (float | None): Smallest value (None before the first one).
+        maximum (float | None): Largest value (None before the first one).
+        sketch (QuantileSketch): Approximate distribution of the values.
+    """
+    def __init__(self, pattern: re.Pattern, field: str):
+        self.pattern = pattern
+        self.field = field
+        self.count: int = 0
+        self.values: int = 0
+        self.total: float = 0.0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self.sketch = QuantileSketch()
+        self._group = int(field) if field.isdigit() else field
+
+    def add_message(self, message: str) -> None:
+        """ Counts one matched message and folds in the number its group captured."""
+        self.count += 1
+        match = self.pattern.search(message)
+        text = match.group(self._group) if match else None
+        try:
+            value = float(text)
+        except (TypeError, ValueError):
+            return
+        if not math.isfinite(value):
+            return
+        self.values += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.sketch.add(value)
+
+    def add(self, entry: LogEntry) -> None:
+        """ Counts one matched entry."""
+        self.add_message(entry.message)
+
+    def extend(self, batch: EntryBatch, indices: Iterable[int] | None = None) -> None:
+        """ Counts the rows of a columnar batch (all of them, or only those at the given indices)."""
+        for i in range(len(batch)) if indices is None else indices:
+            self.add_message(batch.message(i))
+
+    def merge(self, other: "FieldStats") -> None:
+        """ Adds the statistics of another accumulator of the same rule."""
+        self.count += other.count
+        self.values += other.values
+        self.total += other.total
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                self.minimum = value if self.minimum is None else min(self.minimum, value)
+                self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self) -> float | None:
+        """ The mean of the values (None if there are none)."""
+        return self.total / self.values if self.values else None
+
+    def summary(self) -> dict:
+        """ Returns the reported statistics: field, values, sum, min, max, mean and the PERCENTILES."""
+        summary = {"field": self.field, "values": self.values, "sum": self.total, "min": self.minimum,
+                   "max": self.maximum, "mean": self.mean}
+        for p in PERCENTILES:
+            summary[f"p{p}"] = self.sketch.quantile(p / 100)
+        return summary
+
+    def state(self) -> dict:
+        """ Returns the accumulator as plain JSON-compatible data (see from_state)."""
+        return {"count": self.count, "values": self.values, "sum": self.total, "min": self.minimum,
+                "max": self.maximum, "sketch": self.sketch.state()}
+
+    @classmethod
+    def from_state(cls, pattern: re.Pattern, field: str, state: dict) -> "FieldStats":
+        """ Rebuilds an accumulator saved with state()."""
+        stats = cls(pattern, field)
+        stats.count, stats.values, stats.total = state["count"], state["values"], state["sum"]
+        stats.minimum, stats.maximum = state["min"], state["max"]
+        stats.sketch = QuantileSketch.from_state(state["sketch"])
+        return stats
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(())
+
+
+Accumulator = BucketCounts | FieldStats | Summary   # Result of an aggregated rule
+
+
+def new_accumulator(ev_config: EventConfig, local_timezone: ZoneInfo) -> Accumulator:
+    """ Returns the empty accumulator of an aggregated rule (see EventConfig.aggregated)."""
+    if ev_config.summary is not None:
+        return new_summary(ev_config.summary, ev_config.summary_size)
+    if ev_config.stat is not None:
+        return FieldStats(ev_config.pattern, ev_config.stat)
+    return BucketCounts(ev_config.bucket, ev_config.group_by, local_timezone)
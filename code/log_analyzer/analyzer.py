@@ -1,17 +1,35 @@
-import gzip
-import json
 import os
-from datetime import datetime
+import time
+from contextlib import AbstractContextManager, nullcontext
 from zoneinfo import ZoneInfo
 from pathlib import Path
+from log_analyzer.aggregation import Accumulator, BucketCounts, FieldStats, new_accumulator
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.console import ConsoleWriter
+from log_analyzer.defaults import (BACKENDS, DEFAULT_CACHE_BYTES, DEFAULT_LOCAL_TIME, FOLLOW_INTERVAL,
+                                   conflicting_options)
 from log_analyzer.log_entry import LogEntry
-from log_analyzer.event_config import load_configs, EventConfig
-from log_analyzer.event_filter import EventFilter
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from log_analyzer.event_config import load_configs, format_duration, EventConfig
+from log_analyzer.exporter import export_results
+from log_analyzer.metrics import FileMetrics, RuleMetrics, RunMetrics
+from log_analyzer.ordering import merge_batches, merge_entries, sort_entries, sorted_rows
+from log_analyzer.rule_engine import RuleEngine
+from log_analyzer.timestamps import TimestampParser, naive_epoch, parse_bound
+from log_analyzer import vectorized
+from log_analyzer.streaming import (CountedMatches, SpooledMatches, iter_file_entries, iter_file_lines,
+                                    list_log_files, stream_analysis)
+from log_analyzer.summaries import EntrySample, EntryWindow, TopMessages
 from log_analyzer import error_messages
 from functools import cached_property
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from log_analyzer.incremental import Checkpoint
+    from log_analyzer.result_cache import ResultCache
+
+# The modules of the other modes (parallel, incremental, result_cache) and the thread pool are imported by the
+# methods using them, so a short run only loads what its mode needs (see benchmarks.bench_startup).
 
-DEFAULT_LOCAL_TIME = "Asia/Jerusalem"    # Default timezone used for interpreting timestamps
 MAX_WORKERS = os.cpu_count() or 4        # Maximum number of threads to use
 
 
@@ -25,9 +43,20 @@ class LogAnalyzer:
         ts_from:       optional ISO timestamp string (inclusive lower bound)
         ts_to:         optional ISO timestamp string (inclusive upper bound)
         local_timezone (ZoneInfo): The timezone used for interpreting timestamps.
+        streaming (bool): Whether to analyze in bounded-memory streaming mode.
+        backend (str): "thread" or "process" execution backend.
+        columnar (bool): Whether matches are kept in memory-lean columnar EntryBatch containers.
+        use_index (bool): Whether log files are read through their persistent sidecar indexes.
+        max_workers (int): Number of threads or worker processes to use.
+        checkpoint (str | None): Checkpoint file of the incremental mode (None for a full analysis).
+        cache (ResultCache | None): Persistent per-file, per-rule result cache (see result_cache), if enabled.
+        metrics (RunMetrics | None): Timers and counters of the run, when collected (see metrics).
     """
     def __init__(self, log_dir: str, events_file: str, ts_from: str | None = None,
-                 ts_to: str | None = None, local_timezone: ZoneInfo = ZoneInfo(DEFAULT_LOCAL_TIME)):
+                 ts_to: str | None = None, local_timezone: ZoneInfo = ZoneInfo(DEFAULT_LOCAL_TIME),
+                 streaming: bool = False, backend: str = "thread", jobs: int | None = None,
+                 columnar: bool = False, use_index: bool = False, checkpoint: str | None = None,
+                 collect_metrics: bool = False, cache_dir: str | None = None, cache_size: int = DEFAULT_CACHE_BYTES):
         """
         Initializes the LogAnalyzer.
 
@@ -37,21 +66,59 @@ class LogAnalyzer:
             ts_from (str | None): Optional ISO timestamp string for the start of the time range.
             ts_to (str | None): Optional ISO timestamp string for the end of the time range.
             local_timezone (ZoneInfo): Timezone to apply to parsed timestamps.
+            streaming (bool): If True, never hold all parsed entries in memory: --count rules keep only an
+                integer and matches of other rules are spooled to temporary files as they are found.
+            backend (str): "thread" (default) or "process". The process backend splits large files into
+                line-aligned chunks and parses them in worker processes, escaping the GIL.
+            jobs (int | None): Number of threads or worker processes (defaults to the CPU count).
+            columnar (bool): If True, parse lines straight into columnar EntryBatch containers (epoch-int
+                timestamps, coded level/event_type, one shared message buffer) instead of LogEntry objects.
+            use_index (bool): If True, build a sidecar index next to each log file on the first scan and, on
+                later runs, read only the blocks that can match the configured event types and time window.
+            checkpoint (str | None): If set, analyze incrementally: only the bytes appended to each log file since
+                the checkpoint are processed, --count rules report running totals and other rules the entries
+                found by this run. Rotated (renamed or compressed) files are followed. See incremental.
+            collect_metrics (bool): If True, per-stage timers and per-file / per-rule counters of the run are
+                collected into self.metrics (see metrics).
+            cache_dir (str | None): If set, the result of every rule on every log file is cached in this directory,
+                and only files whose cached results are missing or stale are read (see result_cache). Applies to
+                the default and columnar modes of the thread backend.
+            cache_size (int): Size bound in bytes of the result cache; least recently used entries are evicted.
+
+        Raises:
+            ValueError: If the backend is unknown, jobs is not positive, or two modes that cannot be combined are
+                requested (see defaults.UNSUPPORTED_OPTIONS).
         """
         self.log_dir = log_dir
         self.configs: list[EventConfig] = load_configs(events_file)
         self.local_timezone = local_timezone
-        try:
-            self.ts_from = datetime.fromisoformat(ts_from).replace(tzinfo=local_timezone) if ts_from else None
-        except ValueError as e:
-            raise ValueError(error_messages.INVALID_TIMESTAMP_FORMAT.format(ts=ts_from, error=e))
+        self.ts_from = parse_bound(ts_from, local_timezone)
+        self.ts_to = parse_bound(ts_to, local_timezone)
+
+        if backend not in BACKENDS:
+            raise ValueError(error_messages.INVALID_BACKEND.format(backend=backend, allowed=", ".join(BACKENDS)))
 
-        try:
-            self.ts_to = datetime.fromisoformat(ts_to).replace(tzinfo=local_timezone) if ts_to else None
-        except ValueError as e:
-            raise ValueError(error_messages.INVALID_TIMESTAMP_FORMAT.format(ts=ts_to, error=e))
+        if jobs is not None and jobs < 1:
+            raise ValueError(error_messages.INVALID_JOBS.format(jobs=jobs))
+        conflict = conflicting_options({option for option, given in (
+            ("--checkpoint", checkpoint is not None), ("--backend process", backend == "process"),
+            ("--stream", streaming), ("--columnar", columnar), ("--cache", cache_dir is not None),
+            ("--index", use_index)) if given})
+        if conflict is not None:
+            raise ValueError(error_messages.INCOMPATIBLE_OPTIONS.format(mode=conflict[0], option=conflict[1]))
 
-        self.max_workers = MAX_WORKERS
+        self.max_workers = MAX_WORKERS if jobs is None else jobs
+        self.streaming = streaming
+        self.backend = backend
+        self.columnar = columnar
+        self.use_index = use_index
+        self.checkpoint = checkpoint
+        self._checkpoint_state: Checkpoint | None = None   # Loaded on the first incremental pass
+        self.cache: "ResultCache | None" = None
+        if cache_dir is not None:
+            from log_analyzer.result_cache import ResultCache
+            self.cache = ResultCache(cache_dir, cache_size)
+        self.metrics: RunMetrics | None = RunMetrics(self.configs) if collect_metrics else None
 
     # -------------------
     # Helper Functions
@@ -60,70 +127,309 @@ class LogAnalyzer:
     @cached_property
     def _cached_analysis(self) -> list[tuple[EventConfig, list[LogEntry]]]:
         """Computes the filtered log entries per event config once and caches the result."""
+        with self._stage("analyze"):
+            results = self._select_analysis()
+        if self.metrics is not None:
+            self.metrics.record_matches(results)
+        return results
+
+    def _select_analysis(self) -> list[tuple[EventConfig, list[LogEntry]]]:
+        """ Runs the analysis of the configured mode."""
+        if self.checkpoint is not None:
+            return self._analyze_incremental()
+        if self.backend == "process":
+            return self._analyze_processes()
+        if self.streaming:
+            return self._analyze_streaming()
+        if self.cache is not None:
+            return self._analyze_cached()
+        if self.columnar:
+            return self._analyze_columnar()
         return self._analyze()
 
     def _analyze(self) -> list[tuple[EventConfig, list[LogEntry]]]:
-        """ Analyze log entries by applying all event filters in parallel using threads."""
-        entries = self._gather_entries()  # Load and filter log entries from all log files
+        """
+        Analyze log entries in a single pass: every entry is dispatched once, through a compiled RuleEngine,
+        to only the rules indexed under its event_type and level. Results keep the events-file order, and the
+        entries are dispatched in time order, so every rule's matches are too; --bucket / --group-by / --stat
+        rules only fold their matches into an accumulator.
+        """
+        entries = self._gather_entries()  # Load and filter log entries from all log files, in time order
+        engine = RuleEngine(self.configs, rule_metrics=self._rule_metrics())
 
-        def _process_config(ev_config: EventConfig) -> tuple[EventConfig, list[LogEntry]]:
-            """ A task that filters entries using a specific config"""
-            flt = EventFilter(ev_config)
-            matched = [e for e in entries if flt.matches(e)]
-            return ev_config, matched
+        matched: list[list[LogEntry] | Accumulator] = [
+            new_accumulator(cfg, self.local_timezone) if cfg.aggregated else [] for cfg in self.configs]
+        add = [target.add if isinstance(target, Accumulator) else target.append for target in matched]
+        with self._stage("match"):
+            for entry in entries:
+                for idx in engine.match(entry):
+                    add[idx](entry)
 
-        results = []
-        # Use thread pool to process each config in parallel
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(_process_config, cfg): cfg for cfg in self.configs}
-            # Collect results as each thread finishes
-            for future in as_completed(futures):
-                results.append(future.result())
+        return list(zip(self.configs, matched))
 
-        return results
+    def _analyze_streaming(self) -> list[tuple[EventConfig, CountedMatches | SpooledMatches]]:
+        """
+        Analyze log entries without materializing them: each file is read line by line and every entry is
+        routed straight to its rules. --count rules keep only an integer, other rules spool matches to disk.
+        """
+        engine = RuleEngine(self.configs, rule_metrics=self._rule_metrics())
+        results = stream_analysis(list_log_files(self.log_dir), engine, self._timestamp_parser(), self.use_index,
+                                  self.metrics)
+        return list(zip(self.configs, results))
+
+    def _analyze_columnar(self) -> list[tuple[EventConfig, EntryBatch]]:
+        """
+        Analyze log entries in memory-lean columnar form: each file is parsed (in parallel threads) straight
+        into an EntryBatch, every batch is dispatched once through the RuleEngine on its level/event codes,
+        and each rule's matches of every file, sorted by time, are k-way merged into its own EntryBatch (see
+        ordering). With NumPy installed the --from/--to window is applied to each batch's timestamp column as one
+        vectorized comparison.
+        """
+        ts_parser = self._timestamp_parser()
+        rules = RuleEngine(self.configs).rules
+        vectorize = vectorized.enabled()
+
+        def _process_file(path: Path) -> tuple[EntryBatch, object]:
+            """ Parses a single log file into a columnar batch, with its window mask when vectorized."""
+            file_metrics = self._file_metrics(path)
+            batch = EntryBatch.from_lines(iter_file_lines(path, ts_parser, rules, self.use_index, file_metrics),
+                                          ts_parser, file_metrics, window=not vectorize)
+            return batch, vectorized.window_mask(batch, ts_parser, file_metrics) if vectorize else None
+
+        batches = self._map_files(_process_file, list_log_files(self.log_dir))
+
+        engine = RuleEngine(self.configs, rule_metrics=self._rule_metrics())
+        matched = [new_accumulator(cfg, self.local_timezone) if cfg.aggregated else EntryBatch(self.local_timezone)
+                   for cfg in self.configs]
+        parts: list[list[tuple[EntryBatch, list[int]]]] = [[] for _ in self.configs]
+        with self._stage("match"):
+            for batch, window in batches:
+                for idx, indices in enumerate(engine.match_batch(batch, window)):
+                    if isinstance(matched[idx], Accumulator):
+                        matched[idx].extend(batch, indices)
+                    elif indices:
+                        parts[idx].append((batch, sorted_rows(batch, indices)))
+            for target, rule_parts in zip(matched, parts):
+                if rule_parts:
+                    merge_batches(target, rule_parts)
+
+        return list(zip(self.configs, matched))
+
+    def _analyze_cached(self) -> list[tuple[EventConfig, list[LogEntry] | EntryBatch | Accumulator]]:
+        """
+        Analyze log entries through the result cache: the partial result of every rule on every file is taken
+        from the cache when its key is present, and only the missing rules of a file are computed (reading the
+        file once for all of them) and stored. Partial results are kept sorted by time and k-way merged.
+        """
+        from log_analyzer.result_cache import Partial, entry_key, file_key, rule_key
+
+        run_parser = self._timestamp_parser()
+        now, now_epoch = run_parser.now, naive_epoch(run_parser.now)
+        rule_keys = [rule_key(cfg, run_parser) for cfg in self.configs]
+
+        def _new(cfg: EventConfig) -> list[LogEntry] | Accumulator:
+            """ Returns an empty partial result of a rule."""
+            return new_accumulator(cfg, self.local_timezone) if cfg.aggregated else []
+
+        def _process_file(path: Path) -> list[Partial]:
+            """ Returns the partial result of every rule on a file, computing the ones not cached."""
+            file_part = file_key(path)
+            keys = [entry_key(file_part, rule_part) for rule_part in rule_keys]
+            partials = [self.cache.get(key, now_epoch) for key in keys]
+            missing = [idx for idx, partial in enumerate(partials) if partial is None]
+            if not missing:
+                return partials
+
+            engine = RuleEngine([self.configs[idx] for idx in missing])
+            fresh = [_new(cfg) for cfg in engine.configs]
+            add = [target.add if isinstance(target, Accumulator) else target.append for target in fresh]
+            ts_parser = TimestampParser(self.local_timezone, self.ts_from, self.ts_to, now)   # Tracks this file only
+            for entry in iter_file_entries(path, ts_parser, engine.rules, self.use_index, self._file_metrics(path)):
+                for idx in engine.match(entry):
+                    add[idx](entry)
+
+            for idx, partial in zip(missing, fresh):
+                if isinstance(partial, list):
+                    sort_entries(partial)
+                # The file's future-dated lines become valid once "now" reaches the earliest of them
+                self.cache.put(keys[idx], self.configs[idx], partial, self.local_timezone, ts_parser.earliest_future)
+                partials[idx] = partial
+            return partials
+
+        per_file = self._map_files(_process_file, list_log_files(self.log_dir))
+        self.cache.save()
+
+        matched = [new_accumulator(cfg, self.local_timezone) if cfg.aggregated else
+                   EntryBatch(self.local_timezone) if self.columnar else [] for cfg in self.configs]
+        with self._stage("match"):
+            for idx, target in enumerate(matched):
+                runs = [partials[idx] for partials in per_file]
+                if isinstance(target, Accumulator):
+                    for partial in runs:
+                        target.merge(partial)
+                elif isinstance(target, EntryBatch):
+                    batches = [partial if isinstance(partial, EntryBatch) else
+                               EntryBatch.from_entries(partial, self.local_timezone) for partial in runs]
+                    merge_batches(target, [(batch, range(len(batch))) for batch in batches if batch])
+                else:
+                    target.extend(merge_entries(runs))
+
+        return list(zip(self.configs, matched))
+
+    def _analyze_processes(self) -> list[tuple[EventConfig, list[LogEntry] | CountedMatches | SpooledMatches]]:
+        """
+        Analyze log entries in worker processes. Each line-aligned chunk is parsed and filtered in a worker,
+        which sends back a count for --count rules and the matched entries for the others. Kept entries are
+        k-way merged into time order; spooled (--stream) matches stay in file order.
+        """
+        from log_analyzer.parallel import analyze_in_processes
+
+        merged = [new_accumulator(cfg, self.local_timezone) if cfg.aggregated else
+                  CountedMatches() if cfg.count else SpooledMatches(cfg.event_type) if self.streaming else []
+                  for cfg in self.configs]
+        runs: list[list[list[LogEntry]]] = [[] for _ in self.configs]   # Sorted chunk results of the list rules
+        chunk_results = analyze_in_processes(list_log_files(self.log_dir), self.configs, self._timestamp_parser(),
+                                             max_workers=self.max_workers, use_index=self.use_index)
+        for chunk_result in chunk_results:
+            for idx, (target, partial) in enumerate(zip(merged, chunk_result)):
+                if isinstance(target, Accumulator):
+                    target.merge(partial)
+                elif isinstance(target, CountedMatches):
+                    target.count += partial
+                elif isinstance(target, SpooledMatches):
+                    for entry in partial:
+                        target.add(entry)
+                else:
+                    runs[idx].append(sort_entries(partial))
+
+        for idx, rule_runs in enumerate(runs):
+            if rule_runs:
+                merged[idx] = list(merge_entries(rule_runs))
+        return list(zip(self.configs, merged))
+
+    def _analyze_incremental(self,
+                             hold_back: bool = False) -> list[tuple[EventConfig, list[LogEntry] | CountedMatches]]:
+        """
+        Analyze only what was appended to the log files since the last pass: --count rules report running
+        totals, other rules the entries matched by this pass. The checkpoint is saved afterwards (it is kept in
+        memory only when no checkpoint file was given). With hold_back (follow mode), an unterminated last line
+        waits for its newline.
+        """
+        from log_analyzer.incremental import Checkpoint, analyze_increment, config_signature
+
+        ts_parser = self._timestamp_parser()
+        if self._checkpoint_state is None:
+            self._checkpoint_state = Checkpoint.load(self.checkpoint, config_signature(self.configs, ts_parser),
+                                                     len(self.configs))
+        results = analyze_increment(list_log_files(self.log_dir), self._checkpoint_state, RuleEngine(self.configs),
+                                    ts_parser, hold_back)
+        self._checkpoint_state.save()
+        return list(zip(self.configs, results))
 
     def _gather_entries(self) -> list[LogEntry]:
         """
          Walks through all log files in the log directory and parses them into LogEntry objects, using threads to
-         process multiple files concurrently.
+         process multiple files concurrently. Every file's entries are sorted by time and the files are k-way
+         merged, so the result is in time order whichever file finished first (see ordering).
         """
-        # Identify valid log files: .log or .gz
-        entries: list[LogEntry] = []
-        log_dir_path = Path(self.log_dir)
-        log_files = [p for p in log_dir_path.iterdir() if p.is_file() and (p.suffix == ".log" or p.suffix == ".gz")]
+        log_files = list_log_files(self.log_dir)  # Identify valid log files: .log or .gz
+        ts_parser = self._timestamp_parser()      # Shared by all threads: bounds computed once per run
+        rules = RuleEngine(self.configs).rules   # Lets the readers skip lines no rule can match
 
         def _process_file(path: Path) -> list[LogEntry]:
             """
             Reads a single log file, parses each line to a LogEntry (if valid),and applies time-range filtering.
             """
-            result = []
-            open_func = gzip.open if path.suffix == ".gz" else open
-            with open_func(path, "rt", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    try:
-                        entry = LogEntry.parse_line(line, local_timezone=self.local_timezone)
-                        if entry and self._in_range(entry):
-                            result.append(entry)
-                    except ValueError:
-                        continue   # Skip lines that don't match expected format.
-            return result
+            return sort_entries(list(iter_file_entries(path, ts_parser, rules, self.use_index,
+                                                       self._file_metrics(path))))
 
         # Process all files in parallel
+        per_file = self._map_files(_process_file, log_files)
+
+        return list(merge_entries(per_file))
+
+    @staticmethod
+    def _print_results(results: list[tuple[EventConfig, list[LogEntry]]]) -> None:
+        """ Prints the header and the count or matching entries of every event configuration (see console)."""
+        with ConsoleWriter() as out:   # Entries are formatted in chunks and written in large blocks
+            for ev_config, matched in results:
+                header = f"EventType: {ev_config.event_type}"
+                specs = []
+                if ev_config.count:
+                    specs.append("v count")
+                if ev_config.level:
+                    specs.append(f" level={ev_config.level}")
+                if ev_config.pattern:
+                    specs.append(f" pattern={ev_config.pattern.pattern}")
+                if ev_config.bucket:
+                    specs.append(f" bucket={format_duration(ev_config.bucket)}")
+                if ev_config.group_by:
+                    specs.append(f" group-by={ev_config.group_by}")
+                if ev_config.stat:
+                    specs.append(f" stat={ev_config.stat}")
+                if ev_config.summary:
+                    specs.append(f" {ev_config.summary}={ev_config.summary_size}")
+                if specs:
+                    header += "\nflags:" + ",".join(specs) + ":"
+
+                if isinstance(matched, FieldStats):
+                    out.line(f"{header}\nCount of matches: {len(matched)}")
+                    stats = ", ".join(f"{name}={'-' if value is None else f'{value:g}'}"
+                                      for name, value in matched.summary().items() if name != "field")
+                    out.line(f"  {matched.field}: {stats}\n")
+                elif isinstance(matched, BucketCounts):
+                    out.line(f"{header}\nCount of matches: {len(matched)}")
+                    for row in matched.rows():
+                        cell = [row.start.isoformat()] if row.start is not None else []
+                        if row.group is not None:
+                            cell.append(f"{ev_config.group_by}={row.group}")
+                        out.line(f"  {'  '.join(cell)}: {row.count}")
+                    out.line(" ")
+                elif isinstance(matched, TopMessages):
+                    out.line(f"{header}\nCount of matches: {len(matched)}\nmost frequent messages:")
+                    for message, count, error in matched.rows():
+                        out.line(f"  {count}{f' (+-{error})' if error else ''}: {message}")
+                    out.line(" ")
+                elif isinstance(matched, (EntryWindow, EntrySample)):
+                    label = {"head": "first", "tail": "last", "sample": "sampled"}[ev_config.summary]
+                    out.line(f"{header}\nCount of matches: {len(matched)}")
+                    out.line(f"{label} {ev_config.summary_size} matching entries:")
+                    out.entries(matched)
+                    if not matched:
+                        out.line("  none")
+                    out.line(" ")
+                elif ev_config.count:
+                    out.line(f"{header}\nCount of matches: {len(matched)}\n")
+                else:
+                    out.line(f"{header}\nmatching entries:")
+                    out.entries(matched)
+                    if not matched:
+                        out.line("  none")
+                    out.line(" ")
+
+    def _map_files(self, fn: Callable[[Path], object], paths: list[Path]) -> list:
+        """ Runs fn over log files on a thread pool, or in the calling thread when there is a single file."""
+        if len(paths) <= 1 or self.max_workers == 1:
+            return [fn(path) for path in paths]   # No pool to start (nor concurrent.futures to import)
+        from concurrent.futures import ThreadPoolExecutor
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(_process_file, path): path for path in log_files}
-            for future in as_completed(futures):
-                entries.extend(future.result())
+            return list(executor.map(fn, paths))
+
+    def _timestamp_parser(self) -> TimestampParser:
+        """ Creates the run's timestamp parser, which also applies the --from/--to window."""
+        return TimestampParser(self.local_timezone, self.ts_from, self.ts_to)
+
+    def _stage(self, name: str) -> AbstractContextManager:
+        """ Times a with-block into a metrics stage (a no-op when metrics are not collected)."""
+        return self.metrics.stage(name) if self.metrics is not None else nullcontext()
 
-        return entries
+    def _file_metrics(self, path: Path) -> FileMetrics | None:
+        """ Returns the metrics record of a file read by the calling thread, or None when not collected."""
+        return self.metrics.new_file(path) if self.metrics is not None else None
 
-    def _in_range(self, entry: LogEntry) -> bool:
-        """Check whether entry.timestamp is between self.ts_from and self.ts_to (inclusive)."""
-        ts = entry.timestamp
-        if self.ts_from and ts < self.ts_from:
-            return False
-        if self.ts_to and ts > self.ts_to:
-            return False
-        return True
+    def _rule_metrics(self) -> list[RuleMetrics] | None:
+        """ Returns the per-rule metrics records, or None when not collected."""
+        return self.metrics.rules if self.metrics is not None else None
 
     # -------------------
     # Public Functions
@@ -137,32 +443,52 @@ class LogAnalyzer:
             - Applies the relevant filters (event_type, --level, --pattern)
             - Prints a header that describes the filters
             - If --count was specified, prints the number of matches
+            - If --bucket / --group-by was specified, prints the number of matches per time bucket / group
+            - If --stat was specified, prints statistics (sum, min, max, mean, percentiles) of the captured number
+            - If --head / --tail / --sample was specified, prints the number of matches and only the first / last /
+              sampled entries; with --top-messages, the most frequent normalized messages and their counts
             - Otherwise, prints the actual matching log entries (or "(none)" if there are none)
 
         This is the main method triggered in CLI usage when no export format is requested.
         """
+        results = self._cached_analysis
+        with self._stage("output"):
+            self._print_results(results)
 
-        for ev_config, matched in self._cached_analysis:
-            header = f"EventType: {ev_config.event_type}"
-            specs = []
-            if ev_config.count:
-                specs.append("v count")
-            if ev_config.level:
-                specs.append(f" level={ev_config.level}")
-            if ev_config.pattern:
-                specs.append(f" pattern={ev_config.pattern.pattern}")
-            if specs:
-                header += "\nflags:" + ",".join(specs) + ":"
-
-            if ev_config.count:
-                print(f"{header}\nCount of matches: {len(matched)}\n")
-            else:
-                print(f"{header}\nmatching entries:")
-                for entry in matched:
-                    print(f"  {entry}")
-                if not matched:
-                    print("  none")
-                print(" ")
+    def follow(self, interval: float = FOLLOW_INTERVAL, passes: int | None = None) -> None:
+        """
+        Keeps analyzing the log directory incrementally, like `tail -f`: every interval seconds the bytes appended
+        since the previous pass are processed, and the new matches and running --count totals are printed
+        whenever something changed. Runs until interrupted.
+
+        Args:
+            interval (float): Seconds to wait between two passes.
+            passes (int | None): Stop after this many passes (None runs forever).
+        """
+        done = 0
+        last_counts = None
+        while passes is None or done < passes:
+            results = self._analyze_incremental(hold_back=True)
+            counts = [len(matched) for _, matched in results]
+            if last_counts is None or counts != last_counts or any(
+                    not ev_config.count and matched for ev_config, matched in results):
+                self._print_results(results)
+            last_counts = counts
+            done += 1
+            if passes is None or done < passes:
+                time.sleep(interval)
+
+    def export(self, path: str, fmt: str = "json") -> None:
+        """
+        Streams the filtered log entries to a file, one entry at a time (see exporter).
+
+        Args:
+            path (str): Destination file path.
+            fmt (str): "json" (one group per event configuration) or "ndjson" (one record per line).
+        """
+        results = self._cached_analysis
+        with self._stage("output"):
+            export_results(results, path, self.local_timezone, fmt)
 
     def export_to_json(self, path: str) -> None:
         """
@@ -171,27 +497,21 @@ class LogAnalyzer:
              Args:
                  path (str): Destination file path.
              """
-        with open(path, "w", encoding="utf-8") as f:
-            results = []
-            for ev_config, matched in self._cached_analysis:
-                group = {
-                    "event_type": ev_config.event_type,
-                    "filters": {
-                        "count": ev_config.count,
-                        "level": ev_config.level,
-                        "pattern": ev_config.pattern.pattern if ev_config.pattern else None,
-                    },
-                    "entries": [
-                        {
-                            "timestamp": entry.timestamp.isoformat(),
-                            "level": entry.level,
-                            "message": entry.message,
-                        }
-                        for entry in matched
-                    ]
-                }
-                results.append(group)
-
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+        self.export(path, "json")
+
+    def close(self) -> None:
+        """
+        Closes (and thereby deletes) the spool files of the streaming matches and drops the cached analysis, so
+        a later run() or export() analyzes again.
+        """
+        results = self.__dict__.pop("_cached_analysis", None)
+        for _, matched in results or ():
+            if isinstance(matched, SpooledMatches):
+                matched.close()
+
+    def __enter__(self) -> "LogAnalyzer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
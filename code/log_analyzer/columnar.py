@@ -0,0 +1,256 @@
+"""
+Columnar, memory-lean container for many parsed log entries.
+
+Instead of one Python object per entry, an EntryBatch keeps:
+    - timestamps as naive-epoch microseconds in an array('q')
+    - level and event_type as small-int codes (array('H')) into per-batch dictionaries
+    - messages in one shared text buffer, addressed by offsets in an array('q')
+
+Entries are only materialized as LogEntry objects on demand. A batch can also be written to / read from a
+binary stream as one table of the columnar export format (see columnar_file).
+"""
+
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime
+from typing import BinaryIO, Iterable, Iterator
+from zoneinfo import ZoneInfo
+from log_analyzer import error_messages
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.metrics import FileMetrics
+from log_analyzer.timestamps import CACHE_SIZE, TimestampParser, from_naive_epoch, naive_epoch
+
+_TABLE_HEADER = struct.Struct("<QQQ")   # Rows, dictionary JSON bytes, message text bytes
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    """ Reads exactly size bytes from a binary stream."""
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError(error_messages.TRUNCATED_COLUMNAR_FILE)
+    return data
+
+
+def _little_endian(column: array) -> array:
+    """ Returns the column with little-endian items (a byte-swapped copy on big-endian machines)."""
+    if sys.byteorder == "little":
+        return column
+    swapped = array(column.typecode, column)
+    swapped.byteswap()
+    return swapped
+
+
+class EntryBatch:
+    """
+    A columnar batch of log entries that all share one local timezone.
+
+    Attributes:
+        local_timezone (ZoneInfo): Timezone of every timestamp in the batch.
+        timestamps (array): Naive-epoch microseconds, one per entry.
+        level_codes (array): Index into self.levels, one per entry.
+        event_codes (array): Index into self.event_types, one per entry.
+        levels (list[str]): Level dictionary (code -> level string).
+        event_types (list[str]): Event type dictionary (code -> event type string).
+    """
+    def __init__(self, local_timezone: ZoneInfo):
+        """ Creates an empty batch."""
+        self.local_timezone = local_timezone
+        self.timestamps = array("q")
+        self.level_codes = array("H")
+        self.event_codes = array("H")
+        self.levels: list[str] = []
+        self.event_types: list[str] = []
+        self._level_index: dict[str, int] = {}
+        self._event_index: dict[str, int] = {}
+        self._offsets = array("q", [0])   # Message i is self._text[offsets[i]:offsets[i + 1]]
+        self._pending: list[str] = []     # Messages appended since the buffer was last joined
+        self._text = ""
+
+    # -------------------
+    # Building
+    # -------------------
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[LogEntry], local_timezone: ZoneInfo) -> "EntryBatch":
+        """ Builds a batch from LogEntry objects."""
+        batch = cls(local_timezone)
+        for entry in entries:
+            batch.append(naive_epoch(entry.timestamp), entry.level, entry.event_type, entry.message)
+        return batch
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], ts_parser: TimestampParser,
+                   metrics: FileMetrics | None = None, window: bool = True) -> "EntryBatch":
+        """
+        Parses raw log lines straight into a batch, skipping invalid lines and lines outside the parser's
+        --from/--to window. No LogEntry or tz-aware datetime is created. When metrics is given, the lines,
+        entries, rejections and timings are recorded in it. With window=False lines outside the window are kept
+        (and counted as entries), for callers that filter the timestamp column afterwards (see vectorized).
+        """
+        batch = cls(ts_parser.local_timezone)
+        if metrics is not None:
+            lines = metrics.timed_lines(lines)
+        for line in lines:
+            try:
+                ts_str, level, event_type, message = LogEntry.split_line(line)
+                epoch = ts_parser.parse_epoch(ts_str)
+            except ValueError:
+                if metrics is not None:
+                    metrics.reject(line, ts_parser)
+                continue   # Skip lines that don't match expected format.
+            if not window or ts_parser.in_window(epoch):
+                batch.append(epoch, level, event_type, message)
+            elif metrics is not None:
+                metrics.reject(line, ts_parser)
+        if metrics is not None:
+            metrics.entries += len(batch)
+        return batch
+
+    def level_code(self, level: str) -> int | None:
+        """ Returns the code of a level string, or None if no entry in the batch has that level."""
+        return self._level_index.get(level)
+
+    def event_code(self, event_type: str) -> int | None:
+        """ Returns the code of an event type, or None if no entry in the batch has that event type."""
+        return self._event_index.get(event_type)
+
+    @staticmethod
+    def _code(index: dict[str, int], values: list[str], value: str) -> int:
+        """ Returns the code of value in a dictionary, adding it if it is new."""
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(values)
+            values.append(value)
+        return code
+
+    def append(self, epoch: int, level: str, event_type: str, message: str) -> None:
+        """ Appends one entry given as naive-epoch microseconds and its text fields."""
+        level_code = self._level_index.get(level)
+        if level_code is None:
+            level_code = self._code(self._level_index, self.levels, level)
+        event_code = self._event_index.get(event_type)
+        if event_code is None:
+            event_code = self._code(self._event_index, self.event_types, event_type)
+
+        self.timestamps.append(epoch)
+        self.level_codes.append(level_code)
+        self.event_codes.append(event_code)
+        self._pending.append(message)
+        self._offsets.append(self._offsets[-1] + len(message))
+
+    def extend(self, other: "EntryBatch", indices: Iterable[int] | None = None) -> None:
+        """
+        Appends entries of another batch (all of them, or only those at the given indices), re-coding its
+        level and event_type dictionaries. Whole batches are appended column by column.
+        """
+        if indices is not None:
+            for i in indices:
+                self.append(other.timestamps[i], other.level(i), other.event_type(i), other.message(i))
+            return
+
+        level_map = [self._code(self._level_index, self.levels, level) for level in other.levels]
+        event_map = [self._code(self._event_index, self.event_types, event) for event in other.event_types]
+        base = self._offsets[-1]
+        self.timestamps.extend(other.timestamps)
+        self.level_codes.extend(array("H", [level_map[code] for code in other.level_codes]))
+        self.event_codes.extend(array("H", [event_map[code] for code in other.event_codes]))
+        self._offsets.extend(array("q", [base + offset for offset in other._offsets[1:]]))
+        self._pending.append(other._buffer())
+
+    def select(self, indices: Iterable[int]) -> "EntryBatch":
+        """ Returns a new batch holding the entries at the given indices, in that order."""
+        subset = EntryBatch(self.local_timezone)
+        subset.extend(self, indices)
+        return subset
+
+    # -------------------
+    # Reading
+    # -------------------
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _buffer(self) -> str:
+        """ Returns the shared message buffer, joining the messages appended since the last call."""
+        if self._pending:
+            self._text += "".join(self._pending)
+            self._pending.clear()
+        return self._text
+
+    def message(self, i: int) -> str:
+        """ Returns the message of entry i as a slice of the shared buffer."""
+        return self._buffer()[self._offsets[i]:self._offsets[i + 1]]
+
+    def level(self, i: int) -> str:
+        """ Returns the level of entry i."""
+        return self.levels[self.level_codes[i]]
+
+    def event_type(self, i: int) -> str:
+        """ Returns the event type of entry i."""
+        return self.event_types[self.event_codes[i]]
+
+    def timestamp(self, i: int) -> datetime:
+        """ Returns the timestamp of entry i as a tz-aware datetime."""
+        return from_naive_epoch(self.timestamps[i], self.local_timezone)
+
+    def entry(self, i: int) -> LogEntry:
+        """ Materializes entry i as a LogEntry."""
+        return LogEntry(self.timestamp(i), self.level(i), self.event_type(i), self.message(i))
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        timestamps: dict[int, datetime] = {}   # Entries of the same instant share one datetime, like parsed ones
+        for i, epoch in enumerate(self.timestamps):
+            ts = timestamps.get(epoch)
+            if ts is None:
+                if len(timestamps) >= CACHE_SIZE:
+                    timestamps.clear()
+                ts = timestamps[epoch] = from_naive_epoch(epoch, self.local_timezone)
+            yield LogEntry(ts, self.level(i), self.event_type(i), self.message(i))
+
+    def records(self) -> Iterator[dict]:
+        """ Yields the export record (timestamp, level, message) of every entry without building LogEntry objects."""
+        for i in range(len(self)):
+            yield {"timestamp": self.timestamp(i).isoformat(), "level": self.level(i), "message": self.message(i)}
+
+    # -------------------
+    # Binary Table
+    # -------------------
+
+    def write_to(self, f: BinaryIO) -> None:
+        """
+        Writes the batch as one binary table: a header (row count, sizes), the level / event_type dictionaries as
+        JSON, the timestamp, level code, event code and message offset columns as little-endian arrays, and the
+        message buffer as UTF-8.
+        """
+        dictionaries = json.dumps([self.levels, self.event_types], ensure_ascii=False).encode("utf-8")
+        text = self._buffer().encode("utf-8")
+        f.write(_TABLE_HEADER.pack(len(self), len(dictionaries), len(text)))
+        f.write(dictionaries)
+        for column in (self.timestamps, self.level_codes, self.event_codes, self._offsets):
+            f.write(_little_endian(column).tobytes())
+        f.write(text)
+
+    @classmethod
+    def read_from(cls, f: BinaryIO, local_timezone: ZoneInfo) -> "EntryBatch":
+        """
+        Reads one table written by write_to.
+
+        Raises:
+            ValueError: If the stream ends in the middle of the table.
+        """
+        rows, dictionaries_size, text_size = _TABLE_HEADER.unpack(_read_exact(f, _TABLE_HEADER.size))
+        batch = cls(local_timezone)
+        batch.levels, batch.event_types = json.loads(_read_exact(f, dictionaries_size).decode("utf-8"))
+        batch._level_index = {level: code for code, level in enumerate(batch.levels)}
+        batch._event_index = {event: code for code, event in enumerate(batch.event_types)}
+
+        batch._offsets = array("q")
+        for column, size in ((batch.timestamps, rows), (batch.level_codes, rows), (batch.event_codes, rows),
+                             (batch._offsets, rows + 1)):
+            column.frombytes(_read_exact(f, size * column.itemsize))
+            if sys.byteorder != "little":
+                column.byteswap()
+        batch._text = _read_exact(f, text_size).decode("utf-8")
+        return batch
@@ -0,0 +1,239 @@
+"""
+Binary columnar export format for analysis results, and its loader.
+
+Downstream tools reloading a JSON export have to parse every record. This format stores, per rule, tables of
+columns instead: naive-epoch timestamps, dictionary-encoded level and event_type codes, and one message
+buffer with offsets (see EntryBatch.write_to). Loading a table is a handful of array.frombytes calls; the
+result is an EntryBatch per rule, ready to be printed, exported again or merged with another run's results
+without reparsing any log.
+
+Layout (integers are little-endian):
+    MAGIC | header size (uint32) | header JSON
+    then, for every rule in header order, its row groups: tables of at most ROW_GROUP entries, ended by an
+    empty table.
+
+The header holds the format version, the timezone of the timestamps and every rule (event_type, count, level,
+pattern and its flags, bucket, group_by, stat, summary) with its number of matches. A --count rule exported from
+a streaming run holds no entries, only that number; it is reloaded as CountedMatches. A --bucket / --group-by
+rule holds no entries either: its (bucket, group, count) cells are stored in the header and reloaded as
+BucketCounts.
+Likewise, the statistics and quantile sketch of a --stat rule are stored in the header and reloaded as
+FieldStats. A --head / --tail / --sample rule stores its kept entries as its tables and its total number of
+matches in the header; a --top-messages rule stores its message counts in the header.
+"""
+
+import json
+import re
+import struct
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator
+from zoneinfo import ZoneInfo
+from log_analyzer import error_messages
+from log_analyzer.aggregation import Accumulator, BucketCounts, FieldStats, new_accumulator
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.event_config import EventConfig
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.streaming import CountedMatches
+from log_analyzer.summaries import EntrySample, EntryWindow, TopMessages, load_summary
+from log_analyzer.timestamps import CACHE_SIZE, naive_epoch
+
+MAGIC = b"LOGCOLS\0"                   # Start of every columnar export file
+FORMAT_VERSION = 1                     # Bumped whenever the layout changes
+ROW_GROUP = 65536                      # Most entries per table
+
+_HEADER_SIZE = struct.Struct("<I")
+
+
+# -------------------
+# Helper Functions
+# -------------------
+
+
+def _rule_header(ev_config: EventConfig, matched: Iterable[LogEntry] | EntryBatch | Accumulator) -> dict:
+    """ Returns the header record of one rule."""
+    record = {
+        "event_type": ev_config.event_type,
+        "count": ev_config.count,
+        "level": ev_config.level,
+        "pattern": ev_config.pattern.pattern if ev_config.pattern else None,
+        "flags": ev_config.pattern.flags if ev_config.pattern else 0,
+        "bucket": ev_config.bucket,
+        "group_by": ev_config.group_by,
+        "stat": ev_config.stat,
+        "summary": ev_config.summary,
+        "summary_size": ev_config.summary_size,
+        "matches": len(matched),
+    }
+    if isinstance(matched, BucketCounts):
+        record["cells"] = [[key, group, count] for (key, group), count in matched.counts.items()]
+    elif isinstance(matched, FieldStats):
+        record["stats"] = matched.state()
+    elif isinstance(matched, (EntryWindow, EntrySample, TopMessages)):
+        record["summary_state"] = matched.state()
+    return record
+
+
+def _rule_config(record: dict) -> EventConfig:
+    """ Rebuilds the EventConfig described by a rule header record."""
+    pattern = re.compile(record["pattern"], record["flags"]) if record["pattern"] is not None else None
+    return EventConfig(record["event_type"], record["count"], record["level"], pattern, record.get("bucket"),
+                       record.get("group_by"), record.get("stat"), record.get("summary"), record.get("summary_size"))
+
+
+def _row_groups(matched: Iterable[LogEntry] | EntryBatch, local_timezone: ZoneInfo) -> Iterator[EntryBatch]:
+    """ Yields the matches of one rule as tables of at most ROW_GROUP entries."""
+    if isinstance(matched, EntryBatch):
+        if len(matched) <= ROW_GROUP:
+            if matched:
+                yield matched   # Already one table: written as is
+            return
+        for start in range(0, len(matched), ROW_GROUP):
+            yield matched.select(range(start, min(start + ROW_GROUP, len(matched))))
+        return
+
+    epochs: dict[datetime, int] = {}   # Entries of the same second share one parsed datetime
+    entries = iter(matched)
+    while group := list(islice(entries, ROW_GROUP)):
+        batch = EntryBatch(local_timezone)
+        for entry in group:
+            epoch = epochs.get(entry.timestamp)
+            if epoch is None:
+                if len(epochs) >= CACHE_SIZE:
+                    epochs.clear()
+                epoch = epochs[entry.timestamp] = naive_epoch(entry.timestamp)
+            batch.append(epoch, entry.level, entry.event_type, entry.message)
+        yield batch
+
+
+def _read_header(f: BinaryIO, path: str) -> dict:
+    """ Reads and checks the file header."""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(error_messages.NOT_A_COLUMNAR_FILE.format(path=path))
+    size_bytes = f.read(_HEADER_SIZE.size)
+    if len(size_bytes) != _HEADER_SIZE.size:
+        raise ValueError(error_messages.TRUNCATED_COLUMNAR_FILE)
+    header = json.loads(f.read(_HEADER_SIZE.unpack(size_bytes)[0]).decode("utf-8"))
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(error_messages.NOT_A_COLUMNAR_FILE.format(path=path))
+    return header
+
+
+# -------------------
+# Public Functions
+# -------------------
+
+
+def export_columnar(results: Iterable[tuple[EventConfig, Iterable[LogEntry] | EntryBatch]], path: str,
+                    local_timezone: ZoneInfo) -> None:
+    """
+    Writes analysis results to a columnar export file.
+
+    Args:
+        results (Iterable[tuple[EventConfig, Iterable[LogEntry] | EntryBatch]]): (rule, matches) pairs, in
+            events-file order.
+        path (str): Destination file path.
+        local_timezone (ZoneInfo): Timezone of the exported timestamps.
+    """
+    results = list(results)
+    header = {
+        "version": FORMAT_VERSION,
+        "timezone": local_timezone.key,
+        "rules": [_rule_header(ev_config, matched) for ev_config, matched in results],
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_SIZE.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for _, matched in results:
+            for batch in _row_groups(matched, local_timezone):
+                batch.write_to(f)
+            EntryBatch(local_timezone).write_to(f)   # End of the rule
+
+
+def load_columnar(path: str) -> list[tuple[EventConfig, EntryBatch | CountedMatches | Accumulator]]:
+    """
+    Loads analysis results written by export_columnar.
+
+    Args:
+        path (str): A columnar export file.
+
+    Returns:
+        list[tuple[EventConfig, EntryBatch | CountedMatches | Accumulator]]: (rule, matches) pairs, in the
+        exported order. A rule exported without its entries is returned as CountedMatches (a streaming --count
+        rule), BucketCounts (a --bucket / --group-by rule) or FieldStats (a --stat rule); a summarized rule is
+        returned as its summary (see summaries).
+
+    Raises:
+        ValueError: If the file is not a (complete) columnar export file.
+    """
+    with open(path, "rb") as f:
+        header = _read_header(f, path)
+        local_timezone = ZoneInfo(header["timezone"])
+        results: list[tuple[EventConfig, EntryBatch | CountedMatches | Accumulator]] = []
+        for record in header["rules"]:
+            ev_config = _rule_config(record)
+            matched = EntryBatch(local_timezone)
+            while batch := EntryBatch.read_from(f, local_timezone):
+                matched.extend(batch)
+            if record.get("cells") is not None:
+                counts = BucketCounts(ev_config.bucket, ev_config.group_by, local_timezone)
+                counts.counts = {(key, group): count for key, group, count in record["cells"]}
+                counts.count = record["matches"]
+                results.append((ev_config, counts))
+            elif record.get("stats") is not None:
+                results.append((ev_config, FieldStats.from_state(ev_config.pattern, ev_config.stat, record["stats"])))
+            elif record.get("summary_state") is not None:
+                results.append((ev_config, load_summary(ev_config.summary, ev_config.summary_size,
+                                                        record["summary_state"], matched)))
+            elif len(matched) != record["matches"]:
+                counted = CountedMatches()
+                counted.count = record["matches"]
+                results.append((ev_config, counted))
+            else:
+                results.append((ev_config, matched))
+    return results
+
+
+def merge_results(runs: list[list[tuple[EventConfig, Iterable[LogEntry] | EntryBatch]]],
+                  local_timezone: ZoneInfo) -> list[tuple[EventConfig, EntryBatch | CountedMatches | Accumulator]]:
+    """
+    Merges the results of several runs of the same rules (e.g. loaded exports of different days), rule by rule.
+
+    Args:
+        runs (list[list[tuple[EventConfig, Iterable[LogEntry] | EntryBatch]]]): Results of the same event
+            configurations, e.g. from load_columnar or LogAnalyzer._cached_analysis.
+        local_timezone (ZoneInfo): Timezone of the merged batches (all runs must share it).
+
+    Returns:
+        list[tuple[EventConfig, EntryBatch | CountedMatches | Accumulator]]: The concatenated matches of every
+        rule. A --count rule that has no stored entries in one of the runs is merged into a CountedMatches total,
+        and the accumulators of --bucket / --group-by / --stat rules and the summaries are merged.
+
+    Raises:
+        ValueError: If the runs were made with different event configurations.
+    """
+    configs = [ev_config for ev_config, _ in runs[0]] if runs else []
+    if any([ev_config for ev_config, _ in run] != configs for run in runs):
+        raise ValueError(error_messages.INCOMPATIBLE_RESULTS)
+
+    merged: list[tuple[EventConfig, EntryBatch | CountedMatches | Accumulator]] = []
+    for idx, ev_config in enumerate(configs):
+        parts = [run[idx][1] for run in runs]
+        if ev_config.aggregated:
+            accumulator = new_accumulator(ev_config, local_timezone)
+            for part in parts:
+                accumulator.merge(part)
+            merged.append((ev_config, accumulator))
+            continue
+        if any(isinstance(part, CountedMatches) for part in parts):
+            counted = CountedMatches()
+            counted.count = sum(len(part) for part in parts)
+            merged.append((ev_config, counted))
+            continue
+        batch = EntryBatch(local_timezone)
+        for part in parts:
+            batch.extend(part if isinstance(part, EntryBatch) else EntryBatch.from_entries(part, local_timezone))
+        merged.append((ev_config, batch))
+    return merged
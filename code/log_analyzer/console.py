@@ -0,0 +1,105 @@
+"""
+Buffered console output of analysis results.
+
+Printing every matched entry with print() costs one write call per line, a syscall per line when stdout is line
+buffered, and one datetime.isoformat() per entry. ConsoleWriter instead:
+    - formats entries FORMAT_CHUNK at a time into one string;
+    - formats each timestamp once for all the entries logged in the same second (see exporter.TimestampFormatter),
+      reading columnar batches straight from their epoch column;
+    - hands the stream blocks of about buffer_size characters;
+    - for interactive use, also flushes once flush_interval seconds passed since the previous flush, and always
+      when it is closed.
+"""
+
+import sys
+import time
+from typing import Iterable, TextIO
+from zoneinfo import ZoneInfo
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.exporter import TimestampFormatter
+from log_analyzer.log_entry import LogEntry
+
+OUTPUT_BUFFER = 64 * 1024   # Characters buffered before they are written to the stream
+FLUSH_INTERVAL = 0.5        # Seconds after which buffered output is written even if the buffer is not full
+FORMAT_CHUNK = 1024         # Entries formatted into one string at a time
+
+
+class ConsoleWriter:
+    """
+    Writes text to a stream (stdout by default) in large blocks.
+
+    Use it as a context manager, or call close() when done, so the end of the output is written.
+
+    Attributes:
+        stream (TextIO): Where the output goes.
+        buffer_size (int): Characters buffered before a write.
+        flush_interval (float): Seconds after which buffered output is written anyway.
+    """
+    def __init__(self, stream: TextIO | None = None, buffer_size: int = OUTPUT_BUFFER,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._parts: list[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+        self._formatters: dict[ZoneInfo, TimestampFormatter] = {}
+
+    def write(self, text: str) -> None:
+        """ Buffers text, writing the buffer out once it is full or flush_interval has passed."""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def line(self, text: str = "") -> None:
+        """ Buffers one line of text (like print(text))."""
+        self.write(text + "\n")
+
+    def entries(self, matched: Iterable[LogEntry] | EntryBatch, indent: str = "  ") -> None:
+        """ Buffers one line per entry, formatted like str(entry), FORMAT_CHUNK entries at a time."""
+        chunk: list[str] = []
+        if isinstance(matched, EntryBatch):
+            format_epoch = self._formatter(matched.local_timezone).format_epoch
+            timestamps, level, event_type, message = (matched.timestamps, matched.level, matched.event_type,
+                                                      matched.message)
+            for i in range(len(matched)):
+                chunk.append(f"{indent}{format_epoch(timestamps[i])} {level(i)} {event_type(i)} {message(i)}\n")
+                if len(chunk) >= FORMAT_CHUNK:
+                    self.write("".join(chunk))
+                    chunk.clear()
+        else:
+            format_ts = self._formatter(None).format
+            for entry in matched:
+                chunk.append(f"{indent}{format_ts(entry.timestamp)} {entry.level} {entry.event_type} {entry.message}\n")
+                if len(chunk) >= FORMAT_CHUNK:
+                    self.write("".join(chunk))
+                    chunk.clear()
+        if chunk:
+            self.write("".join(chunk))
+
+    def _formatter(self, local_timezone: ZoneInfo | None) -> TimestampFormatter:
+        """ Returns the (cached) timestamp formatter of a timezone (None: tz-aware datetimes only)."""
+        formatter = self._formatters.get(local_timezone)
+        if formatter is None:
+            formatter = self._formatters[local_timezone] = TimestampFormatter(local_timezone)
+        return formatter
+
+    def flush(self) -> None:
+        """ Writes everything buffered to the stream and flushes it."""
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """ Writes the rest of the output (the stream itself stays open)."""
+        self.flush()
+
+    def __enter__(self) -> "ConsoleWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
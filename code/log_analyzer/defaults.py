@@ -0,0 +1,38 @@
+"""
+Defaults and choices of the command-line options.
+
+This module imports nothing, so cli.py (and the server) can build their argument parsers, answer --help and
+reject bad arguments (including options that no analysis mode combines, see conflicting_options) before any
+analysis module is loaded. The modules using these values re-export them
+(analyzer.BACKENDS, exporter.EXPORT_FORMATS, result_cache.DEFAULT_MAX_BYTES, ...).
+"""
+
+DEFAULT_LOCAL_TIME = "Asia/Jerusalem"            # Default timezone used for interpreting timestamps
+BACKENDS = ("thread", "process")                 # Supported execution backends
+FOLLOW_INTERVAL = 2.0                            # Seconds between two passes in follow mode
+EXPORT_FORMATS = ("json", "ndjson", "columnar")  # Supported export formats
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024          # Size bound of the result cache entries
+
+# Options each analysis mode does not support, by the option selecting the mode (see LogAnalyzer._select_analysis)
+_INCREMENTAL_UNSUPPORTED = ("--backend process", "--stream", "--columnar", "--cache", "--index")
+UNSUPPORTED_OPTIONS = {
+    "--checkpoint": _INCREMENTAL_UNSUPPORTED,
+    "--follow": _INCREMENTAL_UNSUPPORTED + ("--stats", "--profile"),
+    "--backend process": ("--columnar", "--cache"),
+    "--stream": ("--columnar", "--cache"),
+}
+
+
+def conflicting_options(options: set[str]) -> tuple[str, str] | None:
+    """
+    Returns a pair of the given options that no analysis mode combines (the mode option first), or None.
+
+    Args:
+        options (set[str]): The mode options in use, named as in UNSUPPORTED_OPTIONS (e.g. "--backend process").
+    """
+    for mode, unsupported in UNSUPPORTED_OPTIONS.items():
+        if mode in options:
+            for option in unsupported:
+                if option in options:
+                    return mode, option
+    return None
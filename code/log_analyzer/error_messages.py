@@ -30,3 +30,63 @@ INVALID_FLAG = (
     "Invalid flag {flag!r} in config line {line!r}. "
     "Allowed flags are: {allowed}."
 )
+
+# Raised when an unknown execution backend is requested
+INVALID_BACKEND = "Invalid backend {backend!r}. Allowed backends are: {allowed}."
+
+# Raised when an unknown export format is requested
+INVALID_EXPORT_FORMAT = "Invalid export format {fmt!r}. Allowed formats are: {allowed}."
+
+# Raised when a file is not in the columnar export format, or was written by an unsupported version
+NOT_A_COLUMNAR_FILE = "{path!r} is not a columnar export file (or was written by an unsupported version)."
+
+# Raised when a columnar export file ends in the middle of a table
+TRUNCATED_COLUMNAR_FILE = "Columnar export file ended in the middle of a table."
+
+# Raised when analysis results of different event configurations are merged
+INCOMPATIBLE_RESULTS = "Cannot merge results of different event configurations."
+
+# Raised when a --bucket value is not a positive duration
+INVALID_BUCKET = (
+    "Invalid bucket {value!r} in line {line!r}. "
+    "Use a positive number followed by one of: {units} (e.g. 1m)."
+)
+
+# Raised when --group-by names an unsupported field
+INVALID_GROUP_BY = "Invalid --group-by field {value!r} in line {line!r}. Allowed fields are: {allowed}."
+
+# Raised when quantile sketches of different accuracies are merged
+INCOMPATIBLE_SKETCHES = "Cannot merge quantile sketches of different relative accuracies."
+
+# Raised when --stat does not name a capture group of the rule's --pattern
+INVALID_STAT = (
+    "Invalid --stat {value!r} in line {line!r}. "
+    "It must name a capture group (or group number) of the rule's --pattern."
+)
+
+# Raised when --stat is combined with --bucket or --group-by
+STAT_WITH_BUCKETS = "--stat cannot be combined with --bucket or --group-by (line {line!r})."
+
+# Raised when a rule combines summary flags with each other or with --bucket / --group-by / --stat
+SUMMARY_CONFLICT = (
+    "Only one of --head, --tail, --sample and --top-messages is allowed per rule, "
+    "and not with --bucket, --group-by or --stat (line {line!r})."
+)
+
+# Raised when a --head / --tail / --sample / --top-messages value is not a positive integer
+INVALID_SUMMARY_SIZE = "Invalid {flag} value {value!r} in line {line!r}. Use a positive integer (e.g. 10)."
+
+# Raised when a server query names a log directory the server does not serve
+UNKNOWN_LOG_DIR = "Log directory {logs!r} is not served. Served directories: {served}."
+
+# Raised when a server request targets an endpoint other than /query and /status
+UNKNOWN_ENDPOINT = "Unknown endpoint {path!r}. Use POST /query or GET /status."
+
+# Raised when a server request has a Content-Length header that is not a byte count
+INVALID_CONTENT_LENGTH = "Invalid Content-Length header {value!r}: expected a number of bytes."
+
+# Raised when --jobs is not a positive number of threads / worker processes
+INVALID_JOBS = "Invalid --jobs {jobs!r}. It must be a positive number of threads / worker processes."
+
+# Raised when two options are combined that no analysis mode supports together (see defaults.UNSUPPORTED_OPTIONS)
+INCOMPATIBLE_OPTIONS = "{option} cannot be combined with {mode}: that analysis mode does not support it."
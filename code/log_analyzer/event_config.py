@@ -1,14 +1,69 @@
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
 from log_analyzer import error_messages
 
+try:
+    from re import _constants as sre_constants, _parser as sre_parse   # Python 3.11+
+except ImportError:
+    import sre_constants, sre_parse                                   # Python 3.10
+
 # Supported configuration flags for event rules
 LEVEL_FLAG = "--level"      # Filters entries by log level (e.g., "ERROR")
 COUNT_FLAG = "--count"      # Reports only the number of matching entries
 PATTERN_FLAG = "--pattern"  # Filters entries whose message matches a regex pattern
+BUCKET_FLAG = "--bucket"    # Reports match counts per time bucket (e.g. "1m")
+GROUP_BY_FLAG = "--group-by"  # Reports match counts per value of an entry field (e.g. "level")
+STAT_FLAG = "--stat"        # Reports statistics of the number captured by a group of --pattern
+HEAD_FLAG = "--head"        # Reports only the first N matches (in time order)
+TAIL_FLAG = "--tail"        # Reports only the last N matches (in time order)
+SAMPLE_FLAG = "--sample"    # Reports a uniform random sample of N matches
+TOP_MESSAGES_FLAG = "--top-messages"  # Reports the N most frequent normalized messages
+
+# Flags summarizing the matches of a rule in bounded memory (see summaries), by their EventConfig.summary name
+SUMMARY_FLAGS = {HEAD_FLAG: "head", TAIL_FLAG: "tail", SAMPLE_FLAG: "sample", TOP_MESSAGES_FLAG: "top-messages"}
 
 # Set of all allowed flags for validation
-ALLOWED_FLAGS = {LEVEL_FLAG, COUNT_FLAG, PATTERN_FLAG}
+ALLOWED_FLAGS = {LEVEL_FLAG, COUNT_FLAG, PATTERN_FLAG, BUCKET_FLAG, GROUP_BY_FLAG, STAT_FLAG, *SUMMARY_FLAGS}
+
+GROUP_BY_FIELDS = ("level", "event_type")                       # Fields accepted by --group-by
+DURATION_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}  # --bucket units, in seconds
+
+MIN_LITERAL_LENGTH = 2      # Shorter required substrings are not worth an extra `in` test
+
+# Regex parse-tree markers used by the prefilter extraction
+_START, _END, _BREAK = object(), object(), object()
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, "POSSESSIVE_REPEAT", None)}
+_SCOPED_FLAGS = sre_constants.SRE_FLAG_IGNORECASE | sre_constants.SRE_FLAG_MULTILINE
+
+
+@dataclass(frozen=True)
+class Prefilter:
+    """
+    Cheap necessary conditions extracted from a --pattern regex. A message that fails them cannot match the
+    regex, so the regex only runs on messages that pass.
+
+    Attributes:
+        prefix (str): Literal text every match starts the message with ("" if the pattern is not anchored by ^).
+        suffix (str): Literal text every match ends the message with ("" if the pattern is not anchored by $).
+        literals (tuple[str, ...]): Other substrings every matching message contains, longest first.
+    """
+    prefix: str = ""
+    suffix: str = ""
+    literals: tuple[str, ...] = ()
+
+    def accepts(self, message: str) -> bool:
+        """ Returns False if the message cannot match the pattern, True if the regex has to decide."""
+        if not message.startswith(self.prefix):
+            return False
+        if self.suffix and not message.endswith((self.suffix, self.suffix + "\n")):
+            return False   # $ also matches before a trailing newline
+        return all(literal in message for literal in self.literals)
+
+    @property
+    def required(self) -> str:
+        """ The longest substring every matching message contains ("" if there is none)."""
+        return max((self.prefix, self.suffix, *self.literals), key=len)
 
 
 @dataclass
@@ -21,11 +76,143 @@ class EventConfig:
         count (bool): Whether only a count of matching entries should be reported.
         level (str | None): Optional log level to match.
         pattern (re.Pattern | None): Optional compiled regex pattern to match the message.
+        bucket (int | None): Optional time bucket width in seconds; matches are counted per bucket.
+        group_by (str | None): Optional entry field ("level" or "event_type") matches are counted by.
+        stat (str | None): Optional name (or number) of a pattern group whose numeric value is summarized.
+        summary (str | None): Optional bounded summary of the matches: "head", "tail", "sample" or "top-messages".
+        summary_size (int | None): Number of entries (or messages) the summary reports.
+        prefilter (Prefilter | None): Cheap checks run before the pattern (derived from it, see compile_prefilter).
     """
     event_type: str
     count: bool
     level: str | None
     pattern: re.Pattern | None
+    bucket: int | None = None
+    group_by: str | None = None
+    stat: str | None = None
+    summary: str | None = None
+    summary_size: int | None = None
+    prefilter: Prefilter | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.prefilter = compile_prefilter(self.pattern) if self.pattern is not None else None
+
+    @property
+    def aggregated(self) -> bool:
+        """ Whether matches are folded into an accumulator (see aggregation) instead of all being kept as entries."""
+        return self.bucket is not None or self.group_by is not None or self.stat is not None or self.summary is not None
+
+    def message_matcher(self, use_prefilter: bool = True,
+                        search: Callable[[str], object] | None = None) -> Callable[[str], object] | None:
+        """
+        Returns a function whose result is truthy when a message matches the pattern.
+
+        An anchored regex (^literal...) already fails as fast as a startswith test, but an unanchored one is
+        tried at every position of the message; for those, the longest required literal is checked with a
+        plain `in` test first.
+
+        Args:
+            use_prefilter (bool): Whether to run the prefilter (False always runs the regex alone).
+            search (Callable[[str], object] | None): Runs the regex instead of pattern.search (e.g. to count
+                regex evaluations, see metrics).
+
+        Returns:
+            Callable[[str], object] | None: The matcher, or None if the rule has no pattern (every message matches).
+        """
+        if self.pattern is None:
+            return None
+        search = search or self.pattern.search
+        if use_prefilter and self.prefilter is not None and not self.prefilter.prefix:
+            required = self.prefilter.required
+            return lambda message: required in message and search(message)
+        return search
+
+
+def compile_prefilter(pattern: re.Pattern) -> Prefilter | None:
+    """
+    Extracts the literal text a regex requires: the text right after a leading ^ / \\A, the text right before a
+    trailing $ / \\Z, and the other runs of literal characters outside optional or alternative parts.
+
+    Args:
+        pattern (re.Pattern): A compiled str pattern.
+
+    Returns:
+        Prefilter | None: The prefilter, or None if nothing cheap can be checked (e.g. case-insensitive patterns).
+    """
+    if not isinstance(pattern.pattern, str) or pattern.flags & sre_constants.SRE_FLAG_IGNORECASE:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except re.error:
+        return None
+    flags = parsed.state.flags
+    if flags & sre_constants.SRE_FLAG_IGNORECASE:
+        return None
+
+    tokens: list = []
+    _flatten(parsed, tokens, multiline=bool(flags & sre_constants.SRE_FLAG_MULTILINE))
+
+    runs: list[tuple[int, int, str]] = []     # (first token, last token, text) of every literal run
+    start = 0
+    for i, token in enumerate(tokens + [_BREAK]):
+        if not isinstance(token, str):
+            if i > start:
+                runs.append((start, i - 1, "".join(tokens[start:i])))
+            start = i + 1
+
+    prefix = suffix = ""
+    literals = []
+    for first, last, text in runs:
+        if first == 1 and tokens[0] is _START:
+            prefix = text
+        elif last == len(tokens) - 2 and tokens[-1] is _END:
+            suffix = text
+        elif len(text) >= MIN_LITERAL_LENGTH:
+            literals.append(text)
+    if not (prefix or suffix or literals):
+        return None
+    return Prefilter(prefix, suffix, tuple(sorted(set(literals), key=lambda text: (-len(text), text))))
+
+
+def _flatten(subpattern, tokens: list, multiline: bool) -> None:
+    """
+    Appends the parse tree of a regex as a flat token list: one str per required literal character, _START /
+    _END for anchors at the start / end of the message, and _BREAK wherever a literal run is interrupted.
+    """
+    for op, av in subpattern:
+        if op is sre_constants.LITERAL:
+            tokens.append(chr(av))
+        elif op is sre_constants.AT:
+            if av is sre_constants.AT_BEGINNING_STRING or (av is sre_constants.AT_BEGINNING and not multiline):
+                tokens.append(_START if not tokens else _BREAK)
+            elif av is sre_constants.AT_END_STRING or (av is sre_constants.AT_END and not multiline):
+                tokens.append(_END)
+            else:
+                tokens.append(_BREAK)
+        elif op is sre_constants.SUBPATTERN and not av[1] & _SCOPED_FLAGS:
+            _flatten(av[3], tokens, multiline)          # A group is matched in place
+        elif op in _REPEATS and av[0] >= 1:
+            tokens.append(_BREAK)                       # A repeated part holds its literals at least once
+            _flatten(av[2], tokens, multiline)
+            tokens.append(_BREAK)
+        else:
+            tokens.append(_BREAK)                       # Classes, alternatives, lookarounds, optional parts...
+
+
+def parse_duration(text: str) -> int | None:
+    """ Parses a --bucket duration such as "30s", "1m", "6h" or "1d" into seconds (None if it is invalid)."""
+    number, unit = text[:-1], text[-1:]
+    if not number.isdigit() or unit not in DURATION_UNITS or int(number) == 0:
+        return None
+    return int(number) * DURATION_UNITS[unit]
+
+
+def format_duration(seconds: int) -> str:
+    """ Formats a bucket width in seconds with its largest exact unit (the inverse of parse_duration)."""
+    for unit, size in sorted(DURATION_UNITS.items(), key=lambda item: -item[1]):
+        if seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
 
 
 def load_configs(path: str) -> list[EventConfig]:
@@ -33,7 +220,8 @@ def load_configs(path: str) -> list[EventConfig]:
     Parses a configuration file and returns a list of EventConfig objects.
 
     Each non-empty, non-comment line must start with an event type,
-    optionally followed by  flags: [--count, --level LEVEL, --pattern REGEX]
+    optionally followed by  flags: [--count, --level LEVEL, --pattern REGEX, --bucket DURATION, --group-by FIELD,
+    --stat GROUP, --head N, --tail N, --sample N, --top-messages N]
 
     Args:
         path (str): Path to the events configuration file.
@@ -41,14 +229,19 @@ def load_configs(path: str) -> list[EventConfig]:
     Returns:
         list[EventConfig]: A list of parsed event configuration objects.
     """
-    configs: list[EventConfig] = []
     with open(path, 'r', encoding='utf-8') as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith('#'):
-                continue
-            config = _parse_event_line(line)
-            configs.append(config)
+        return parse_configs(f)
+
+
+def parse_configs(lines: Iterable[str]) -> list[EventConfig]:
+    """ Parses the lines of an events configuration (see load_configs), e.g. the body of a server query."""
+    configs: list[EventConfig] = []
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith('#'):
+            continue
+        config = _parse_event_line(line)
+        configs.append(config)
 
     return configs
 
@@ -66,7 +259,38 @@ def _parse_event_line(line: str) -> EventConfig:
     pattern_str = flags.get(PATTERN_FLAG)
     pattern = re.compile(pattern_str) if pattern_str else None
 
-    return EventConfig(event_type=event_type, count=count, level=level, pattern=pattern)
+    bucket = None
+    if BUCKET_FLAG in flags:
+        bucket = parse_duration(flags[BUCKET_FLAG])
+        if bucket is None:
+            raise ValueError(error_messages.INVALID_BUCKET.format(value=flags[BUCKET_FLAG], line=line,
+                                                                  units=", ".join(DURATION_UNITS)))
+    group_by = flags.get(GROUP_BY_FLAG)
+    if group_by is not None and group_by not in GROUP_BY_FIELDS:
+        raise ValueError(error_messages.INVALID_GROUP_BY.format(value=group_by, line=line,
+                                                                allowed=", ".join(GROUP_BY_FIELDS)))
+
+    stat = flags.get(STAT_FLAG)
+    if stat is not None:
+        if bucket is not None or group_by is not None:
+            raise ValueError(error_messages.STAT_WITH_BUCKETS.format(line=line))
+        valid_group = pattern is not None and (stat in pattern.groupindex or
+                                               (stat.isdigit() and 0 < int(stat) <= pattern.groups))
+        if not valid_group:
+            raise ValueError(error_messages.INVALID_STAT.format(value=stat, line=line))
+
+    summary = summary_size = None
+    summaries = [flag for flag in SUMMARY_FLAGS if flag in flags]
+    if summaries:
+        if len(summaries) > 1 or bucket is not None or group_by is not None or stat is not None:
+            raise ValueError(error_messages.SUMMARY_CONFLICT.format(line=line))
+        flag = summaries[0]
+        if not flags[flag].isdigit() or int(flags[flag]) == 0:
+            raise ValueError(error_messages.INVALID_SUMMARY_SIZE.format(flag=flag, value=flags[flag], line=line))
+        summary, summary_size = SUMMARY_FLAGS[flag], int(flags[flag])
+
+    return EventConfig(event_type=event_type, count=count, level=level, pattern=pattern, bucket=bucket,
+                       group_by=group_by, stat=stat, summary=summary, summary_size=summary_size)
 
 
 def _parse_flags(tokens: list[str], original_line: str) -> dict:
@@ -82,7 +306,7 @@ def _parse_flags(tokens: list[str], original_line: str) -> dict:
             flags[COUNT_FLAG] = True
             idx += 1
 
-        elif flag in {LEVEL_FLAG, PATTERN_FLAG}:
+        elif flag in {LEVEL_FLAG, PATTERN_FLAG, BUCKET_FLAG, GROUP_BY_FLAG, STAT_FLAG, *SUMMARY_FLAGS}:
             if idx + 1 >= len(tokens):
                 raise ValueError(error_messages.MISSING_VALUE_ERR.format(flag=flag, line=original_line))
 
@@ -1,4 +1,5 @@
 import re
+from log_analyzer.columnar import EntryBatch
 from log_analyzer.event_config import EventConfig
 from log_analyzer.log_entry import LogEntry
 
@@ -20,6 +21,7 @@ class EventFilter:
         self.count:      bool = ev_config.count
         self.level:      str | None = ev_config.level
         self.pattern:    re.Pattern | None = ev_config.pattern
+        self._matcher = ev_config.message_matcher()
 
     def matches(self, entry: LogEntry) -> bool:
         """
@@ -28,7 +30,7 @@ class EventFilter:
            A match occurs if:
            - The event_type matches exactly.
            - If a level is specified, it must match the entry's level.
-           - If a pattern is specified, it must match the entry's message.
+           - If a pattern is specified, it must match the entry's message (its literal prefilter runs first).
 
            Returns:
                bool: True if the entry matches all applicable conditions, False otherwise.
@@ -36,5 +38,28 @@ class EventFilter:
         return (
                 entry.event_type == self.event_type and
                 (self.level is None or entry.level == self.level) and
-                (self.pattern is None or bool(self.pattern.search(entry.message)))
+                (self._matcher is None or bool(self._matcher(entry.message)))
         )
+
+    def matches_batch(self, batch: EntryBatch) -> list[int]:
+        """
+           Evaluate the filter directly against a columnar EntryBatch.
+
+           The event_type and level checks compare small-int codes; the regex only runs on the messages of rows
+           that passed them.
+
+           Returns:
+               list[int]: Indices of the matching rows, in batch order.
+           """
+        event_code = batch.event_code(self.event_type)
+        level_code = batch.level_code(self.level) if self.level is not None else None
+        if event_code is None or (self.level is not None and level_code is None):
+            return []
+
+        event_codes, level_codes = batch.event_codes, batch.level_codes
+        return [
+            i for i in range(len(batch))
+            if event_codes[i] == event_code and
+            (level_code is None or level_codes[i] == level_code) and
+            (self._matcher is None or self._matcher(batch.message(i)))
+        ]
@@ -0,0 +1,228 @@
+"""
+Streaming export of analysis results to JSON, NDJSON or the binary columnar format.
+
+Every matched entry is encoded and written as it is read from its result container (list of LogEntry,
+EntryBatch, SpooledMatches), instead of first building one dict per entry and serializing the whole nested
+list at once, so memory stays flat however many entries are exported. Encoded records are written in chunks
+of WRITE_CHUNK, and timestamps are formatted through a cache: the many entries logged in the same second
+share one formatted string.
+
+Formats:
+    - json: a JSON array with one group per rule (event_type, filters, entries), as export_to_json always wrote.
+    - ndjson: one JSON object per line; every rule writes a header record (event_type, filters, matches)
+      followed by one record per entry (event_type, timestamp, level, message).
+    - columnar: binary per-rule column tables that load back without parsing (see columnar_file).
+
+--bucket / --group-by rules hold no entries; their filters include "bucket" and "group_by", and their counts
+are exported as "buckets" records (start, group, count): a "buckets" array of the json group, or one ndjson
+line per bucket after the header. --stat rules export their statistics (field, values, sum, min, max, mean,
+percentiles) as a "stats" object of the json group, or one ndjson "stats" line after the header.
+
+--head / --tail / --sample rules export their kept entries, and the total number of matches as "matches" of the
+json group (the ndjson header always has it). --top-messages rules export their most frequent normalized
+messages as "top_messages" records (message, count, error: how much the count may overestimate).
+"""
+
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, TextIO
+from zoneinfo import ZoneInfo
+from log_analyzer import error_messages
+from log_analyzer.aggregation import BucketCounts, FieldStats
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.defaults import EXPORT_FORMATS
+from log_analyzer.event_config import EventConfig, format_duration
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.summaries import EntrySample, EntryWindow, TopMessages
+from log_analyzer.timestamps import CACHE_SIZE, from_naive_epoch
+
+WRITE_CHUNK = 4096                                 # Encoded records joined into a single write
+
+_encode_str = json.encoder.encode_basestring   # JSON string literal, non-ASCII kept as is (ensure_ascii=False)
+
+
+class TimestampFormatter:
+    """
+    Formats timestamps exactly like datetime.isoformat(), caching the results.
+
+    Tz-aware datetimes are cached as they are (the parser hands out one shared object per timestamp string).
+    Naive-epoch microseconds (columnar batches) are cached per second, so only the fraction is formatted per
+    entry.
+    """
+    def __init__(self, local_timezone: ZoneInfo):
+        """ Creates a formatter for naive epochs of the given timezone."""
+        self.local_timezone = local_timezone
+        self._datetimes: dict[datetime, str] = {}
+        self._seconds: dict[int, tuple[str, str]] = {}   # Epoch second -> (wall-clock text, UTC offset text)
+
+    def format(self, ts: datetime) -> str:
+        """ Returns ts.isoformat()."""
+        text = self._datetimes.get(ts)
+        if text is None:
+            if len(self._datetimes) >= CACHE_SIZE:
+                self._datetimes.clear()
+            text = self._datetimes[ts] = ts.isoformat()
+        return text
+
+    def format_epoch(self, epoch: int) -> str:
+        """ Returns the isoformat() of a naive epoch (microseconds) in the formatter's timezone."""
+        second, micro = divmod(epoch, 1_000_000)
+        parts = self._seconds.get(second)
+        if parts is None:
+            if len(self._seconds) >= CACHE_SIZE:
+                self._seconds.clear()
+            text = from_naive_epoch(second * 1_000_000, self.local_timezone).isoformat()
+            parts = self._seconds[second] = (text[:19], text[19:])
+        wall, offset = parts
+        return f"{wall}.{micro:06d}{offset}" if micro else wall + offset
+
+
+# -------------------
+# Helper Functions
+# -------------------
+
+
+def _filters(ev_config: EventConfig) -> dict:
+    """ Returns the exported description of a rule's flags."""
+    filters = {
+        "count": ev_config.count,
+        "level": ev_config.level,
+        "pattern": ev_config.pattern.pattern if ev_config.pattern else None,
+    }
+    if ev_config.bucket is not None or ev_config.group_by is not None:
+        filters["bucket"] = format_duration(ev_config.bucket) if ev_config.bucket else None
+        filters["group_by"] = ev_config.group_by
+    if ev_config.stat is not None:
+        filters["stat"] = ev_config.stat
+    if ev_config.summary is not None:
+        filters[ev_config.summary.replace("-", "_")] = ev_config.summary_size
+    return filters
+
+
+def _bucket_records(matched: BucketCounts) -> list[dict]:
+    """ Returns the exported (start, group, count) records of an aggregation."""
+    return [{"start": row.start.isoformat() if row.start is not None else None, "group": row.group,
+             "count": row.count} for row in matched.rows()]
+
+
+def _top_records(matched: TopMessages) -> list[dict]:
+    """ Returns the exported (message, count, error) records of a --top-messages rule."""
+    return [{"message": message, "count": count, "error": error} for message, count, error in matched.rows()]
+
+
+def _iter_fields(matched: Iterable[LogEntry] | EntryBatch,
+                 formatter: TimestampFormatter) -> Iterator[tuple[str, str, str]]:
+    """ Yields the (formatted timestamp, level, message) of every matched entry, without building dicts."""
+    if isinstance(matched, EntryBatch):
+        for i in range(len(matched)):
+            yield formatter.format_epoch(matched.timestamps[i]), matched.level(i), matched.message(i)
+    else:
+        for entry in matched:
+            yield formatter.format(entry.timestamp), entry.level, entry.message
+
+
+def _write_chunked(f: TextIO, records: Iterable[str]) -> None:
+    """ Writes encoded records, WRITE_CHUNK of them per write call."""
+    chunk: list[str] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= WRITE_CHUNK:
+            f.write("".join(chunk))
+            chunk.clear()
+    f.write("".join(chunk))
+
+
+def _json_entries(matched: Iterable[LogEntry] | EntryBatch, formatter: TimestampFormatter) -> Iterator[str]:
+    """ Yields the members of a rule's "entries" array, separators included."""
+    separator = "\n      "
+    for ts, level, message in _iter_fields(matched, formatter):
+        yield f'{separator}{{"timestamp": "{ts}", "level": {_encode_str(level)}, "message": {_encode_str(message)}}}'
+        separator = ",\n      "
+
+
+def _ndjson_entries(ev_config: EventConfig, matched: Iterable[LogEntry] | EntryBatch,
+                    formatter: TimestampFormatter) -> Iterator[str]:
+    """ Yields one NDJSON line per matched entry."""
+    prefix = f'{{"event_type": {_encode_str(ev_config.event_type)}, "timestamp": "'
+    for ts, level, message in _iter_fields(matched, formatter):
+        yield f'{prefix}{ts}", "level": {_encode_str(level)}, "message": {_encode_str(message)}}}\n'
+
+
+# -------------------
+# Public Functions
+# -------------------
+
+
+def export_results(results: Iterable[tuple[EventConfig, Iterable[LogEntry] | EntryBatch]], path: str,
+                   local_timezone: ZoneInfo, fmt: str = "json") -> None:
+    """
+    Streams analysis results to a JSON, NDJSON or columnar file.
+
+    Args:
+        results (Iterable[tuple[EventConfig, Iterable[LogEntry] | EntryBatch]]): (rule, matches) pairs, in
+            events-file order; --count rules of the streaming modes export no entries.
+        path (str): Destination file path.
+        local_timezone (ZoneInfo): Timezone of the naive epochs held by EntryBatch results.
+        fmt (str): "json", "ndjson" or "columnar".
+
+    Raises:
+        ValueError: If fmt is not one of EXPORT_FORMATS.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(error_messages.INVALID_EXPORT_FORMAT.format(fmt=fmt, allowed=", ".join(EXPORT_FORMATS)))
+    if fmt == "columnar":
+        from log_analyzer.columnar_file import export_columnar   # Loaded for this format only
+        export_columnar(results, path, local_timezone)
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        write_results(results, f, local_timezone, fmt)
+
+
+def write_results(results: Iterable[tuple[EventConfig, Iterable[LogEntry] | EntryBatch]], f: TextIO,
+                  local_timezone: ZoneInfo, fmt: str = "json") -> None:
+    """
+    Streams analysis results as JSON or NDJSON to an open text stream (see export_results).
+
+    Args:
+        results (Iterable[tuple[EventConfig, Iterable[LogEntry] | EntryBatch]]): (rule, matches) pairs.
+        f (TextIO): Where the document is written.
+        local_timezone (ZoneInfo): Timezone of the naive epochs held by EntryBatch results.
+        fmt (str): "json" or "ndjson".
+    """
+    formatter = TimestampFormatter(local_timezone)
+    if fmt == "ndjson":
+        for ev_config, matched in results:
+            header = {"event_type": ev_config.event_type, "filters": _filters(ev_config), "matches": len(matched)}
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            if isinstance(matched, BucketCounts):
+                _write_chunked(f, (json.dumps({"event_type": ev_config.event_type, **record},
+                                              ensure_ascii=False) + "\n" for record in _bucket_records(matched)))
+            elif isinstance(matched, FieldStats):
+                f.write(json.dumps({"event_type": ev_config.event_type, "stats": matched.summary()},
+                                   ensure_ascii=False) + "\n")
+            elif isinstance(matched, TopMessages):
+                _write_chunked(f, (json.dumps({"event_type": ev_config.event_type, **record},
+                                              ensure_ascii=False) + "\n" for record in _top_records(matched)))
+            _write_chunked(f, _ndjson_entries(ev_config, matched, formatter))
+        return
+
+    f.write("[")
+    separator = "\n"
+    for ev_config, matched in results:
+        f.write(f'{separator}  {{\n    "event_type": {_encode_str(ev_config.event_type)},\n'
+                f'    "filters": {json.dumps(_filters(ev_config), ensure_ascii=False)},\n')
+        if isinstance(matched, BucketCounts):
+            f.write(f'    "buckets": {json.dumps(_bucket_records(matched), ensure_ascii=False)},\n')
+        elif isinstance(matched, FieldStats):
+            f.write(f'    "stats": {json.dumps(matched.summary(), ensure_ascii=False)},\n')
+        elif isinstance(matched, TopMessages):
+            f.write(f'    "top_messages": {json.dumps(_top_records(matched), ensure_ascii=False)},\n')
+        elif isinstance(matched, (EntryWindow, EntrySample)):
+            f.write(f'    "matches": {len(matched)},\n')
+        f.write('    "entries": [')
+        _write_chunked(f, _json_entries(matched, formatter))
+        no_entries = not len(matched) or isinstance(matched, (BucketCounts, FieldStats, TopMessages))
+        f.write("]\n  }" if no_entries else "\n    ]\n  }")
+        separator = ",\n"
+    f.write("\n]\n" if separator != "\n" else "]\n")
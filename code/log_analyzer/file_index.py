@@ -0,0 +1,343 @@
+"""
+Persistent sidecar index per log file.
+
+The first indexed scan of "<name>.log" or "<name>.log.gz" writes "<name>.log.idx" / "<name>.log.gz.idx" next to
+it. The file is split into blocks of roughly BLOCK_SIZE (decompressed) bytes on line boundaries; for each block
+the index keeps its byte range, the smallest and largest line timestamp (a sparse timestamp -> offset table) and
+a bitmap of the event types and levels that occur in it. Later runs only read the blocks that can contain a
+line matching one of the configured (event_type, level) rules inside the --from/--to window.
+
+An index is only trusted while the log file's size and mtime are unchanged. It also records whether the line
+timestamps never decrease (see TimeOrder), which is the proof time_seek needs before it binary-searches a
+--from/--to window.
+
+Timestamps are recorded whenever they are well-formed, regardless of the future / too-old checks, so an index
+stays correct as "now" moves on.
+"""
+
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.mmap_reader import normalize_newlines
+from log_analyzer.timestamps import CACHE_SIZE, TimestampParser, naive_epoch
+
+INDEX_SUFFIX = ".idx"           # Appended to the log file name
+INDEX_VERSION = 2               # Bumped whenever the on-disk layout changes
+BLOCK_SIZE = 1024 * 1024        # Target size in (decompressed) bytes of one index block
+
+
+class Block(NamedTuple):
+    """ One indexed block: a [start, end) byte range and a summary of the lines inside it."""
+    start: int
+    end: int
+    min_epoch: int | None
+    max_epoch: int | None
+    event_bits: int
+    level_bits: int
+
+
+class TimeOrder(NamedTuple):
+    """
+    Whether the lines time_seek probes are in time order: it reads \\n-terminated lines and binary-searches on
+    the first token of those whose token is a timestamp its parser accepts. A line holding a lone \\r is never in
+    order (the probe would not see the line after the \\r).
+
+    Timestamps the building run's parser skipped as in the future or too old are left out of the check; the
+    latest and earliest of them are kept, since the proof only holds for a later run that skips them too.
+    """
+    time_sorted: bool
+    latest_too_old: int | None
+    earliest_future: int | None
+
+    def holds_for(self, ts_parser: TimestampParser) -> bool | None:
+        """ Returns time_sorted, or None if ts_parser accepts a timestamp that was skipped when this was checked."""
+        if any(epoch is not None and ts_parser.is_current(epoch)
+               for epoch in (self.latest_too_old, self.earliest_future)):
+            return None
+        return self.time_sorted
+
+
+def index_path(path: Path) -> Path:
+    """ Returns the sidecar index path of a log file."""
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+class FileIndex:
+    """
+    The sidecar index of one log file.
+
+    Attributes:
+        size (int): Size of the log file when it was indexed.
+        mtime_ns (int): Modification time of the log file when it was indexed.
+        event_types (list[str]): Event type of each bitmap bit.
+        levels (list[str]): Level of each bitmap bit.
+        blocks (list[Block]): The blocks, in file order.
+        time_order (TimeOrder): Whether the file can be binary-searched by time.
+    """
+    def __init__(self, size: int, mtime_ns: int, event_types: list[str], levels: list[str], blocks: list[Block],
+                 time_order: TimeOrder):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.event_types = event_types
+        self.levels = levels
+        self.blocks = blocks
+        self.time_order = time_order
+
+    @classmethod
+    def load(cls, path: Path) -> "FileIndex | None":
+        """ Loads the index of a log file, or returns None if it is missing, unreadable or stale."""
+        try:
+            with open(index_path(path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            stat = path.stat()
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != INDEX_VERSION:
+            return None
+        if data["size"] != stat.st_size or data["mtime_ns"] != stat.st_mtime_ns:
+            return None  # The log file changed since it was indexed
+        return cls(data["size"], data["mtime_ns"], data["event_types"], data["levels"],
+                   [Block(*block) for block in data["blocks"]], TimeOrder(*data["time_order"]))
+
+    def save(self, path: Path) -> None:
+        """ Writes the index next to the log file; silently does nothing if the directory is read-only."""
+        data = {
+            "version": INDEX_VERSION,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "event_types": self.event_types,
+            "levels": self.levels,
+            "blocks": [list(block) for block in self.blocks],
+            "time_order": list(self.time_order),
+        }
+        try:
+            with open(index_path(path), "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+        except OSError:
+            pass
+
+    def candidate_blocks(self, rules: Iterable[tuple[str, str | None]], ts_parser: TimestampParser) -> list[Block]:
+        """
+        Returns the blocks that may hold a line matching one of the rules inside the parser's time window.
+
+        Args:
+            rules (Iterable[tuple[str, str | None]]): (event_type, level or None) pairs of the configured rules.
+            ts_parser (TimestampParser): The run's timestamp parser, holding the --from/--to window.
+        """
+        event_bit = {name: 1 << i for i, name in enumerate(self.event_types)}
+        level_bit = {name: 1 << i for i, name in enumerate(self.levels)}
+        masks = [(event_bit[event_type], level_bit.get(level, 0) if level is not None else None)
+                 for event_type, level in rules if event_type in event_bit]
+
+        result = []
+        for block in self.blocks:
+            if block.min_epoch is None:
+                continue   # No well-formed line in this block
+            if ts_parser.from_epoch is not None and block.max_epoch < ts_parser.from_epoch:
+                continue
+            if ts_parser.to_epoch is not None and block.min_epoch > ts_parser.to_epoch:
+                continue
+            if any(block.event_bits & event_mask and (level_mask is None or block.level_bits & level_mask)
+                   for event_mask, level_mask in masks):
+                result.append(block)
+        return result
+
+    def candidate_ranges(self, rules: Iterable[tuple[str, str | None]],
+                         ts_parser: TimestampParser) -> list[tuple[int, int]]:
+        """ Returns the [start, end) byte ranges of the candidate blocks, with adjacent blocks merged."""
+        ranges: list[tuple[int, int]] = []
+        for block in self.candidate_blocks(rules, ts_parser):
+            if ranges and ranges[-1][1] == block.start:
+                ranges[-1] = (ranges[-1][0], block.end)
+            else:
+                ranges.append((block.start, block.end))
+        return ranges
+
+
+class IndexBuilder:
+    """
+    Accumulates block summaries while a log file is scanned from start to end.
+
+    The time order of the lines is checked against ts_parser's future and too-old bounds when one is given, and
+    against every well-formed timestamp otherwise (which holds for any run).
+    """
+    def __init__(self, block_size: int | None = None, ts_parser: TimestampParser | None = None):
+        self.block_size = block_size or BLOCK_SIZE
+        self.blocks: list[Block] = []
+        self._ts_parser = ts_parser
+        self._now_epoch = naive_epoch(ts_parser.now) if ts_parser is not None else None
+        self._time_sorted = True
+        self._last_epoch: int | None = None
+        self._latest_too_old: int | None = None
+        self._earliest_future: int | None = None
+        self._event_index: dict[str, int] = {}
+        self._level_index: dict[str, int] = {}
+        self._epochs: dict[str, int | None] = {}
+        self._reset(0)
+
+    def _reset(self, start: int) -> None:
+        """ Starts a new block at byte offset start."""
+        self._start = start
+        self._end = start
+        self._min = None
+        self._max = None
+        self._event_bits = 0
+        self._level_bits = 0
+
+    def _flush(self) -> None:
+        """ Closes the current block, if it holds any bytes."""
+        if self._end > self._start:
+            self.blocks.append(Block(self._start, self._end, self._min, self._max,
+                                     self._event_bits, self._level_bits))
+        self._reset(self._end)
+
+    def _epoch(self, ts_str: str) -> int | None:
+        """ Returns the naive epoch of a well-formed timestamp (ignoring the now-based checks), cached."""
+        if ts_str not in self._epochs:
+            if len(self._epochs) >= CACHE_SIZE:
+                self._epochs.clear()
+            try:
+                self._epochs[ts_str] = naive_epoch(datetime.fromisoformat(ts_str))
+            except ValueError:
+                self._epochs[ts_str] = None
+        return self._epochs[ts_str]
+
+    def _check_order(self, line: str) -> None:
+        """ Records whether line is out of time order (see TimeOrder)."""
+        epoch = self._epoch(line.split(" ", 1)[0].strip())
+        if epoch is None:
+            return
+        if self._ts_parser is not None and not self._ts_parser.is_current(epoch):
+            if epoch > self._now_epoch:
+                if self._earliest_future is None or epoch < self._earliest_future:
+                    self._earliest_future = epoch
+            elif self._latest_too_old is None or epoch > self._latest_too_old:
+                self._latest_too_old = epoch
+        elif self._last_epoch is not None and epoch < self._last_epoch:
+            self._time_sorted = False
+        else:
+            self._last_epoch = epoch
+
+    def mark_unsorted(self) -> None:
+        """ Records that time_seek cannot binary-search the file, whose lines are not all \\n-terminated."""
+        self._time_sorted = False
+
+    def observe(self, line: str, length: int) -> None:
+        """ Records one line of the given length in bytes, starting where the previous one ended."""
+        self._end += length
+        if self._time_sorted:
+            self._check_order(line)
+        try:
+            ts_str, level, event_type, _ = LogEntry.split_line(line)
+        except ValueError:
+            pass
+        else:
+            epoch = self._epoch(ts_str)
+            if epoch is not None:
+                self._min = epoch if self._min is None else min(self._min, epoch)
+                self._max = epoch if self._max is None else max(self._max, epoch)
+                self._event_bits |= 1 << self._event_index.setdefault(event_type, len(self._event_index))
+                self._level_bits |= 1 << self._level_index.setdefault(level, len(self._level_index))
+        if self._end - self._start >= self.block_size:
+            self._flush()
+
+    def finish(self, size: int, mtime_ns: int) -> FileIndex:
+        """ Closes the last block and returns the finished index of the file."""
+        self._flush()
+        return FileIndex(size, mtime_ns, list(self._event_index), list(self._level_index), self.blocks,
+                         TimeOrder(self._time_sorted, self._latest_too_old, self._earliest_future))
+
+
+def _open_binary(path: Path):
+    """ Opens a plain or gzip log file for binary reading (gzip offsets are in decompressed bytes)."""
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def _split_lone_cr(raw: bytes) -> list[bytes]:
+    """ Splits a raw \\n-terminated line after each lone \\r it holds, which text mode also reads as a line end."""
+    pieces = raw.split(b"\r")
+    last = pieces.pop()
+    pieces = [piece + b"\r" for piece in pieces]
+    if last == b"\n":
+        pieces[-1] += last   # \r\n
+    elif last:
+        pieces.append(last)
+    return pieces
+
+
+def _iter_raw_lines(f) -> Iterator[bytes]:
+    """ Yields the raw lines of a binary file, each ending at \\n, \\r\\n or \\r as in text mode."""
+    for raw in f:
+        if b"\r" in raw:
+            yield from _split_lone_cr(raw)
+        else:
+            yield raw
+
+
+def _scan(path: Path, builder: IndexBuilder) -> Iterator[str]:
+    """ Yields every decoded line of a log file, with its line ending normalized to \\n, while feeding it to builder."""
+    with _open_binary(path) as f:
+        for raw in f:
+            pieces = _split_lone_cr(raw) if b"\r" in raw else (raw,)
+            if len(pieces) > 1:
+                builder.mark_unsorted()   # time_seek probes \n-terminated lines, so it would miss the later pieces
+            for piece in pieces:
+                line = normalize_newlines(piece).decode("utf-8", errors="ignore")
+                builder.observe(line, len(piece))
+                yield line
+
+
+def build_index(path: Path, block_size: int | None = None, ts_parser: TimestampParser | None = None) -> FileIndex:
+    """ Scans a log file once, writes its sidecar index and returns it."""
+    stat = path.stat()
+    builder = IndexBuilder(block_size, ts_parser)
+    for _ in _scan(path, builder):
+        pass
+    index = builder.finish(stat.st_size, stat.st_mtime_ns)
+    index.save(path)
+    return index
+
+
+def candidate_ranges(path: Path, rules: Iterable[tuple[str, str | None]],
+                     ts_parser: TimestampParser) -> list[tuple[int, int]]:
+    """ Returns FileIndex.candidate_ranges of a log file, building its index first if it is missing or stale."""
+    return (FileIndex.load(path) or build_index(path, ts_parser=ts_parser)).candidate_ranges(rules, ts_parser)
+
+
+def iter_indexed_lines(path: Path, rules: Iterable[tuple[str, str | None]],
+                       ts_parser: TimestampParser) -> Iterator[str]:
+    """
+    Yields the lines of a log file that lie in candidate blocks.
+
+    With a valid index only candidate blocks are read (plain files seek straight to them; gzip files are
+    decompressed but lines outside the candidate blocks are neither decoded nor parsed). Without one, the whole
+    file is read, every line is yielded, and the index is written at the end of the scan.
+    """
+    index = FileIndex.load(path)
+    if index is None:
+        stat = path.stat()
+        builder = IndexBuilder(ts_parser=ts_parser)
+        yield from _scan(path, builder)
+        builder.finish(stat.st_size, stat.st_mtime_ns).save(path)
+        return
+
+    ranges = index.candidate_ranges(rules, ts_parser)
+    with _open_binary(path) as f:
+        lines = _iter_raw_lines(f)
+        pos = 0
+        for start, end in ranges:
+            if path.suffix != ".gz":
+                f.seek(start)
+                pos = start
+                lines = _iter_raw_lines(f)
+            while pos < end:
+                raw = next(lines, b"")
+                if not raw:
+                    return
+                if pos >= start:
+                    yield normalize_newlines(raw).decode("utf-8", errors="ignore")
+                pos += len(raw)
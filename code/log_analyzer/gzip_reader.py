@@ -0,0 +1,209 @@
+"""
+Block-based gzip decompression for .log.gz files.
+
+gzip.open(..., "rt") inflates and decodes through small reads on a single thread. Here the compressed file is
+memory-mapped and fed to zlib in large blocks. The decompressed bytes come out in cache-sized chunks, which are
+cut on newlines and handed to the line splitting / raw candidate check of mmap_reader as whole blocks.
+
+A file made by concatenating gzip streams (rotated archives joined with cat, pigz / bgzip output) holds several
+members, each an independent deflate stream. The first member is always streamed; only once it has ended, and
+another member starts right after it, are the following members inflated in parallel on a thread pool (zlib
+releases the GIL while inflating) and their output passed on in file order. An ordinary single-member file is
+thus streamed whatever bytes its compressed data holds. The speculative inflations hold at most PARALLEL_BUFFER
+decompressed bytes between them; a member larger than its share is streamed when its turn comes.
+
+Malformed files raise the same exceptions as the gzip module (gzip.BadGzipFile, EOFError).
+"""
+
+import gzip
+import mmap
+import os
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+from log_analyzer.mmap_reader import candidate_pattern, iter_block_candidates, split_block
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+READ_BLOCK = 1024 * 1024                  # Compressed bytes fed to zlib at a time
+OUTPUT_CHUNK = 256 * 1024                 # Largest decompressed chunk (small enough to stay in cache)
+GZIP_MAGIC = b"\x1f\x8b\x08"              # Start of every gzip member (magic number + deflate method)
+GZIP_WORKERS = os.cpu_count() or 4        # Threads inflating the members of a multi-member file
+PARALLEL_BUFFER = 16 * 1024 * 1024        # Most decompressed bytes held by the parallel inflations at a time
+_GZIP_WBITS = 16 + zlib.MAX_WBITS         # Makes zlib parse the gzip header and trailer itself
+
+
+def _inflate(data: mmap.mmap, start: int) -> Iterator[bytes]:
+    """
+    Inflates the gzip member starting at byte start, yielding decompressed chunks.
+
+    The generator returns the offset just past the member (available as StopIteration.value).
+    """
+    decompressor = zlib.decompressobj(_GZIP_WBITS)
+    pos = start
+    try:
+        while not decompressor.eof:
+            if pos >= len(data):
+                raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+            block = data[pos:pos + READ_BLOCK]
+            pos += len(block)
+            while True:
+                chunk = decompressor.decompress(block, OUTPUT_CHUNK)
+                if chunk:
+                    yield chunk
+                block = decompressor.unconsumed_tail
+                if decompressor.eof or (not block and len(chunk) < OUTPUT_CHUNK):
+                    break
+    except zlib.error as e:
+        raise gzip.BadGzipFile(str(e)) from e
+    return pos - len(decompressor.unused_data)
+
+
+def _inflate_member(data: mmap.mmap, start: int, limit: int) -> tuple[list[bytes], int | None] | None:
+    """
+    Inflates one member for the thread pool, holding at most limit decompressed bytes (plus one chunk).
+
+    Returns:
+        tuple[list[bytes], int | None] | None: The decompressed chunks and the offset just past the member, ([],
+            None) if the member inflates to more than limit bytes, or None if start is not the start of a valid
+            member.
+    """
+    chunks = []
+    size = 0
+    inflater = _inflate(data, start)
+    try:
+        while size <= limit:
+            chunk = next(inflater)
+            chunks.append(chunk)
+            size += len(chunk)
+    except StopIteration as stop:
+        return chunks, stop.value
+    except (EOFError, gzip.BadGzipFile):
+        return None
+    inflater.close()
+    return [], None   # Too large to buffer: streamed when its turn comes
+
+
+def _next_member(data: mmap.mmap, pos: int) -> int | None:
+    """ Returns where the member at or after byte pos starts (skipping zero padding), or None at the end of file."""
+    while pos < len(data) and data[pos] == 0:
+        pos += 1
+    if pos >= len(data):
+        return None
+    if data[pos:pos + 2] != GZIP_MAGIC[:2]:
+        raise gzip.BadGzipFile(f"Not a gzipped file ({data[pos:pos + 2]!r})")
+    return pos
+
+
+def _member_candidates(data: mmap.mmap, start: int) -> Iterator[int]:
+    """ Yields every offset at or after byte start that looks like the start of a gzip member."""
+    pos = data.find(GZIP_MAGIC, start)
+    while pos != -1:
+        yield pos
+        pos = data.find(GZIP_MAGIC, pos + 1)
+
+
+def _iter_serial(data: mmap.mmap, start: int = 0) -> Iterator[bytes]:
+    """ Inflates the members of a file from byte start on, one after the other, streaming each one."""
+    pos = _next_member(data, start)
+    while pos is not None:
+        pos = yield from _inflate(data, pos)
+        pos = _next_member(data, pos)
+
+
+def _iter_parallel(data: mmap.mmap, start: int, workers: int) -> Iterator[bytes]:
+    """
+    Inflates the members of a multi-member file from byte start (where a member ended) on a thread pool.
+
+    Every candidate offset is tried in order, at most 2 * workers at a time, each holding at most its share of
+    PARALLEL_BUFFER. A candidate is only used if the previous member ends exactly there, so a magic number that
+    happens to occur inside compressed data is discarded.
+    """
+    from concurrent.futures import ThreadPoolExecutor   # Only multi-member files are inflated on a pool
+    limit = max(OUTPUT_CHUNK, PARALLEL_BUFFER // (2 * workers))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque[tuple[int, Future]] = deque()
+        remaining = _member_candidates(data, start)
+        pos = _next_member(data, start)
+        while pos is not None:
+            for candidate in remaining:
+                if candidate < pos:
+                    continue   # Inside a member that was streamed
+                pending.append((candidate, executor.submit(_inflate_member, data, candidate, limit)))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending and pending[0][0] < pos:
+                pending.popleft()[1].cancel()   # Inside the previous member
+            if pending and pending[0][0] == pos:
+                result = pending.popleft()[1].result()
+            else:
+                result = None
+            if result is None:
+                # Not one of the candidates, or invalid: let the serial path raise the gzip error
+                yield from _iter_serial(data, pos)
+                return
+            chunks, end = result
+            if end is None:
+                end = yield from _inflate(data, pos)
+            else:
+                yield from chunks
+            pos = _next_member(data, end)
+
+
+def iter_gzip_chunks(path: Path, workers: int | None = None) -> Iterator[bytes]:
+    """
+    Yields the decompressed bytes of a gzip file in large chunks (not aligned on lines).
+
+    Args:
+        path (Path): A .log.gz file.
+        workers (int | None): Threads used for multi-member files (defaults to GZIP_WORKERS).
+    """
+    workers = workers or GZIP_WORKERS
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return   # Empty file: nothing to inflate
+        with mm:
+            pos = _next_member(mm, 0)
+            if pos is None:
+                return
+            end = yield from _inflate(mm, pos)   # The first member is always streamed
+            if workers > 1 and mm.find(GZIP_MAGIC, end) != -1:
+                yield from _iter_parallel(mm, end, workers)
+            else:
+                yield from _iter_serial(mm, end)
+
+
+def iter_gzip_lines(path: Path, rules: Iterable[tuple[str, str | None]] | None = None,
+                    workers: int | None = None) -> Iterator[str]:
+    """
+    Yields the decoded lines of a gzip log file, without line endings.
+
+    \\n, \\r\\n and \\r all end a line, like in text mode. When rules are given, only
+    the lines whose raw EVENT_TYPE and LEVEL fields can match one of them are decoded (see mmap_reader).
+
+    Args:
+        path (Path): A .log.gz file.
+        rules (Iterable[tuple[str, str | None]] | None): (event_type, level or None) pairs of the configured rules.
+        workers (int | None): Threads used for multi-member files (defaults to GZIP_WORKERS).
+    """
+    pattern = candidate_pattern(rules) if rules is not None else None
+    if rules is not None and pattern is None:
+        return
+
+    def _lines(block: bytes) -> Iterable[str]:
+        return iter_block_candidates(block, pattern) if pattern is not None else split_block(block)
+
+    tail = b""
+    for chunk in iter_gzip_chunks(path, workers):
+        cut = chunk.rfind(b"\n") + 1
+        if not cut:
+            tail += chunk
+            continue
+        yield from _lines(tail + chunk[:cut])
+        tail = chunk[cut:]
+    if tail:
+        yield from _lines(tail)
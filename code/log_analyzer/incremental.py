@@ -0,0 +1,311 @@
+"""
+Incremental analysis with a checkpoint file.
+
+The checkpoint remembers, for every log file, its device/inode, a fingerprint of its first bytes and how many
+(decompressed) bytes of it were already processed, plus the running total of every --count rule. The next pass
+only reads what was appended since, and adds to those totals instead of recomputing them.
+
+Log rotation is followed:
+    - A file keeps its checkpoint while its inode and fingerprint stay the same, even if it is renamed.
+    - A file that shrank, or whose first bytes changed (truncated / replaced in place), is read from the start.
+    - A file with a new inode whose first bytes match a checkpointed file (e.g. "app.log" compressed to
+      "app.log.1.gz") resumes where that file stopped, so only its unprocessed tail is read.
+    - A checkpointed file that vanished is remembered for DETACHED_TTL seconds, waiting for its rotated copy.
+
+A plain file's last line may still be being written. In follow mode it is only processed once it ends with a
+newline. A one-shot pass processes it like a full analysis would, and the checkpoint remembers its length,
+hash and --count contributions: the next pass skips it if it is unchanged, or takes its counts back and reads
+it again once it has grown. Gzip files are complete, so their last line is always processed.
+
+Every pass uses the same rules and --from/--to window as the checkpoint; a checkpoint written with other
+settings is discarded and the analysis starts over.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterator, NamedTuple
+from log_analyzer.aggregation import Accumulator, new_accumulator
+from log_analyzer.event_config import EventConfig
+from log_analyzer.gzip_reader import iter_gzip_chunks
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.mmap_reader import candidate_pattern, iter_block_candidates
+from log_analyzer.rule_engine import RuleEngine
+from log_analyzer.streaming import CountedMatches
+from log_analyzer.timestamps import TimestampParser
+
+CHECKPOINT_VERSION = 2          # Bumped whenever the on-disk layout changes
+HEAD_SIZE = 1024                # Bytes of (decompressed) content fingerprinting a file across rotations
+DETACHED_TTL = 24 * 60 * 60     # Seconds a vanished file stays in the checkpoint
+READ_BLOCK = 8 * 1024 * 1024    # Bytes read from a plain file at a time
+
+
+class FileState(NamedTuple):
+    """ The checkpoint of one log file."""
+    name: str
+    dev: int
+    ino: int
+    size: int
+    mtime_ns: int
+    offset: int          # (Decompressed) bytes already processed; on a line boundary unless tail_len is set
+    head_len: int        # Number of leading bytes covered by head_hash
+    head_hash: str
+    seen: float          # Wall-clock time the file was last present
+    tail_len: int        # Bytes of the processed unterminated last line, ending at offset (0 if none)
+    tail_hash: str
+    tail_counts: list[int]   # What that line added to the --count totals
+
+
+def config_signature(configs: list[EventConfig], ts_parser: TimestampParser) -> str:
+    """ Returns a digest of the rules and time window a checkpoint is only valid for."""
+    # Summary flags are only listed when set, so the checkpoints of rules without them stay valid
+    data = [[cfg.event_type, cfg.count, cfg.level, cfg.pattern.pattern if cfg.pattern else None, cfg.bucket,
+             cfg.group_by, cfg.stat] + ([cfg.summary, cfg.summary_size] if cfg.summary else []) for cfg in configs]
+    data.append([ts_parser.from_epoch, ts_parser.to_epoch])
+    return hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """
+    Processed offsets and running --count totals, optionally persisted to a JSON file.
+
+    Attributes:
+        path (str | None): Where the checkpoint is saved (None keeps it in memory only).
+        signature (str): config_signature of the run the checkpoint belongs to.
+        counts (list[int]): Running total of every rule (only meaningful for --count rules).
+        files (list[FileState]): The checkpointed files.
+    """
+    def __init__(self, path: str | None, signature: str, rules: int):
+        self.path = path
+        self.signature = signature
+        self.counts: list[int] = [0] * rules
+        self.files: list[FileState] = []
+
+    @classmethod
+    def load(cls, path: str | None, signature: str, rules: int) -> "Checkpoint":
+        """ Loads a checkpoint, or returns an empty one if it is missing, unreadable or belongs to other settings."""
+        checkpoint = cls(path, signature, rules)
+        if path is None:
+            return checkpoint
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return checkpoint
+
+        if data.get("version") != CHECKPOINT_VERSION or data.get("signature") != signature:
+            return checkpoint
+        if len(data["counts"]) == rules:
+            checkpoint.counts = data["counts"]
+            checkpoint.files = [FileState(*state) for state in data["files"]]
+        return checkpoint
+
+    def save(self) -> None:
+        """ Atomically writes the checkpoint (does nothing for an in-memory checkpoint)."""
+        if self.path is None:
+            return
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "signature": self.signature,
+            "counts": self.counts,
+            "files": [list(state) for state in self.files],
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+
+# -------------------
+# Helper Functions
+# -------------------
+
+
+def _read_head(path: Path) -> bytes:
+    """ Returns the first HEAD_SIZE (decompressed) bytes of a log file."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        return f.read(HEAD_SIZE)
+
+
+def _head_hash(head: bytes) -> str:
+    """ Returns the fingerprint of a file head."""
+    return hashlib.sha1(head).hexdigest()
+
+
+def _same_head(state: FileState, head: bytes) -> bool:
+    """ Whether a file starts with the bytes fingerprinted in a checkpoint."""
+    return len(head) >= state.head_len and _head_hash(head[:state.head_len]) == state.head_hash
+
+
+def _plain_chunks(path: Path, offset: int) -> Iterator[bytes]:
+    """ Yields the bytes of a plain file after offset, in blocks of READ_BLOCK."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while chunk := f.read(READ_BLOCK):
+            yield chunk
+
+
+def _gzip_chunks(path: Path, offset: int) -> Iterator[bytes]:
+    """ Yields the decompressed bytes of a gzip file after offset."""
+    for chunk in iter_gzip_chunks(path):
+        if offset >= len(chunk):
+            offset -= len(chunk)
+            continue
+        yield chunk[offset:]
+        offset = 0
+
+
+def _iter_new_blocks(path: Path, offset: int, hold_back: bool) -> Iterator[tuple[bytes, int]]:
+    """
+    Yields (block, end offset) pairs of whole lines following byte offset of a log file's (decompressed) content,
+    then the unterminated last line, if any, as a block of its own.
+
+    With hold_back, a plain file's unterminated last line is not yielded (it is read once it ends with a newline).
+    """
+    compressed = path.suffix == ".gz"
+    chunks = _gzip_chunks(path, offset) if compressed else _plain_chunks(path, offset)
+
+    pos, tail = offset, b""
+    for chunk in chunks:
+        cut = chunk.rfind(b"\n") + 1
+        if not cut:
+            tail += chunk
+            continue
+        block, tail = tail + chunk[:cut], chunk[cut:]
+        pos += len(block)
+        yield block, pos
+    if tail and (compressed or not hold_back):
+        yield tail, pos + len(tail)
+
+
+def _read_at(path: Path, offset: int, size: int) -> bytes:
+    """ Returns up to size bytes of a log file's (decompressed) content, starting at byte offset."""
+    chunks = _gzip_chunks(path, offset) if path.suffix == ".gz" else _plain_chunks(path, offset)
+    data = b""
+    for chunk in chunks:
+        data += chunk
+        if len(data) >= size:
+            break
+    return data[:size]
+
+
+def _same_tail(path: Path, state: FileState) -> bool:
+    """ Whether the unterminated last line processed by a checkpoint is still the same line (maybe now ended)."""
+    data = _read_at(path, state.offset - state.tail_len, state.tail_len + 1)
+    return _head_hash(data[:state.tail_len]) == state.tail_hash and data[state.tail_len:] in (b"", b"\n", b"\r")
+
+
+def _unchanged(stat: os.stat_result, checkpoint: Checkpoint, claimed: set[int]) -> FileState | None:
+    """ Returns the checkpoint of a file whose inode, size and mtime did not change since the last pass."""
+    key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    for i, state in enumerate(checkpoint.files):
+        if i not in claimed and (state.dev, state.ino, state.size, state.mtime_ns) == key:
+            claimed.add(i)
+            return state
+    return None
+
+
+def _resume(path: Path, stat: os.stat_result, head: bytes, checkpoint: Checkpoint,
+            claimed: set[int]) -> FileState | None:
+    """ Finds the checkpoint a file resumes from: same inode and head first, then same head (a rotated copy)."""
+    for i, state in enumerate(checkpoint.files):
+        if i not in claimed and (state.dev, state.ino) == (stat.st_dev, stat.st_ino):
+            shrunk = path.suffix != ".gz" and stat.st_size < state.offset
+            if not shrunk and _same_head(state, head):
+                claimed.add(i)
+                return state
+    for i, state in enumerate(checkpoint.files):
+        if i not in claimed and state.head_len and _same_head(state, head):
+            claimed.add(i)
+            return state
+    return None
+
+
+# -------------------
+# Public Functions
+# -------------------
+
+
+def analyze_increment(paths: list[Path], checkpoint: Checkpoint, engine: RuleEngine, ts_parser: TimestampParser,
+                      hold_back: bool = False) -> list[CountedMatches | Accumulator | list[LogEntry]]:
+    """
+    Processes what was appended to the log files since the checkpoint and advances the checkpoint.
+
+    Args:
+        paths (list[Path]): The current log files.
+        checkpoint (Checkpoint): Offsets and totals of the previous passes; updated in place (not saved).
+        engine (RuleEngine): The compiled rules.
+        ts_parser (TimestampParser): The pass's timestamp parser, holding the --from/--to window.
+        hold_back (bool): Whether the unterminated last line of a plain file waits for its newline (follow mode).
+
+    Returns:
+        list[CountedMatches | Accumulator | list[LogEntry]]: For each rule (in config order), the running total
+        of a --count rule, the accumulator of this pass for a --bucket / --group-by / --stat rule, or the entries
+        matched by this pass for other rules.
+    """
+    pattern = candidate_pattern(engine.rules)
+    new_entries: list[Accumulator | list[LogEntry]] = [
+        new_accumulator(cfg, ts_parser.local_timezone) if cfg.aggregated else [] for cfg in engine.configs]
+    counts = list(checkpoint.counts)
+    now = time.time()
+    claimed: set[int] = set()
+    states: list[FileState] = []
+
+    for path in sorted(paths):
+        stat = path.stat()
+        unchanged = _unchanged(stat, checkpoint, claimed)
+        if unchanged is not None:
+            states.append(unchanged._replace(name=path.name, seen=now))   # Nothing to read
+            continue
+
+        head = _read_head(path)
+        previous = _resume(path, stat, head, checkpoint, claimed)
+        offset, tail = 0, (0, "", [])
+        if previous is not None:
+            offset = previous.offset
+            if previous.tail_len and _same_tail(path, previous):
+                tail = previous.tail_len, previous.tail_hash, previous.tail_counts
+            elif previous.tail_len:
+                # The last line grew (or changed): take back what it counted and read it again
+                offset -= previous.tail_len
+                counts = [count - added for count, added in zip(counts, previous.tail_counts)]
+
+        for block, end in _iter_new_blocks(path, offset, hold_back):
+            before = list(counts)
+            if pattern is not None:   # Without rules only the offset moves
+                # Invalid lines and lines outside the --from/--to window are skipped
+                for entry in LogEntry.parse_batch(list(iter_block_candidates(block, pattern)), ts_parser).entries():
+                    for idx in engine.match(entry):
+                        if engine.configs[idx].aggregated:
+                            new_entries[idx].add(entry)
+                        elif engine.configs[idx].count:
+                            counts[idx] += 1
+                        else:
+                            new_entries[idx].append(entry)
+            offset = end
+            tail = (0, "", [])
+            if path.suffix != ".gz" and not block.endswith((b"\n", b"\r")):
+                tail = len(block), _head_hash(block), [count - old for count, old in zip(counts, before)]
+
+        head_len = min(len(head), offset)
+        states.append(FileState(path.name, stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, offset,
+                                head_len, _head_hash(head[:head_len]), now, *tail))
+
+    detached = [state for i, state in enumerate(checkpoint.files)
+                if i not in claimed and now - state.seen < DETACHED_TTL]
+    checkpoint.files = states + detached
+    checkpoint.counts = counts
+
+    results: list[CountedMatches | Accumulator | list[LogEntry]] = []
+    for cfg, count, entries in zip(engine.configs, counts, new_entries):
+        if cfg.count and not cfg.aggregated:
+            total = CountedMatches()
+            total.count = count
+            results.append(total)
+        else:
+            results.append(entries)
+    return results
@@ -1,22 +1,58 @@
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime
+from typing import Iterable, NamedTuple
 from zoneinfo import ZoneInfo
 from log_analyzer import error_messages
+from log_analyzer.timestamps import REJECT_FORMAT, REJECT_OUT_OF_RANGE, TimestampParser
 
 EXPECTED_LINE_FIELDS = 4  # TIMESTAMP, LEVEL, EVENT_TYPE, MESSAGE
-MAX_PAST_YEARS = 100  # Logs older than this will be rejected
+BATCH_LINES = 4096        # Lines the readers hand to parse_batch at a time
 DEFAULT_TIMEZONE = ZoneInfo("Asia/Jerusalem")  # Default timezone information.
 
 
+class ParsedLines(NamedTuple):
+    """
+    Result of LogEntry.parse_batch: the accepted lines as columns, and the reason code of every input line.
+
+    Attributes:
+        timestamps (list[datetime]): Tz-aware timestamp of every accepted line.
+        levels (list[str]): Interned level of every accepted line.
+        event_types (list[str]): Interned event type of every accepted line.
+        messages (list[str]): Message of every accepted line.
+        reasons (list[str | None]): For every input line, None if it was accepted, otherwise why it was rejected
+            (one of timestamps.REJECT_REASONS).
+    """
+    timestamps: list[datetime]
+    levels: list[str]
+    event_types: list[str]
+    messages: list[str]
+    reasons: list[str | None]
+
+    @property
+    def rejected(self) -> list[bool]:
+        """ The rejection mask: True for every input line that was rejected."""
+        return [reason is not None for reason in self.reasons]
+
+    def entries(self) -> list["LogEntry"]:
+        """ Returns the accepted lines as LogEntry objects, in input order."""
+        return list(map(LogEntry, self.timestamps, self.levels, self.event_types, self.messages))
+
+
 class LogEntry:
     """
     Represents a single log entry.
 
+    Instances use __slots__ (no per-instance __dict__), and the parsers intern the level and event_type strings
+    so millions of entries share a handful of string objects.
+
     Attributes:
        timestamp (datetime): When the event occurred.
        level (str): Log severity (e.g., INFO, WARNING, ERROR).
        event_type (str): Category or type of the event.
        message (str): The textual log message.
     """
+    __slots__ = ("timestamp", "level", "event_type", "message")
+
     def __init__(self, timestamp: datetime, level: str, event_type: str, message: str):
         """ Initializes a LogEntry instance with timestamp, level, event type, and message. """
         self.timestamp: datetime = timestamp
@@ -25,9 +61,11 @@ class LogEntry:
         self.message: str = message
 
     @classmethod
-    def parse_line(cls, line: str, local_timezone: ZoneInfo = None) -> "LogEntry":
+    def parse_line(cls, line: str, local_timezone: ZoneInfo = None,
+                   ts_parser: TimestampParser | None = None) -> "LogEntry | None":
         """
-        Parses a single raw log line into a structured LogEntry object, including validation.
+        Parses a single raw log line into a structured LogEntry object, including validation. Shares its checks
+        with parse_batch, but raises the reason of a rejected line as a ValueError.
 
         The log line must follow the format: <TIMESTAMP> <LEVEL> <EVENT_TYPE> <MESSAGE>
         Validation includes:
@@ -38,17 +76,96 @@ class LogEntry:
         Args:
             line (str): The raw log line to parse.
             local_timezone (ZoneInfo, optional): Timezone to assign if timestamp is naive.
+            ts_parser (TimestampParser, optional): Shared per-run parser with cached bounds and results. When
+                given, its timezone is used and lines outside its --from/--to window yield None.
 
         Returns:
-            LogEntry: A validated and parsed LogEntry object.
+            LogEntry | None: A validated and parsed LogEntry object, or None if ts_parser rejected it as out of range.
 
         Raises:
             ValueError: If the line format is invalid, or if the timestamp is malformed, in the future, or too old.
         """
+        if ts_parser is None:
+            ts_parser = TimestampParser(local_timezone or DEFAULT_TIMEZONE)
+
+        fields = cls._parse_fields(line, ts_parser.parse_or_reason)
+        if fields.__class__ is not str:
+            ts, level, event_type, message = fields
+            return cls(ts, sys.intern(level), sys.intern(event_type), message)
+        if fields == REJECT_OUT_OF_RANGE:
+            return None
+
+        # Rejected: the raising helpers produce the detailed error message
+        ts_str = cls.split_line(line)[0]
+        ts_parser.parse(ts_str)
+        raise ValueError(error_messages.INVALID_LINE_FORMAT)
+
+    @classmethod
+    def parse_batch(cls, lines: bytes | Iterable[str], ts_parser: TimestampParser | None = None,
+                    local_timezone: ZoneInfo | None = None) -> ParsedLines:
+        """
+        Parses a chunk of raw log lines into columns, without raising: every rejected line only gets a reason code.
+
+        Lines are validated exactly like parse_line does (format, uppercase level and event type, timestamp);
+        invalid lines cost a list append instead of a raised and caught ValueError.
+
+        Args:
+            lines (bytes | Iterable[str]): Raw lines, or a buffer of UTF-8 text holding newline-terminated lines.
+            ts_parser (TimestampParser, optional): Shared per-run parser with cached bounds and results; lines
+                outside its --from/--to window are rejected as REJECT_OUT_OF_RANGE.
+            local_timezone (ZoneInfo, optional): Timezone of a parser created for this call when none is given.
+
+        Returns:
+            ParsedLines: The columns of the accepted lines and the reason code (None if accepted) of every line.
+        """
+        if isinstance(lines, (bytes, bytearray, memoryview)):
+            lines = bytes(lines).decode("utf-8", errors="ignore").split("\n")
+            if not lines[-1]:
+                lines.pop()   # The empty text after the last newline
+        if ts_parser is None:
+            ts_parser = TimestampParser(local_timezone or DEFAULT_TIMEZONE)
+
+        timestamps, levels, event_types, messages, reasons = [], [], [], [], []
+        parse_fields = cls._parse_fields
+        parse_ts = ts_parser.parse_or_reason
+        intern = sys.intern
+        for line in lines:
+            fields = parse_fields(line, parse_ts)
+            if fields.__class__ is str:
+                reasons.append(fields)
+                continue
+            ts, level, event_type, message = fields
+            timestamps.append(ts)
+            levels.append(intern(level))
+            event_types.append(intern(event_type))
+            messages.append(message)
+            reasons.append(None)
+
+        return ParsedLines(timestamps, levels, event_types, messages, reasons)
 
-        if local_timezone is None:
-            local_timezone = DEFAULT_TIMEZONE
+    @staticmethod
+    def _parse_fields(line: str, parse_ts) -> "tuple[datetime, str, str, str] | str":
+        """ Returns the (timestamp, level, event type, message) of a line, or the reason code it is rejected."""
+        parts = line.strip().split(" ", EXPECTED_LINE_FIELDS - 1)
+        if len(parts) < EXPECTED_LINE_FIELDS:
+            return REJECT_FORMAT
+        ts_str, level, event_type, message = parts
+        if not event_type.isupper() or not level.isupper():
+            return REJECT_FORMAT
+        ts = parse_ts(ts_str)
+        if ts.__class__ is str:
+            return ts
+        return ts, level, event_type, message
+
+    @staticmethod
+    def split_line(line: str) -> tuple[str, str, str, str]:
+        """
+        Splits a raw log line into its TIMESTAMP, LEVEL, EVENT_TYPE and MESSAGE fields and validates that LEVEL
+        and EVENT_TYPE are uppercase. The timestamp itself is not validated here.
 
+        Raises:
+            ValueError: If the line does not have the expected structure.
+        """
         # Split into exactly EXPECTED_LINE_FIELDS parts
         parts = line.strip().split(" ", EXPECTED_LINE_FIELDS - 1)
 
@@ -60,10 +177,7 @@ class LogEntry:
         if not ev_type.isupper() or not lvl_str.isupper():
             raise ValueError(error_messages.INVALID_LINE_FORMAT)
 
-        # Validate timestamp
-        ts = cls._validate_and_parse_timestamp(ts_str, local_timezone)
-
-        return cls(ts, lvl_str, ev_type, msg)
+        return ts_str, lvl_str, ev_type, msg
 
     def __str__(self) -> str:
         """
@@ -81,20 +195,4 @@ class LogEntry:
             Ensures ISO format, applies timezone if needed, and verifies the timestamp is neither in the
             future nor too old.
         """
-        try:
-            ts = datetime.fromisoformat(ts_str)
-        except ValueError as e:
-            raise ValueError(error_messages.INVALID_TIMESTAMP_FORMAT.format(ts=ts_str, error=e))
-
-        ts = ts.replace(tzinfo=local_timezone)
-
-        now = datetime.now(local_timezone)
-
-        if ts > now:
-            raise ValueError(error_messages.FUTURE_TIMESTAMP.format(ts=ts, now=now))
-
-        if ts < now - timedelta(days=MAX_PAST_YEARS * 365):
-            raise ValueError(error_messages.TOO_OLD_TIMESTAMP.format(ts=ts, years=MAX_PAST_YEARS))
-
-        return ts
-
+        return TimestampParser(local_timezone).parse(ts_str)
@@ -0,0 +1,201 @@
+"""
+Run metrics: where the time of an analysis goes, and what happened to every line.
+
+A RunMetrics object is handed down the read path only when metrics are requested (LogAnalyzer(collect_metrics=
+True), --stats / --profile); otherwise every hook is a None check, so a plain run pays nothing. It collects:
+    - stage timers: wall-clock time of the analysis, of dispatching entries to the rules and of printing or
+      exporting the results;
+    - per file (and so per worker thread): bytes read, lines read, entries kept, lines rejected by reason (see
+      timestamps.REJECT_REASONS), time spent in the reader (I/O, or I/O and decompression for .gz files) and
+      time spent on the lines it produced (parsing and timestamp validation, plus matching in streaming mode);
+    - per rule: entries matched and regex evaluations (literal prefilter rejections do not run the regex).
+
+Lines the mmap reader skips without decoding them (their event type and level match no rule) are not read
+lines. Files read by worker processes (--backend process) and incremental passes report stage timers and
+matches only; with a result cache, only the files actually read are recorded and no regex evaluation is counted.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, Iterator
+from log_analyzer.event_config import EventConfig
+from log_analyzer.log_entry import LogEntry, ParsedLines
+from log_analyzer.timestamps import REJECT_FORMAT, REJECT_REASONS, TimestampParser
+
+
+@dataclass
+class FileMetrics:
+    """
+    Counters and timers of one log file.
+
+    Attributes:
+        path (str): The log file.
+        worker (str): Name of the thread that read it.
+        bytes_read (int): Bytes read from disk (compressed bytes for .gz files).
+        lines_read (int): Lines handed to the parser.
+        entries (int): Lines parsed into entries inside the time window.
+        rejected (dict[str, int]): Rejected lines per reason.
+        read_seconds (float): Time spent waiting for the reader.
+        parse_seconds (float): Time spent on the lines between two reads.
+    """
+    path: str
+    worker: str
+    bytes_read: int = 0
+    lines_read: int = 0
+    entries: int = 0
+    rejected: dict[str, int] = field(default_factory=lambda: dict.fromkeys(REJECT_REASONS, 0))
+    read_seconds: float = 0.0
+    parse_seconds: float = 0.0
+
+    def timed_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """ Yields the lines of a reader, counting them and splitting the elapsed time into read and parse time."""
+        clock = time.perf_counter
+        started = waiting = clock()
+        read = 0.0
+        count = 0
+        try:
+            for line in lines:
+                resumed = clock()
+                read += resumed - waiting
+                count += 1
+                yield line
+                waiting = clock()
+            read += clock() - waiting
+        finally:
+            self.lines_read += count
+            self.read_seconds += read
+            self.parse_seconds += clock() - started - read
+
+    def add_parsed(self, parsed: ParsedLines) -> None:
+        """ Counts the entries and rejected lines of a parsed batch."""
+        self.entries += len(parsed.messages)
+        for reason, count in Counter(parsed.reasons).items():
+            if reason is not None:
+                self.rejected[reason] += count
+
+    def reject(self, line: str, ts_parser: TimestampParser) -> None:
+        """ Counts a line the parser rejected (or left outside the time window) under its reason."""
+        try:
+            ts_str = LogEntry.split_line(line)[0]
+        except ValueError:
+            reason = REJECT_FORMAT
+        else:
+            reason = ts_parser.rejection_reason(ts_str) or REJECT_FORMAT
+        self.rejected[reason] += 1
+
+
+@dataclass
+class RuleMetrics:
+    """
+    Counters of one rule.
+
+    Attributes:
+        event_type (str): The rule's event type.
+        matched (int): Entries the rule matched.
+        regex_evaluations (int | None): Times the rule's regex ran (None when not measured).
+    """
+    event_type: str
+    matched: int = 0
+    regex_evaluations: int | None = None
+
+
+class RunMetrics:
+    """
+    Metrics of one analysis run.
+
+    Attributes:
+        stages (dict[str, float]): Wall-clock seconds per stage ("analyze", "match", "output").
+        files (list[FileMetrics]): One record per file read, in completion order.
+        rules (list[RuleMetrics]): One record per rule, in events-file order.
+    """
+    def __init__(self, configs: list[EventConfig]):
+        """ Creates empty metrics for the given rules."""
+        self.stages: dict[str, float] = {}
+        self.files: list[FileMetrics] = []
+        self.rules: list[RuleMetrics] = [RuleMetrics(cfg.event_type) for cfg in configs]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """ Adds the wall-clock time of the with-block to a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def new_file(self, path) -> FileMetrics:
+        """ Returns the (registered) record of a file read by the calling thread."""
+        file_metrics = FileMetrics(str(path), threading.current_thread().name)
+        self.files.append(file_metrics)
+        return file_metrics
+
+    def record_matches(self, results: Iterable[tuple[EventConfig, Iterable]]) -> None:
+        """ Records the number of entries every rule matched."""
+        for rule, (_, matched) in zip(self.rules, results):
+            rule.matched = len(matched)
+
+    def totals(self) -> dict:
+        """ Returns the file counters summed over every file, with the read / gzip / parse times."""
+        rejected = dict.fromkeys(REJECT_REASONS, 0)
+        for file_metrics in self.files:
+            for reason, count in file_metrics.rejected.items():
+                rejected[reason] += count
+        return {
+            "files": len(self.files),
+            "bytes_read": sum(f.bytes_read for f in self.files),
+            "lines_read": sum(f.lines_read for f in self.files),
+            "entries": sum(f.entries for f in self.files),
+            "rejected": rejected,
+            "read_seconds": sum(f.read_seconds for f in self.files if not f.path.endswith(".gz")),
+            "gzip_seconds": sum(f.read_seconds for f in self.files if f.path.endswith(".gz")),
+            "parse_seconds": sum(f.parse_seconds for f in self.files),
+        }
+
+    def workers(self) -> dict[str, dict]:
+        """ Returns the files, lines read and busy seconds of every worker thread."""
+        workers: dict[str, dict] = {}
+        for f in self.files:
+            worker = workers.setdefault(f.worker, {"files": 0, "lines_read": 0, "seconds": 0.0})
+            worker["files"] += 1
+            worker["lines_read"] += f.lines_read
+            worker["seconds"] += f.read_seconds + f.parse_seconds
+        return workers
+
+    def to_dict(self) -> dict:
+        """ Returns every metric as plain JSON-compatible data."""
+        return {
+            "stages": dict(self.stages),
+            "totals": self.totals(),
+            "workers": self.workers(),
+            "files": [asdict(f) for f in self.files],
+            "rules": [asdict(rule) for rule in self.rules],
+        }
+
+    def write_json(self, path: str) -> None:
+        """ Writes the metrics (see to_dict) to a JSON profile file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self) -> str:
+        """ Returns a human-readable summary of the metrics."""
+        totals = self.totals()
+        lines = ["Run statistics:"]
+        lines.append("  stages: " + ", ".join(f"{name}={seconds:.3f}s" for name, seconds in self.stages.items()))
+        if self.files:
+            lines.append(f"  files: {totals['files']}, bytes read: {totals['bytes_read']}, "
+                         f"lines read: {totals['lines_read']}, entries: {totals['entries']}")
+            rejected = totals["rejected"].items()
+            lines.append("  rejected: " + ", ".join(f"{reason}={count}" for reason, count in rejected))
+            lines.append(f"  summed over files: read={totals['read_seconds']:.3f}s, "
+                         f"gzip={totals['gzip_seconds']:.3f}s, parse={totals['parse_seconds']:.3f}s")
+            for name, worker in self.workers().items():
+                lines.append(f"  worker {name}: {worker['files']} files, {worker['lines_read']} lines, "
+                             f"{worker['seconds']:.3f}s")
+        for idx, rule in enumerate(self.rules, 1):
+            evaluations = "-" if rule.regex_evaluations is None else rule.regex_evaluations
+            lines.append(f"  rule {idx} ({rule.event_type}): matched={rule.matched}, regex evaluations={evaluations}")
+        return "\n".join(lines)
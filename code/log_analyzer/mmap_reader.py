@@ -0,0 +1,120 @@
+"""
+Memory-mapped reader for plain .log files.
+
+The file is mapped into memory and walked in large blocks that end on a newline. The LEVEL and EVENT_TYPE fields
+of each line are checked on the raw bytes against the configured rules, with one compiled regex scanning the
+whole block (see candidate_pattern). Only candidate lines are decoded to str; lines whose event type
+(or level) no rule can accept are never decoded or turned into objects.
+
+\\n, \\r\\n and \\r all end a line, the same line endings text mode recognizes.
+"""
+
+import mmap
+import re
+from pathlib import Path
+from typing import Iterable, Iterator
+
+READ_BLOCK = 8 * 1024 * 1024   # Bytes taken from the mapping at a time
+
+
+def field_filter(rules: Iterable[tuple[str, str | None]]) -> dict[bytes, frozenset[bytes] | None]:
+    """
+    Builds the raw-bytes lookup used to pick candidate lines.
+
+    Args:
+        rules (Iterable[tuple[str, str | None]]): (event_type, level or None) pairs of the configured rules.
+
+    Returns:
+        dict[bytes, frozenset[bytes] | None]: For each event type, the accepted levels (None meaning any level).
+    """
+    wanted: dict[bytes, set[bytes] | None] = {}
+    for event_type, level in rules:
+        key = event_type.encode("utf-8")
+        if level is None:
+            wanted[key] = None
+        elif key not in wanted:
+            wanted[key] = {level.encode("utf-8")}
+        elif wanted[key] is not None:
+            wanted[key].add(level.encode("utf-8"))
+    return {key: frozenset(levels) if levels is not None else None for key, levels in wanted.items()}
+
+
+def candidate_pattern(rules: Iterable[tuple[str, str | None]]) -> re.Pattern[bytes] | None:
+    """
+    Compiles the rules into one multi-line bytes regex matching whole candidate lines, so a block is filtered in
+    a single C-level scan. Lines starting with a space always match: leading spaces shift the fields, so the
+    regular parser decides.
+
+    Returns:
+        re.Pattern[bytes] | None: The pattern, or None if there are no rules (no line can match).
+    """
+    wanted = field_filter(rules)
+    if not wanted:
+        return None
+    alternatives = []
+    for event_type, levels in wanted.items():
+        level = b"[^ \n]*" if levels is None else b"(?:" + b"|".join(map(re.escape, sorted(levels))) + b")"
+        alternatives.append(level + b" " + re.escape(event_type))
+    return re.compile(b"^(?: |[^ \n]* (?:" + b"|".join(alternatives) + b") )[^\n]*$", re.MULTILINE)
+
+
+def normalize_newlines(block: bytes) -> bytes:
+    """ Turns \r\n and lone \r line endings into \n, as text mode does."""
+    if b"\r" in block:
+        block = block.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return block
+
+
+def split_block(block: bytes) -> list[str]:
+    """ Decodes a block of raw bytes holding whole lines and returns its lines, without line endings."""
+    lines = normalize_newlines(block).decode("utf-8", errors="ignore").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def iter_block_candidates(block: bytes, pattern: re.Pattern[bytes]) -> Iterator[str]:
+    """
+    Yields the decoded candidate lines of a block of raw bytes holding whole lines.
+
+    Args:
+        block (bytes): Raw log bytes that start and end on line boundaries.
+        pattern (re.Pattern[bytes]): The pattern returned by candidate_pattern.
+    """
+    matches = pattern.findall(normalize_newlines(block))
+    if matches:
+        yield from b"\n".join(matches).decode("utf-8", errors="ignore").split("\n")
+
+
+def iter_candidate_lines(path: Path, rules: Iterable[tuple[str, str | None]], start: int = 0,
+                         end: int | None = None) -> Iterator[str]:
+    """
+    Yields the decoded lines of the byte range [start, end) of a plain log file whose raw EVENT_TYPE and LEVEL
+    fields can match one of the rules. The range must start on a line boundary.
+
+    The check is conservative: every line LogEntry.parse_line could turn into a matching entry is yielded.
+
+    Args:
+        path (Path): A plain .log file.
+        rules (Iterable[tuple[str, str | None]]): (event_type, level or None) pairs of the configured rules.
+        start (int): First byte of the range.
+        end (int | None): End of the range (defaults to the end of the file).
+    """
+    pattern = candidate_pattern(rules)
+    if pattern is None:
+        return
+
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return   # Empty file: nothing to map
+        with mm:
+            end = len(mm) if end is None else min(end, len(mm))
+            pos = start
+            while pos < end:
+                cut = mm.rfind(b"\n", pos, min(pos + READ_BLOCK, end))
+                cut = end if cut == -1 or pos + READ_BLOCK >= end else cut + 1
+                block = mm[pos:cut]
+                pos = cut
+                yield from iter_block_candidates(block, pattern)
@@ -0,0 +1,57 @@
+"""
+Deterministic time order of analysis results.
+
+Files are read concurrently, so the order results arrive in says nothing about time. Instead, the matches of
+every file are kept sorted by timestamp (a single cheap pass over a log that is already in order, as most are),
+and the per-file runs of a rule are combined with a heap-based k-way merge: one globally time-ordered stream per
+rule, without a full sort of the combined entries. Equal timestamps keep the order of the files (sorted by name,
+see streaming.list_log_files), then their order inside the file.
+"""
+
+import heapq
+from operator import attrgetter
+from typing import Iterable, Iterator
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.log_entry import LogEntry
+
+_timestamp = attrgetter("timestamp")
+
+
+def sort_entries(entries: list[LogEntry]) -> list[LogEntry]:
+    """ Sorts a file's entries by timestamp in place (stable) and returns them."""
+    entries.sort(key=_timestamp)
+    return entries
+
+
+def sorted_rows(batch: EntryBatch, rows: Iterable[int]) -> list[int]:
+    """ Returns row indices of a batch ordered by timestamp (stable)."""
+    return sorted(rows, key=batch.timestamps.__getitem__)
+
+
+def merge_entries(runs: Iterable[Iterable[LogEntry]]) -> Iterator[LogEntry]:
+    """ K-way merges time-ordered runs of entries (e.g. one per file) into one time-ordered stream."""
+    return heapq.merge(*runs, key=_timestamp)
+
+
+def _keyed_rows(batch: EntryBatch, part: int, rows: Iterable[int]) -> Iterator[tuple[int, int, int]]:
+    """ Yields (timestamp, part, row) of the given rows; part breaks ties between files in file order."""
+    timestamps = batch.timestamps
+    for i in rows:
+        yield timestamps[i], part, i
+
+
+def merge_batches(target: EntryBatch, parts: list[tuple[EntryBatch, list[int]]]) -> None:
+    """
+    Appends the given rows of several batches to target in global time order.
+
+    Args:
+        target (EntryBatch): The batch to append to.
+        parts (list[tuple[EntryBatch, list[int]]]): (batch, row indices in time order) of every file, in file order.
+    """
+    if len(parts) == 1:
+        target.extend(*parts[0])
+        return
+    runs = [_keyed_rows(batch, part, rows) for part, (batch, rows) in enumerate(parts)]
+    for _, part, i in heapq.merge(*runs):
+        batch = parts[part][0]
+        target.append(batch.timestamps[i], batch.level(i), batch.event_type(i), batch.message(i))
@@ -0,0 +1,184 @@
+"""
+Process-pool analysis backend.
+
+Parsing and regex matching are pure Python, so threads are held to roughly one core by the GIL. This backend
+splits large plain .log files into byte-range chunks on line boundaries (gzip files are one chunk each, since
+they cannot be entered mid-stream), hands the chunks to worker processes that parse and filter locally, and
+merges their compact per-rule results in file order.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, NamedTuple
+from log_analyzer.aggregation import Accumulator, new_accumulator
+from log_analyzer.event_config import EventConfig
+from log_analyzer.file_index import candidate_ranges
+from log_analyzer.log_entry import BATCH_LINES, LogEntry
+from log_analyzer.mmap_reader import iter_candidate_lines
+from log_analyzer.rule_engine import RuleEngine
+from log_analyzer.streaming import iter_file_lines
+from log_analyzer.time_seek import window_byte_range
+from log_analyzer.timestamps import TimestampParser
+
+CHUNK_SIZE = 32 * 1024 * 1024   # Target size in bytes of one plain-text work unit
+WHOLE_FILE = -1                 # Chunk end marker meaning "read to the end of the file"
+
+
+class Chunk(NamedTuple):
+    """ A byte range [start, end) of a log file that starts and ends on line boundaries."""
+    path: str
+    start: int
+    end: int
+
+
+def plan_chunks(path: Path, chunk_size: int = CHUNK_SIZE, ts_parser: TimestampParser | None = None,
+                rules: list[tuple[str, str | None]] | None = None, use_index: bool = False) -> list[Chunk]:
+    """
+    Splits a log file into chunks of roughly chunk_size bytes, each ending just after a newline.
+
+    Gzip files cannot be split and are returned as a single whole-file chunk. For plain files, only the byte
+    ranges that can hold matches are chunked: the candidate blocks of the sidecar index when use_index is
+    set, or the --from/--to window of a time-sorted file.
+
+    Args:
+        path (Path): A .log or .log.gz file.
+        chunk_size (int): Target chunk size in bytes.
+        ts_parser (TimestampParser | None): The run's timestamp parser, used to locate the window.
+        rules (list[tuple[str, str | None]] | None): (event_type, level) pairs to look up in the index.
+        use_index (bool): Whether to chunk only the candidate blocks of the sidecar index.
+
+    Returns:
+        list[Chunk]: Consecutive chunks covering the file (or the ranges that can hold matches), in file order.
+    """
+    if path.suffix == ".gz":
+        return [Chunk(str(path), 0, WHOLE_FILE)]
+
+    if use_index:
+        ranges = candidate_ranges(path, rules, ts_parser)
+    else:
+        ranges = [(window_byte_range(path, ts_parser) if ts_parser is not None else None) or
+                  (0, path.stat().st_size)]
+
+    chunks = []
+    with open(path, "rb") as f:
+        for first, last in ranges:
+            boundaries = [first]
+            target = first + chunk_size
+            while target < last:
+                f.seek(target - 1)
+                f.readline()  # Resync: move past the end of the line that contains byte target - 1
+                boundary = f.tell()
+                if boundary >= last:
+                    break
+                boundaries.append(boundary)
+                target = boundary + chunk_size
+            boundaries.append(last)
+            chunks.extend(Chunk(str(path), start, end)
+                          for start, end in zip(boundaries, boundaries[1:]) if end > start)
+
+    return chunks
+
+
+def iter_chunk_lines(chunk: Chunk, ts_parser: TimestampParser | None = None,
+                     rules: list[tuple[str, str | None]] | None = None, use_index: bool = False) -> Iterator[str]:
+    """
+    Yields the text lines of a chunk, decoded exactly like the single-threaded reader does.
+
+    When rules are given, lines that no rule can match are skipped without being decoded (see mmap_reader).
+    Whole-file (gzip) chunks are read with iter_file_lines, through the sidecar index if use_index is set.
+    """
+    path = Path(chunk.path)
+    if chunk.end == WHOLE_FILE:
+        yield from iter_file_lines(path, ts_parser, rules, use_index)
+        return
+
+    if rules is not None:
+        yield from iter_candidate_lines(path, rules, chunk.start, chunk.end)
+        return
+
+    with open(path, "rb") as f:
+        f.seek(chunk.start)
+        data = f.read(chunk.end - chunk.start)
+    yield from io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", errors="ignore")
+
+
+# -------------------
+# Worker side
+# -------------------
+
+_worker_engine: RuleEngine | None = None
+_worker_ts_parser: TimestampParser | None = None
+_worker_use_index: bool = False
+
+
+def _init_worker(configs: list[EventConfig], ts_parser: TimestampParser, use_index: bool) -> None:
+    """ Compiles the rules once per worker process instead of once per chunk."""
+    global _worker_engine, _worker_ts_parser, _worker_use_index
+    _worker_engine = RuleEngine(configs)
+    _worker_ts_parser = ts_parser
+    _worker_use_index = use_index
+
+
+def analyze_chunk(chunk: Chunk) -> list[int | Accumulator | list[LogEntry]]:
+    """
+    Parses and filters one chunk inside a worker process.
+
+    Returns:
+        list[int | Accumulator | list[LogEntry]]: One item per rule: the accumulator of --bucket /
+        --group-by / --stat rules, the match count for --count rules, otherwise the matched entries in file order.
+    """
+    engine = _worker_engine
+    ts_parser = _worker_ts_parser
+    results: list[int | Accumulator | list[LogEntry]] = [
+        new_accumulator(cfg, ts_parser.local_timezone) if cfg.aggregated else 0 if cfg.count else []
+        for cfg in engine.configs]
+
+    lines = iter_chunk_lines(chunk, ts_parser, engine.rules, _worker_use_index)
+    while batch := list(islice(lines, BATCH_LINES)):
+        # Invalid lines and lines outside the --from/--to window are skipped
+        for entry in LogEntry.parse_batch(batch, ts_parser).entries():
+            for idx in engine.match(entry):
+                if engine.configs[idx].aggregated:
+                    results[idx].add(entry)
+                elif engine.configs[idx].count:
+                    results[idx] += 1
+                else:
+                    results[idx].append(entry)
+
+    return results
+
+
+# -------------------
+# Coordinator side
+# -------------------
+
+def analyze_in_processes(paths: list[Path], configs: list[EventConfig], ts_parser: TimestampParser,
+                         max_workers: int | None = None, chunk_size: int | None = None,
+                         use_index: bool = False) -> Iterator[list[int | Accumulator | list[LogEntry]]]:
+    """
+    Runs analyze_chunk over every chunk of every file in a process pool.
+
+    Args:
+        paths (list[Path]): Log files to analyze.
+        configs (list[EventConfig]): The rules to apply.
+        ts_parser (TimestampParser): The run's timestamp parser; every worker gets a copy with the same bounds.
+        max_workers (int | None): Number of worker processes (defaults to the CPU count).
+        chunk_size (int | None): Target chunk size in bytes for plain .log files (defaults to CHUNK_SIZE).
+        use_index (bool): Whether to read through the sidecar indexes.
+
+    Yields:
+        list[int | Accumulator | list[LogEntry]]: The per-rule result of each chunk, in file and chunk order.
+    """
+    rules = RuleEngine(configs).rules
+    chunks = [chunk for path in paths
+              for chunk in plan_chunks(path, chunk_size or CHUNK_SIZE, ts_parser, rules, use_index)]
+    if not chunks:
+        return
+
+    workers = min(max_workers or os.cpu_count() or 1, len(chunks))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(configs, ts_parser, use_index)) as executor:
+        yield from executor.map(analyze_chunk, chunks)
@@ -0,0 +1,167 @@
+"""
+Persistent per-file, per-rule result cache.
+
+Scheduled jobs often run the same events file over the same (archived) log files. The cache keeps the partial
+result of every rule on every log file, so a later run only reads the files whose results are missing or stale
+and merges the cached partial results of the others.
+
+An entry is keyed by:
+    - the log file: its resolved path, size and mtime (a rewritten file gets a new key);
+    - the rule: event_type, level, pattern source and flags, count, bucket, group_by, stat and summary;
+    - the --from/--to window and the timezone of the run.
+Changing one rule therefore only recomputes that rule, and changing one file only that file.
+
+Every entry is one file of the columnar export format (see columnar_file) holding a single rule; an index in the
+cache directory keeps the entries in least-recently-used order with their sizes. Once the entries exceed the
+size bound, the least recently used ones are evicted.
+
+Future-dated lines become valid as time passes: an entry computed from a file holding some expires once "now"
+reaches the earliest of them. (Lines crossing the MAX_PAST_YEARS bound are not tracked.)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from zoneinfo import ZoneInfo
+from log_analyzer.aggregation import Accumulator
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.columnar_file import export_columnar, load_columnar
+from log_analyzer.defaults import DEFAULT_CACHE_BYTES
+from log_analyzer.event_config import EventConfig
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.timestamps import TimestampParser
+
+CACHE_VERSION = 1                        # Bumped whenever the layout of the entries or the index changes
+DEFAULT_MAX_BYTES = DEFAULT_CACHE_BYTES  # Size bound of the cached entries
+INDEX_NAME = "index.json"                # The LRU index inside the cache directory
+ENTRY_SUFFIX = ".cols"                   # Entries are columnar export files
+
+Partial = list[LogEntry] | EntryBatch | Accumulator   # The result of one rule on one file
+
+
+def file_key(path: Path) -> list:
+    """ Returns the part of a cache key identifying the current content of a log file."""
+    stat = path.stat()
+    return [str(path.resolve()), stat.st_size, stat.st_mtime_ns]
+
+
+def rule_key(ev_config: EventConfig, ts_parser: TimestampParser) -> list:
+    """ Returns the part of a cache key identifying a rule under a run's time window and timezone."""
+    pattern = ev_config.pattern
+    return [ev_config.event_type, ev_config.level, pattern.pattern if pattern else None, pattern.flags if pattern
+            else 0, ev_config.count, ev_config.bucket, ev_config.group_by, ev_config.stat, ev_config.summary,
+            ev_config.summary_size, ts_parser.from_epoch, ts_parser.to_epoch, ts_parser.local_timezone.key]
+
+
+def entry_key(file_part: list, rule_part: list) -> str:
+    """ Returns the cache key of one rule on one file."""
+    data = json.dumps([CACHE_VERSION, file_part, rule_part], ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    A size-bounded LRU cache of per-file, per-rule partial results, stored in a directory.
+
+    Safe to use from several threads; the index is only written by save().
+
+    Attributes:
+        directory (Path): The cache directory (created if missing).
+        max_bytes (int): Size bound of the entries; least recently used entries are evicted beyond it.
+        hits (int): Entries found by get() since the cache was opened.
+        misses (int): Entries get() did not find.
+    """
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """ Opens (or creates) the cache in a directory, loading its index."""
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: dict[str, list] = {}   # Key -> [size in bytes, expiry naive epoch or None], LRU first
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(self.directory / INDEX_NAME, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = {key: [size, expires] for key, size, expires in data["entries"]}
+        except (OSError, ValueError):
+            pass   # Missing or unreadable index: start empty
+
+    @property
+    def size(self) -> int:
+        """ Total size in bytes of the cached entries."""
+        return sum(size for size, _ in self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _path(self, key: str) -> Path:
+        """ Returns the file of an entry."""
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str, now_epoch: int | None = None) -> Partial | None:
+        """
+        Returns a cached partial result (marking it as recently used), or None if it is missing, unreadable or
+        expired at now_epoch (naive epoch of the run's "now").
+        """
+        with self._lock:
+            record = self._entries.pop(key, None)
+            expires = record[1] if record is not None else None
+            if record is None or (expires is not None and now_epoch is not None and now_epoch >= expires):
+                self.misses += 1
+                return None
+            self._entries[key] = record
+        try:
+            (_, partial), = load_columnar(str(self._path(key)))
+        except (OSError, ValueError):
+            with self._lock:
+                self._entries.pop(key, None)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return partial
+
+    def put(self, key: str, ev_config: EventConfig, partial: Partial, local_timezone: ZoneInfo,
+            expires: int | None = None) -> None:
+        """
+        Stores a partial result, evicting least recently used entries beyond the size bound.
+
+        Args:
+            key (str): The entry key (see entry_key).
+            ev_config (EventConfig): The rule of the partial result.
+            partial (Partial): The result of the rule on one file.
+            local_timezone (ZoneInfo): Timezone of the result's timestamps.
+            expires (int | None): Naive epoch from which the entry is stale (None: never).
+        """
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        export_columnar([(ev_config, partial)], str(tmp_path), local_timezone)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = [path.stat().st_size, expires]
+            self._evict()
+
+    def _evict(self) -> None:
+        """ Removes least recently used entries until the cache fits its size bound (lock held)."""
+        total = self.size
+        while total > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            total -= self._entries.pop(key)[0]
+            self._path(key).unlink(missing_ok=True)
+
+    def save(self) -> None:
+        """ Atomically writes the index (entries in least-recently-used order)."""
+        with self._lock:
+            data = {"version": CACHE_VERSION, "entries": [[key, *record] for key, record in self._entries.items()]}
+        tmp_path = self.directory / f"{INDEX_NAME}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.directory / INDEX_NAME)
@@ -0,0 +1,184 @@
+from typing import Callable, NamedTuple
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.event_config import EventConfig
+from log_analyzer.log_entry import LogEntry
+from log_analyzer import vectorized
+from log_analyzer.metrics import RuleMetrics
+
+
+Matcher = Callable[[str], object]   # Truthy when a message matches a rule's pattern (see EventConfig)
+Rules = tuple[tuple[int, Matcher | None], ...]
+
+
+class Dispatch(NamedTuple):
+    """
+    What the engine runs for one (event_type, level) pair.
+
+    Attributes:
+        rules (Rules): (rule index, matcher or None) of every candidate rule, ordered by rule index.
+        head_len (int): Length of the message head used to look up by_head.
+        by_head (dict[str, Rules] | None): For each head of an anchored prefix, the candidate rules a message
+            starting with it can match; None if fewer than two candidate rules have an anchored prefix.
+        rest (Rules): The candidate rules without an anchored prefix (what a message with any other head runs).
+    """
+    rules: Rules
+    head_len: int
+    by_head: dict[str, Rules] | None
+    rest: Rules
+
+
+class RuleEngine:
+    """
+    Compiles a list of EventConfig rules into an index so every log entry is dispatched once, only to the
+    rules that can possibly match it.
+
+    Rules are indexed by event_type and then by level (None meaning "any level"). The candidate list for a
+    given (event_type, level) pair is built on first use and cached, so the per-entry cost is two dict lookups
+    plus one pattern check per candidate rule that has a pattern.
+
+    Patterns come with a literal prefilter (see compile_prefilter). Unanchored patterns test a required literal
+    with `in` before running the regex. When several candidate rules have patterns anchored on a literal prefix
+    (^literal...), they are bucketed by the head of that prefix, so a message only runs the rules whose prefix
+    it can start with instead of every regex of its (event_type, level) pair.
+
+    The matching semantics are identical to EventFilter.matches.
+    """
+    def __init__(self, configs: list[EventConfig], use_prefilter: bool = True,
+                 rule_metrics: list[RuleMetrics] | None = None):
+        """
+        Builds the event_type -> level -> rules index.
+
+        Args:
+            configs (list[EventConfig]): The rules to compile, in events-file order.
+            use_prefilter (bool): Whether to run the literal prefilters before the regexes.
+            rule_metrics (list[RuleMetrics] | None): If given (one per rule), every regex evaluation of a rule
+                is counted in its record.
+        """
+        self.configs: list[EventConfig] = list(configs)
+        self.use_prefilter = use_prefilter
+        self._index: dict[str, dict[str | None, list[tuple[int, Matcher | None]]]] = {}
+        self._dispatch: dict[tuple[str, str], Dispatch] = {}
+        self.matchers: list[Matcher | None] = []   # The matcher of every rule, in self.configs order
+
+        for idx, cfg in enumerate(self.configs):
+            by_level = self._index.setdefault(cfg.event_type, {})
+            search = None
+            if rule_metrics is not None and cfg.pattern is not None:
+                search = self._counted_search(cfg.pattern.search, rule_metrics[idx])
+            self.matchers.append(cfg.message_matcher(use_prefilter, search))
+            by_level.setdefault(cfg.level, []).append((idx, self.matchers[-1]))
+
+    @staticmethod
+    def _counted_search(search: Matcher, rule: RuleMetrics) -> Matcher:
+        """ Wraps a regex search so that every call is counted in the rule's metrics."""
+        rule.regex_evaluations = 0
+
+        def _search(message: str) -> object:
+            rule.regex_evaluations += 1
+            return search(message)
+        return _search
+
+    @property
+    def rules(self) -> list[tuple[str, str | None]]:
+        """ The (event_type, level or None) pair of every rule, used by readers to skip irrelevant lines early."""
+        return [(cfg.event_type, cfg.level) for cfg in self.configs]
+
+    @property
+    def event_types(self) -> frozenset[str]:
+        """ The set of event types mentioned by at least one rule."""
+        return frozenset(self._index)
+
+    def candidates(self, event_type: str, level: str) -> Rules:
+        """
+        Returns the (rule index, matcher) pairs whose event_type and level constraints accept the given values,
+        ordered by rule index. The matcher is None for rules without a pattern.
+        """
+        return self.dispatch(event_type, level).rules
+
+    def dispatch(self, event_type: str, level: str) -> Dispatch:
+        """ Returns the cached Dispatch of an (event_type, level) pair, building it on first use."""
+        key = (event_type, level)
+        cached = self._dispatch.get(key)
+        if cached is not None:
+            return cached
+
+        by_level = self._index.get(event_type)
+        if by_level is None:
+            rules = ()
+        else:
+            rules = tuple(sorted(by_level.get(None, []) + by_level.get(level, []), key=lambda rule: rule[0]))
+
+        prefixes = {}
+        if self.use_prefilter:
+            for idx, matcher in rules:
+                prefilter = self.configs[idx].prefilter
+                if prefilter is not None and prefilter.prefix:
+                    prefixes[idx] = prefilter.prefix
+
+        if len(prefixes) < 2:
+            cached = Dispatch(rules, 0, None, rules)
+        else:
+            head_len = min(map(len, prefixes.values()))
+            by_head = {
+                head: tuple(rule for rule in rules if rule[0] not in prefixes or prefixes[rule[0]][:head_len] == head)
+                for head in {prefix[:head_len] for prefix in prefixes.values()}
+            }
+            rest = tuple(rule for rule in rules if rule[0] not in prefixes)
+            cached = Dispatch(rules, head_len, by_head, rest)
+        self._dispatch[key] = cached
+        return cached
+
+    def match(self, entry: LogEntry) -> list[int]:
+        """
+        Returns the indices (into self.configs) of every rule the entry matches.
+
+        Args:
+            entry (LogEntry): A parsed log entry.
+
+        Returns:
+            list[int]: Matching rule indices in ascending order (empty if none match).
+        """
+        rules, head_len, by_head, rest = self.dispatch(entry.event_type, entry.level)
+        message = entry.message
+        if by_head is not None:
+            rules = by_head.get(message[:head_len], rest)
+        return [idx for idx, matcher in rules if matcher is None or matcher(message)]
+
+    def match_batch(self, batch: EntryBatch, window=None) -> list[list[int]]:
+        """
+        Dispatches every row of a columnar EntryBatch in one pass, resolving candidates per (event, level) code pair.
+        When NumPy is installed, the event_type / level (and window) checks of every rule are vectorized
+        comparisons over the code columns instead (see vectorized).
+
+        Args:
+            batch (EntryBatch): The rows to match.
+            window (np.ndarray | None): Mask of the rows inside the time window (see vectorized.window_mask);
+                None if every row is.
+
+        Returns:
+            list[list[int]]: For each rule (in self.configs order), the indices of the matching rows.
+        """
+        if vectorized.enabled():
+            masks = vectorized.rule_masks(self.configs, batch, window)
+            return [vectorized.rule_rows(mask, batch, matcher) for mask, matcher in zip(masks, self.matchers)]
+
+        matched: list[list[int]] = [[] for _ in self.configs]
+        by_codes: dict[tuple[int, int], Dispatch] = {}
+
+        for i, codes in enumerate(zip(batch.event_codes, batch.level_codes)):
+            if window is not None and not window[i]:
+                continue
+            dispatch = by_codes.get(codes)
+            if dispatch is None:
+                dispatch = by_codes[codes] = self.dispatch(batch.event_types[codes[0]], batch.levels[codes[1]])
+            rules, head_len, by_head, rest = dispatch
+            if not rules:
+                continue
+            message = batch.message(i)
+            if by_head is not None:
+                rules = by_head.get(message[:head_len], rest)
+            for idx, matcher in rules:
+                if matcher is None or matcher(message):
+                    matched[idx].append(i)
+
+        return matched
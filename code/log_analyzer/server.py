@@ -0,0 +1,428 @@
+"""
+Long-running analysis server with a warm in-memory index.
+
+A cli.py run pays interpreter startup and parses the whole log directory for every query. The server parses the
+configured directories once, keeps their entries in memory and answers events.txt-style queries from there:
+    - Every log file is held as columnar segments (see columnar.EntryBatch), each sorted by time and indexed by
+      event type, so a query only visits the rows of the event types its rules mention, and a --from/--to window
+      is two binary searches per event type instead of a scan.
+    - A watcher thread refreshes the index every interval seconds: only the complete lines appended to a plain
+      file since the previous refresh are parsed, into a new segment (segments are compacted once a file has
+      MAX_SEGMENTS of them). An unterminated last line is indexed too, in a tail segment of its own that is
+      parsed again whenever the file grows (it may still be being written). A file that shrank or was replaced,
+      a gzip file that changed, or a file holding a timestamp that was in the future when it was parsed and no
+      longer is, is parsed again in full; removed files are dropped.
+    - A refresh builds a new file table and swaps it in at once, so queries never wait for it and never see a
+      half-updated file.
+
+The server speaks HTTP, on a localhost port or on a Unix socket:
+    POST /query?logs=<dir>&from=<ISO>&to=<ISO>&format=json|ndjson   (body: events-file lines)
+        Answers with the document `cli.py --output` would write (see exporter.write_results).
+    GET /status
+        Answers with the files, entries and segments held per directory and the time of the last refresh.
+Invalid rules, timestamps or parameters are answered with 400 and {"error": "<message>"}.
+
+Usage:
+    python -m log_analyzer.server <logs_dir> [<logs_dir> ...] [--host <host>] [--port <port>] [--socket <path>]
+                                  [--interval <seconds>]
+"""
+
+import argparse
+import json
+import os
+import re
+import socketserver
+import stat
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from itertools import chain, islice
+from pathlib import Path
+from typing import Iterable, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+from zoneinfo import ZoneInfo
+from log_analyzer import error_messages
+from log_analyzer.aggregation import Accumulator, new_accumulator
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.defaults import DEFAULT_LOCAL_TIME, FOLLOW_INTERVAL
+from log_analyzer.event_config import EventConfig, parse_configs
+from log_analyzer.exporter import write_results
+from log_analyzer.gzip_reader import iter_gzip_lines
+from log_analyzer.mmap_reader import split_block
+from log_analyzer.ordering import merge_batches, sorted_rows
+from log_analyzer.rule_engine import RuleEngine
+from log_analyzer.streaming import list_log_files
+from log_analyzer.timestamps import TimestampParser, naive_epoch, parse_bound
+
+DEFAULT_HOST = "127.0.0.1"          # The server only listens locally by default
+DEFAULT_PORT = 8765                 # Default TCP port
+QUERY_FORMATS = ("json", "ndjson")  # Output formats of /query
+MAX_SEGMENTS = 16                   # Segments a file may have before they are compacted into one
+
+_CONTENT_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
+
+class Segment(NamedTuple):
+    """ A time-sorted batch of a file's entries and, per event type, its rows in time order."""
+    batch: EntryBatch
+    by_event: dict[str, array]
+
+    def rows(self, event_types: Iterable[str], from_epoch: int | None, to_epoch: int | None) -> Iterable[int]:
+        """ Returns the rows of the given event types inside the (inclusive) window, in time order."""
+        key = self.batch.timestamps.__getitem__
+        selected = []
+        for event_type in event_types:
+            rows = self.by_event.get(event_type)
+            if rows is None:
+                continue
+            start = bisect_left(rows, from_epoch, key=key) if from_epoch is not None else 0
+            end = bisect_right(rows, to_epoch, key=key) if to_epoch is not None else len(rows)
+            if start < end:
+                selected.append(rows[start:end])
+        if len(selected) == 1:
+            return selected[0]
+        return sorted(chain.from_iterable(selected))   # Rows of a sorted batch: index order is time order
+
+
+class FileState(NamedTuple):
+    """ What the index holds of one log file."""
+    dev: int
+    ino: int
+    size: int
+    mtime_ns: int
+    offset: int                   # Bytes of complete lines parsed so far (plain files); always on a line boundary
+    expires: int | None           # Naive epoch of the earliest future timestamp skipped; parse again once reached
+    segments: tuple[Segment, ...]
+    tail: Segment | None          # Entries of the unterminated last line after offset, if any
+
+    @property
+    def all_segments(self) -> tuple[Segment, ...]:
+        return self.segments if self.tail is None else self.segments + (self.tail,)
+
+    @property
+    def entries(self) -> int:
+        return sum(len(segment.batch) for segment in self.all_segments)
+
+
+def _make_segment(batch: EntryBatch) -> Segment:
+    """ Sorts a batch by time (unless it already is) and indexes its rows by event type."""
+    timestamps = batch.timestamps
+    if any(a > b for a, b in zip(timestamps, islice(timestamps, 1, None))):
+        batch = batch.select(sorted_rows(batch, range(len(batch))))
+    by_code: dict[int, array] = {}
+    for i, code in enumerate(batch.event_codes):
+        rows = by_code.get(code)
+        if rows is None:
+            rows = by_code[code] = array("q")
+        rows.append(i)
+    if batch:
+        batch.message(0)   # Joins the message buffer now, so concurrent queries only ever read it
+    return Segment(batch, {batch.event_types[code]: rows for code, rows in by_code.items()})
+
+
+def _compact(segments: tuple[Segment, ...]) -> tuple[Segment, ...]:
+    """ Merges the segments of a file into one once there are more than MAX_SEGMENTS of them."""
+    if len(segments) <= MAX_SEGMENTS:
+        return segments
+    merged = EntryBatch(segments[0].batch.local_timezone)
+    merge_batches(merged, [(segment.batch, range(len(segment.batch))) for segment in segments])
+    return (_make_segment(merged),)
+
+
+def _parse_segment(lines: Iterable[str], ts_parser: TimestampParser) -> Segment | None:
+    """ Parses lines into a segment, or returns None if none of them is a valid entry."""
+    batch = EntryBatch.from_lines(lines, ts_parser)
+    return _make_segment(batch) if batch else None
+
+
+def _read_lines(path: Path, offset: int) -> tuple[list[str], int, list[str]]:
+    """
+    Reads a plain file after offset. Returns its complete lines, the offset after the last of them, and its
+    unterminated last line (a list of at most one line). Lines end at \\n, \\r\\n or \\r, as in text mode.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = max(data.rfind(b"\n"), data.rfind(b"\r")) + 1
+    return split_block(data[:end]), offset + end, split_block(data[end:])
+
+
+def _earliest(a: int | None, b: int | None) -> int | None:
+    """ Returns the smaller of two optional epochs."""
+    return b if a is None else a if b is None else min(a, b)
+
+
+class WarmIndex:
+    """
+    The parsed entries of one log directory, kept in memory and refreshed incrementally.
+
+    Attributes:
+        log_dir (str): The indexed directory.
+        local_timezone (ZoneInfo): Timezone of the log timestamps.
+        refreshed_at (float | None): Wall-clock time of the last refresh, if any.
+    """
+    def __init__(self, log_dir: str, local_timezone: ZoneInfo):
+        self.log_dir = log_dir
+        self.local_timezone = local_timezone
+        self.refreshed_at: float | None = None
+        self._files: dict[str, FileState] = {}   # By file name, in file order; replaced (never changed) by refresh
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """ Brings the index up to date with the directory (see the module docstring)."""
+        with self._lock:
+            now = datetime.now(self.local_timezone)
+            files: dict[str, FileState] = {}
+            for path in list_log_files(self.log_dir):
+                try:
+                    files[path.name] = self._update(path, self._files.get(path.name),
+                                                    TimestampParser(self.local_timezone, now=now))
+                except FileNotFoundError:
+                    continue   # Removed while the directory was being refreshed
+            self._files = files
+            self.refreshed_at = time.time()
+
+    @staticmethod
+    def _update(path: Path, old: FileState | None, ts_parser: TimestampParser) -> FileState:
+        """ Returns the new state of a file: the old one, the old one plus its appended lines, or a full parse."""
+        st = path.stat()
+        if (old is not None and (old.dev, old.ino) == (st.st_dev, st.st_ino)
+                and (old.expires is None or naive_epoch(ts_parser.now) < old.expires)):
+            if (old.size, old.mtime_ns) == (st.st_size, st.st_mtime_ns):
+                return old
+            if path.suffix != ".gz" and st.st_size >= old.size:
+                # Read from the end of the complete lines, so a grown last line is parsed again
+                lines, offset, tail = _read_lines(path, old.offset)
+                segment = _parse_segment(lines, ts_parser)
+                segments = _compact(old.segments + (segment,)) if segment is not None else old.segments
+                return FileState(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, offset,
+                                 _earliest(old.expires, ts_parser.earliest_future), segments,
+                                 _parse_segment(tail, ts_parser))
+
+        if path.suffix == ".gz":
+            segment, offset, tail = _parse_segment(iter_gzip_lines(path), ts_parser), st.st_size, None
+        else:
+            lines, offset, tail_lines = _read_lines(path, 0)
+            segment, tail = _parse_segment(lines, ts_parser), _parse_segment(tail_lines, ts_parser)
+        return FileState(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, offset, ts_parser.earliest_future,
+                         (segment,) if segment is not None else (), tail)
+
+    def query(self, configs: list[EventConfig], ts_from: datetime | None = None,
+              ts_to: datetime | None = None) -> list[tuple[EventConfig, EntryBatch | Accumulator]]:
+        """
+        Runs rules over the indexed entries, with the results LogAnalyzer would give in columnar mode.
+
+        Args:
+            configs (list[EventConfig]): The rules, in events-file order.
+            ts_from (datetime | None): Optional inclusive lower bound (its wall-clock time is used).
+            ts_to (datetime | None): Optional inclusive upper bound (its wall-clock time is used).
+
+        Returns:
+            list[tuple[EventConfig, EntryBatch | Accumulator]]: The time-ordered matches or accumulator of every rule.
+        """
+        from_epoch = naive_epoch(ts_from) if ts_from else None
+        to_epoch = naive_epoch(ts_to) if ts_to else None
+        engine = RuleEngine(configs)
+        matched = [new_accumulator(cfg, self.local_timezone) if cfg.aggregated else EntryBatch(self.local_timezone)
+                   for cfg in configs]
+        parts: list[list[tuple[EntryBatch, Iterable[int]]]] = [[] for _ in configs]
+
+        for state in list(self._files.values()):
+            for segment in state.all_segments:
+                rows = segment.rows(engine.event_types, from_epoch, to_epoch)
+                if not len(rows):
+                    continue
+                batch = segment.batch if len(rows) == len(segment.batch) else segment.batch.select(rows)
+                for idx, indices in enumerate(engine.match_batch(batch)):
+                    if isinstance(matched[idx], Accumulator):
+                        matched[idx].extend(batch, indices)
+                    elif indices:
+                        parts[idx].append((batch, indices))
+        for target, rule_parts in zip(matched, parts):
+            if rule_parts:
+                merge_batches(target, rule_parts)
+
+        return list(zip(configs, matched))
+
+    def status(self) -> dict:
+        """ Returns the number of files, entries and segments held, and the time of the last refresh."""
+        files = self._files
+        return {"files": len(files), "entries": sum(state.entries for state in files.values()),
+                "segments": sum(len(state.all_segments) for state in files.values()), "refreshed_at": self.refreshed_at}
+
+
+class AnalysisServer:
+    """
+    Serves queries over the warm indexes of one or more log directories.
+
+    Attributes:
+        indexes (dict[str, WarmIndex]): The index of every served directory, by the path it was given as.
+        local_timezone (ZoneInfo): Timezone of the log timestamps and of the --from/--to bounds.
+        interval (float): Seconds between two refreshes of the watcher thread.
+    """
+    def __init__(self, log_dirs: list[str], local_timezone: ZoneInfo = ZoneInfo(DEFAULT_LOCAL_TIME),
+                 interval: float = FOLLOW_INTERVAL):
+        self.indexes = {log_dir: WarmIndex(log_dir, local_timezone) for log_dir in log_dirs}
+        self.local_timezone = local_timezone
+        self.interval = interval
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    def refresh(self) -> None:
+        """ Refreshes the index of every served directory."""
+        for index in self.indexes.values():
+            index.refresh()
+
+    def query(self, events: str, logs: str | None = None, ts_from: str | None = None,
+              ts_to: str | None = None) -> list[tuple[EventConfig, EntryBatch | Accumulator]]:
+        """
+        Answers a query.
+
+        Args:
+            events (str): Rules, one per line, as in an events file.
+            logs (str | None): The served directory to query (defaults to the first one).
+            ts_from (str | None): Optional ISO timestamp string for the start of the time range.
+            ts_to (str | None): Optional ISO timestamp string for the end of the time range.
+
+        Returns:
+            list[tuple[EventConfig, EntryBatch | Accumulator]]: The matches or accumulator of every rule.
+
+        Raises:
+            ValueError: If a rule or a timestamp is invalid, or logs is not a served directory.
+        """
+        if logs is None:
+            logs = next(iter(self.indexes))
+        if logs not in self.indexes:
+            raise ValueError(error_messages.UNKNOWN_LOG_DIR.format(logs=logs, served=", ".join(self.indexes)))
+        configs = parse_configs(events.splitlines())
+        return self.indexes[logs].query(configs, parse_bound(ts_from, self.local_timezone),
+                                        parse_bound(ts_to, self.local_timezone))
+
+    def status(self) -> dict:
+        """ Returns the status of every served directory (see WarmIndex.status)."""
+        return {log_dir: index.status() for log_dir, index in self.indexes.items()}
+
+    def start_watching(self) -> None:
+        """ Starts the thread refreshing the indexes every interval seconds."""
+        def _watch() -> None:
+            while not self._stop.wait(self.interval):
+                try:
+                    self.refresh()
+                except OSError:
+                    continue   # E.g. a directory briefly missing; the last state is served meanwhile
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=_watch, name="log-analyzer-watcher", daemon=True)
+        self._watcher.start()
+
+    def make_server(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    socket_path: str | None = None) -> socketserver.BaseServer:
+        """ Returns an HTTP server bound to host:port, or to a Unix socket when socket_path is given."""
+        if socket_path is not None:
+            if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                os.unlink(socket_path)   # Left behind by a previous server
+            httpd = _UnixHTTPServer(socket_path, _Handler)
+        else:
+            httpd = ThreadingHTTPServer((host, port), _Handler)
+        httpd.analysis = self
+        return httpd
+
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: str | None = None) -> None:
+        """ Indexes the directories, then serves queries (and keeps the indexes fresh) until interrupted."""
+        self.refresh()
+        self.start_watching()
+        httpd = self.make_server(host, port, socket_path)
+        try:
+            httpd.serve_forever()
+        finally:
+            httpd.server_close()
+            if socket_path is not None:
+                os.unlink(socket_path)
+            self.close()
+
+    def close(self) -> None:
+        """ Stops the watcher thread."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """ An HTTP server on a Unix socket."""
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """ Handles the /query and /status requests of an AnalysisServer (self.server.analysis)."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != "/status":
+            self._send_json(404, {"error": error_messages.UNKNOWN_ENDPOINT.format(path=self.path)})
+            return
+        self._send_json(200, self.server.analysis.status())
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != "/query":
+            self._send_json(404, {"error": error_messages.UNKNOWN_ENDPOINT.format(path=self.path)})
+            return
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        fmt = params.get("format", "json")
+        try:
+            length = self.headers.get("Content-Length") or "0"
+            if not length.isdigit():
+                raise ValueError(error_messages.INVALID_CONTENT_LENGTH.format(value=length))
+            body = self.rfile.read(int(length)).decode("utf-8")   # UnicodeDecodeError is a ValueError
+            if fmt not in QUERY_FORMATS:
+                raise ValueError(error_messages.INVALID_EXPORT_FORMAT.format(fmt=fmt, allowed=", ".join(QUERY_FORMATS)))
+            results = self.server.analysis.query(body, params.get("logs"), params.get("from"), params.get("to"))
+        except (ValueError, re.error) as e:   # re.error: an invalid --pattern
+            self._send_json(400, {"error": str(e)})
+            return
+        out = StringIO()
+        write_results(results, out, self.server.analysis.local_timezone, fmt)
+        self._send(200, _CONTENT_TYPES[fmt], out.getvalue().encode("utf-8"))
+
+    def _send_json(self, status: int, document: dict) -> None:
+        self._send(status, _CONTENT_TYPES["json"], json.dumps(document, ensure_ascii=False).encode("utf-8"))
+
+    def _send(self, status: int, content_type: str, data: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        pass   # Queries are not logged to stderr
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("log_dirs", nargs="+", help="Directories of .log / .log.gz files to serve")
+    p.add_argument("--host", default=DEFAULT_HOST, help="Address to listen on")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    p.add_argument("--socket", help="Listen on this Unix socket instead of a TCP port")
+    p.add_argument("--interval", type=float, default=FOLLOW_INTERVAL, help="Seconds between two index refreshes")
+    args = p.parse_args()
+
+    server = AnalysisServer(args.log_dirs, interval=args.interval)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"Serving {', '.join(args.log_dirs)} on {where}")
+    try:
+        server.serve(args.host, args.port, args.socket)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
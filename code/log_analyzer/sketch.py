@@ -0,0 +1,206 @@
+"""
+Mergeable sketches: quantiles with a relative-error guarantee (the DDSketch scheme), and heavy hitters (the
+Space-Saving scheme).
+
+Every value is counted in a logarithmic bucket: bucket k of the positive store holds values in
+(gamma^(k-1), gamma^k], with gamma = (1 + a) / (1 - a) for a relative accuracy a. Any quantile is then
+returned within a relative error a of an actual value of the data. Two sketches with the same accuracy are
+merged by adding their bucket counts, so partial sketches from parallel workers combine exactly as if one
+sketch had seen all the values.
+
+Memory is bounded by max_buckets per sign: once a store grows past it, its lowest buckets are folded
+together, which only loses accuracy for the smallest values.
+
+HeavyHitters counts at most capacity distinct items: a new item replaces the one with the smallest count and
+inherits that count as its possible overestimate, so every reported count is an upper bound within its error of
+the true count, and any item occurring more than total / capacity times is guaranteed to be kept. Two sketches
+are merged by adding their counts (an item missing from a full sketch is bounded by that sketch's minimum).
+"""
+
+import heapq
+import math
+from log_analyzer import error_messages
+
+RELATIVE_ACCURACY = 0.01   # Quantiles are within 1% of a real value
+MAX_BUCKETS = 2048         # Buckets kept per sign; covers ~1e-9 .. 1e9 at 1% without folding
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles of a stream of numbers in constant memory.
+
+    Attributes:
+        relative_accuracy (float): Relative error bound of the returned quantiles.
+        max_buckets (int): Most buckets kept for positive (and for negative) values.
+        count (int): Number of values added.
+    """
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY, max_buckets: int = MAX_BUCKETS):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.count: int = 0
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: dict[int, int] = {}
+        self._negative: dict[int, int] = {}   # Keyed by the bucket of the absolute value
+        self._zeros: int = 0
+
+    def _key(self, value: float) -> int:
+        """ Returns the bucket of a positive value."""
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """ Returns the representative value of a bucket (the point of least relative error)."""
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _fold(self, store: dict[int, int]) -> None:
+        """ Folds the lowest buckets of a store into one so that it keeps at most max_buckets."""
+        keys = sorted(store)
+        excess = len(keys) - self.max_buckets + 1
+        floor = keys[excess]
+        store[floor] += sum(store.pop(key) for key in keys[:excess])
+
+    def add(self, value: float) -> None:
+        """ Adds one value (NaN is ignored)."""
+        if value != value:
+            return
+        if value == 0:
+            self._zeros += 1
+        else:
+            store = self._positive if value > 0 else self._negative
+            key = self._key(abs(value))
+            store[key] = store.get(key, 0) + 1
+            if len(store) > self.max_buckets:
+                self._fold(store)
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Adds every value counted by another sketch.
+
+        Raises:
+            ValueError: If the sketches were made with different accuracies.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(error_messages.INCOMPATIBLE_SKETCHES)
+        for mine, theirs in ((self._positive, other._positive), (self._negative, other._negative)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+            if len(mine) > self.max_buckets:
+                self._fold(mine)
+        self._zeros += other._zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        """ Returns the approximate q-quantile (0 <= q <= 1), or None if the sketch is empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self._negative, reverse=True):   # Largest magnitude (smallest value) first
+            seen += self._negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self._zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._value(key)
+        return None   # Not reached: the buckets hold count values and rank < count
+
+    def state(self) -> dict:
+        """ Returns the sketch as plain JSON-compatible data (see from_state)."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "positive": [[key, count] for key, count in self._positive.items()],
+            "negative": [[key, count] for key, count in self._negative.items()],
+            "zeros": self._zeros,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "QuantileSketch":
+        """ Rebuilds a sketch saved with state()."""
+        sketch = cls(state["relative_accuracy"], state["max_buckets"])
+        sketch._positive = {key: count for key, count in state["positive"]}
+        sketch._negative = {key: count for key, count in state["negative"]}
+        sketch._zeros = state["zeros"]
+        sketch.count = sketch._zeros + sum(sketch._positive.values()) + sum(sketch._negative.values())
+        return sketch
+
+
+class HeavyHitters:
+    """
+    Approximate most frequent items of a stream in constant memory (Space-Saving).
+
+    Attributes:
+        capacity (int): Most distinct items counted at a time.
+        total (int): Number of items added.
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.total: int = 0
+        self._counts: dict[str, list[int]] = {}       # Item -> [count, overestimate]
+        self._heap: list[tuple[int, str]] = []        # (count when pushed, item); stale entries are skipped
+
+    def _floor(self) -> int:
+        """ Returns the count an unseen item may have had (0 while the sketch is not full)."""
+        if len(self._counts) < self.capacity:
+            return 0
+        while True:
+            count, item = self._heap[0]
+            if self._counts[item][0] == count:
+                return count
+            heapq.heapreplace(self._heap, (self._counts[item][0], item))
+
+    def add(self, item: str, count: int = 1) -> None:
+        """ Counts count occurrences of an item."""
+        self.total += count
+        counter = self._counts.get(item)
+        if counter is not None:
+            counter[0] += count
+            return
+        if len(self._counts) < self.capacity:
+            self._counts[item] = [count, 0]
+            heapq.heappush(self._heap, (count, item))
+            return
+        floor = self._floor()                         # Evict the item with the smallest count
+        _, evicted = heapq.heappop(self._heap)
+        del self._counts[evicted]
+        self._counts[item] = [floor + count, floor]
+        heapq.heappush(self._heap, (floor + count, item))
+
+    def merge(self, other: "HeavyHitters") -> None:
+        """ Adds every item counted by another sketch, keeping the capacity items of largest count."""
+        mine, theirs = self._floor(), other._floor()
+        merged: dict[str, list[int]] = {}
+        for item in self._counts.keys() | other._counts.keys():
+            a = self._counts.get(item, [mine, mine])
+            b = other._counts.get(item, [theirs, theirs])
+            merged[item] = [a[0] + b[0], a[1] + b[1]]
+        kept = sorted(merged.items(), key=lambda pair: (-pair[1][0], pair[0]))[:self.capacity]
+        self._counts = dict(kept)
+        self._heap = [(counter[0], item) for item, counter in kept]
+        heapq.heapify(self._heap)
+        self.total += other.total
+
+    def top(self, n: int) -> list[tuple[str, int, int]]:
+        """ Returns the (item, count, overestimate) of the n items of largest count, largest first."""
+        ranked = sorted(self._counts.items(), key=lambda pair: (-pair[1][0], pair[0]))
+        return [(item, count, error) for item, (count, error) in ranked[:n]]
+
+    def state(self) -> dict:
+        """ Returns the sketch as plain JSON-compatible data (see from_state)."""
+        return {"capacity": self.capacity, "total": self.total,
+                "items": [[item, count, error] for item, (count, error) in self._counts.items()]}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "HeavyHitters":
+        """ Rebuilds a sketch saved with state()."""
+        sketch = cls(state["capacity"])
+        sketch.total = state["total"]
+        sketch._counts = {item: [count, error] for item, count, error in state["items"]}
+        sketch._heap = [(count, item) for item, count, _ in state["items"]]
+        heapq.heapify(sketch._heap)
+        return sketch
@@ -0,0 +1,238 @@
+"""
+Generator-based streaming pipeline: read a line, parse it, apply the time-range check, route it to the matching
+rules and either count it or spool it to disk. Nothing grows with the input except the spool files, so peak
+memory stays bounded no matter how large the log directory is.
+"""
+
+import json
+from contextlib import ExitStack
+from datetime import datetime
+from itertools import chain, islice
+from pathlib import Path
+from typing import Iterator
+from log_analyzer import vectorized
+from log_analyzer.aggregation import Accumulator, new_accumulator
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.log_entry import BATCH_LINES, LogEntry
+from log_analyzer.metrics import FileMetrics, RunMetrics
+from log_analyzer.mmap_reader import iter_candidate_lines
+from log_analyzer.rule_engine import RuleEngine
+from log_analyzer.time_seek import iter_range_lines, window_byte_range
+from log_analyzer.timestamps import CACHE_SIZE, TimestampParser, from_naive_epoch
+
+LOG_SUFFIXES = (".log", ".gz")  # File suffixes treated as log files
+
+
+def list_log_files(log_dir: str) -> list[Path]:
+    """ Returns the .log and .log.gz files directly inside log_dir, sorted by name (a deterministic file order)."""
+    return sorted(p for p in Path(log_dir).iterdir() if p.is_file() and p.suffix in LOG_SUFFIXES)
+
+
+def iter_file_lines(path: Path, ts_parser: TimestampParser | None = None,
+                    rules: list[tuple[str, str | None]] | None = None, use_index: bool = False,
+                    metrics: FileMetrics | None = None) -> Iterator[str]:
+    """
+    Yields the raw text lines of a plain or gzip-compressed log file, one at a time.
+
+    For plain .log files only the byte ranges that can hold matches are read: the candidate blocks of the
+    sidecar index when use_index is set (see file_index), or the --from/--to window of a time-sorted file (see
+    time_seek). When rules ((event_type, level) pairs of the configured rules) are given, those ranges are read
+    through the mmap reader, which skips lines no rule can match without decoding them (see mmap_reader).
+
+    Gzip files are decompressed in full, in large blocks and with multi-member files inflated in parallel (see
+    gzip_reader), or through the index module when use_index is set.
+
+    When metrics is given, the bytes read from disk are added to it. The index and gzip modules are only
+    imported for the files that need them.
+    """
+    if use_index:
+        from log_analyzer.file_index import FileIndex, candidate_ranges, iter_indexed_lines
+    if use_index and (path.suffix == ".gz" or FileIndex.load(path) is None):
+        if metrics is not None:
+            metrics.bytes_read += path.stat().st_size   # Built or read through in full
+        yield from iter_indexed_lines(path, rules, ts_parser)
+        return
+
+    if path.suffix == ".gz":
+        from log_analyzer.gzip_reader import iter_gzip_lines
+        if metrics is not None:
+            metrics.bytes_read += path.stat().st_size
+        yield from iter_gzip_lines(path, rules)
+        return
+
+    if use_index:
+        ranges = candidate_ranges(path, rules, ts_parser)
+    else:
+        ranges = [(window_byte_range(path, ts_parser) if ts_parser is not None else None) or (0, None)]
+    if metrics is not None:
+        size = path.stat().st_size
+        metrics.bytes_read += sum((size if end is None else end) - start for start, end in ranges)
+
+    for start, end in ranges:
+        if rules is not None:
+            yield from iter_candidate_lines(path, rules, start, end)
+        elif end is None:
+            with open(path, "rt", encoding="utf-8", errors="ignore") as f:
+                yield from f
+        else:
+            yield from iter_range_lines(path, start, end)
+
+
+def iter_file_entries(path: Path, ts_parser: TimestampParser, rules: list[tuple[str, str | None]] | None = None,
+                      use_index: bool = False, metrics: FileMetrics | None = None) -> Iterator[LogEntry]:
+    """
+    Yields the valid LogEntry objects of a single log file that fall inside the time range. Lines are parsed
+    BATCH_LINES at a time with LogEntry.parse_batch, so invalid lines cost no exception.
+
+    Args:
+        path (Path): A .log or .log.gz file.
+        ts_parser (TimestampParser): The run's timestamp parser; it also applies the --from/--to window.
+        rules (list[tuple[str, str | None]] | None): (event_type, level) pairs used to skip irrelevant lines.
+        use_index (bool): Whether to read through the sidecar index.
+        metrics (FileMetrics | None): If given, the file's lines, entries, rejections and timings are recorded.
+    """
+    lines = iter_file_lines(path, ts_parser, rules, use_index, metrics)
+    if metrics is not None:
+        lines = metrics.timed_lines(lines)
+    while batch := list(islice(lines, BATCH_LINES)):
+        parsed = LogEntry.parse_batch(batch, ts_parser)   # Invalid and out-of-range lines are skipped
+        if metrics is not None:
+            metrics.add_parsed(parsed)
+        yield from parsed.entries()
+
+
+class CountedMatches:
+    """
+    Result of a --count rule in streaming mode: keeps only the number of matches.
+
+    Behaves like an empty sequence of entries whose len() is the match count, so reporting code that only
+    calls len() works unchanged.
+    """
+    def __init__(self):
+        self.count: int = 0
+
+    def add(self, entry: LogEntry) -> None:
+        """ Records one more match."""
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(())
+
+
+class SpooledMatches:
+    """
+    Result of a non-count rule in streaming mode: every match is written to a temporary spool file as soon
+    as it is found, one compact JSON record per line.
+
+    Iterating replays the spool from disk and rebuilds one LogEntry at a time, so the matches can be
+    reported (or exported) any number of times without ever holding them all in memory.
+    """
+    def __init__(self, event_type: str):
+        """ Opens an anonymous spool file for matches of the given event type."""
+        import tempfile   # Only the streaming modes spool (it pulls in shutil, random, ...)
+        self.event_type: str = event_type
+        self.count: int = 0
+        with ExitStack() as stack:
+            self._spool = stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8"))
+            self._resources = stack.pop_all()   # Owned by this object from here on; released by close()
+
+    def add(self, entry: LogEntry) -> None:
+        """ Appends one match to the spool."""
+        self._spool.write(json.dumps([entry.timestamp.isoformat(), entry.level, entry.message]))
+        self._spool.write("\n")
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        self._spool.flush()
+        self._spool.seek(0)
+        for record in self._spool:
+            ts, level, message = json.loads(record)
+            yield LogEntry(datetime.fromisoformat(ts), level, self.event_type, message)
+        self._spool.seek(0, 2)  # Back to the end so later add() calls keep appending
+
+    def close(self) -> None:
+        """ Closes (and thereby deletes) the spool file."""
+        self._resources.close()
+
+    def __enter__(self) -> "SpooledMatches":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def stream_analysis(paths: list[Path], engine: RuleEngine, ts_parser: TimestampParser,
+                    use_index: bool = False,
+                    metrics: RunMetrics | None = None) -> list[CountedMatches | SpooledMatches | Accumulator]:
+    """
+    Streams every entry of every file through the rule engine exactly once. If reading fails, the spool files
+    created so far are deleted before the error propagates.
+
+    Args:
+        paths (list[Path]): Log files to read, in order.
+        engine (RuleEngine): Compiled rules.
+        ts_parser (TimestampParser): The run's timestamp parser, including the --from/--to window.
+        use_index (bool): Whether to read through the sidecar indexes.
+        metrics (RunMetrics | None): If given, every file's metrics are recorded (matching counts as parse time).
+
+    Returns:
+        list[CountedMatches | SpooledMatches | Accumulator]: One result per rule, in engine.configs order.
+    """
+    with ExitStack() as cleanup:
+        results = [new_accumulator(cfg, ts_parser.local_timezone) if cfg.aggregated else
+                   CountedMatches() if cfg.count else cleanup.enter_context(SpooledMatches(cfg.event_type))
+                   for cfg in engine.configs]
+        for path in paths:
+            file_metrics = metrics.new_file(path) if metrics is not None else None
+            if vectorized.enabled():
+                _stream_vectorized(iter_file_lines(path, ts_parser, engine.rules, use_index, file_metrics), engine,
+                                   ts_parser, results, file_metrics)
+                continue
+            for entry in iter_file_entries(path, ts_parser, engine.rules, use_index, file_metrics):
+                for idx in engine.match(entry):
+                    results[idx].add(entry)
+        cleanup.pop_all()   # Keep the spools open: the caller closes them (see LogAnalyzer.close)
+    return results
+
+
+def _stream_vectorized(lines: Iterator[str], engine: RuleEngine, ts_parser: TimestampParser,
+                       results: list[CountedMatches | SpooledMatches | Accumulator],
+                       metrics: FileMetrics | None = None) -> None:
+    """
+    NumPy path of stream_analysis: lines are parsed BATCH_LINES at a time into a columnar batch, whose window,
+    event_type and level checks run vectorized (see vectorized). --count rules without a pattern only add the
+    count of their mask; a LogEntry is built only for rows a spooling rule matched.
+    """
+    count_only = [vectorized.count_only(cfg) for cfg in engine.configs]
+    timestamps: dict[int, datetime] = {}   # Naive epoch -> tz-aware datetime shared by the entries of a second
+    for first in lines:
+        batch = EntryBatch.from_lines(chain((first,), islice(lines, BATCH_LINES - 1)), ts_parser, metrics,
+                                      window=False)
+        window = vectorized.window_mask(batch, ts_parser, metrics)
+        entries: dict[int, LogEntry] = {}   # Rows matched by several rules are built once
+        for idx, mask in enumerate(vectorized.rule_masks(engine.configs, batch, window)):
+            target = results[idx]
+            if count_only[idx]:
+                target.count += vectorized.count(mask)
+                continue
+            rows = vectorized.rule_rows(mask, batch, engine.matchers[idx])
+            if isinstance(target, Accumulator):
+                target.extend(batch, rows)
+            else:
+                for i in rows:
+                    entry = entries.get(i)
+                    if entry is None:
+                        epoch = batch.timestamps[i]
+                        ts = timestamps.get(epoch)
+                        if ts is None:
+                            if len(timestamps) >= CACHE_SIZE:
+                                timestamps.clear()
+                            ts = timestamps[epoch] = from_naive_epoch(epoch, ts_parser.local_timezone)
+                        entry = entries[i] = LogEntry(ts, batch.level(i), batch.event_type(i), batch.message(i))
+                    target.add(entry)
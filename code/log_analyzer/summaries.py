@@ -0,0 +1,301 @@
+"""
+Bounded summaries of high-cardinality rules: --head, --tail, --sample and --top-messages.
+
+A noisy rule can match millions of entries, and printing or exporting all of them costs more than finding them.
+These rules keep a fixed number of them instead, whatever the number of matches, so huge result sets are
+summarized without ever being materialized (also in the streaming modes):
+    - --head N / --tail N: the first / last N matches in time order. The tail is a ring buffer: a match later
+      than everything kept is appended and pushes out the oldest one. Out-of-order matches are inserted at their
+      place; equal timestamps keep their arrival order.
+    - --sample N: a uniform random sample of N matches (reservoir sampling, Algorithm L: after the reservoir is
+      full, the number of matches to skip before the next replacement is drawn at once, so skipped matches cost
+      one comparison). The random generator is seeded, so a run is reproducible.
+    - --top-messages N: the N most frequent messages once their variable parts (numbers, addresses, times, hex
+      values, UUIDs) are replaced by a placeholder, counted in a HeavyHitters sketch of TOP_CAPACITY_FACTOR * N messages.
+
+Like the accumulators of aggregation, every summary counts all the matches (its len()), adds columnar batches
+in one pass, and merges another summary of the same rule, so partial results of workers, files or cached runs
+combine. Merged heads / tails are exact; merged samples are uniform samples of the union.
+"""
+
+import heapq
+import math
+import random
+import re
+from bisect import bisect_right
+from collections import deque
+from operator import attrgetter
+from typing import Iterable, Iterator
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.sketch import HeavyHitters
+from log_analyzer.timestamps import CACHE_SIZE
+
+SAMPLE_SEED = 0             # Seed of the --sample generator (a run is reproducible)
+TOP_CAPACITY_FACTOR = 10    # Messages counted per reported --top-messages message
+PLACEHOLDER = "<*>"         # Replaces the variable parts of a message
+
+_VARIABLE = re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+                       r"|\b0[xX][0-9a-fA-F]+\b|\d+(?:[.:]\d+)*")   # UUIDs, hex, numbers (1.5, 10.0.0.1, 12:30)
+_timestamp = attrgetter("timestamp")
+
+
+def normalize_message(message: str) -> str:
+    """ Replaces the numbers, hex values and UUIDs of a message by PLACEHOLDER."""
+    return _VARIABLE.sub(PLACEHOLDER, message)
+
+
+class EntryWindow:
+    """
+    Result of a --head / --tail rule: the first or last matches in time order.
+
+    Attributes:
+        kind (str): "head" or "tail".
+        size (int): Most entries kept.
+        count (int): Total number of matches.
+    """
+    def __init__(self, kind: str, size: int):
+        self.kind = kind
+        self.size = size
+        self.count: int = 0
+        self._entries: deque[LogEntry] = deque(maxlen=size)   # In time order
+
+    def add(self, entry: LogEntry) -> None:
+        """ Counts one matched entry, keeping it if it is among the first / last ones."""
+        self.count += 1
+        entries = self._entries
+        full = len(entries) == self.size
+        if self.kind == "tail":
+            if not entries or entry.timestamp >= entries[-1].timestamp:
+                entries.append(entry)   # The usual in-order case: the ring buffer drops the oldest
+                return
+            pos = bisect_right(entries, entry.timestamp, key=_timestamp)
+            if full:
+                if pos == 0:
+                    return   # Older than every kept entry
+                entries.popleft()
+                pos -= 1
+            entries.insert(pos, entry)
+            return
+        if full and entry.timestamp >= entries[-1].timestamp:
+            return   # The usual in-order case once the head is complete
+        if full:
+            entries.pop()
+        entries.insert(bisect_right(entries, entry.timestamp, key=_timestamp), entry)
+
+    def extend(self, batch: EntryBatch, indices: Iterable[int] | None = None) -> None:
+        """ Counts the rows of a columnar batch; only the rows that can be kept are turned into entries."""
+        rows = range(len(batch)) if indices is None else list(indices)
+        timestamps = batch.timestamps
+        if self.kind == "tail":
+            chosen = heapq.nlargest(self.size, rows, key=lambda i: (timestamps[i], i))[::-1]
+        else:
+            chosen = heapq.nsmallest(self.size, rows, key=timestamps.__getitem__)
+        for i in chosen:
+            self.add(batch.entry(i))
+        self.count += len(rows) - len(chosen)
+
+    def merge(self, other: "EntryWindow") -> None:
+        """ Adds the matches of another window of the same rule (other's entries go after equal ones)."""
+        merged = list(heapq.merge(self._entries, other._entries, key=_timestamp))
+        self._entries = deque(merged[-self.size:] if self.kind == "tail" else merged[:self.size], maxlen=self.size)
+        self.count += other.count
+
+    def state(self) -> dict:
+        """ Returns what the kept entries do not tell (see from_state)."""
+        return {"count": self.count}
+
+    @classmethod
+    def from_state(cls, kind: str, size: int, state: dict, entries: Iterable[LogEntry]) -> "EntryWindow":
+        """ Rebuilds a window from its state() and its kept entries."""
+        window = cls(kind, size)
+        window._entries.extend(entries)
+        window.count = state["count"]
+        return window
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(self._entries)
+
+
+class EntrySample:
+    """
+    Result of a --sample rule: a uniform random sample of the matches (reservoir sampling).
+
+    Attributes:
+        size (int): Most entries kept.
+        count (int): Total number of matches.
+    """
+    def __init__(self, size: int, seed: int = SAMPLE_SEED):
+        self.size = size
+        self.count: int = 0
+        self._reservoir: list[LogEntry] = []
+        self._rng = random.Random(seed)
+        self._weight = 1.0            # Algorithm L: the largest of the reservoir's random keys, kept implicitly
+        self._next = 0                # Number of the next match (1-based) that replaces a reservoir slot
+
+    def _uniform(self) -> float:
+        """ Returns a random number in (0, 1]."""
+        return 1.0 - self._rng.random()
+
+    def _skip(self) -> None:
+        """ Draws the next match that enters the reservoir."""
+        self._weight *= math.exp(math.log(self._uniform()) / self.size)
+        gap = math.floor(math.log(self._uniform()) / math.log1p(-self._weight)) if self._weight < 1.0 else 0
+        self._next = self.count + gap + 1
+
+    def _accept(self, entry: LogEntry) -> None:
+        """ Replaces a random reservoir slot by the entry and draws the next match to keep."""
+        self._reservoir[self._rng.randrange(self.size)] = entry
+        self._skip()
+
+    def add(self, entry: LogEntry) -> None:
+        """ Counts one matched entry, keeping it with probability size / count."""
+        self.count += 1
+        if len(self._reservoir) < self.size:
+            self._reservoir.append(entry)
+            if len(self._reservoir) == self.size:
+                self._skip()
+        elif self.count == self._next:
+            self._accept(entry)
+
+    def extend(self, batch: EntryBatch, indices: Iterable[int] | None = None) -> None:
+        """ Counts the rows of a columnar batch; only the rows drawn into the reservoir are turned into entries."""
+        rows = range(len(batch)) if indices is None else list(indices)
+        start = 0
+        while start < len(rows) and len(self._reservoir) < self.size:
+            self.add(batch.entry(rows[start]))
+            start += 1
+        base, end = self.count, self.count + len(rows) - start
+        while len(self._reservoir) == self.size and self._next <= end:
+            self.count = self._next
+            self._accept(batch.entry(rows[start + self.count - base - 1]))
+        self.count = end
+
+    def merge(self, other: "EntrySample") -> None:
+        """
+        Combines the finished sample of another part of the matches into a uniform sample of both: how many
+        entries come from each part is drawn like drawing without replacement from all the matches.
+        """
+        mine, theirs = self._reservoir[:], other._reservoir[:]
+        self._rng.shuffle(mine)
+        self._rng.shuffle(theirs)
+        left, right = self.count, other.count
+        merged: list[LogEntry] = []
+        for _ in range(min(self.size, left + right)):
+            if self._rng.random() * (left + right) < left:
+                merged.append(mine.pop())
+                left -= 1
+            else:
+                merged.append(theirs.pop())
+                right -= 1
+        self._reservoir = merged
+        self.count += other.count
+        self._weight = 1.0
+        if len(merged) == self.size:
+            self._skip()
+
+    def state(self) -> dict:
+        """ Returns what the kept entries do not tell (see from_state)."""
+        return {"count": self.count}
+
+    @classmethod
+    def from_state(cls, size: int, state: dict, entries: Iterable[LogEntry]) -> "EntrySample":
+        """ Rebuilds a sample from its state() and its kept entries."""
+        sample = cls(size)
+        sample._reservoir = list(entries)
+        sample.count = state["count"]
+        return sample
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(sorted(self._reservoir, key=_timestamp))   # Reported in time order
+
+
+class TopMessages:
+    """
+    Result of a --top-messages rule: the most frequent normalized messages (see normalize_message).
+
+    Like CountedMatches, it behaves like an empty sequence of entries whose len() is the number of matches.
+
+    Attributes:
+        size (int): Number of messages reported.
+        sketch (HeavyHitters): Counts of the normalized messages.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self.sketch = HeavyHitters(size * TOP_CAPACITY_FACTOR)
+        self._normalized: dict[str, str] = {}   # Repeated messages are normalized once
+
+    def add_message(self, message: str) -> None:
+        """ Counts one matched message."""
+        normalized = self._normalized.get(message)
+        if normalized is None:
+            if len(self._normalized) >= CACHE_SIZE:
+                self._normalized.clear()
+            normalized = self._normalized[message] = normalize_message(message)
+        self.sketch.add(normalized)
+
+    def add(self, entry: LogEntry) -> None:
+        """ Counts one matched entry."""
+        self.add_message(entry.message)
+
+    def extend(self, batch: EntryBatch, indices: Iterable[int] | None = None) -> None:
+        """ Counts the rows of a columnar batch (all of them, or only those at the given indices)."""
+        for i in range(len(batch)) if indices is None else indices:
+            self.add_message(batch.message(i))
+
+    def merge(self, other: "TopMessages") -> None:
+        """ Adds the counts of another summary of the same rule."""
+        self.sketch.merge(other.sketch)
+
+    def rows(self) -> list[tuple[str, int, int]]:
+        """ Returns the (message, count, overestimate) of the most frequent messages, most frequent first."""
+        return self.sketch.top(self.size)
+
+    def state(self) -> dict:
+        """ Returns the summary as plain JSON-compatible data (see from_state)."""
+        return self.sketch.state()
+
+    @classmethod
+    def from_state(cls, size: int, state: dict) -> "TopMessages":
+        """ Rebuilds a summary saved with state()."""
+        top = cls(size)
+        top.sketch = HeavyHitters.from_state(state)
+        return top
+
+    def __len__(self) -> int:
+        return self.sketch.total
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(())
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        state["_normalized"] = {}   # A cache only; not worth sending between processes
+        return state
+
+
+Summary = EntryWindow | EntrySample | TopMessages   # Result of a --head / --tail / --sample / --top-messages rule
+
+
+def new_summary(kind: str, size: int) -> Summary:
+    """ Returns the empty summary of a rule (see EventConfig.summary)."""
+    if kind == "sample":
+        return EntrySample(size)
+    if kind == "top-messages":
+        return TopMessages(size)
+    return EntryWindow(kind, size)
+
+
+def load_summary(kind: str, size: int, state: dict, entries: Iterable[LogEntry]) -> Summary:
+    """ Rebuilds a summary from its state() and its kept entries (e.g. from a columnar export)."""
+    if kind == "sample":
+        return EntrySample.from_state(size, state, entries)
+    if kind == "top-messages":
+        return TopMessages.from_state(size, state)
+    return EntryWindow.from_state(kind, size, state, entries)
@@ -0,0 +1,109 @@
+"""
+Timestamp-range seek for time-ordered plain .log files.
+
+Append-only logs are sorted by timestamp, so the lines inside a --from/--to window form one contiguous byte
+range. This module finds that range with a binary search over byte offsets (seek, then resync to the next line
+start), so only the lines of a narrow window are parsed and filtered. Files that are compressed, not sorted, or
+queried without a window are left to the regular full scan.
+
+A binary search is only correct on a file whose timestamps never decrease: a single line logged a few seconds
+late can sit past the point where the search stops. Sortedness is therefore proven with a full pass over the
+line timestamps before any seek, never guessed from samples. The pass builds the file's sidecar index (see
+file_index), which records the proof, so later runs over an unchanged file (same size and mtime) seek at once.
+"""
+
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple
+from log_analyzer.timestamps import TimestampParser
+
+
+class _Probe(NamedTuple):
+    """ The first line with a valid timestamp found at or after some offset."""
+    start: int
+    end: int
+    epoch: int
+
+
+def _probe(f: BinaryIO, pos: int, ts_parser: TimestampParser) -> _Probe | None:
+    """
+    Returns the first line that starts at or after byte offset pos and has a valid timestamp, or None if there
+    is no such line before the end of the file.
+    """
+    if pos > 0:
+        f.seek(pos - 1)
+        f.readline()  # Resync: skip the rest of the line containing byte pos - 1
+    else:
+        f.seek(0)
+
+    start = f.tell()
+    for line in iter(f.readline, b""):
+        end = start + len(line)
+        ts_str = line.split(b" ", 1)[0].decode("utf-8", errors="ignore").strip()
+        try:
+            return _Probe(start, end, ts_parser.parse_epoch(ts_str))
+        except ValueError:
+            start = end   # Not a valid log line; keep looking
+    return None
+
+
+def find_offset(f: BinaryIO, size: int, target: int, ts_parser: TimestampParser) -> int:
+    """
+    Binary-searches a time-sorted file for the first line whose timestamp is >= target.
+
+    Every valid line that starts before the returned offset has a timestamp < target. The returned offset is
+    always the start of a line (or the file size).
+
+    Args:
+        f (BinaryIO): The file, opened in binary mode.
+        size (int): File size in bytes.
+        target (int): Naive-epoch microseconds to search for.
+        ts_parser (TimestampParser): Parser used to read line timestamps.
+    """
+    lo, hi = 0, size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        found = _probe(f, mid, ts_parser)
+        if found is None or found.epoch >= target:
+            hi = mid
+        else:
+            lo = found.end
+    return min(lo, size)
+
+
+def window_byte_range(path: Path, ts_parser: TimestampParser) -> tuple[int, int] | None:
+    """
+    Returns the [start, end) byte range of a plain .log file that holds every line inside the parser's
+    --from/--to window, or None when a full scan is needed (gzip input, no window, or an unsorted file).
+
+    Sortedness is read from the file's sidecar index, which is built (and the file scanned in full) when it is
+    missing or stale, or when its proof does not hold for this run (see file_index.TimeOrder).
+    """
+    if path.suffix != ".log" or not ts_parser.has_window:
+        return None
+
+    from log_analyzer.file_index import FileIndex, build_index
+    index = FileIndex.load(path)
+    time_sorted = index.time_order.holds_for(ts_parser) if index is not None else None
+    if time_sorted is None:
+        index = build_index(path, ts_parser=ts_parser)
+        time_sorted = index.time_order.time_sorted
+    if not time_sorted:
+        return None
+    size = index.size
+    with open(path, "rb") as f:
+        start = find_offset(f, size, ts_parser.from_epoch, ts_parser) if ts_parser.from_epoch is not None else 0
+        end = find_offset(f, size, ts_parser.to_epoch + 1, ts_parser) if ts_parser.to_epoch is not None else size
+    return start, max(start, end)
+
+
+def iter_range_lines(path: Path, start: int, end: int) -> Iterator[str]:
+    """ Yields the decoded text lines of the byte range [start, end) of a file, which must start on a line."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line.decode("utf-8", errors="ignore")
@@ -0,0 +1,222 @@
+"""
+Fast-path timestamp parsing and validation.
+
+All comparisons are done on naive wall-clock times expressed as integer microseconds since 1970-01-01
+("naive epoch"). Every timestamp in a run is interpreted in the same local timezone, and Python compares two
+datetimes that share a tzinfo by their wall-clock values anyway, so this gives exactly the same answers as
+comparing tz-aware datetimes while being much cheaper.
+"""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from log_analyzer import error_messages
+
+MAX_PAST_YEARS = 100     # Logs older than this will be rejected
+CACHE_SIZE = 4096        # Distinct timestamp strings (or seconds) remembered before the cache is reset
+
+# Reasons a line is rejected (see TimestampParser.rejection_reason and metrics)
+REJECT_FORMAT = "format"               # Not <TIMESTAMP> <LEVEL> <EVENT_TYPE> <MESSAGE>, or a malformed timestamp
+REJECT_FUTURE = "future"               # Timestamp after "now"
+REJECT_TOO_OLD = "too_old"             # Timestamp older than MAX_PAST_YEARS
+REJECT_OUT_OF_RANGE = "out_of_range"   # Valid, but outside the --from/--to window
+REJECT_REASONS = (REJECT_FORMAT, REJECT_FUTURE, REJECT_TOO_OLD, REJECT_OUT_OF_RANGE)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_FRACTION_LENGTHS = (23, 26)   # YYYY-MM-DDTHH:MM:SS.fff and YYYY-MM-DDTHH:MM:SS.ffffff
+
+
+def naive_epoch(ts: datetime) -> int:
+    """ Returns the wall-clock time of ts (its tzinfo is ignored) as integer microseconds since 1970-01-01."""
+    return (ts.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+
+
+def from_naive_epoch(epoch: int, local_timezone: ZoneInfo) -> datetime:
+    """ Inverse of naive_epoch: builds a tz-aware datetime in local_timezone from naive-epoch microseconds."""
+    return (_EPOCH + timedelta(microseconds=epoch)).replace(tzinfo=local_timezone)
+
+
+def parse_bound(ts: str | None, local_timezone: ZoneInfo) -> datetime | None:
+    """
+    Parses a --from / --to ISO timestamp string into a datetime in local_timezone (None if ts is empty).
+
+    Raises:
+        ValueError: If ts is not an ISO timestamp.
+    """
+    if not ts:
+        return None
+    try:
+        return datetime.fromisoformat(ts).replace(tzinfo=local_timezone)
+    except ValueError as e:
+        raise ValueError(error_messages.INVALID_TIMESTAMP_FORMAT.format(ts=ts, error=e))
+
+
+class TimestampParser:
+    """
+    Parses and validates log timestamps for one analysis run.
+
+    - The "now" and "too old" bounds are computed once, when the parser is created, instead of once per line.
+    - Results are cached per second, so the many lines logged within the same second are parsed once: a
+      timestamp with a .fff or .ffffff fraction reuses the record of its whole-second prefix and only adds the
+      fraction. Other timestamp strings are cached whole.
+    - The optional --from/--to window is checked on naive epoch integers; a tz-aware datetime is only built for
+      timestamps that are accepted.
+
+    Attributes:
+        local_timezone (ZoneInfo): Timezone assigned to every parsed timestamp.
+        now (datetime): The tz-aware "now" used for the future-timestamp check.
+        from_epoch (int | None): Naive epoch of the inclusive --from bound, if any.
+        to_epoch (int | None): Naive epoch of the inclusive --to bound, if any.
+        earliest_future (int | None): Naive epoch of the earliest future timestamp rejected so far, if any.
+    """
+    def __init__(self, local_timezone: ZoneInfo, ts_from: datetime | None = None, ts_to: datetime | None = None,
+                 now: datetime | None = None):
+        """
+        Initializes the parser and precomputes all bounds.
+
+        Args:
+            local_timezone (ZoneInfo): Timezone to apply to parsed timestamps.
+            ts_from (datetime | None): Optional inclusive lower bound (its wall-clock time is used).
+            ts_to (datetime | None): Optional inclusive upper bound (its wall-clock time is used).
+            now (datetime | None): Reference time for the future / too-old checks (defaults to the current time).
+        """
+        self.local_timezone = local_timezone
+        self.now = (now or datetime.now(local_timezone)).replace(tzinfo=local_timezone)
+        self._now_epoch = naive_epoch(self.now)
+        self._oldest_epoch = naive_epoch(self.now - timedelta(days=MAX_PAST_YEARS * 365))
+        self.from_epoch = naive_epoch(ts_from) if ts_from else None
+        self.to_epoch = naive_epoch(ts_to) if ts_to else None
+        self.earliest_future: int | None = None
+
+        # ts_str -> [naive epoch, tz-aware datetime or None until first accepted] or (reject reason, error message)
+        self._cache: dict[str, list | tuple[str, str]] = {}
+
+    @property
+    def has_window(self) -> bool:
+        """ Whether a --from or --to bound is set."""
+        return self.from_epoch is not None or self.to_epoch is not None
+
+    def parse_epoch(self, ts_str: str) -> int:
+        """
+        Validates a timestamp string and returns its naive epoch, without building a tz-aware datetime.
+
+        Raises:
+            ValueError: If the timestamp is malformed, in the future, or older than MAX_PAST_YEARS.
+        """
+        return self._lookup(ts_str)[0]
+
+    def is_current(self, epoch: int) -> bool:
+        """ Check whether a naive epoch is neither in the future nor older than MAX_PAST_YEARS."""
+        return self._oldest_epoch <= epoch <= self._now_epoch
+
+    def in_window(self, epoch: int) -> bool:
+        """ Check whether a naive epoch is between the --from and --to bounds (inclusive)."""
+        if self.from_epoch is not None and epoch < self.from_epoch:
+            return False
+        if self.to_epoch is not None and epoch > self.to_epoch:
+            return False
+        return True
+
+    def parse(self, ts_str: str) -> datetime | None:
+        """
+        Validates a timestamp string and returns it as a tz-aware datetime.
+
+        Returns:
+            datetime | None: The parsed timestamp, or None if it is valid but outside the --from/--to window.
+
+        Raises:
+            ValueError: If the timestamp is malformed, in the future, or older than MAX_PAST_YEARS.
+        """
+        cached = self._lookup(ts_str)
+        if not self.in_window(cached[0]):
+            return None
+        if cached[1] is None:
+            cached[1] = datetime.fromisoformat(ts_str).replace(tzinfo=self.local_timezone)
+        return cached[1]
+
+    def parse_or_reason(self, ts_str: str) -> datetime | str:
+        """
+        Like parse, without raising (for batch parsing, see LogEntry.parse_batch).
+
+        Returns:
+            datetime | str: The parsed timestamp, or the reason it is rejected: REJECT_FORMAT, REJECT_FUTURE,
+            REJECT_TOO_OLD or REJECT_OUT_OF_RANGE (valid, but outside the --from/--to window).
+        """
+        cached = self._record(ts_str)
+        if cached.__class__ is tuple:
+            return cached[0]
+        if not self.in_window(cached[0]):
+            return REJECT_OUT_OF_RANGE
+        if cached[1] is None:
+            cached[1] = datetime.fromisoformat(ts_str).replace(tzinfo=self.local_timezone)
+        return cached[1]
+
+    def rejection_reason(self, ts_str: str) -> str | None:
+        """
+        Returns why a timestamp is rejected: REJECT_FORMAT, REJECT_FUTURE or REJECT_TOO_OLD, REJECT_OUT_OF_RANGE
+        if it is valid but outside the --from/--to window, or None if it is accepted.
+        """
+        cached = self._record(ts_str)
+        if cached.__class__ is tuple:
+            return cached[0]
+        return None if self.in_window(cached[0]) else REJECT_OUT_OF_RANGE
+
+    def _record(self, ts_str: str) -> list | tuple[str, str]:
+        """ Returns the cache record of ts_str (see _validate), validating it on a miss."""
+        if (len(ts_str) in _FRACTION_LENGTHS and ts_str[19] == "." and ts_str[13] == ts_str[16] == ":"
+                and ts_str[20:].isdigit() and ts_str.isascii()):
+            return self._record_fraction(ts_str)
+        cached = self._cache.get(ts_str)
+        if cached is None:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            cached = self._cache[ts_str] = self._validate(ts_str)
+        return cached
+
+    def _record_fraction(self, ts_str: str) -> list | tuple[str, str]:
+        """
+        Returns the record of a timestamp with a fraction of a second: the naive epoch of its cached whole-second
+        prefix plus the fraction. Timestamps whose second is rejected, or that pass "now" by their fraction, are
+        validated in full (and not cached), so they are rejected with the same reason and message as before.
+        """
+        prefix = ts_str[:19]
+        second = self._cache.get(prefix)
+        if second is None:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            second = self._cache[prefix] = self._validate(prefix, track_future=False)
+        if second.__class__ is not tuple:
+            epoch = second[0] + int(ts_str[20:].ljust(6, "0"))
+            if epoch <= self._now_epoch:
+                return [epoch, None]
+        return self._validate(ts_str)
+
+    def _lookup(self, ts_str: str) -> list:
+        """ Returns the cached [naive epoch, aware datetime | None] record for ts_str, validating it on a miss."""
+        cached = self._record(ts_str)
+        if cached.__class__ is tuple:
+            raise ValueError(cached[1])
+        return cached
+
+    def _validate(self, ts_str: str, track_future: bool = True) -> list | tuple[str, str]:
+        """
+        Parses ts_str once; returns a cache record, or the (reason, error message) pair if the timestamp is
+        rejected. A future timestamp updates earliest_future unless track_future is False (whole-second prefixes,
+        whose lines are validated again in full).
+        """
+        try:
+            ts = datetime.fromisoformat(ts_str)
+        except ValueError as e:
+            return REJECT_FORMAT, error_messages.INVALID_TIMESTAMP_FORMAT.format(ts=ts_str, error=e)
+
+        epoch = naive_epoch(ts)
+        if epoch > self._now_epoch:
+            if track_future and (self.earliest_future is None or epoch < self.earliest_future):
+                self.earliest_future = epoch
+            return REJECT_FUTURE, error_messages.FUTURE_TIMESTAMP.format(ts=ts.replace(tzinfo=self.local_timezone),
+                                                                         now=self.now)
+
+        if epoch < self._oldest_epoch:
+            return REJECT_TOO_OLD, error_messages.TOO_OLD_TIMESTAMP.format(ts=ts.replace(tzinfo=self.local_timezone),
+                                                                           years=MAX_PAST_YEARS)
+        return [epoch, None]
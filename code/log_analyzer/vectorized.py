@@ -0,0 +1,101 @@
+"""
+Optional NumPy path over columnar batches: the time-range, event_type and level predicates of every rule run as
+vectorized comparisons over an EntryBatch's int64 timestamp column and its uint16 level / event_type code
+columns, instead of one Python object at a time.
+
+    - window_mask: the rows inside the --from/--to window.
+    - rule_masks: for every rule, the rows its event_type, level and the window accept.
+    - rule_rows: those rows narrowed down by the rule's --pattern, which only runs on the messages of masked rows.
+    - count_only rules (--count, no --pattern, not aggregated) are answered with np.count_nonzero of their mask,
+      without looking at a single row.
+
+Everything here needs NumPy; callers check enabled() and keep their per-row path when it is not installed.
+NumPy is only imported by the first enabled() call, so runs that never take a columnar path do not load it.
+"""
+
+from typing import Callable
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.event_config import EventConfig
+from log_analyzer.metrics import FileMetrics
+from log_analyzer.timestamps import REJECT_OUT_OF_RANGE, TimestampParser
+
+_NOT_LOADED = object()
+np = _NOT_LOADED   # The numpy module once enabled() imported it; None if it is not installed
+
+
+def enabled() -> bool:
+    """ Whether NumPy is installed, so the vectorized path can be used (imports it on the first call)."""
+    global np
+    if np is _NOT_LOADED:
+        try:
+            import numpy
+        except ImportError:   # Optional: the analyzer falls back to the per-row path
+            numpy = None
+        np = numpy
+    return np is not None
+
+
+def count_only(ev_config: EventConfig) -> bool:
+    """ Whether a rule's result is fully answered by the count of its mask (--count without --pattern)."""
+    return ev_config.count and ev_config.pattern is None and not ev_config.aggregated
+
+
+def window_mask(batch: EntryBatch, ts_parser: TimestampParser,
+                metrics: FileMetrics | None = None) -> "np.ndarray | None":
+    """
+    Returns the mask of the batch rows inside the parser's --from/--to window (inclusive), or None without a
+    window. When metrics is given, the rows outside it are moved from its entries to its out-of-range rejections.
+    """
+    if not ts_parser.has_window:
+        return None
+    timestamps = np.frombuffer(batch.timestamps, dtype=np.int64)
+    mask = np.ones(len(batch), dtype=bool)
+    if ts_parser.from_epoch is not None:
+        mask &= timestamps >= ts_parser.from_epoch
+    if ts_parser.to_epoch is not None:
+        mask &= timestamps <= ts_parser.to_epoch
+    if metrics is not None:
+        outside = len(batch) - int(np.count_nonzero(mask))
+        metrics.entries -= outside
+        metrics.rejected[REJECT_OUT_OF_RANGE] += outside
+    return mask
+
+
+def rule_masks(configs: list[EventConfig], batch: EntryBatch, window: "np.ndarray | None" = None) -> list:
+    """
+    Returns, for every rule, the mask of the rows its event_type and level accept (and the window, if given).
+    The --pattern of the rules is not applied.
+    """
+    event_codes = np.frombuffer(batch.event_codes, dtype=np.uint16)
+    level_codes = np.frombuffer(batch.level_codes, dtype=np.uint16)
+    nothing = np.zeros(len(batch), dtype=bool)
+    by_event: dict[str, np.ndarray] = {}   # Rules of the same event type share one comparison
+
+    masks = []
+    for cfg in configs:
+        event_code = batch.event_code(cfg.event_type)
+        level_code = batch.level_code(cfg.level) if cfg.level is not None else None
+        if event_code is None or (cfg.level is not None and level_code is None):
+            masks.append(nothing)
+            continue
+        mask = by_event.get(cfg.event_type)
+        if mask is None:
+            mask = by_event[cfg.event_type] = event_codes == event_code
+            if window is not None:
+                mask &= window
+        masks.append(mask & (level_codes == level_code) if level_code is not None else mask)
+    return masks
+
+
+def rule_rows(mask: "np.ndarray", batch: EntryBatch, matcher: Callable[[str], object] | None = None) -> list[int]:
+    """ Returns the indices of the masked rows, keeping only those whose message the matcher accepts."""
+    rows = np.flatnonzero(mask).tolist()
+    if matcher is None:
+        return rows
+    message = batch.message
+    return [i for i in rows if matcher(message(i))]
+
+
+def count(mask: "np.ndarray") -> int:
+    """ Returns the number of masked rows."""
+    return int(np.count_nonzero(mask))
@@ -0,0 +1,193 @@
+"""
+Tests for log_analyzer.aggregation and the --bucket / --group-by rules.
+
+Test Overview:
+    - test_every_mode_gives_the_same_buckets: Default, streaming, columnar and process analyses count the same
+      cells, without keeping entries.
+    - test_batch_binning_matches_entry_binning: Binning a columnar batch (with and without NumPy) gives the
+      counts of adding its entries one by one.
+    - test_buckets_are_printed_and_exported: run() prints one line per cell; json, ndjson and columnar exports
+      carry the cells.
+    - test_every_mode_gives_the_same_stats: Every analysis mode extracts the same --stat values, skipping
+      matches whose group captured nothing.
+    - test_stats_are_printed_exported_and_merged: run() prints the statistics; json, ndjson and columnar
+      exports carry them, and reloaded runs merge.
+"""
+
+import json
+import sys
+from io import StringIO
+import pytest
+from log_analyzer.aggregation import BucketCounts, BucketRow, FieldStats
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.columnar_file import load_columnar, merge_results
+from log_analyzer.log_entry import DEFAULT_TIMEZONE
+from log_analyzer.timestamps import TimestampParser
+
+LOG_LINES = [
+    "2025-07-18T10:00:05 INFO EVENT one",
+    "2025-07-18T10:00:59.900000 ERROR EVENT two",
+    "2025-07-18T10:01:00 ERROR EVENT three",
+    "2025-07-18T10:03:30 INFO EVENT four",
+    "2025-07-18T10:03:31 INFO OTHER five",
+    "invalid line",
+]
+
+CONFIG = "EVENT --bucket 1m\nEVENT --group-by level --count\nEVENT --bucket 1h --group-by level\nOTHER --level INFO"
+
+
+def _make_logs(tmp_path):
+    """ Helper writing the log directory and events file."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(LOG_LINES[:3]))
+    (log_dir / "b.log").write_text("\n".join(LOG_LINES[3:]))
+    config_file = tmp_path / "events.txt"
+    config_file.write_text(CONFIG)
+    return str(log_dir), str(config_file)
+
+
+def _ts(text: str):
+    """ Helper building a tz-aware bucket start."""
+    return TimestampParser(DEFAULT_TIMEZONE).parse(text)
+
+
+EXPECTED = [
+    [BucketRow(_ts("2025-07-18T10:00:00"), None, 2), BucketRow(_ts("2025-07-18T10:01:00"), None, 1),
+     BucketRow(_ts("2025-07-18T10:03:00"), None, 1)],
+    [BucketRow(None, "ERROR", 2), BucketRow(None, "INFO", 2)],
+    [BucketRow(_ts("2025-07-18T10:00:00"), "ERROR", 2), BucketRow(_ts("2025-07-18T10:00:00"), "INFO", 2)],
+]
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"streaming": True}, {"columnar": True}, {"backend": "process", "jobs": 2}])
+def test_every_mode_gives_the_same_buckets(tmp_path, kwargs):
+    """ Every analysis mode counts the same cells, without keeping entries."""
+    log_dir, config_file = _make_logs(tmp_path)
+    results = LogAnalyzer(log_dir, config_file, **kwargs)._cached_analysis
+
+    for (_, matched), expected in zip(results, EXPECTED):
+        assert isinstance(matched, BucketCounts)
+        assert matched.rows() == expected and len(matched) == 4 and list(matched) == []
+    assert len(results[3][1]) == 1
+
+
+def test_batch_binning_matches_entry_binning(monkeypatch):
+    """ Binning a columnar batch gives the counts of adding its entries one by one."""
+    ts_parser = TimestampParser(DEFAULT_TIMEZONE)
+    batch = EntryBatch.from_lines(LOG_LINES, ts_parser)
+    expected = BucketCounts(60, "level", DEFAULT_TIMEZONE)
+    for i in (0, 1, 3, 4):
+        expected.add(batch.entry(i))
+
+    binned = BucketCounts(60, "level", DEFAULT_TIMEZONE)
+    binned.extend(batch, [0, 1, 3, 4])
+    assert binned.counts == expected.counts and binned.count == 4
+
+    monkeypatch.setattr("log_analyzer.vectorized.np", None)
+    fallback = BucketCounts(60, "level", DEFAULT_TIMEZONE)
+    fallback.extend(batch, [0, 1, 3, 4])
+    fallback.extend(batch, [])
+    assert fallback.counts == expected.counts and fallback.count == 4
+
+
+def test_buckets_are_printed_and_exported(tmp_path):
+    """ run() prints one line per cell; json, ndjson and columnar exports carry the cells."""
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(log_dir, config_file)
+
+    saved_stdout = sys.stdout
+    try:
+        sys.stdout = StringIO()
+        analyzer.run()
+        output = sys.stdout.getvalue()
+    finally:
+        sys.stdout = saved_stdout
+    assert "flags: bucket=1h, group-by=level:\nCount of matches: 4\n" in output
+    assert "  2025-07-18T10:00:00+03:00  level=ERROR: 2\n" in output
+    assert "  level=INFO: 2\n" in output
+
+    analyzer.export(str(tmp_path / "out.json"), "json")
+    groups = json.loads((tmp_path / "out.json").read_text())
+    assert groups[0]["filters"]["bucket"] == "1m" and groups[0]["entries"] == []
+    assert groups[1]["buckets"] == [{"start": None, "group": "ERROR", "count": 2},
+                                    {"start": None, "group": "INFO", "count": 2}]
+
+    analyzer.export(str(tmp_path / "out.ndjson"), "ndjson")
+    records = [json.loads(line) for line in (tmp_path / "out.ndjson").read_text().splitlines()]
+    assert records[1] == {"event_type": "EVENT", "start": "2025-07-18T10:00:00+03:00", "group": None, "count": 2}
+
+    analyzer.export(str(tmp_path / "out.columnar"), "columnar")
+    loaded = load_columnar(str(tmp_path / "out.columnar"))
+    assert [ev_config for ev_config, _ in loaded] == analyzer.configs
+    assert [matched.rows() for _, matched in loaded[:3]] == EXPECTED
+    merged = merge_results([loaded, analyzer._cached_analysis], DEFAULT_TIMEZONE)
+    assert merged[0][1].rows()[0].count == 4
+
+
+STAT_LINES = [
+    "2025-07-18T10:00:00 INFO RUN Iteration time: 1.50 sec",
+    "2025-07-18T10:00:01 INFO RUN Iteration time: 2.50 sec",
+    "2025-07-18T10:00:02 ERROR RUN Iteration time: n/a",
+    "2025-07-18T10:00:03 INFO RUN Iteration time: 8.00 sec",
+    "2025-07-18T10:00:04 INFO OTHER Iteration time: 100.00 sec",
+]
+
+STAT_CONFIG = r"RUN --pattern Iteration\stime:\s((?P<seconds>\d+\.\d+)\ssec)? --stat seconds"
+
+
+def _make_stat_logs(tmp_path):
+    """ Helper writing the log directory and events file of a --stat rule."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(STAT_LINES[:2]))
+    (log_dir / "b.log").write_text("\n".join(STAT_LINES[2:]))
+    config_file = tmp_path / "events.txt"
+    config_file.write_text(STAT_CONFIG)
+    return str(log_dir), str(config_file)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"streaming": True}, {"columnar": True}, {"backend": "process", "jobs": 2}])
+def test_every_mode_gives_the_same_stats(tmp_path, kwargs):
+    """ Every analysis mode extracts the same values, skipping matches whose group captured nothing."""
+    log_dir, config_file = _make_stat_logs(tmp_path)
+    (_, stats), = LogAnalyzer(log_dir, config_file, **kwargs)._cached_analysis
+
+    assert isinstance(stats, FieldStats) and len(stats) == 4 and list(stats) == []
+    summary = stats.summary()
+    assert {key: summary[key] for key in ("field", "values", "sum", "min", "max", "mean")} == \
+        {"field": "seconds", "values": 3, "sum": 12.0, "min": 1.5, "max": 8.0, "mean": 4.0}
+    assert summary["p50"] == pytest.approx(2.5, rel=0.01) and summary["p90"] <= summary["p99"] <= summary["max"]
+
+
+def test_stats_are_printed_exported_and_merged(tmp_path):
+    """ run() prints the statistics; every export format carries them, and reloaded runs merge."""
+    log_dir, config_file = _make_stat_logs(tmp_path)
+    analyzer = LogAnalyzer(log_dir, config_file)
+
+    saved_stdout = sys.stdout
+    try:
+        sys.stdout = StringIO()
+        analyzer.run()
+        output = sys.stdout.getvalue()
+    finally:
+        sys.stdout = saved_stdout
+    assert "stat=seconds:\nCount of matches: 4\n  seconds: values=3, sum=12, min=1.5, max=8, mean=4, p50=" in output
+
+    analyzer.export(str(tmp_path / "out.json"), "json")
+    group, = json.loads((tmp_path / "out.json").read_text())
+    assert group["filters"]["stat"] == "seconds" and group["entries"] == []
+    assert group["stats"] == analyzer._cached_analysis[0][1].summary()
+
+    analyzer.export(str(tmp_path / "out.ndjson"), "ndjson")
+    records = [json.loads(line) for line in (tmp_path / "out.ndjson").read_text().splitlines()]
+    assert len(records) == 2 and records[1]["stats"]["sum"] == 12.0
+
+    analyzer.export(str(tmp_path / "out.columnar"), "columnar")
+    loaded = load_columnar(str(tmp_path / "out.columnar"))
+    assert [ev_config for ev_config, _ in loaded] == analyzer.configs
+    assert loaded[0][1].summary() == group["stats"]
+    merged = merge_results([loaded, loaded], DEFAULT_TIMEZONE)[0][1]
+    assert (len(merged), merged.values, merged.total, merged.minimum, merged.maximum) == (8, 6, 24.0, 1.5, 8.0)
+    assert merged.summary()["p50"] == group["stats"]["p50"]
@@ -0,0 +1,107 @@
+"""
+Tests for the memory-lean representations: the __slots__ LogEntry and the columnar EntryBatch.
+
+Test Overview:
+    - test_log_entry_has_no_dict_and_interns_fields: LogEntry uses __slots__ and parse_line interns level/event_type.
+    - test_batch_round_trips_entries: Entries stored in an EntryBatch come back unchanged.
+    - test_from_lines_skips_invalid_and_out_of_window: Parsing lines into a batch drops the same lines as parse_line.
+    - test_event_filter_matches_batch: EventFilter.matches_batch agrees with EventFilter.matches row by row.
+    - test_rule_engine_match_batch: RuleEngine.match_batch agrees with RuleEngine.match row by row.
+    - test_columnar_analyzer_export_matches_default: The columnar analyzer exports the same JSON.
+"""
+
+import json
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.event_config import EventConfig
+from log_analyzer.event_filter import EventFilter
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.rule_engine import RuleEngine
+from log_analyzer.timestamps import TimestampParser
+
+TZ = ZoneInfo("Asia/Jerusalem")
+
+LINES = [
+    "2025-07-18T10:00:00 INFO EVENT First valid match",
+    "this is invalid log line",
+    "2025-07-18T11:00:00.500 INFO EVENT Another valid match",
+    "2025-07-18T12:00:00 DEBUG EVENT Another debug line",
+    "2025-07-18T13:00:00 ERROR OTHER disk full",
+    "2025-07-19T13:00:00 ERROR OTHER disk full again",
+]
+
+CONFIGS = [
+    EventConfig(event_type="EVENT", count=True, level=None, pattern=None),
+    EventConfig(event_type="EVENT", count=False, level="INFO", pattern=re.compile(r"^Another")),
+    EventConfig(event_type="OTHER", count=False, level="ERROR", pattern=None),
+    EventConfig(event_type="MISSING", count=False, level=None, pattern=None),
+]
+
+
+def _batch() -> EntryBatch:
+    """ Helper that parses LINES into a batch."""
+    return EntryBatch.from_lines(LINES, TimestampParser(TZ))
+
+
+def test_log_entry_has_no_dict_and_interns_fields():
+    """ LogEntry uses __slots__ and parse_line interns level/event_type."""
+    first = LogEntry.parse_line(LINES[0])
+    second = LogEntry.parse_line(LINES[2])
+    assert not hasattr(first, "__dict__")
+    assert first.level is second.level
+    assert first.event_type is second.event_type
+
+
+def test_batch_round_trips_entries():
+    """ Entries stored in an EntryBatch come back unchanged."""
+    entries = [LogEntry.parse_line(line) for line in LINES if line != "this is invalid log line"]
+    batch = EntryBatch.from_entries(entries, TZ)
+
+    assert len(batch) == len(entries)
+    assert [str(e) for e in batch] == [str(e) for e in entries]
+    assert batch.levels == ["INFO", "DEBUG", "ERROR"]
+    assert list(batch.level_codes) == [0, 0, 1, 2, 2]
+
+
+def test_from_lines_skips_invalid_and_out_of_window():
+    """ Parsing lines into a batch drops the same lines as parse_line."""
+    ts_to = datetime.fromisoformat("2025-07-18T13:00:00").replace(tzinfo=TZ)
+    batch = EntryBatch.from_lines(LINES, TimestampParser(TZ, ts_to=ts_to))
+    assert [batch.message(i) for i in range(len(batch))] == [
+        "First valid match", "Another valid match", "Another debug line", "disk full"]
+    assert batch.timestamp(1) == datetime.fromisoformat("2025-07-18T11:00:00.500").replace(tzinfo=TZ)
+
+
+def test_event_filter_matches_batch():
+    """ EventFilter.matches_batch agrees with EventFilter.matches row by row."""
+    batch = _batch()
+    entries = list(batch)
+    for cfg in CONFIGS:
+        flt = EventFilter(cfg)
+        assert flt.matches_batch(batch) == [i for i, e in enumerate(entries) if flt.matches(e)]
+
+
+def test_rule_engine_match_batch():
+    """ RuleEngine.match_batch agrees with RuleEngine.match row by row."""
+    batch = _batch()
+    engine = RuleEngine(CONFIGS)
+    per_rule = engine.match_batch(batch)
+    for i, entry in enumerate(batch):
+        assert [idx for idx, rows in enumerate(per_rule) if i in rows] == engine.match(entry)
+
+
+def test_columnar_analyzer_export_matches_default(tmp_path):
+    """ The columnar analyzer exports the same JSON."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(LINES))
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("EVENT --count\nEVENT --level INFO --pattern ^Another\nOTHER --level ERROR")
+
+    LogAnalyzer(str(log_dir), str(config_file)).export_to_json(str(tmp_path / "default.json"))
+    LogAnalyzer(str(log_dir), str(config_file), columnar=True).export_to_json(str(tmp_path / "columnar.json"))
+
+    assert json.loads((tmp_path / "columnar.json").read_text()) == json.loads((tmp_path / "default.json").read_text())
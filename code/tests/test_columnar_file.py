@@ -0,0 +1,112 @@
+"""
+Tests for log_analyzer.columnar_file, the binary columnar export format and its loader.
+
+Test Overview:
+    - test_export_and_load_round_trip: Results of every analysis mode reload with the same rules and entries, also
+      when a rule spans several row groups; streaming --count rules reload as CountedMatches.
+    - test_whole_batch_extend_recodes_dictionaries: Appending a whole batch re-codes its dictionaries like
+      appending it entry by entry.
+    - test_merge_results: Runs of the same rules are merged rule by rule; other rules are rejected.
+    - test_invalid_files_raise: Foreign and truncated files raise ValueError.
+"""
+
+import pytest
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.columnar_file import load_columnar, merge_results
+from log_analyzer.log_entry import DEFAULT_TIMEZONE
+from log_analyzer.streaming import CountedMatches
+
+LOG_LINES = [
+    "2025-07-18T10:00:00 INFO EVENT plain message",
+    "2025-07-18T10:00:00.250000 ERROR EVENT unicode ✓ café",
+    "2025-07-18T10:00:01 WARNING EVENT third",
+    "2025-01-05T08:30:00 ERROR EVENT winter time",
+    "2025-07-18T10:00:02 INFO OTHER other event",
+]
+
+CONFIG = "EVENT --count\nEVENT --level ERROR\nOTHER --pattern ^other\nEVENT --pattern ^nothing"
+
+
+def _make_logs(tmp_path):
+    """ Helper writing the log directory and events file."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(LOG_LINES), encoding="utf-8")
+    config_file = tmp_path / "events.txt"
+    config_file.write_text(CONFIG)
+    return str(log_dir), str(config_file)
+
+
+def _rows(matched) -> list[tuple]:
+    """ Helper listing the entries of a result as comparable tuples."""
+    return sorted((e.timestamp.isoformat(), e.level, e.event_type, e.message) for e in matched)
+
+
+@pytest.mark.parametrize("row_group", [65536, 2])
+@pytest.mark.parametrize("kwargs", [{}, {"streaming": True}, {"columnar": True}])
+def test_export_and_load_round_trip(tmp_path, monkeypatch, kwargs, row_group):
+    """ Results of every analysis mode reload with the same rules and entries."""
+    monkeypatch.setattr("log_analyzer.columnar_file.ROW_GROUP", row_group)
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(log_dir, config_file, **kwargs)
+    path = tmp_path / "results.columnar"
+    analyzer.export(str(path), "columnar")
+
+    loaded = load_columnar(str(path))
+    assert [ev_config for ev_config, _ in loaded] == analyzer.configs
+    for (_, original), (_, reloaded) in zip(analyzer._cached_analysis, loaded):
+        assert len(reloaded) == len(original)
+        if isinstance(original, CountedMatches):
+            assert isinstance(reloaded, CountedMatches)
+        else:
+            assert isinstance(reloaded, EntryBatch) and _rows(reloaded) == _rows(original)
+    assert len(loaded[0][1]) == 4 and len(loaded[1][1]) == 2
+
+
+def test_whole_batch_extend_recodes_dictionaries():
+    """ Appending a whole batch re-codes its dictionaries like appending it entry by entry."""
+    first = EntryBatch(DEFAULT_TIMEZONE)
+    first.append(1, "INFO", "A", "one")
+    second = EntryBatch(DEFAULT_TIMEZONE)
+    second.append(2, "ERROR", "B", "two")
+    second.append(3, "INFO", "A", "three ✓")
+
+    by_entry = EntryBatch(DEFAULT_TIMEZONE)
+    by_entry.extend(first, range(1))
+    by_entry.extend(second, range(2))
+    first.extend(second)
+    assert list(first.records()) == list(by_entry.records())
+    assert first.levels == ["INFO", "ERROR"] and list(first.level_codes) == [0, 1, 0]
+
+
+def test_merge_results(tmp_path):
+    """ Runs of the same rules are merged rule by rule; other rules are rejected."""
+    log_dir, config_file = _make_logs(tmp_path)
+    path = tmp_path / "results.columnar"
+    LogAnalyzer(log_dir, config_file, streaming=True).export(str(path), "columnar")
+    loaded = load_columnar(str(path))
+    fresh = LogAnalyzer(log_dir, config_file)._cached_analysis
+
+    merged = merge_results([loaded, fresh], DEFAULT_TIMEZONE)
+    assert [len(matched) for _, matched in merged] == [8, 4, 2, 0]
+    assert isinstance(merged[0][1], CountedMatches)
+    assert _rows(merged[1][1]) == sorted(_rows(fresh[1][1]) * 2)
+
+    with pytest.raises(ValueError):
+        merge_results([loaded, loaded[:2]], DEFAULT_TIMEZONE)
+
+
+def test_invalid_files_raise(tmp_path):
+    """ Foreign and truncated files raise ValueError."""
+    log_dir, config_file = _make_logs(tmp_path)
+    path = tmp_path / "results.columnar"
+    LogAnalyzer(log_dir, config_file).export(str(path), "columnar")
+
+    truncated = tmp_path / "truncated.columnar"
+    truncated.write_bytes(path.read_bytes()[:-10])
+    foreign = tmp_path / "results.json"
+    LogAnalyzer(log_dir, config_file).export(str(foreign), "json")
+    for bad in (truncated, foreign):
+        with pytest.raises(ValueError):
+            load_columnar(str(bad))
@@ -26,14 +26,25 @@ Test overview:
     - test_all_flags_combined: Use all supported flags in one rule.
     - test_flags_in_any_order: Verifies that the flags can be mixed arbitrarily.
 
+    # Aggregation flags
+    - test_bucket_and_group_by_flags: Parse --bucket durations and --group-by fields; reject invalid values.
+    - test_stat_flag: Parse --stat groups of the pattern; reject unknown groups and --stat with buckets.
+    - test_summary_flags: Parse --head / --tail / --sample / --top-messages sizes; reject invalid sizes and
+      combined summaries.
+
     # Whitespace and comment handling
     - test_skip_comments_and_blank_lines: Skip comments and empty lines.
     - test_empty_or_comments_only: Empty file or comment-only file → empty config.
+
+    # Pattern prefilter
+    - test_prefilter_extracts_required_literals: Anchored prefixes / suffixes and required literals are
+      extracted; optional parts, alternatives and case-insensitive patterns are not.
+    - test_prefilter_never_rejects_a_match: The prefilter and the matcher agree with the regex on every message.
 """
 
 import re
 import pytest
-from log_analyzer.event_config import load_configs, EventConfig
+from log_analyzer.event_config import load_configs, compile_prefilter, format_duration, EventConfig, Prefilter
 
 # Supported configuration flags for event rules
 CFG_NAME = "events.txt"
@@ -164,6 +175,74 @@ def test_flags_in_any_order(tmp_path):
     assert c.pattern.pattern == "x+"
 
 
+@pytest.mark.parametrize("line, bucket, group_by", [
+    ("EVENT --bucket 1m", 60, None),
+    ("EVENT --group-by level --count", None, "level"),
+    ("EVENT --bucket 90s --group-by event_type --level ERROR", 90, "event_type"),
+    ("EVENT --bucket 1d", 86400, None),
+    ("EVENT --bucket 0m", ValueError, None),
+    ("EVENT --bucket 5 --count", ValueError, None),
+    ("EVENT --bucket 1w", ValueError, None),
+    ("EVENT --group-by message", ValueError, None),
+    ("EVENT --bucket", ValueError, None),
+])
+def test_bucket_and_group_by_flags(tmp_path, line, bucket, group_by):
+    """Tests parsing of --bucket durations and --group-by fields, and rejection of invalid values."""
+    cfg = tmp_path / CFG_NAME
+    cfg.write_text(line)
+    if bucket is ValueError:
+        with pytest.raises(ValueError):
+            load_configs(str(cfg))
+        return
+    c = load_configs(str(cfg))[0]
+    assert (c.bucket, c.group_by, c.aggregated) == (bucket, group_by, True)
+    if bucket:
+        assert format_duration(bucket) == line.split()[2]
+
+
+@pytest.mark.parametrize("line, stat", [
+    (r"EVENT --pattern time:\s(?P<seconds>\d+\.\d+) --stat seconds", "seconds"),
+    (r"EVENT --stat 1 --pattern (\d+)ms --level INFO", "1"),
+    (r"EVENT --pattern (\d+)ms --stat 2", ValueError),
+    (r"EVENT --pattern (?P<ms>\d+)ms --stat seconds", ValueError),
+    ("EVENT --stat seconds", ValueError),
+    (r"EVENT --pattern (\d+)ms --stat 1 --bucket 1m", ValueError),
+])
+def test_stat_flag(tmp_path, line, stat):
+    """Tests parsing of --stat groups, and rejection of unknown groups and of --stat combined with buckets."""
+    cfg = tmp_path / CFG_NAME
+    cfg.write_text(line)
+    if stat is ValueError:
+        with pytest.raises(ValueError):
+            load_configs(str(cfg))
+        return
+    c = load_configs(str(cfg))[0]
+    assert (c.stat, c.bucket, c.group_by, c.aggregated) == (stat, None, None, True)
+
+
+@pytest.mark.parametrize("line, summary", [
+    ("EVENT --head 10", ("head", 10)),
+    ("EVENT --level ERROR --tail 5", ("tail", 5)),
+    ("EVENT --sample 3 --pattern ^disk", ("sample", 3)),
+    ("EVENT --top-messages 20", ("top-messages", 20)),
+    ("EVENT --head 0", ValueError),
+    ("EVENT --tail ten", ValueError),
+    ("EVENT --head 5 --tail 5", ValueError),
+    ("EVENT --sample 5 --bucket 1m", ValueError),
+    ("EVENT --top-messages", ValueError),
+])
+def test_summary_flags(tmp_path, line, summary):
+    """Tests parsing of the summary flags, and rejection of invalid sizes and of combined summaries."""
+    cfg = tmp_path / CFG_NAME
+    cfg.write_text(line)
+    if summary is ValueError:
+        with pytest.raises(ValueError):
+            load_configs(str(cfg))
+        return
+    c = load_configs(str(cfg))[0]
+    assert ((c.summary, c.summary_size), c.aggregated) == (summary, True)
+
+
 def test_skip_comments_and_blank_lines(tmp_path):
     """Tests that comment lines and blank lines are ignored."""
     # Arrange: mix comments, blanks, and two real rules
@@ -203,3 +282,37 @@ def test_empty_or_comments_only(tmp_path):
     # or only comment lines:
     cfg.write_text("# just a comment\n# another one\n\n")
     assert load_configs(str(cfg)) == []
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    (r"^Iteration time:\s\d+\.\d+\ssec$", Prefilter(prefix="Iteration time:", suffix="sec")),
+    (r"\d+ items", Prefilter(literals=(" items",))),
+    (r"foo(bar)?baz", Prefilter(literals=("baz", "foo"))),
+    (r"^(?:abc)d\s+(?:xyz)+", Prefilter(prefix="abcd", literals=("xyz",))),
+    (r"(?m)^abc$", Prefilter(literals=("abc",))),
+    (r"^a|b", None),
+    (r"(?i)abc", None),
+    (r"\d+", None),
+])
+def test_prefilter_extracts_required_literals(pattern, expected):
+    """Tests the literal extraction of compile_prefilter and that EventConfig carries it."""
+    assert compile_prefilter(re.compile(pattern)) == expected
+    config = EventConfig(event_type="EVENT", count=False, level=None, pattern=re.compile(pattern))
+    assert config.prefilter == expected
+
+
+def test_prefilter_never_rejects_a_match():
+    """Tests that the prefilter and the matcher agree with the regex on every message."""
+    patterns = [r"^Iteration time:\s\d+\.\d+\ssec$", r"\d+ items", r"foo(bar)?baz", r"ab(?:cd)+ef$", r"^x\Z",
+                r"disk space low:\s\d+%\sfull$", r"(?i:AB)cd", r"a(?=bc)bc"]
+    messages = ["Iteration time: 12.5 sec", "Iteration time: 12.5 sec\n", "Iteration time: 12.5 msec", "3 items",
+                "items", "foobaz", "foobarbaz", "fobaz", "abcdcdef", "abef", "x", "x\n", "disk space low: 9% full",
+                "disk full", "abcd", "ABcd", "abc", ""]
+    for pattern in map(re.compile, patterns):
+        config = EventConfig(event_type="EVENT", count=False, level=None, pattern=pattern)
+        matcher = config.message_matcher()
+        for message in messages:
+            expected = bool(pattern.search(message))
+            assert bool(matcher(message)) == expected, (pattern, message)
+            if expected and config.prefilter is not None:
+                assert config.prefilter.accepts(message), (pattern, message)
@@ -0,0 +1,68 @@
+"""
+Tests for log_analyzer.console, the buffered console output of LogAnalyzer.run.
+
+Test Overview:
+    - test_entries_match_print: Lists of entries and columnar batches are written exactly as printing str(entry)
+      per line did.
+    - test_flushes_by_size_and_time: Output is written once the buffer is full or flush_interval has passed,
+      and always on close.
+"""
+
+import io
+from datetime import datetime, timedelta
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.console import ConsoleWriter
+from log_analyzer.log_entry import DEFAULT_TIMEZONE, LogEntry
+
+
+class _CountingStream(io.StringIO):
+    """ A text stream counting the write calls it gets."""
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+def _entries(n: int) -> list[LogEntry]:
+    """ Helper building n entries, some of them in the same second or with a fraction of a second."""
+    start = datetime(2025, 7, 18, 10, 0, 0, tzinfo=DEFAULT_TIMEZONE)
+    return [LogEntry(start + timedelta(seconds=i // 3, microseconds=250000 * (i % 2)), "ERROR" if i % 4 else "INFO",
+                     "EVENT", f"message {i} ✓") for i in range(n)]
+
+
+def test_entries_match_print():
+    """ Entries and batches are written like print(f"  {entry}") per entry."""
+    entries = _entries(2500)
+    expected = "".join(f"  {entry}\n" for entry in entries)
+    for matched in (entries, EntryBatch.from_entries(entries, DEFAULT_TIMEZONE)):
+        stream = io.StringIO()
+        with ConsoleWriter(stream) as out:
+            out.line("matching entries:")
+            out.entries(matched)
+            out.entries([])
+        assert stream.getvalue() == "matching entries:\n" + expected
+
+
+def test_flushes_by_size_and_time(monkeypatch):
+    """ Output is written once the buffer is full or flush_interval has passed, and on close."""
+    stream = _CountingStream()
+    out = ConsoleWriter(stream, buffer_size=100, flush_interval=60)
+    out.line("x" * 50)
+    assert stream.writes == 0
+    out.line("x" * 50)
+    assert stream.writes == 1 and stream.getvalue() == ("x" * 50 + "\n") * 2
+
+    clock = [1000.0]
+    monkeypatch.setattr("log_analyzer.console.time.monotonic", lambda: clock[0])
+    out = ConsoleWriter(stream, buffer_size=1 << 20, flush_interval=0.5)
+    out.line("first")
+    assert stream.writes == 1
+    clock[0] += 1
+    out.line("second")
+    assert stream.writes == 2 and stream.getvalue().endswith("first\nsecond\n")
+    out.line("third")
+    out.close()
+    assert stream.writes == 3 and stream.getvalue().endswith("third\n")
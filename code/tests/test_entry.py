@@ -11,12 +11,15 @@ which parses a single log line into a structured LogEntry object.
 - test_wrong_order():  Raises ValueError for lines with incorrect field order.
 - test_invalid_timestamp_format(): Raises ValueError for timestamp with incorrect format.
 - test_'invalid_range_timestamp(): Raises ValueError when the timestamp is either in the future or to old.
+- test_parse_batch_reason_codes(): Batch parsing of lines or bytes gives the columns of the accepted lines and a
+  reason code per line, agreeing with parse_line.
 """
 
 import pytest
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from log_analyzer.log_entry import LogEntry, MAX_PAST_YEARS
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.timestamps import MAX_PAST_YEARS, TimestampParser
 
 DEFAULT_LOCAL_TZ = ZoneInfo("Asia/Jerusalem")
 
@@ -109,9 +112,36 @@ def test_range_timestamp():
     assert f"more than {MAX_PAST_YEARS} years" in str(exc.value)
 
 
-
-
-
-
-
+def test_parse_batch_reason_codes():
+    """Batch parsing gives the accepted columns and a reason code per line, agreeing with parse_line."""
+    lines = [
+        "2025-07-17T12:00:00 INFO LOGIN User 'bob' logged in",
+        "not a log line",
+        "2025-07-17T12:00:00 info LOGIN lowercase level",
+        "2025-13-17T12:00:00 ERROR LOGIN invalid month",
+        "2999-01-01T00:00:00 ERROR LOGIN future",
+        "1800-01-01T00:00:00 ERROR LOGIN too old",
+        "2025-07-16T23:59:59 WARNING LOGIN before the window",
+        "2025-07-17T12:00:01 ERROR LOGOUT  two spaces kept in the message ",
+        "",
+    ]
+    parser = TimestampParser(DEFAULT_LOCAL_TZ, ts_from=datetime(2025, 7, 17))
+    parsed = LogEntry.parse_batch(lines, parser)
+
+    assert parsed.reasons == [None, "format", "format", "format", "future", "too_old", "out_of_range", None, "format"]
+    assert parsed.rejected == [reason is not None for reason in parsed.reasons]
+    assert parsed.levels == ["INFO", "ERROR"] and parsed.event_types == ["LOGIN", "LOGOUT"]
+    assert parsed.messages == ["User 'bob' logged in", " two spaces kept in the message"]
+    assert [str(entry) for entry in parsed.entries()] == [
+        str(LogEntry.parse_line(lines[0], ts_parser=parser)), str(LogEntry.parse_line(lines[7], ts_parser=parser))]
+
+    from_bytes = LogEntry.parse_batch("\n".join(lines).encode("utf-8") + b"\n", parser)
+    assert from_bytes == parsed
+
+    for line, reason in zip(lines, parsed.reasons):
+        if reason == "out_of_range":
+            assert LogEntry.parse_line(line, ts_parser=parser) is None
+        elif reason is not None:
+            with pytest.raises(ValueError):
+                LogEntry.parse_line(line, ts_parser=parser)
 
@@ -0,0 +1,111 @@
+"""
+Tests for log_analyzer.exporter, the streaming JSON / NDJSON export.
+
+Test Overview:
+    - test_timestamp_formatter_matches_isoformat: Cached formatting gives isoformat() for datetimes and naive
+      epochs, with and without microseconds and on both sides of a DST change.
+    - test_json_export_matches_previous_document: Every analysis mode exports the document json.dump used to
+      write, including messages that need escaping.
+    - test_ndjson_export_has_one_record_per_line: NDJSON holds a header per rule followed by its entries.
+    - test_cli_output_exports_without_prompting: --output/--format export without asking for input.
+"""
+
+import json
+import sys
+from datetime import datetime
+import pytest
+import cli
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.exporter import TimestampFormatter, export_results
+from log_analyzer.log_entry import DEFAULT_TIMEZONE
+from log_analyzer.timestamps import naive_epoch
+
+LOG_LINES = [
+    "2025-07-18T10:00:00 INFO EVENT plain message",
+    "2025-07-18T10:00:00.250000 ERROR EVENT quotes \" and back\\slash",
+    "2025-07-18T10:00:01 INFO EVENT unicode ✓ café\ttab",
+    "2025-01-05T08:30:00.000001 ERROR EVENT winter time",
+    "2025-07-18T10:00:02 INFO OTHER not exported by EVENT rules",
+]
+
+CONFIG = "EVENT --count\nEVENT --level ERROR\nEVENT --pattern ^nothing"
+
+
+def _make_logs(tmp_path):
+    """ Helper writing the log directory and events file."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(LOG_LINES), encoding="utf-8")
+    config_file = tmp_path / "events.txt"
+    config_file.write_text(CONFIG)
+    return str(log_dir), str(config_file)
+
+
+def _previous_document(analyzer: LogAnalyzer) -> list[dict]:
+    """ Helper building the document the previous export_to_json implementation dumped."""
+    return [{
+        "event_type": ev_config.event_type,
+        "filters": {
+            "count": ev_config.count,
+            "level": ev_config.level,
+            "pattern": ev_config.pattern.pattern if ev_config.pattern else None,
+        },
+        "entries": [{"timestamp": entry.timestamp.isoformat(), "level": entry.level, "message": entry.message}
+                    for entry in matched],
+    } for ev_config, matched in analyzer._cached_analysis]
+
+
+def test_timestamp_formatter_matches_isoformat():
+    """ Cached formatting gives isoformat() for datetimes and naive epochs."""
+    formatter = TimestampFormatter(DEFAULT_TIMEZONE)
+    for ts in (datetime(2025, 7, 18, 10, 0, 0), datetime(2025, 7, 18, 10, 0, 0, 250000),
+               datetime(2025, 1, 5, 8, 30, 0, 1), datetime(2025, 3, 28, 3, 0, 0), datetime(2025, 3, 27, 23, 59, 59)):
+        aware = ts.replace(tzinfo=DEFAULT_TIMEZONE)
+        for _ in range(2):   # Cache miss, then hit
+            assert formatter.format(aware) == aware.isoformat()
+            assert formatter.format_epoch(naive_epoch(ts)) == aware.isoformat()
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"streaming": True}, {"columnar": True}])
+def test_json_export_matches_previous_document(tmp_path, kwargs):
+    """ Every analysis mode exports the document json.dump used to write."""
+    log_dir, config_file = _make_logs(tmp_path)
+    out = tmp_path / "out.json"
+    LogAnalyzer(log_dir, config_file, **kwargs).export_to_json(str(out))
+
+    expected = _previous_document(LogAnalyzer(log_dir, config_file))
+    if kwargs.get("streaming"):
+        expected[0]["entries"] = []   # --count rules keep no entries in streaming mode
+        expected[1]["entries"].append(expected[1]["entries"].pop(0))   # Spooled matches keep the file order
+    assert json.loads(out.read_text(encoding="utf-8")) == expected
+
+
+def test_ndjson_export_has_one_record_per_line(tmp_path):
+    """ NDJSON holds a header per rule followed by its entries."""
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(log_dir, config_file)
+    out = tmp_path / "out.ndjson"
+    analyzer.export(str(out), "ndjson")
+
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    expected = []
+    for group in _previous_document(analyzer):
+        expected.append({"event_type": group["event_type"], "filters": group["filters"],
+                         "matches": len(group["entries"])})
+        expected.extend({"event_type": group["event_type"], **entry} for entry in group["entries"])
+    assert records == expected
+
+    with pytest.raises(ValueError):
+        export_results(analyzer._cached_analysis, str(out), DEFAULT_TIMEZONE, "xml")
+
+
+def test_cli_output_exports_without_prompting(tmp_path, monkeypatch, capsys):
+    """ --output/--format export without asking for input."""
+    log_dir, config_file = _make_logs(tmp_path)
+    out = tmp_path / "batch.ndjson"
+    monkeypatch.setattr(sys, "argv", ["cli.py", log_dir, config_file, "--output", str(out), "--format", "ndjson"])
+    monkeypatch.setattr("builtins.input", lambda *_: pytest.fail("input() called"))
+
+    cli.main()
+    assert f"Export complete: {out}" in capsys.readouterr().out
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 3 + 4 + 2
@@ -0,0 +1,147 @@
+"""
+Tests for log_analyzer.file_index, the persistent per-file sidecar index.
+
+Test Overview:
+    - test_first_scan_writes_index: Reading a file without an index yields every line and writes the index.
+    - test_candidate_blocks_filter_by_event_level_and_time: Only blocks that hold the requested event type and
+      level inside the time window are selected.
+    - test_index_invalidated_by_size_and_mtime: Changing the log file makes its index stale.
+    - test_indexed_analysis_matches_full_scan: Plain and gzip files give the same results with and without the
+      index, on the first (building) run and on later runs, for every backend.
+    - test_carriage_return_lines: Lines ending in \\r\\n or a lone \\r are split and indexed as text mode reads
+      them, on the building run and on later runs.
+"""
+
+import gzip
+import os
+from zoneinfo import ZoneInfo
+from datetime import datetime
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.file_index import FileIndex, build_index, index_path, iter_indexed_lines
+from log_analyzer.timestamps import TimestampParser
+
+TZ = ZoneInfo("Asia/Jerusalem")
+
+
+def _lines() -> list[str]:
+    """ Helper building a log where each event type lives in its own region of the file."""
+    lines = []
+    for i in range(400):
+        event = "ALPHA" if i < 200 else "BETA"
+        level = "ERROR" if i % 50 == 0 else "INFO"
+        lines.append(f"2025-07-18T{i // 60:02d}:{i % 60:02d}:00 {level} {event} message {i}")
+        if i % 13 == 0:
+            lines.append("garbage line")
+    return lines
+
+
+def _write(path, lines):
+    """ Helper writing lines to a plain or gzip log file."""
+    if path.suffix == ".gz":
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    else:
+        path.write_text("\n".join(lines) + "\n")
+
+
+def test_first_scan_writes_index(tmp_path):
+    """ Reading a file without an index yields every line and writes the index."""
+    path = tmp_path / "a.log"
+    _write(path, _lines())
+    lines = list(iter_indexed_lines(path, [("ALPHA", None)], TimestampParser(TZ)))
+
+    assert [line.rstrip("\n") for line in lines] == _lines()
+    assert index_path(path).exists()
+    assert FileIndex.load(path) is not None
+
+
+def test_candidate_blocks_filter_by_event_level_and_time(tmp_path):
+    """ Only blocks that hold the requested event type and level inside the time window are selected."""
+    path = tmp_path / "a.log"
+    _write(path, _lines())
+    index = build_index(path, block_size=1000)
+    everything = TimestampParser(TZ)
+
+    alpha = index.candidate_blocks([("ALPHA", None)], everything)
+    beta = index.candidate_blocks([("BETA", None)], everything)
+    beta_errors = index.candidate_blocks([("BETA", "ERROR")], everything)
+    assert index.blocks[0] in alpha and index.blocks[0] not in beta
+    assert index.blocks[-1] in beta and index.blocks[-1] not in alpha
+    assert 0 < len(beta_errors) < len(beta)
+    assert index.candidate_blocks([("GAMMA", None)], everything) == []
+    assert index.candidate_blocks([("ALPHA", "DEBUG")], everything) == []
+
+    late = TimestampParser(TZ, ts_from=datetime.fromisoformat("2025-07-18T05:00:00").replace(tzinfo=TZ))
+    assert index.candidate_blocks([("ALPHA", None)], late) == []
+
+
+def test_index_invalidated_by_size_and_mtime(tmp_path):
+    """ Changing the log file makes its index stale."""
+    path = tmp_path / "a.log"
+    _write(path, _lines())
+    build_index(path)
+    assert FileIndex.load(path) is not None
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert FileIndex.load(path) is None
+
+    build_index(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("2025-07-18T09:00:00 INFO ALPHA appended\n")
+    assert FileIndex.load(path) is None
+
+
+def test_indexed_analysis_matches_full_scan(tmp_path, monkeypatch):
+    """ Plain and gzip files give the same results with and without the index, on every run and backend."""
+    monkeypatch.setattr("log_analyzer.file_index.BLOCK_SIZE", 700)
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    _write(log_dir / "a.log", _lines())
+    _write(log_dir / "b.log.gz", _lines())
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("BETA --count\nBETA --level ERROR\nGAMMA --count")
+    window = ("2025-07-18T01:00:00", "2025-07-18T06:00:00")
+
+    def _results(**kwargs):
+        analysis = LogAnalyzer(str(log_dir), str(config_file), *window, **kwargs)._cached_analysis
+        return [sorted(str(e) for e in matched) if not cfg.count else len(matched) for cfg, matched in analysis]
+
+    expected = _results()
+    assert _results(use_index=True) == expected       # First run builds the indexes
+    assert index_path(log_dir / "a.log").exists() and index_path(log_dir / "b.log.gz").exists()
+    assert _results(use_index=True) == expected       # Later runs read candidate blocks only
+    assert _results(use_index=True, streaming=True) == expected
+    assert _results(use_index=True, columnar=True) == expected
+    assert _results(use_index=True, backend="process", jobs=2) == expected
+
+
+def test_carriage_return_lines(tmp_path, monkeypatch):
+    """ \\r\\n and lone \\r line endings are split and indexed as text mode reads them."""
+    monkeypatch.setattr("log_analyzer.file_index.BLOCK_SIZE", 700)
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    lines = _lines()
+    data = "".join(line + ("\r" if i % 3 == 0 else "\r\n" if i % 3 == 1 else "\n") for i, line in enumerate(lines))
+    (log_dir / "a.log").write_bytes(data.encode())
+    with gzip.open(log_dir / "b.log.gz", "wb") as f:
+        f.write(data.encode())
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("BETA --count\nALPHA --level ERROR")
+    everything = TimestampParser(TZ)
+
+    assert list(iter_indexed_lines(log_dir / "a.log", [("ALPHA", None)], everything)) == [
+        line + "\n" for line in lines]
+    index = FileIndex.load(log_dir / "a.log")
+    assert not index.time_order.time_sorted
+    assert [line.rstrip("\n") for line in iter_indexed_lines(log_dir / "a.log", [("BETA", None)], everything)
+            if "BETA" in line] == [line for line in lines if "BETA" in line]
+
+    def _results(**kwargs):
+        analysis = LogAnalyzer(str(log_dir), str(config_file), **kwargs)._cached_analysis
+        return [sorted(str(e) for e in matched) if not cfg.count else len(matched) for cfg, matched in analysis]
+
+    expected = _results()
+    assert expected[0] == 200 * 2
+    assert _results(use_index=True) == expected
+    assert _results(use_index=True) == expected
@@ -0,0 +1,143 @@
+"""
+Tests for log_analyzer.gzip_reader, the block-based (and, for multi-member files, parallel) gzip decompression.
+
+Test Overview:
+    - test_lines_match_gzip_module: Single and multi-member files give the same lines as gzip.open in text mode,
+      with any block size and worker count, including CRLF endings, zero padding and empty files.
+    - test_magic_number_inside_member_is_ignored: A gzip magic number inside a member's data is not taken as the
+      start of a new member.
+    - test_single_member_is_streamed: A single-member file is never inflated on the pool, even when its compressed
+      data holds the magic number.
+    - test_parallel_buffer_is_bounded: Members larger than their share of PARALLEL_BUFFER are streamed instead of
+      buffered, and the output is unchanged.
+    - test_malformed_files_raise_like_gzip: Non-gzip and truncated files raise gzip.BadGzipFile / EOFError.
+    - test_rules_skip_non_candidate_lines: With rules only candidate lines are decoded, also through the analyzer.
+"""
+
+import gzip
+import pytest
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer import gzip_reader
+from log_analyzer.gzip_reader import GZIP_MAGIC, OUTPUT_CHUNK, iter_gzip_lines
+
+LINES = [f"2025-07-18T10:{i // 60:02d}:{i % 60:02d} {'ERROR' if i % 9 == 0 else 'INFO'} "
+         f"{'ALPHA' if i % 2 else 'BETA'} message {i}" for i in range(600)]
+
+
+def _members(lines: list[str], per_member: int, newline: str = "\n") -> list[bytes]:
+    """ Helper compressing consecutive groups of lines into separate gzip members."""
+    text = newline.join(lines) + newline
+    data = text.encode("utf-8")
+    step = len(data) // max(1, len(lines) // per_member)
+    return [gzip.compress(data[i:i + step]) for i in range(0, len(data), step)]
+
+
+def _expected(path) -> list[str]:
+    """ Helper reading a file the way the previous implementation did."""
+    with gzip.open(path, "rt", encoding="utf-8", errors="ignore") as f:
+        return [line.rstrip("\r\n") for line in f]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_lines_match_gzip_module(tmp_path, monkeypatch, workers):
+    """ Single and multi-member files give the same lines as gzip.open in text mode."""
+    monkeypatch.setattr("log_analyzer.gzip_reader.READ_BLOCK", 97)
+    monkeypatch.setattr("log_analyzer.gzip_reader.OUTPUT_CHUNK", 61)
+    files = {
+        "single.log.gz": gzip.compress(("\n".join(LINES) + "\n").encode()),
+        "multi.log.gz": b"".join(_members(LINES, 50)),
+        "crlf.log.gz": b"".join(_members(LINES, 70, "\r\n")),
+        "padded.log.gz": b"".join(_members(LINES, 200)) + b"\0" * 10,
+        "empty.log.gz": b"",
+    }
+    for name, data in files.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        assert list(iter_gzip_lines(path, workers=workers)) == _expected(path), name
+    assert list(iter_gzip_lines(tmp_path / "multi.log.gz", workers=workers)) == LINES
+
+
+def test_magic_number_inside_member_is_ignored(tmp_path):
+    """ A gzip magic number inside a member's data is not taken as the start of a new member."""
+    tricky = [f"{line} {GZIP_MAGIC.decode('latin-1')}" for line in LINES[:100]]
+    stored = gzip.compress(("\n".join(tricky) + "\n").encode("latin-1"), compresslevel=0)
+    assert GZIP_MAGIC in stored[10:]
+    path = tmp_path / "tricky.log.gz"
+    path.write_bytes(stored + gzip.compress(("\n".join(LINES) + "\n").encode()))
+
+    assert list(iter_gzip_lines(path, workers=4)) == _expected(path)
+
+
+def test_single_member_is_streamed(tmp_path, monkeypatch):
+    """ A single-member file is never inflated on the pool, even when its compressed data holds the magic number."""
+    tricky = [f"{line} {GZIP_MAGIC.decode('latin-1')}" for line in LINES]
+    data = gzip.compress(("\n".join(tricky) + "\n").encode("latin-1"), compresslevel=0)
+    assert GZIP_MAGIC in data[10:]
+    path = tmp_path / "single.log.gz"
+    path.write_bytes(data)
+
+    def _fail(*args):
+        raise AssertionError("single-member file inflated on the pool")
+
+    monkeypatch.setattr("log_analyzer.gzip_reader._iter_parallel", _fail)
+    assert list(iter_gzip_lines(path, workers=4)) == _expected(path)
+
+
+def test_parallel_buffer_is_bounded(tmp_path, monkeypatch):
+    """ Members larger than their share of PARALLEL_BUFFER are streamed instead of buffered."""
+    monkeypatch.setattr("log_analyzer.gzip_reader.PARALLEL_BUFFER", 0)
+    lines = [f"{line} {'x' * 100}" for line in LINES] * 10
+    small, large = _members(lines[:100], 20), _members(lines, 2000)
+    assert max(len(gzip.decompress(member)) for member in large) > OUTPUT_CHUNK
+    path = tmp_path / "mixed.log.gz"
+    path.write_bytes(b"".join(small + large + small))
+
+    buffered = []
+    inflate_member = gzip_reader._inflate_member
+
+    def _recording(data, start, limit):
+        result = inflate_member(data, start, limit)
+        if result is not None:
+            buffered.append(sum(map(len, result[0])))
+        return result
+
+    monkeypatch.setattr("log_analyzer.gzip_reader._inflate_member", _recording)
+    assert list(iter_gzip_lines(path, workers=4)) == _expected(path)
+    assert buffered and max(buffered) <= 2 * OUTPUT_CHUNK
+
+
+def test_malformed_files_raise_like_gzip(tmp_path):
+    """ Non-gzip and truncated files raise gzip.BadGzipFile / EOFError."""
+    plain = tmp_path / "plain.log.gz"
+    plain.write_text("\n".join(LINES))
+    with pytest.raises(gzip.BadGzipFile):
+        list(iter_gzip_lines(plain))
+
+    members = _members(LINES, 100)
+    truncated = tmp_path / "truncated.log.gz"
+    truncated.write_bytes(b"".join(members)[:-20])
+    for workers in (1, 4):
+        with pytest.raises(EOFError):
+            list(iter_gzip_lines(truncated, workers=workers))
+
+    garbage = tmp_path / "garbage.log.gz"
+    garbage.write_bytes(b"".join(members) + b"trailing garbage")
+    with pytest.raises(gzip.BadGzipFile):
+        list(iter_gzip_lines(garbage, workers=4))
+
+
+def test_rules_skip_non_candidate_lines(tmp_path):
+    """ With rules only candidate lines are decoded, also through the analyzer."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    path = log_dir / "a.log.gz"
+    path.write_bytes(b"".join(_members(LINES, 40)))
+
+    lines = list(iter_gzip_lines(path, [("ALPHA", "ERROR"), ("BETA", None)]))
+    assert lines == [line for line in LINES if " BETA " in line or " ERROR ALPHA " in line]
+
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("BETA --count\nALPHA --level ERROR")
+    for kwargs in ({}, {"streaming": True}, {"columnar": True}, {"backend": "process", "jobs": 2}):
+        analysis = LogAnalyzer(str(log_dir), str(config_file), **kwargs)._cached_analysis
+        assert [len(matched) for _, matched in analysis] == [300, 33]
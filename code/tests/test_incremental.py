@@ -0,0 +1,137 @@
+"""
+Tests for log_analyzer.incremental, the checkpointed incremental / follow mode.
+
+Test Overview:
+    - test_only_appended_lines_are_processed: A second run only reads the appended lines; --count totals keep
+      growing.
+    - test_unterminated_last_line_matches_full_analysis: A one-shot run processes an unterminated last line like
+      a full analysis; the next run skips it while it is unchanged and reads it again (without counting it twice)
+      once it has grown.
+    - test_rotation_to_gzip_resumes_old_file: A file compressed to .gz resumes where it stopped and a new file
+      with the old name is read from the start.
+    - test_truncation_and_new_settings_restart: A truncated file is re-read and a checkpoint written for other
+      rules is discarded.
+    - test_follow_prints_only_new_matches: Follow mode prints the new matches of every pass; an unfinished last
+      line waits for its newline.
+"""
+
+import gzip
+import json
+from log_analyzer.analyzer import LogAnalyzer
+
+CONFIG = "EVENT --count\nEVENT --level ERROR"
+
+
+def _lines(start: int, stop: int) -> str:
+    """ Helper building lines start..stop-1; every fifth one is an ERROR."""
+    return "".join(f"2025-07-18T10:{i // 60:02d}:{i % 60:02d} {'ERROR' if i % 5 == 0 else 'INFO'} EVENT line {i}\n"
+                   for i in range(start, stop))
+
+
+def _setup(tmp_path, config: str = CONFIG):
+    """ Helper creating the log directory, events file and checkpoint path."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    events = tmp_path / "events.txt"
+    events.write_text(config)
+    return log_dir, str(events), str(tmp_path / "checkpoint.json")
+
+
+def _run(log_dir, events, checkpoint) -> tuple[int, list[str]]:
+    """ Helper running one incremental pass; returns the --count total and the new ERROR messages."""
+    (_, counted), (_, errors) = LogAnalyzer(str(log_dir), events, checkpoint=checkpoint)._cached_analysis
+    return len(counted), [entry.message for entry in errors]
+
+
+def test_only_appended_lines_are_processed(tmp_path):
+    """ A second run only reads the appended lines; --count totals keep growing."""
+    log_dir, events, checkpoint = _setup(tmp_path)
+    log = log_dir / "app.log"
+    log.write_text(_lines(0, 10))
+
+    assert _run(log_dir, events, checkpoint) == (10, ["line 0", "line 5"])
+    assert _run(log_dir, events, checkpoint) == (10, [])
+
+    with open(log, "a") as f:
+        f.write(_lines(10, 16))
+    assert _run(log_dir, events, checkpoint) == (16, ["line 10", "line 15"])
+    with open(checkpoint, encoding="utf-8") as f:
+        assert json.load(f)["counts"][0] == 16
+
+
+def test_unterminated_last_line_matches_full_analysis(tmp_path):
+    """ An unterminated last line is processed like a full analysis, and never counted twice."""
+    log_dir, events, checkpoint = _setup(tmp_path)
+    log = log_dir / "app.log"
+
+    def _full() -> tuple[int, list[str]]:
+        (_, counted), (_, errors) = LogAnalyzer(str(log_dir), events)._cached_analysis
+        return len(counted), [entry.message for entry in errors]
+
+    log.write_text(_lines(0, 3) + "2025-07-18T10:00:59 ERROR EVENT unfin")
+    assert _run(log_dir, events, checkpoint) == _full() == (4, ["line 0", "unfin"])
+    log.touch()
+    assert _run(log_dir, events, checkpoint) == (4, [])
+
+    with open(log, "a") as f:
+        f.write("ished")
+    assert _run(log_dir, events, checkpoint) == (4, ["unfinished"])
+    with open(log, "a") as f:
+        f.write("\n" + _lines(5, 6) + "not a log line")
+    assert _run(log_dir, events, checkpoint) == (5, ["line 5"])
+    with open(log, "a") as f:
+        f.write(" either\n2025-07-18T10:01:00 ERROR EVENT last")
+    assert _run(log_dir, events, checkpoint) == (6, ["last"])
+    assert _full()[0] == 6
+
+
+def test_rotation_to_gzip_resumes_old_file(tmp_path):
+    """ A file compressed to .gz resumes where it stopped; a new file with the old name starts over."""
+    log_dir, events, checkpoint = _setup(tmp_path)
+    log = log_dir / "app.log"
+    log.write_text(_lines(0, 20))
+    assert _run(log_dir, events, checkpoint)[0] == 20
+
+    # Lines written just before rotation, then logrotate-style compression and a fresh file
+    with open(log, "a") as f:
+        f.write(_lines(20, 26))
+    with gzip.open(log_dir / "app.log.1.gz", "wb") as f:
+        f.write(log.read_bytes())
+    log.unlink()
+    log.write_text(_lines(100, 103))
+
+    assert _run(log_dir, events, checkpoint) == (29, ["line 100", "line 20", "line 25"])
+    assert _run(log_dir, events, checkpoint) == (29, [])
+
+
+def test_truncation_and_new_settings_restart(tmp_path):
+    """ A truncated file is re-read and a checkpoint written for other rules is discarded."""
+    log_dir, events, checkpoint = _setup(tmp_path)
+    log = log_dir / "app.log"
+    log.write_text(_lines(0, 10))
+    assert _run(log_dir, events, checkpoint)[0] == 10
+
+    log.write_text(_lines(50, 53))   # Truncated and rewritten in place
+    assert _run(log_dir, events, checkpoint) == (13, ["line 50"])
+
+    with open(events, "w") as f:
+        f.write("EVENT --count --level INFO\nEVENT --level ERROR")
+    assert _run(log_dir, events, checkpoint) == (2, ["line 50"])
+
+
+def test_follow_prints_only_new_matches(tmp_path, monkeypatch, capsys):
+    """ Follow mode prints the new matches of every pass."""
+    log_dir, events, _ = _setup(tmp_path)
+    log = log_dir / "app.log"
+    log.write_text(_lines(0, 6) + "2025-07-18T10:00:59 ERROR EVENT unfin")
+
+    def _append(seconds):
+        with open(log, "a") as f:
+            f.write("ished\n" + _lines(6, 11))
+    monkeypatch.setattr("log_analyzer.analyzer.time.sleep", _append)
+
+    LogAnalyzer(str(log_dir), events).follow(interval=0, passes=2)
+    out = capsys.readouterr().out
+    assert out.count("Count of matches: 6") == 1 and out.count("Count of matches: 12") == 1
+    assert out.count("EVENT line 0") == 1 and out.count("EVENT line 10") == 1
+    assert out.count("EVENT unfinished") == 1 and "unfin\n" not in out
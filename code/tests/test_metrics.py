@@ -0,0 +1,115 @@
+"""
+Tests for log_analyzer.metrics and the --stats / --profile instrumentation.
+
+Test Overview:
+    - test_metrics_are_off_by_default: Without collect_metrics no metrics object exists.
+    - test_file_counters_and_rejection_reasons: Every thread mode records bytes and lines read, entries and
+      rejected lines by reason, per file and worker.
+    - test_rule_counters: Matches and regex evaluations are counted per rule; prefilter rejections run no regex.
+    - test_stages_report_and_profile: Stage timers are recorded, and the report and JSON profile hold the
+      counters.
+    - test_cli_stats_and_profile: --stats prints the report and --profile writes the JSON file.
+"""
+
+import json
+import sys
+import pytest
+import cli
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.timestamps import REJECT_REASONS
+
+LOG_LINES = [
+    "2025-07-18T10:00:02 INFO EVENT Iteration time: 1.5 sec",
+    "2025-07-18T10:00:00 ERROR EVENT request failed",
+    "2025-07-18T09:00:00 INFO EVENT Iteration time: 2.5 sec",
+    "2025-07-18T10:00:01 INFO EVENT no timing here",
+    "2025-07-18T10:00:03 INFO OTHER Iteration time: 3.5 sec",
+    "not a log line",
+    "2025-02-30T10:00:00 INFO EVENT impossible date",
+    "2999-01-01T00:00:00 INFO EVENT future",
+    "1800-01-01T00:00:00 INFO EVENT too old",
+]
+
+CONFIG = "EVENT --pattern time:\\s\\d\nEVENT --level ERROR\nOTHER --count --pattern ^Iteration"
+
+
+def _make_logs(tmp_path):
+    """ Helper writing the log directory (two files, the second one rejected entirely) and events file."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(LOG_LINES[:6]) + "\n")
+    (log_dir / "b.log").write_text("\n".join(LOG_LINES[6:]) + "\n")
+    config_file = tmp_path / "events.txt"
+    config_file.write_text(CONFIG)
+    return log_dir, str(config_file)
+
+
+def test_metrics_are_off_by_default(tmp_path):
+    """ Without collect_metrics no metrics object exists."""
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(str(log_dir), config_file)
+    analyzer.run()
+    assert analyzer.metrics is None
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"streaming": True}, {"columnar": True}])
+def test_file_counters_and_rejection_reasons(tmp_path, kwargs):
+    """ Bytes and lines read, entries and rejected lines by reason are recorded per file and worker."""
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(str(log_dir), config_file, ts_from="2025-07-18T09:30:00", collect_metrics=True, **kwargs)
+    analysis = analyzer._cached_analysis
+
+    metrics = analyzer.metrics
+    assert [len(matched) for _, matched in analysis] == [rule.matched for rule in metrics.rules]
+    assert sorted(f.path for f in metrics.files) == [str(log_dir / "a.log"), str(log_dir / "b.log")]
+    totals = metrics.totals()
+    size = sum(path.stat().st_size for path in log_dir.glob("*.log"))
+    # "not a log line" is skipped by the reader without being decoded: no rule can match it
+    assert (totals["files"], totals["bytes_read"], totals["lines_read"], totals["entries"]) == (2, size, 8, 4)
+    assert totals["rejected"] == {"format": 1, "future": 1, "too_old": 1, "out_of_range": 1}
+    assert list(totals["rejected"]) == list(REJECT_REASONS)
+    assert sum(worker["lines_read"] for worker in metrics.workers().values()) == 8
+
+
+def test_rule_counters(tmp_path):
+    """ Matches and regex evaluations are counted per rule; prefilter rejections run no regex."""
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(str(log_dir), config_file, collect_metrics=True)
+    analysis = analyzer._cached_analysis
+
+    rules = analyzer.metrics.rules
+    assert [rule.matched for rule in rules] == [len(matched) for _, matched in analysis] == [2, 1, 1]
+    # "time:" is required by the first pattern: the two EVENT messages without it never reach the regex
+    assert [rule.regex_evaluations for rule in rules] == [2, None, 1]
+
+
+def test_stages_report_and_profile(tmp_path):
+    """ Stage timers are recorded, and the report and JSON profile hold the counters."""
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(str(log_dir), config_file, collect_metrics=True)
+    analyzer.run()
+    analyzer.export(str(tmp_path / "out.json"))
+
+    assert set(analyzer.metrics.stages) == {"analyze", "match", "output"}
+    assert analyzer.metrics.stages["analyze"] >= analyzer.metrics.stages["match"] > 0
+    report = analyzer.metrics.report()
+    assert "lines read: 8, entries: 5" in report and "rule 1 (EVENT): matched=2, regex evaluations=2" in report
+
+    profile = tmp_path / "profile.json"
+    analyzer.metrics.write_json(str(profile))
+    data = json.loads(profile.read_text())
+    assert data["totals"]["rejected"]["format"] == 1 and len(data["files"]) == 2
+    assert data["rules"][2] == {"event_type": "OTHER", "matched": 1, "regex_evaluations": 1}
+
+
+def test_cli_stats_and_profile(tmp_path, monkeypatch, capsys):
+    """ --stats prints the report and --profile writes the JSON file."""
+    log_dir, config_file = _make_logs(tmp_path)
+    profile = tmp_path / "profile.json"
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(log_dir), config_file, "--output", str(tmp_path / "out.json"),
+                                      "--stats", "--profile", str(profile)])
+    cli.main()
+
+    output = capsys.readouterr().out
+    assert "Run statistics:" in output and "rejected: format=1, future=1, too_old=1, out_of_range=0" in output
+    assert json.loads(profile.read_text())["totals"]["lines_read"] == 8
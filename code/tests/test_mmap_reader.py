@@ -0,0 +1,81 @@
+"""
+Tests for log_analyzer.mmap_reader, the memory-mapped reader that only decodes candidate lines.
+
+Test Overview:
+    - test_field_filter_merges_levels: Rules on the same event type merge their levels; a level-less rule
+      accepts any level.
+    - test_only_candidate_lines_are_yielded: Lines whose raw event type / level no rule accepts are skipped.
+    - test_line_endings_and_edge_cases: CRLF and CR endings, leading spaces, empty files and byte ranges.
+    - test_analysis_unchanged_by_prefilter: The analyzer gives the same results as reading every line.
+"""
+
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.mmap_reader import READ_BLOCK, field_filter, iter_candidate_lines
+
+LINES = [
+    "2025-07-18T10:00:00 INFO EVENT First valid match",
+    "2025-07-18T10:00:01 ERROR EVENT Error line",
+    "2025-07-18T10:00:02 INFO OTHER Never decoded",
+    "2025-07-18T10:00:03 INFO ÉVÉNEMENT non-ascii event",
+    "this is invalid log line",
+    "2025-07-18T10:00:04 DEBUG LEVELED only debug wanted",
+    "2025-07-18T10:00:05 INFO LEVELED wrong level",
+]
+
+
+def test_field_filter_merges_levels():
+    """ Rules on the same event type merge their levels; a level-less rule accepts any level."""
+    wanted = field_filter([("A", "INFO"), ("A", "ERROR"), ("B", "INFO"), ("B", None), ("C", None), ("C", "X")])
+    assert wanted == {b"A": frozenset({b"INFO", b"ERROR"}), b"B": None, b"C": None}
+
+
+def test_only_candidate_lines_are_yielded(tmp_path):
+    """ Lines whose raw event type / level no rule accepts are skipped."""
+    path = tmp_path / "a.log"
+    path.write_text("\n".join(LINES), encoding="utf-8")
+    rules = [("EVENT", None), ("LEVELED", "DEBUG"), ("ÉVÉNEMENT", None)]
+
+    assert list(iter_candidate_lines(path, rules)) == [LINES[0], LINES[1], LINES[3], LINES[5]]
+    assert list(iter_candidate_lines(path, [])) == []
+
+
+def test_line_endings_and_edge_cases(tmp_path, monkeypatch):
+    """ CRLF and CR endings, leading spaces, empty files and byte ranges."""
+    path = tmp_path / "a.log"
+    path.write_bytes(b"2025-07-18T10:00:00 INFO EVENT crlf\r\n"
+                     b"2025-07-18T10:00:01 INFO EVENT cr\r"
+                     b"  2025-07-18T10:00:02 INFO EVENT leading spaces\n"
+                     b"2025-07-18T10:00:03 INFO OTHER skipped\n")
+    rules = [("EVENT", None)]
+    expected = ["2025-07-18T10:00:00 INFO EVENT crlf", "2025-07-18T10:00:01 INFO EVENT cr",
+                "  2025-07-18T10:00:02 INFO EVENT leading spaces"]
+    assert list(iter_candidate_lines(path, rules)) == expected
+
+    monkeypatch.setattr("log_analyzer.mmap_reader.READ_BLOCK", 16)
+    assert READ_BLOCK != 16
+    assert list(iter_candidate_lines(path, rules)) == expected
+    assert list(iter_candidate_lines(path, rules, start=37)) == expected[1:]
+
+    empty = tmp_path / "empty.log"
+    empty.write_bytes(b"")
+    assert list(iter_candidate_lines(empty, rules)) == []
+
+
+def test_analysis_unchanged_by_prefilter(tmp_path, monkeypatch):
+    """ The analyzer gives the same results as reading every line."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(LINES * 3), encoding="utf-8")
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("EVENT --count\nLEVELED --level DEBUG\nÉVÉNEMENT --count", encoding="utf-8")
+
+    def _results(**kwargs):
+        analysis = LogAnalyzer(str(log_dir), str(config_file), **kwargs)._cached_analysis
+        return [[str(e) for e in matched] if not cfg.count else len(matched) for cfg, matched in analysis]
+
+    prefiltered = [_results(), _results(columnar=True), _results(backend="process", jobs=2)]
+    monkeypatch.setattr("log_analyzer.streaming.iter_candidate_lines",
+                        lambda path, rules, start, end: iter(path.read_text(encoding="utf-8").splitlines()))
+    full = _results()
+    assert full[0] == 6 and len(full[1]) == 3 and full[2] == 3
+    assert all(result == full for result in prefiltered)
@@ -0,0 +1,93 @@
+"""
+Tests for log_analyzer.ordering and the time order of analysis results.
+
+Test Overview:
+    - test_merge_keeps_time_order_and_ties: K-way merges of entries and batch rows give time order, breaking ties
+      by file order and then by order inside the file.
+    - test_every_mode_gives_time_ordered_results: The default, columnar, cached and process modes give the same
+      time-ordered matches of jittered files, whichever file finishes first, with groups in events-file order.
+"""
+
+import re
+import time
+from datetime import datetime, timedelta
+import pytest
+from log_analyzer import analyzer as analyzer_module
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.log_entry import DEFAULT_TIMEZONE, LogEntry
+from log_analyzer.ordering import merge_batches, merge_entries, sort_entries, sorted_rows
+from log_analyzer.streaming import iter_file_entries
+
+START = datetime(2025, 7, 18, 10, 0, 0)
+CONFIG = "OTHER --level ERROR\nEVENT --pattern ^tick\nEVENT --count"
+
+
+def _entry(seconds, message):
+    """ Helper building an EVENT entry seconds after START."""
+    return LogEntry((START + timedelta(seconds=seconds)).replace(tzinfo=DEFAULT_TIMEZONE), "INFO", "EVENT", message)
+
+
+def test_merge_keeps_time_order_and_ties():
+    """ Merges give time order; ties keep file order, then the order inside the file."""
+    run_a = sort_entries([_entry(2, "a2"), _entry(0, "a0"), _entry(1, "a1-first"), _entry(1, "a1-second")])
+    run_b = sort_entries([_entry(1, "b1"), _entry(3, "b3")])
+    expected = ["a0", "a1-first", "a1-second", "b1", "a2", "b3"]
+    assert [entry.message for entry in merge_entries([run_a, run_b])] == expected
+
+    batch_a = EntryBatch.from_entries([_entry(2, "a2"), _entry(0, "a0"), _entry(1, "a1-first"),
+                                       _entry(1, "a1-second")], DEFAULT_TIMEZONE)
+    batch_b = EntryBatch.from_entries([_entry(3, "b3"), _entry(1, "b1")], DEFAULT_TIMEZONE)
+    target = EntryBatch(DEFAULT_TIMEZONE)
+    merge_batches(target, [(batch_a, sorted_rows(batch_a, range(4))), (batch_b, sorted_rows(batch_b, [0, 1]))])
+    assert [entry.message for entry in target] == expected
+
+
+def _make_logs(tmp_path):
+    """ Helper writing four files whose lines interleave in time, each with a few out-of-order lines."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    for file_no in range(4):
+        lines = []
+        for i in range(50):
+            seconds = i * 4 + file_no + (-7 if i % 9 == 5 else 0)   # Jitter: some lines arrive late
+            ts = (START + timedelta(seconds=seconds)).isoformat()
+            level = "ERROR" if i % 5 == 0 else "INFO"
+            lines.append(f"{ts} {level} {'OTHER' if i % 3 == 0 else 'EVENT'} tick {file_no}-{i}")
+        (log_dir / f"{file_no}.log").write_text("\n".join(lines) + "\n")
+    config_file = tmp_path / "events.txt"
+    config_file.write_text(CONFIG)
+    return str(log_dir), str(config_file)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"columnar": True}, {"cache_dir": "cache"}, {"cache_dir": "cache",
+                                    "columnar": True}, {"backend": "process", "jobs": 2}])
+def test_every_mode_gives_time_ordered_results(tmp_path, monkeypatch, kwargs):
+    """ Every mode gives the same time-ordered matches, whichever file finishes first; groups keep their order."""
+    log_dir, config_file = _make_logs(tmp_path)
+    if "cache_dir" in kwargs:
+        kwargs["cache_dir"] = str(tmp_path / kwargs["cache_dir"])
+
+    def _slow_first_file(path, *args):
+        """ Delays the first file so the others finish before it."""
+        if path.name == "0.log":
+            time.sleep(0.05)
+        return iter_file_entries(path, *args)
+    monkeypatch.setattr(analyzer_module, "iter_file_entries", _slow_first_file)
+
+    kwargs.setdefault("jobs", 4)
+    runs = [LogAnalyzer(log_dir, config_file, **kwargs)._cached_analysis for _ in range(2)]
+    for results in runs:
+        assert [(cfg.event_type, cfg.level, cfg.count) for cfg, _ in results] == [
+            ("OTHER", "ERROR", False), ("EVENT", None, False), ("EVENT", None, True)]
+        for cfg, matched in results[:2]:
+            timestamps = [entry.timestamp for entry in matched]
+            assert timestamps == sorted(timestamps) and len(timestamps) > 10
+    messages = [[entry.message for entry in matched] for _, matched in runs[0][:2]]
+    assert messages == [[entry.message for entry in matched] for _, matched in runs[1][:2]]
+
+    by_time = {}   # Expected order: time, then file name, then line
+    for message in messages[1]:
+        file_no, i = map(int, re.findall(r"\d+", message))
+        by_time[message] = (i * 4 + file_no + (-7 if i % 9 == 5 else 0), file_no, i)
+    assert messages[1] == sorted(messages[1], key=by_time.__getitem__)
@@ -0,0 +1,108 @@
+"""
+Tests for the process-pool backend (log_analyzer.parallel and LogAnalyzer(backend="process")).
+
+Test Overview:
+    - test_plan_chunks_cover_file_on_line_boundaries: Chunks are contiguous, cover the whole file and each
+      one ends right after a newline.
+    - test_plan_chunks_gzip_is_single_chunk: A .log.gz file is never split.
+    - test_chunk_lines_reassemble_file: Reading every chunk yields exactly the lines of the file.
+    - test_process_backend_matches_thread_backend: Counts and matched entries are identical to the default
+      backend, and entries keep file order.
+    - test_invalid_backend_raises: An unknown backend name raises a ValueError.
+    - test_invalid_jobs_and_mode_combinations_rejected: jobs < 1 and modes that cannot be combined raise a
+      ValueError (and are rejected by cli.py's argument parsing); supported combinations are accepted.
+"""
+
+import gzip
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.parallel import Chunk, WHOLE_FILE, iter_chunk_lines, plan_chunks
+
+LINES = [f"2025-07-18T10:{i // 60:02d}:{i % 60:02d} {'INFO' if i % 3 else 'ERROR'} EVENT message number {i}"
+         for i in range(200)]
+
+
+def test_plan_chunks_cover_file_on_line_boundaries(tmp_path):
+    """ Chunks are contiguous, cover the whole file and each one ends right after a newline."""
+    path = tmp_path / "big.log"
+    path.write_text("\n".join(LINES) + "\n")
+    data = path.read_bytes()
+
+    chunks = plan_chunks(path, chunk_size=500)
+    assert len(chunks) > 1
+    assert chunks[0].start == 0 and chunks[-1].end == len(data)
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert prev.end == nxt.start
+        assert data[prev.end - 1:prev.end] == b"\n"
+
+
+def test_plan_chunks_gzip_is_single_chunk(tmp_path):
+    """ A .log.gz file is never split."""
+    path = tmp_path / "big.log.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("\n".join(LINES))
+    assert plan_chunks(path, chunk_size=10) == [Chunk(str(path), 0, WHOLE_FILE)]
+
+
+def test_chunk_lines_reassemble_file(tmp_path):
+    """ Reading every chunk yields exactly the lines of the file."""
+    path = tmp_path / "big.log"
+    path.write_text("\n".join(LINES))  # No trailing newline on purpose
+    lines = [line for chunk in plan_chunks(path, chunk_size=333) for line in iter_chunk_lines(chunk)]
+    assert [line.rstrip("\n") for line in lines] == LINES
+
+
+def test_process_backend_matches_thread_backend(tmp_path, monkeypatch):
+    """ Counts and matched entries are identical to the default backend, and entries keep file order."""
+    monkeypatch.setattr("log_analyzer.parallel.CHUNK_SIZE", 700)
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(LINES))
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("EVENT --count\nEVENT --level ERROR\nEVENT --pattern number 1\\d$")
+
+    thread = LogAnalyzer(str(log_dir), str(config_file))._cached_analysis
+    process = LogAnalyzer(str(log_dir), str(config_file), backend="process", jobs=2)._cached_analysis
+
+    assert [len(matched) for _, matched in process] == [len(matched) for _, matched in thread]
+    for (_, t_matched), (_, p_matched) in list(zip(thread, process))[1:]:
+        assert [str(e) for e in p_matched] == [str(e) for e in t_matched]
+
+
+def test_invalid_backend_raises(tmp_path):
+    """ An unknown backend name raises a ValueError."""
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("EVENT --count")
+    with pytest.raises(ValueError, match="Invalid backend"):
+        LogAnalyzer(str(tmp_path), str(config_file), backend="gpu")
+
+
+def test_invalid_jobs_and_mode_combinations_rejected(tmp_path):
+    """ jobs < 1 and modes that cannot be combined are rejected; supported combinations are accepted."""
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("EVENT --count")
+    with pytest.raises(ValueError, match="Invalid --jobs"):
+        LogAnalyzer(str(tmp_path), str(config_file), jobs=0)
+    for kwargs in ({"backend": "process", "columnar": True}, {"streaming": True, "cache_dir": str(tmp_path)},
+                   {"checkpoint": str(tmp_path / "cp.json"), "use_index": True}):
+        with pytest.raises(ValueError, match="cannot be combined"):
+            LogAnalyzer(str(tmp_path), str(config_file), **kwargs)
+    for kwargs in ({"backend": "process", "streaming": True, "use_index": True, "jobs": 1},
+                   {"cache_dir": str(tmp_path), "columnar": True, "use_index": True}):
+        LogAnalyzer(str(tmp_path), str(config_file), **kwargs)
+
+    code_dir = Path(__file__).resolve().parent.parent
+    for args, error in ((["--jobs", "0"], "argument --jobs: must be a positive integer"),
+                        (["--stream", "--columnar"], "--columnar cannot be combined with --stream"),
+                        (["--follow", "--backend", "process"], "--backend process cannot be combined with --follow"),
+                        (["--cache", "cache", "--cache-size", "0"], "argument --cache-size: must be a positive integer"),
+                        (["--follow", "--interval", "0"], "argument --interval: must be a positive number"),
+                        (["--follow", "--interval", "nan"], "argument --interval: must be a positive number"),
+                        (["--follow", "--stats"], "--stats cannot be combined with --follow"),
+                        (["--follow", "--profile", "out.json"], "--profile cannot be combined with --follow")):
+        done = subprocess.run([sys.executable, "cli.py", str(tmp_path), str(config_file), *args], cwd=code_dir,
+                              capture_output=True, text=True)
+        assert done.returncode == 2 and error in done.stderr
@@ -0,0 +1,151 @@
+"""
+Tests for log_analyzer.result_cache and the cached analysis mode.
+
+Test Overview:
+    - test_cached_runs_match_uncached: Cold and warm cached runs (default and columnar) export the same JSON as an
+      uncached run, and a warm run reads no log file.
+    - test_only_stale_files_and_rules_are_recomputed: A changed file, a new rule or another time window only
+      recompute what their keys cover.
+    - test_lru_eviction_bounds_the_size: Entries beyond the size bound are evicted least recently used first,
+      and the index survives reopening the cache.
+    - test_future_lines_expire_entries: Results of a file holding future-dated lines expire once "now" reaches
+      the earliest of them.
+    - test_cli_cache: --cache / --cache-size create and reuse the cache.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+import pytest
+import cli
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.result_cache import INDEX_NAME, ResultCache
+from log_analyzer.timestamps import naive_epoch
+
+LOG_A = [
+    "2025-07-18T10:00:00 INFO EVENT Iteration time: 1.5 sec",
+    "2025-07-18T10:00:01 ERROR EVENT request failed",
+    "2025-07-18T10:00:02 INFO OTHER Iteration time: 3.5 sec",
+]
+LOG_B = [
+    "2025-07-18T11:00:00 INFO EVENT Iteration time: 2.5 sec",
+    "not a log line",
+    "2025-07-18T11:00:01 ERROR OTHER disk full",
+]
+
+CONFIG = ("EVENT --count\nEVENT --level ERROR\nOTHER --pattern ^Iteration\nEVENT --bucket 1h\n"
+          "EVENT --pattern time:\\s(\\d+) --stat 1")
+
+
+def _make_logs(tmp_path):
+    """ Helper writing the log directory (two files) and events file."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(LOG_A) + "\n")
+    (log_dir / "b.log").write_text("\n".join(LOG_B) + "\n")
+    config_file = tmp_path / "events.txt"
+    config_file.write_text(CONFIG)
+    return log_dir, str(config_file)
+
+
+def _run(tmp_path, log_dir, config_file, name, **kwargs):
+    """ Helper exporting an analysis to JSON; returns the exported data and the names of the files read."""
+    analyzer = LogAnalyzer(str(log_dir), config_file, collect_metrics=True, **kwargs)
+    analyzer.export_to_json(str(tmp_path / f"{name}.json"))
+    read = sorted(os.path.basename(f.path) for f in analyzer.metrics.files)
+    return json.loads((tmp_path / f"{name}.json").read_text()), read
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_cached_runs_match_uncached(tmp_path, columnar):
+    """ Cold and warm cached runs export the same JSON as an uncached run; a warm run reads no log file."""
+    log_dir, config_file = _make_logs(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    expected, _ = _run(tmp_path, log_dir, config_file, "plain", columnar=columnar)
+
+    cold, cold_read = _run(tmp_path, log_dir, config_file, "cold", columnar=columnar, cache_dir=cache_dir)
+    warm, warm_read = _run(tmp_path, log_dir, config_file, "warm", columnar=columnar, cache_dir=cache_dir)
+    assert cold == warm == expected
+    assert (cold_read, warm_read) == (["a.log", "b.log"], [])
+    assert len(ResultCache(cache_dir)) == 10
+
+
+def test_only_stale_files_and_rules_are_recomputed(tmp_path):
+    """ A changed file, a new rule or another time window only recompute what their keys cover."""
+    log_dir, config_file = _make_logs(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    _run(tmp_path, log_dir, config_file, "first", cache_dir=cache_dir)
+
+    with open(log_dir / "b.log", "a") as f:
+        f.write("2025-07-18T11:00:02 ERROR EVENT appended\n")
+    data, read = _run(tmp_path, log_dir, config_file, "changed", cache_dir=cache_dir)
+    assert read == ["b.log"]
+    assert [len(group["entries"]) for group in data][:2] == [4, 2]
+
+    (tmp_path / "events.txt").write_text(CONFIG + "\nOTHER --level ERROR")
+    analyzer = LogAnalyzer(str(log_dir), config_file, collect_metrics=True, cache_dir=cache_dir)
+    results = analyzer._cached_analysis
+    assert len(analyzer.metrics.files) == 2 and analyzer.cache.hits == 10 and analyzer.cache.misses == 2
+    assert [entry.message for entry in results[-1][1]] == ["disk full"]
+
+    _, read = _run(tmp_path, log_dir, config_file, "window", cache_dir=cache_dir, ts_from="2025-07-18T10:30:00")
+    assert read == ["a.log", "b.log"]
+
+
+def test_lru_eviction_bounds_the_size(tmp_path):
+    """ Entries beyond the size bound are evicted least recently used first; the index survives reopening."""
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(str(log_dir), config_file)
+    ev_config, matched = analyzer._cached_analysis[1]
+    cache = ResultCache(str(tmp_path / "cache"))
+    for key in ("a", "b", "c"):
+        cache.put(key, ev_config, matched, analyzer.local_timezone)
+    entry_size = cache.size // 3
+
+    assert [entry.message for entry in cache.get("a")] == ["request failed"]   # "a" is now the most recent
+    cache.max_bytes = 3 * entry_size   # Room for a, c and the smaller d
+    cache.put("d", ev_config, [], analyzer.local_timezone)
+    assert "b" not in cache and "c" in cache and "a" in cache and cache.size <= cache.max_bytes
+    assert not (tmp_path / "cache" / "b.cols").exists()
+    cache.save()
+
+    reopened = ResultCache(str(tmp_path / "cache"))
+    assert list(reopened._entries) == list(cache._entries) and reopened.get("b") is None
+    (tmp_path / "cache" / INDEX_NAME).write_text("not json")
+    assert len(ResultCache(str(tmp_path / "cache"))) == 0
+
+
+def test_future_lines_expire_entries(tmp_path):
+    """ Results of a file holding future-dated lines expire once "now" reaches the earliest of them."""
+    log_dir, config_file = _make_logs(tmp_path)
+    with open(log_dir / "a.log", "a") as f:
+        f.write("2999-01-01T00:00:00 INFO EVENT future\n2998-01-01T00:00:00 INFO EVENT future\n")
+    cache_dir = str(tmp_path / "cache")
+    _run(tmp_path, log_dir, config_file, "first", cache_dir=cache_dir)
+    _, read = _run(tmp_path, log_dir, config_file, "second", cache_dir=cache_dir)
+    assert read == []
+
+    cache = ResultCache(cache_dir)
+    earliest = naive_epoch(datetime(2998, 1, 1))
+    assert sorted(expires or 0 for _, expires in cache._entries.values()) == [0] * 5 + [earliest] * 5
+    key = next(key for key, (_, expires) in cache._entries.items() if expires)
+    assert cache.get(key, earliest - 1) is not None and cache.get(key, earliest) is None
+
+
+def test_cli_cache(tmp_path, monkeypatch, capsys):
+    """ --cache / --cache-size create and reuse the cache."""
+    log_dir, config_file = _make_logs(tmp_path)
+    cache_dir = tmp_path / "cache"
+    argv = ["cli.py", str(log_dir), config_file, "--output", str(tmp_path / "out.json"), "--cache", str(cache_dir),
+            "--cache-size", "1"]
+    monkeypatch.setattr(sys, "argv", argv)
+    cli.main()
+    first = (tmp_path / "out.json").read_text()
+    assert (cache_dir / INDEX_NAME).exists()
+
+    monkeypatch.setattr(LogEntry, "parse_batch", None)   # A warm run parses nothing
+    cli.main()
+    assert (tmp_path / "out.json").read_text() == first
+    assert "Count of matches: 3" in capsys.readouterr().out
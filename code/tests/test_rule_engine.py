@@ -0,0 +1,83 @@
+"""
+Tests for RuleEngine, the compiled single-pass dispatcher that replaces running one EventFilter per config.
+
+Test Overview:
+    - test_match_agrees_with_event_filter: For every entry and every rule, RuleEngine.match gives exactly the
+      same answer as EventFilter.matches.
+    - test_unknown_event_type_has_no_candidates: Entries whose event_type no rule mentions are rejected
+      without evaluating any pattern.
+    - test_candidates_are_in_config_order: Level-less and level-specific rules are merged in events-file order.
+    - test_prefix_buckets_give_same_matches: Bucketing anchored patterns by prefix (including prefixes of each
+      other and rules without a prefix) gives the same matches as running every regex.
+"""
+
+import re
+from datetime import datetime
+from log_analyzer.event_config import EventConfig
+from log_analyzer.event_filter import EventFilter
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.rule_engine import RuleEngine
+
+
+def _make_entry(event_type: str, level: str, message: str) -> LogEntry:
+    """ Helper to create a basic LogEntry """
+    return LogEntry(timestamp=datetime.now(), level=level, event_type=event_type, message=message)
+
+
+CONFIGS = [
+    EventConfig(event_type="EVENT", count=True, level=None, pattern=None),
+    EventConfig(event_type="EVENT", count=False, level="INFO", pattern=None),
+    EventConfig(event_type="EVENT", count=False, level=None, pattern=re.compile(r"^Another")),
+    EventConfig(event_type="EVENT", count=False, level="ERROR", pattern=re.compile(r"disk")),
+    EventConfig(event_type="OTHER", count=True, level="INFO", pattern=re.compile(r"\d+ items")),
+]
+
+
+def test_match_agrees_with_event_filter():
+    """ For every entry and every rule, RuleEngine.match gives exactly the same answer as EventFilter.matches."""
+    entries = [
+        _make_entry("EVENT", "INFO", "First valid match"),
+        _make_entry("EVENT", "INFO", "Another valid match"),
+        _make_entry("EVENT", "ERROR", "disk full"),
+        _make_entry("EVENT", "DEBUG", "Another debug line"),
+        _make_entry("OTHER", "INFO", "3 items queued"),
+        _make_entry("OTHER", "WARNING", "3 items queued"),
+        _make_entry("UNKNOWN", "INFO", "Another disk"),
+    ]
+    engine = RuleEngine(CONFIGS)
+    filters = [EventFilter(cfg) for cfg in CONFIGS]
+
+    for entry in entries:
+        expected = [idx for idx, flt in enumerate(filters) if flt.matches(entry)]
+        assert engine.match(entry) == expected
+
+
+def test_unknown_event_type_has_no_candidates():
+    """ Entries whose event_type no rule mentions are rejected without evaluating any pattern."""
+    engine = RuleEngine(CONFIGS)
+    assert engine.candidates("UNKNOWN", "INFO") == ()
+    assert engine.event_types == {"EVENT", "OTHER"}
+
+
+def test_candidates_are_in_config_order():
+    """ Level-less and level-specific rules are merged in events-file order."""
+    engine = RuleEngine(CONFIGS)
+    assert [idx for idx, _ in engine.candidates("EVENT", "INFO")] == [0, 1, 2]
+    assert [idx for idx, _ in engine.candidates("EVENT", "ERROR")] == [0, 2, 3]
+
+
+def test_prefix_buckets_give_same_matches():
+    """ Bucketing anchored patterns by prefix gives the same matches as running every regex."""
+    patterns = [r"^connection timeout at\s.+$", r"^connect", r"^conn", r"timeout", None, r"^rate limit \d+$",
+                r"^data corruption", r"\d+ items$", r"^connection timeout at endpoint A$"]
+    configs = [EventConfig(event_type="GNMI", count=False, level="ERROR" if i % 2 else None,
+                           pattern=re.compile(pattern) if pattern else None) for i, pattern in enumerate(patterns)]
+    messages = ["connection timeout at endpoint A", "connect", "con", "conn", "", "rate limit 3", "rate limit x",
+                "data corruption detected", "timeout connecting", "3 items", "connection refused", "c"]
+
+    engine, reference = RuleEngine(configs), RuleEngine(configs, use_prefilter=False)
+    assert engine.dispatch("GNMI", "ERROR").by_head is not None
+    for level in ("ERROR", "INFO"):
+        for message in messages:
+            entry = _make_entry("GNMI", level, message)
+            assert engine.match(entry) == reference.match(entry), (level, message)
@@ -0,0 +1,247 @@
+"""
+Tests for log_analyzer.server, the analysis server with a warm in-memory index.
+
+Test Overview:
+    - test_queries_match_the_analyzer: Queries, with and without a --from/--to window, give the same document as
+      exporting a LogAnalyzer run.
+    - test_refresh_follows_the_directory: Appended lines are indexed (a partial last line is parsed again once it
+      grows), replaced and gzip files are parsed again, removed files are dropped, and many appends are
+      compacted into one segment.
+    - test_carriage_return_lines: Lines ending in a lone \\r are split as in text mode, on the first parse and on
+      appends.
+    - test_http_endpoints: /query and /status over HTTP, and the 400 / 404 answers.
+    - test_malformed_queries_get_400: An invalid --pattern regex, a body that is not UTF-8 and a bad Content-Length
+      are answered with 400, and the server keeps answering.
+    - test_unix_socket: The server answers queries on a Unix socket.
+"""
+
+import gzip
+import http.client
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+from io import StringIO
+import pytest
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.exporter import write_results
+from log_analyzer.log_entry import DEFAULT_TIMEZONE
+from log_analyzer.server import MAX_SEGMENTS, AnalysisServer
+
+START = datetime(2025, 7, 18, 10, 0, 0)
+EVENTS = ("EVENT\nEVENT --level ERROR --pattern took.[12]ms\nEVENT --count\nOTHER --bucket 1m --group-by level\n"
+          "EVENT --pattern took.(\\d+)ms --stat 1\nEVENT --tail 3\n")
+
+
+def _line(seconds: int, level: str, event_type: str, message: str) -> str:
+    """ Helper formatting a log line seconds after START."""
+    return f"{(START + timedelta(seconds=seconds)).isoformat()} {level} {event_type} {message}\n"
+
+
+def _lines(first: int, count: int, step: int = 1) -> str:
+    """ Helper building count lines of alternating event types and levels."""
+    return "".join(_line(first + i * step, "ERROR" if i % 3 == 0 else "INFO", "EVENT" if i % 4 else "OTHER",
+                         f"request {first + i} took {i % 5}ms") for i in range(count))
+
+
+def _make_logs(tmp_path):
+    """ Helper writing an out-of-order plain file, an interleaved one, a gzip file and the events file."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    lines = _lines(0, 40, 2).splitlines(keepends=True)
+    lines[3], lines[9] = lines[9], lines[3]
+    (log_dir / "a.log").write_text("".join(lines) + "not a log line\n")
+    (log_dir / "b.log").write_text(_lines(1, 40, 2))
+    with gzip.open(log_dir / "c.log.gz", "wt") as f:
+        f.write(_lines(30, 10))
+    (tmp_path / "events.txt").write_text(EVENTS)
+    return str(log_dir), str(tmp_path / "events.txt")
+
+
+def _document(results, fmt: str = "json") -> str:
+    """ Helper writing results as the exporter does."""
+    out = StringIO()
+    write_results(results, out, DEFAULT_TIMEZONE, fmt)
+    return out.getvalue()
+
+
+def _exported(tmp_path, log_dir: str, config_file: str, **kwargs) -> str:
+    """ Helper exporting a LogAnalyzer run as JSON."""
+    path = tmp_path / "expected.json"
+    LogAnalyzer(log_dir, config_file, local_timezone=DEFAULT_TIMEZONE, **kwargs).export(str(path), "json")
+    return path.read_text(encoding="utf-8")
+
+
+def test_queries_match_the_analyzer(tmp_path):
+    """ Queries give the same document as a LogAnalyzer export, with and without a window."""
+    log_dir, config_file = _make_logs(tmp_path)
+    server = AnalysisServer([log_dir], DEFAULT_TIMEZONE)
+    server.refresh()
+
+    assert _document(server.query(EVENTS)) == _exported(tmp_path, log_dir, config_file)
+    ts_from, ts_to = (START + timedelta(seconds=11)).isoformat(), (START + timedelta(seconds=33)).isoformat()
+    assert _document(server.query(EVENTS, log_dir, ts_from, ts_to)) \
+        == _exported(tmp_path, log_dir, config_file, ts_from=ts_from, ts_to=ts_to)
+    assert server.status()[log_dir]["entries"] == 90
+
+    with pytest.raises(ValueError):
+        server.query("EVENT --level", log_dir)
+    with pytest.raises(ValueError):
+        server.query(EVENTS, ts_from="yesterday")
+    with pytest.raises(ValueError):
+        server.query(EVENTS, str(tmp_path))
+
+
+def test_refresh_follows_the_directory(tmp_path):
+    """ Appends, partial lines, replaced / gzip / removed files and compaction are followed."""
+    log_dir, config_file = _make_logs(tmp_path)
+    server = AnalysisServer([log_dir], DEFAULT_TIMEZONE)
+    server.refresh()
+    index = server.indexes[log_dir]
+    logs = tmp_path / "logs"
+
+    with open(logs / "b.log", "a") as f:
+        f.write(_lines(100, 5) + _line(200, "INFO", "EVENT", "partial")[:-1])
+    server.refresh()
+    assert index.status()["entries"] == 96
+    assert _document(server.query(EVENTS)) == _exported(tmp_path, log_dir, config_file)
+    with open(logs / "b.log", "a") as f:
+        f.write(" line")
+    server.refresh()
+    assert index.status()["entries"] == 96
+    assert _document(server.query(EVENTS)) == _exported(tmp_path, log_dir, config_file)
+    with open(logs / "b.log", "a") as f:
+        f.write("\n")
+    server.refresh()
+    assert index.status()["entries"] == 96
+    assert _document(server.query(EVENTS)) == _exported(tmp_path, log_dir, config_file)
+
+    (logs / "a.log").write_text(_lines(0, 3))
+    with gzip.open(logs / "c.log.gz", "wt") as f:
+        f.write(_lines(50, 2))
+    (logs / "d.log").write_text(_lines(300, 4))
+    server.refresh()
+    assert index.status()["entries"] == 3 + 46 + 2 + 4
+    assert _document(server.query(EVENTS)) == _exported(tmp_path, log_dir, config_file)
+
+    (logs / "d.log").unlink()
+    for i in range(MAX_SEGMENTS):
+        with open(logs / "a.log", "a") as f:
+            f.write(_lines(10 - i, 2, 7))
+        server.refresh()
+    assert index.status()["segments"] == 1 + 3 + 1
+    assert _document(server.query(EVENTS)) == _exported(tmp_path, log_dir, config_file)
+
+
+def test_carriage_return_lines(tmp_path):
+    """ Lone \\r line endings split entries, as the analyzer reads them."""
+    log_dir, config_file = _make_logs(tmp_path)
+    logs = tmp_path / "logs"
+    (logs / "b.log").write_bytes(_lines(1, 40, 2).replace("\n", "\r").encode())
+    server = AnalysisServer([log_dir], DEFAULT_TIMEZONE)
+    server.refresh()
+    assert server.status()[log_dir]["entries"] == 90
+    assert _document(server.query(EVENTS)) == _exported(tmp_path, log_dir, config_file)
+
+    with open(logs / "b.log", "ab") as f:
+        f.write(_lines(100, 5).replace("\n", "\r").encode())
+    server.refresh()
+    assert server.status()[log_dir]["entries"] == 95
+    assert _document(server.query(EVENTS)) == _exported(tmp_path, log_dir, config_file)
+
+
+def _serve(server: AnalysisServer, **kwargs):
+    """ Helper running an HTTP server of the analysis server in a thread."""
+    httpd = server.make_server(**kwargs)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    return httpd, thread
+
+
+def test_http_endpoints(tmp_path):
+    """ /query and /status answer over HTTP; bad queries get 400 and unknown paths 404."""
+    log_dir, config_file = _make_logs(tmp_path)
+    server = AnalysisServer([log_dir], DEFAULT_TIMEZONE)
+    server.refresh()
+    httpd, thread = _serve(server, port=0)
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        ts_to = (START + timedelta(seconds=20)).isoformat()
+        with urllib.request.urlopen(f"{base}/query?to={ts_to}", data=EVENTS.encode()) as response:
+            assert response.headers["Content-Type"].startswith("application/json")
+            assert response.read().decode() == _exported(tmp_path, log_dir, config_file, ts_to=ts_to)
+        with urllib.request.urlopen(f"{base}/query?format=ndjson&logs={log_dir}", data=EVENTS.encode()) as response:
+            assert response.read().decode() == _document(server.query(EVENTS), "ndjson")
+        with urllib.request.urlopen(f"{base}/status") as response:
+            assert json.loads(response.read())[log_dir]["files"] == 3
+
+        for path, data, status in (("/query?format=xml", EVENTS, 400), ("/query", "EVENT --count 3 4", 400),
+                                   ("/query?from=soon", EVENTS, 400), ("/other", EVENTS, 404), ("/", None, 404)):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(base + path, data=data.encode() if data else None)
+            assert error.value.code == status and "error" in json.loads(error.value.read())
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+
+
+def test_malformed_queries_get_400(tmp_path):
+    """ Invalid regexes, non-UTF-8 bodies and bad Content-Length headers are answered with 400."""
+    log_dir, config_file = _make_logs(tmp_path)
+    server = AnalysisServer([log_dir], DEFAULT_TIMEZONE)
+    server.refresh()
+    httpd, thread = _serve(server, port=0)
+    try:
+        for body, headers in ((b"LOGIN --pattern (", {}), (b"EVENT --pattern \xff", {}),
+                              (b"EVENT", {"Content-Length": "-1"}), (b"EVENT", {"Content-Length": "many"})):
+            connection = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1])
+            connection.putrequest("POST", "/query")
+            for name, value in {"Content-Length": str(len(body)), **headers}.items():
+                connection.putheader(name, value)
+            connection.endheaders(body)
+            response = connection.getresponse()
+            assert response.status == 400 and "error" in json.loads(response.read())
+            connection.close()
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{httpd.server_address[1]}/query",
+                                    data=EVENTS.encode()) as response:
+            assert response.read().decode() == _exported(tmp_path, log_dir, config_file)
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    """ An HTTP client connection over a Unix socket."""
+    def __init__(self, path: str):
+        super().__init__("localhost")
+        self.socket_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available")
+def test_unix_socket(tmp_path):
+    """ The server answers queries on a Unix socket."""
+    log_dir, config_file = _make_logs(tmp_path)
+    server = AnalysisServer([log_dir], DEFAULT_TIMEZONE)
+    server.refresh()
+    socket_path = str(tmp_path / "server.sock")
+    httpd, thread = _serve(server, socket_path=socket_path)
+    try:
+        connection = _UnixConnection(socket_path)
+        connection.request("POST", "/query", body=EVENTS.encode())
+        assert connection.getresponse().read().decode() == _exported(tmp_path, log_dir, config_file)
+        connection.request("GET", "/status")
+        assert json.loads(connection.getresponse().read())[log_dir]["entries"] == 90
+        connection.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
@@ -0,0 +1,84 @@
+"""
+Tests for log_analyzer.sketch, the mergeable quantile sketch.
+
+Test Overview:
+    - test_quantiles_within_relative_accuracy: Quantiles of positive, negative and zero values are within the
+      relative accuracy of the exact ones.
+    - test_merge_equals_single_sketch: Merging sketches of parts equals sketching the whole; sketches of another
+      accuracy are rejected.
+    - test_state_round_trip: A sketch rebuilt from its state answers the same quantiles.
+    - test_heavy_hitters_bounds: HeavyHitters keeps every frequent item, with counts that overestimate by at
+      most their error; merged sketches keep the same guarantee and survive a state round trip.
+"""
+
+import random
+import pytest
+from log_analyzer.sketch import HeavyHitters, QuantileSketch
+
+
+def _exact(values: list[float], q: float) -> float:
+    """ Helper returning the exact q-quantile with the sketch's rank convention."""
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    """ Quantiles are within the relative accuracy of the exact ones."""
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 2) for _ in range(5000)] + [-rng.uniform(1, 50) for _ in range(500)] + [0.0] * 50
+    sketch = QuantileSketch()
+    for value in values + [float("nan")]:
+        sketch.add(value)
+
+    assert sketch.count == len(values)
+    for q in (0.0, 0.05, 0.091, 0.5, 0.9, 0.99, 1.0):
+        exact = _exact(values, q)
+        assert abs(sketch.quantile(q) - exact) <= sketch.relative_accuracy * abs(exact)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_merge_equals_single_sketch():
+    """ Merging sketches of parts equals sketching the whole; other accuracies are rejected."""
+    values = [i * 0.37 for i in range(1, 3000)]
+    whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (first if i % 3 else second).add(value)
+    first.merge(second)
+    assert sorted(first.state()["positive"]) == sorted(whole.state()["positive"]) and first.count == whole.count
+    assert [first.quantile(q) for q in (0.1, 0.5, 0.99)] == [whole.quantile(q) for q in (0.1, 0.5, 0.99)]
+
+    with pytest.raises(ValueError):
+        first.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_state_round_trip():
+    """ A sketch rebuilt from its state answers the same quantiles, also after folding buckets."""
+    sketch = QuantileSketch(max_buckets=16)
+    for i in range(1, 1000):
+        sketch.add(i ** 2)
+    rebuilt = QuantileSketch.from_state(sketch.state())
+    assert rebuilt.count == sketch.count == 999
+    assert [rebuilt.quantile(q) for q in (0.0, 0.5, 1.0)] == [sketch.quantile(q) for q in (0.0, 0.5, 1.0)]
+    assert sketch.quantile(1.0) == pytest.approx(998 ** 2, rel=sketch.relative_accuracy)
+
+
+def test_heavy_hitters_bounds():
+    """ Frequent items are kept with counts within their error; merging and state round trips keep that."""
+    rng = random.Random(3)
+    items = [f"hot{i}" for i in range(5) for _ in range(200 * (i + 1))] + [f"cold{rng.randrange(2000)}"
+                                                                          for _ in range(3000)]
+    rng.shuffle(items)
+    exact = {item: items.count(item) for item in set(items)}
+
+    whole, left, right = HeavyHitters(50), HeavyHitters(50), HeavyHitters(50)
+    for i, item in enumerate(items):
+        whole.add(item)
+        (left if i % 2 else right).add(item)
+    left.merge(HeavyHitters.from_state(right.state()))
+
+    for sketch in (whole, left):
+        assert sketch.total == len(items)
+        top = sketch.top(5)
+        assert [item for item, _, _ in top] == [f"hot{i}" for i in range(4, -1, -1)]
+        for item, count, error in top:
+            assert count - error <= exact[item] <= count
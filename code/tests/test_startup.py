@@ -0,0 +1,87 @@
+"""
+Tests for the lazy imports of cli.py and log_analyzer, and for the parsing of benchmarks.bench_startup.
+
+Test Overview:
+    - test_cli_import_loads_no_analysis_module: Importing cli.py and answering --help only load log_analyzer.defaults.
+    - test_run_loads_only_its_mode: A default run over plain logs loads no module of the other modes (processes,
+      checkpoints, result cache, index, gzip, thread pool, NumPy); those load on the paths that need them.
+    - test_parse_importtime: The -X importtime report is parsed into modules, times and nesting depths.
+"""
+
+import gzip
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from benchmarks.bench_startup import parse_importtime
+
+CODE_DIR = Path(__file__).resolve().parent.parent
+OTHER_MODES = ("log_analyzer.parallel", "log_analyzer.incremental", "log_analyzer.result_cache",
+               "log_analyzer.columnar_file", "log_analyzer.file_index", "log_analyzer.gzip_reader", "gzip",
+               "concurrent.futures", "multiprocessing", "tempfile", "numpy")
+
+_RUN = """
+import contextlib, io, runpy, sys
+sys.argv = ["cli.py", *sys.argv[1:]]
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        runpy.run_path("cli.py", run_name="__main__")
+    except SystemExit:
+        pass
+print(" ".join(sys.modules))
+"""
+
+
+def _loaded(*args: str) -> set[str]:
+    """ Helper running cli.py with args in a fresh interpreter; returns the modules it loaded."""
+    done = subprocess.run([sys.executable, "-c", _RUN, *args], cwd=CODE_DIR, capture_output=True, text=True,
+                          check=True)
+    return set(done.stdout.split())
+
+
+def _make_logs(tmp_path, compress: bool = False) -> list[str]:
+    """ Helper writing two small log files and an events file; returns the cli.py arguments analyzing them."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir(parents=True)
+    start = datetime(2025, 7, 18, 10, 0, 0)
+    for i in range(2):
+        text = "".join(f"{(start + timedelta(seconds=j)).isoformat()} INFO EVENT request {j}\n" for j in range(20))
+        if compress and i:
+            (log_dir / f"{i}.log.gz").write_bytes(gzip.compress(text.encode()))
+        else:
+            (log_dir / f"{i}.log").write_text(text)
+    (tmp_path / "events.txt").write_text("EVENT\nEVENT --count\n")
+    return [str(log_dir), str(tmp_path / "events.txt"), "--output", str(tmp_path / "out.json")]
+
+
+def test_cli_import_loads_no_analysis_module():
+    """ Importing cli.py and answering --help only load log_analyzer.defaults."""
+    done = subprocess.run([sys.executable, "-c", "import cli, sys; print(' '.join(sys.modules))"], cwd=CODE_DIR,
+                          capture_output=True, text=True, check=True)
+    for modules in (set(done.stdout.split()), _loaded("--help")):
+        assert {name for name in modules if name.startswith("log_analyzer")} == {"log_analyzer",
+                                                                               "log_analyzer.defaults"}
+
+
+def test_run_loads_only_its_mode(tmp_path):
+    """ A default run loads no module of the other modes; they load on the paths that need them."""
+    args = _make_logs(tmp_path)
+    loaded = _loaded(*args, "--jobs", "1")
+    assert "log_analyzer.analyzer" in loaded and (tmp_path / "out.json").exists()
+    assert not loaded.intersection(OTHER_MODES)
+
+    assert "concurrent.futures" in _loaded(*args, "--jobs", "2")
+    assert "log_analyzer.result_cache" in _loaded(*args, "--cache", str(tmp_path / "cache"))
+    assert "log_analyzer.columnar_file" in _loaded(*args, "--format", "columnar")
+    assert "log_analyzer.incremental" in _loaded(*args, "--checkpoint", str(tmp_path / "checkpoint.json"))
+    assert "log_analyzer.gzip_reader" in _loaded(*_make_logs(tmp_path / "gz", compress=True), "--jobs", "1")
+
+
+def test_parse_importtime():
+    """ The -X importtime report is parsed into modules, times and nesting depths."""
+    report = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |     _io\n"
+              "import time:       300 |        420 |   io\n"
+              "import time:        50 |        470 | cli\n"
+              "Hi! Welcome\n")
+    assert parse_importtime(report) == [("_io", 120, 120, 2), ("io", 300, 420, 1), ("cli", 50, 470, 0)]
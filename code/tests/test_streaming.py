@@ -0,0 +1,148 @@
+"""
+Tests for the streaming analysis mode (log_analyzer.streaming and LogAnalyzer(streaming=True)).
+
+Test Overview:
+    - test_iter_file_entries_skips_invalid_and_out_of_range: The per-file generator drops invalid lines and
+      entries outside the timestamp parser's --from/--to window.
+    - test_count_rule_keeps_only_an_integer: --count rules are backed by CountedMatches, not stored entries.
+    - test_spooled_matches_replay: Spooled matches can be replayed more than once and keep accepting new ones;
+      leaving their with block deletes the spool file.
+    - test_streaming_output_matches_batch_output: run() prints exactly the same report in both modes.
+    - test_streaming_export_matches_batch_export: export_to_json writes the same non-count entries in both modes.
+    - test_close_deletes_spools: Leaving the analyzer's with block closes every spool file, for the thread and
+      process backends, and a later run analyzes again. A failing streaming analysis closes the spools it opened.
+"""
+
+import gzip
+import json
+import sys
+from datetime import datetime
+from io import StringIO
+import pytest
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.log_entry import LogEntry, DEFAULT_TIMEZONE
+from log_analyzer.streaming import CountedMatches, SpooledMatches, iter_file_entries
+from log_analyzer.timestamps import TimestampParser
+
+LOG_LINES = [
+    "2025-07-18T10:00:00 INFO EVENT First valid match",
+    "this is invalid log line",
+    "2025-07-18T11:00:00 INFO EVENT Another valid match",
+    "2025-07-18T12:00:00 DEBUG EVENT Should not match level INFO",
+    "2025-07-18T13:00:00 INFO OTHER Should be ignored",
+]
+
+CONFIG_LINES = [
+    "EVENT --count",
+    "EVENT --pattern ^Another.*",
+    "EVENT --level INFO",
+    "OTHER --count --level INFO",
+]
+
+
+def _make_logs(tmp_path):
+    """ Helper that writes a plain and a gzip log file plus an events file, returning their paths."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "a.log").write_text("\n".join(LOG_LINES))
+    with gzip.open(log_dir / "b.log.gz", "wt", encoding="utf-8") as f:
+        f.write("\n".join(LOG_LINES[:3]))
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("\n".join(CONFIG_LINES))
+    return log_dir, config_file
+
+
+def _run_output(analyzer: LogAnalyzer) -> str:
+    """ Helper that captures the console output of analyzer.run()."""
+    saved_stdout = sys.stdout
+    try:
+        sys.stdout = StringIO()
+        analyzer.run()
+        return sys.stdout.getvalue()
+    finally:
+        sys.stdout = saved_stdout
+
+
+def test_iter_file_entries_skips_invalid_and_out_of_range(tmp_path):
+    """ The per-file generator drops invalid lines and entries outside the timestamp parser's window."""
+    log_dir, _ = _make_logs(tmp_path)
+    ts_parser = TimestampParser(DEFAULT_TIMEZONE, ts_to=datetime.fromisoformat("2025-07-18T11:00:00"))
+    entries = list(iter_file_entries(log_dir / "a.log", ts_parser))
+    assert [e.message for e in entries] == ["First valid match", "Another valid match"]
+
+
+def test_count_rule_keeps_only_an_integer(tmp_path):
+    """ --count rules are backed by CountedMatches, not stored entries."""
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(str(log_dir), str(config_file), streaming=True)
+    results = analyzer._cached_analysis
+
+    assert isinstance(results[0][1], CountedMatches)
+    assert len(results[0][1]) == 5
+    assert list(results[0][1]) == []
+    assert isinstance(results[1][1], SpooledMatches)
+    assert len(results[1][1]) == 2
+
+
+def test_spooled_matches_replay():
+    """ Spooled matches can be replayed more than once and keep accepting new ones."""
+    with SpooledMatches("EVENT") as spool:
+        spool.add(LogEntry.parse_line("2025-07-18T10:00:00 INFO EVENT one"))
+        assert [str(e) for e in spool] == ["2025-07-18T10:00:00+03:00 INFO EVENT one"]
+
+        spool.add(LogEntry.parse_line("2025-07-18T11:00:00 ERROR EVENT two"))
+        assert [e.message for e in spool] == ["one", "two"]
+        assert len(spool) == 2
+    assert spool._spool.closed
+
+
+def test_streaming_output_matches_batch_output(tmp_path):
+    """ run() prints exactly the same report in both modes."""
+    log_dir, config_file = _make_logs(tmp_path)
+    batch = _run_output(LogAnalyzer(str(log_dir), str(config_file)))
+    streamed = _run_output(LogAnalyzer(str(log_dir), str(config_file), streaming=True))
+
+    def _normalize(output: str) -> list[str]:
+        # Files are read concurrently in batch mode, so only compare the lines as a multiset
+        return sorted(output.splitlines())
+
+    assert _normalize(streamed) == _normalize(batch)
+    assert "Count of matches: 5" in streamed
+
+
+def test_streaming_export_matches_batch_export(tmp_path):
+    """ export_to_json writes the same non-count entries in both modes."""
+    log_dir, config_file = _make_logs(tmp_path)
+    batch_file = tmp_path / "batch.json"
+    stream_file = tmp_path / "stream.json"
+    LogAnalyzer(str(log_dir), str(config_file)).export_to_json(str(batch_file))
+    LogAnalyzer(str(log_dir), str(config_file), streaming=True).export_to_json(str(stream_file))
+
+    batch = json.loads(batch_file.read_text())
+    streamed = json.loads(stream_file.read_text())
+    for batch_group, stream_group in zip(batch, streamed):
+        assert stream_group["filters"] == batch_group["filters"]
+        if not stream_group["filters"]["count"]:
+            assert sorted(map(json.dumps, stream_group["entries"])) == sorted(map(json.dumps, batch_group["entries"]))
+
+
+def test_close_deletes_spools(tmp_path, monkeypatch):
+    """ Leaving the analyzer's with block closes every spool file; a later run analyzes again."""
+    log_dir, config_file = _make_logs(tmp_path)
+    for kwargs in ({}, {"backend": "process", "jobs": 2}):
+        with LogAnalyzer(str(log_dir), str(config_file), streaming=True, **kwargs) as analyzer:
+            output = _run_output(analyzer)
+            analyzer.export_to_json(str(tmp_path / "out.json"))
+            spools = [matched for _, matched in analyzer._cached_analysis if isinstance(matched, SpooledMatches)]
+        assert len(spools) == 2 and all(spool._spool.closed for spool in spools)
+        assert _run_output(analyzer) == output
+        analyzer.close()
+
+    opened = []
+    monkeypatch.setattr(SpooledMatches, "__enter__", lambda spool: opened.append(spool) or spool)
+    def _unreadable(path, *args):
+        raise OSError(f"cannot read {path}")
+    monkeypatch.setattr("log_analyzer.streaming.iter_file_lines", _unreadable)
+    with pytest.raises(OSError), LogAnalyzer(str(log_dir), str(config_file), streaming=True) as analyzer:
+        analyzer.run()
+    assert len(opened) == 2 and all(spool._spool.closed for spool in opened)
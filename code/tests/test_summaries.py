@@ -0,0 +1,193 @@
+"""
+Tests for log_analyzer.summaries and the --head / --tail / --sample / --top-messages rules.
+
+Test Overview:
+    - test_every_mode_gives_the_same_summaries: Default, streaming, columnar, process and cached analyses give
+      the same heads, tails and top messages, and samples of the right size drawn from the matches.
+    - test_window_handles_out_of_order_matches: Heads and tails stay the first / last matches in time order
+      when matches arrive out of order, are added as batches or are merged.
+    - test_sample_is_uniform: Batches draw the same reservoir as single entries, and every match is sampled
+      (and merged) with the same probability.
+    - test_top_messages_normalize_variable_parts: Numbers, hex values and UUIDs are counted as one message.
+    - test_summaries_are_printed_exported_and_reloaded: run() prints the summaries; json, ndjson and columnar
+      exports carry them, and reloaded runs merge.
+"""
+
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from io import StringIO
+import pytest
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.columnar_file import load_columnar, merge_results
+from log_analyzer.log_entry import DEFAULT_TIMEZONE, LogEntry
+from log_analyzer.summaries import EntrySample, EntryWindow, TopMessages, normalize_message
+
+START = datetime(2025, 7, 18, 10, 0, 0)
+CONFIG = "EVENT --head 3\nEVENT --tail 3 --level ERROR\nEVENT --sample 4\nEVENT --top-messages 2\nOTHER --head 2"
+
+
+def _line(seconds: int, level: str, event_type: str, message: str) -> str:
+    """ Helper formatting a log line seconds after START."""
+    return f"{(START + timedelta(seconds=seconds)).isoformat()} {level} {event_type} {message}"
+
+
+def _make_logs(tmp_path):
+    """ Helper writing two interleaved log files (one slightly out of order) and the events file."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    for file_no in range(2):
+        lines = [_line(i * 2 + file_no, "ERROR" if i % 4 == 0 else "INFO", "EVENT",
+                       f"request {i * 2 + file_no} took {i % 3}ms") for i in range(30)]
+        lines[5], lines[6] = lines[6], lines[5]
+        (log_dir / f"{file_no}.log").write_text("\n".join(lines) + "\n")
+    config_file = tmp_path / "events.txt"
+    config_file.write_text(CONFIG)
+    return str(log_dir), str(config_file)
+
+
+def _entry(seconds: int, message: str = "") -> LogEntry:
+    """ Helper building an EVENT entry seconds after START."""
+    return LogEntry((START + timedelta(seconds=seconds)).replace(tzinfo=DEFAULT_TIMEZONE), "INFO", "EVENT",
+                    message or str(seconds))
+
+
+def _messages(matched) -> list[str]:
+    """ Helper listing the messages of the kept entries."""
+    return [entry.message for entry in matched]
+
+
+@pytest.mark.parametrize("kwargs", [{"streaming": True}, {"columnar": True}, {"backend": "process", "jobs": 2},
+                                    {"cache_dir": "cache"}])
+def test_every_mode_gives_the_same_summaries(tmp_path, kwargs):
+    """ Every mode gives the same heads, tails and top messages, and samples drawn from the matches."""
+    log_dir, config_file = _make_logs(tmp_path)
+    expected = LogAnalyzer(log_dir, config_file)._cached_analysis
+    if "cache_dir" in kwargs:
+        kwargs["cache_dir"] = str(tmp_path / "cache")
+        cold = LogAnalyzer(log_dir, config_file, **kwargs)._cached_analysis   # The checked run is warm
+        assert [len(matched) for _, matched in cold] == [len(matched) for _, matched in expected]
+    results = LogAnalyzer(log_dir, config_file, **kwargs)._cached_analysis
+
+    head, tail, sample, top, other = (matched for _, matched in expected)
+    assert _messages(head) == ["request 0 took 0ms", "request 1 took 0ms", "request 2 took 1ms"]
+    assert _messages(tail) == ["request 49 took 0ms", "request 56 took 1ms", "request 57 took 1ms"]
+    assert [len(matched) for matched in (head, tail, sample, top, other)] == [60, 16, 60, 60, 0]
+    assert top.rows() == [("request <*> took <*>ms", 60, 0)] and list(top) == []
+
+    for (_, matched), (_, reference) in zip(results, expected):
+        assert type(matched) is type(reference) and len(matched) == len(reference)
+        if isinstance(matched, EntrySample):
+            kept = _messages(matched)
+            assert len(kept) == 4 and len(set(kept)) == 4
+            assert [entry.timestamp for entry in matched] == sorted(entry.timestamp for entry in matched)
+        elif isinstance(matched, TopMessages):
+            assert matched.rows() == reference.rows()
+        else:
+            assert _messages(matched) == _messages(reference)
+
+
+def test_window_handles_out_of_order_matches():
+    """ Heads and tails keep the first / last matches in time order, whatever the arrival order."""
+    order = [5, 1, 9, 3, 3, 7, 0, 8, 2, 6, 4, 9]
+    head, tail = EntryWindow("head", 3), EntryWindow("tail", 3)
+    for i, seconds in enumerate(order):
+        head.add(_entry(seconds, f"{seconds}.{i}"))
+        tail.add(_entry(seconds, f"{seconds}.{i}"))
+    assert _messages(head) == ["0.6", "1.1", "2.8"] and len(head) == 12
+    assert _messages(tail) == ["8.7", "9.2", "9.11"] and len(tail) == 12
+
+    batch = EntryBatch.from_entries([_entry(seconds, f"{seconds}.{i}") for i, seconds in enumerate(order)],
+                                    DEFAULT_TIMEZONE)
+    for window in (head, tail):
+        batched = EntryWindow(window.kind, 3)
+        batched.extend(batch)
+        assert _messages(batched) == _messages(window) and len(batched) == 12
+
+    first, second = EntryWindow("tail", 3), EntryWindow("tail", 3)
+    first.extend(batch, range(6))
+    second.extend(batch, range(6, 12))
+    first.merge(second)
+    assert _messages(first) == _messages(tail) and len(first) == 12
+
+
+def test_sample_is_uniform():
+    """ Batches draw the same reservoir as entries; every match (also after merging) is equally likely."""
+    entries = [_entry(i) for i in range(10)]
+    batch = EntryBatch.from_entries(entries, DEFAULT_TIMEZONE)
+    one_by_one, batched = EntrySample(3, seed=11), EntrySample(3, seed=11)
+    for entry in entries:
+        one_by_one.add(entry)
+    batched.extend(batch, range(4))
+    batched.extend(batch, range(4, 10))
+    assert _messages(batched) == _messages(one_by_one) and len(batched) == 10
+
+    trials = 4000
+    picked = {str(i): 0 for i in range(10)}
+    merged_picked = dict(picked)
+    rng = random.Random(5)
+    for _ in range(trials):
+        sample = EntrySample(2, seed=rng.random())
+        sample.extend(batch)
+        for message in _messages(sample):
+            picked[message] += 1
+        left, right = EntrySample(2, seed=rng.random()), EntrySample(2, seed=rng.random())
+        left.extend(batch, range(3))
+        right.extend(batch, range(3, 10))
+        left.merge(right)
+        for message in _messages(left):
+            merged_picked[message] += 1
+    for counts in (picked, merged_picked):
+        assert sum(counts.values()) == 2 * trials
+        assert all(abs(count / trials - 0.2) < 0.04 for count in counts.values())
+
+
+def test_top_messages_normalize_variable_parts():
+    """ Messages differing only in numbers, hex values or UUIDs are counted as one."""
+    assert normalize_message("user 42 took 3.5s at 0x7ffe from 10.0.0.5, id 123e4567-e89b-12d3-a456-426614174000") \
+        == "user <*> took <*>s at <*> from <*>, id <*>"
+    top = TopMessages(1)
+    for i in range(5):
+        top.add(_entry(i, f"disk {i} full"))
+    top.add(_entry(9, "restart"))
+    assert top.rows() == [("disk <*> full", 5, 0)] and len(top) == 6
+
+
+def test_summaries_are_printed_exported_and_reloaded(tmp_path):
+    """ run() prints the summaries; json, ndjson and columnar exports carry them, and reloaded runs merge."""
+    log_dir, config_file = _make_logs(tmp_path)
+    analyzer = LogAnalyzer(log_dir, config_file)
+
+    saved_stdout = sys.stdout
+    try:
+        sys.stdout = StringIO()
+        analyzer.run()
+        output = sys.stdout.getvalue()
+    finally:
+        sys.stdout = saved_stdout
+    assert "flags: head=3:\nCount of matches: 60\nfirst 3 matching entries:\n" in output
+    assert "last 3 matching entries:\n" in output and "sampled 4 matching entries:\n" in output
+    assert "most frequent messages:\n  60: request <*> took <*>ms\n" in output
+    assert output.count("took") == 3 + 3 + 4 + 1
+
+    analyzer.export(str(tmp_path / "out.json"), "json")
+    groups = json.loads((tmp_path / "out.json").read_text())
+    assert groups[0]["filters"]["head"] == 3 and groups[0]["matches"] == 60 and len(groups[0]["entries"]) == 3
+    assert groups[3]["top_messages"] == [{"message": "request <*> took <*>ms", "count": 60, "error": 0}]
+    assert groups[3]["entries"] == [] and groups[4]["entries"] == []
+
+    analyzer.export(str(tmp_path / "out.ndjson"), "ndjson")
+    records = [json.loads(line) for line in (tmp_path / "out.ndjson").read_text().splitlines()]
+    assert records[0]["matches"] == 60 and len(records) == 5 + 3 + 3 + 4 + 1
+
+    analyzer.export(str(tmp_path / "out.columnar"), "columnar")
+    loaded = load_columnar(str(tmp_path / "out.columnar"))
+    assert [ev_config for ev_config, _ in loaded] == analyzer.configs
+    for (_, matched), (_, reference) in zip(loaded, analyzer._cached_analysis):
+        assert type(matched) is type(reference) and len(matched) == len(reference)
+        assert _messages(matched) == _messages(reference)
+    merged = merge_results([loaded, analyzer._cached_analysis], DEFAULT_TIMEZONE)
+    assert len(merged[0][1]) == 120 and _messages(merged[0][1]) == ["request 0 took 0ms"] * 2 + ["request 1 took 0ms"]
+    assert merged[3][1].rows() == [("request <*> took <*>ms", 120, 0)]
@@ -0,0 +1,64 @@
+"""
+Tests for benchmarks.synthetic, the deterministic log generator of the benchmarks.
+
+Test Overview:
+    - test_generation_is_deterministic: The same spec yields the same lines; another seed yields others.
+    - test_lines_follow_the_spec: Timestamps follow the ordering, and the analyzer rejects about invalid_ratio of
+      the lines and parses every other one.
+    - test_written_dataset_is_analyzable: .log and .log.gz datasets hold every line and analyze with their
+      events.txt, every rule matching some entries.
+"""
+
+import gzip
+import pytest
+from benchmarks.synthetic import LogSpec, default_rules, generate_lines, write_dataset
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.event_filter import EventFilter
+from log_analyzer.log_entry import DEFAULT_TIMEZONE, LogEntry
+from log_analyzer.timestamps import TimestampParser
+
+
+def test_generation_is_deterministic():
+    """ The same spec yields the same lines; another seed yields others."""
+    spec = LogSpec(lines=500, ordering="jittered")
+    assert list(generate_lines(spec)) == list(generate_lines(spec))
+    assert list(generate_lines(spec)) != list(generate_lines(LogSpec(lines=500, ordering="jittered", seed=1)))
+    with pytest.raises(ValueError):
+        next(generate_lines(LogSpec(ordering="random")))
+
+
+@pytest.mark.parametrize("ordering", ["sorted", "jittered", "shuffled"])
+def test_lines_follow_the_spec(ordering):
+    """ Timestamps follow the ordering; about invalid_ratio of the lines are rejected, the others parse."""
+    spec = LogSpec(lines=4000, event_types=5, invalid_ratio=0.1, ordering=ordering)
+    ts_parser = TimestampParser(DEFAULT_TIMEZONE)
+    entries, invalid = [], 0
+    for line in generate_lines(spec):
+        try:
+            entries.append(LogEntry.parse_line(line, ts_parser=ts_parser))
+        except ValueError:
+            invalid += 1
+
+    assert 300 < invalid < 500
+    assert {entry.event_type for entry in entries} == {"TELEMETRY", "DEVICE", "GNMI", "EVENT003", "EVENT004"}
+    timestamps = [entry.timestamp for entry in entries]
+    assert (timestamps == sorted(timestamps)) == (ordering == "sorted")
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_written_dataset_is_analyzable(tmp_path, compress):
+    """ Written datasets hold every line and analyze with their events.txt."""
+    spec = LogSpec(lines=1001, invalid_ratio=0)
+    paths = write_dataset(tmp_path, spec, files=3, compress=compress)
+    assert [path.name for path in paths] == [f"synthetic-00{i}.log{'.gz' if compress else ''}" for i in range(3)]
+
+    opener = gzip.open if compress else open
+    lines = [line for path in paths for line in opener(path, "rt", encoding="utf-8").read().splitlines()]
+    assert len(lines) == 1001
+    entries = [LogEntry.parse_line(line) for line in lines]
+
+    results = LogAnalyzer(str(tmp_path), str(tmp_path / "events.txt"))._cached_analysis
+    assert len(results) == len(default_rules(spec))
+    for ev_config, matched in results:
+        expected = sum(1 for entry in entries if EventFilter(ev_config).matches(entry))
+        assert len(matched) == expected > 0
@@ -0,0 +1,144 @@
+"""
+Tests for log_analyzer.time_seek, the binary-search seek used for --from/--to on time-sorted .log files.
+
+Test Overview:
+    - test_window_range_holds_exactly_the_window: The byte range found by binary search starts at the first
+      line >= --from and ends after the last line <= --to, including duplicate timestamps and invalid lines.
+    - test_unsorted_and_gzip_files_fall_back: Unsorted files, gzip files and queries without a window return None.
+    - test_analyzer_results_unchanged_with_seek: Seeking does not change the analysis results of any backend.
+    - test_jittered_file_is_not_seeked: A file that is only locally out of order (a few late lines, as in
+      benchmarks.synthetic's "jittered" ordering) is scanned in full, so no match near the window edges is lost.
+    - test_sortedness_proof_is_persisted: The full sortedness pass runs once per file version: later runs read
+      the proof from the sidecar index, and appending an out-of-order line invalidates it. A future timestamp
+      does not break the proof, until a run no longer skips it as future.
+"""
+
+import gzip
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from benchmarks.synthetic import LogSpec, write_dataset
+from log_analyzer import file_index
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.time_seek import iter_range_lines, window_byte_range
+from log_analyzer.timestamps import TimestampParser
+
+TZ = ZoneInfo("Asia/Jerusalem")
+
+
+def _sorted_lines() -> list[str]:
+    """ Helper building a time-sorted log with duplicate timestamps and some invalid lines."""
+    lines = []
+    for i in range(300):
+        ts = f"2025-07-18T{i // 60:02d}:{i % 60:02d}:00"
+        lines.append(f"{ts} INFO EVENT message {i}")
+        if i % 7 == 0:
+            lines.append(f"{ts} ERROR EVENT duplicate {i}")
+        if i % 11 == 0:
+            lines.append("garbage line without timestamp")
+    return lines
+
+
+def _parser(ts_from: str | None, ts_to: str | None, now: datetime | None = None) -> TimestampParser:
+    """ Helper creating a TimestampParser with the given window."""
+    def _ts(value):
+        return datetime.fromisoformat(value).replace(tzinfo=TZ) if value else None
+    return TimestampParser(TZ, _ts(ts_from), _ts(ts_to), now)
+
+
+def test_window_range_holds_exactly_the_window(tmp_path):
+    """ The byte range starts at the first line >= --from and ends after the last line <= --to."""
+    path = tmp_path / "sorted.log"
+    lines = _sorted_lines()
+    path.write_text("\n".join(lines) + "\n")
+
+    parser = _parser("2025-07-18T01:00:00", "2025-07-18T02:10:00")
+    start, end = window_byte_range(path, parser)
+    window = [line.rstrip("\n") for line in iter_range_lines(path, start, end)]
+
+    valid = [line for line in window if not line.startswith("garbage")]
+    expected = [line for line in lines if not line.startswith("garbage") and
+                "2025-07-18T01:00:00" <= line.split()[0] <= "2025-07-18T02:10:00"]
+    assert valid == expected
+    assert 0 < start < end < path.stat().st_size
+
+
+def test_unsorted_and_gzip_files_fall_back(tmp_path):
+    """ Unsorted files, gzip files and queries without a window return None."""
+    lines = _sorted_lines()
+    unsorted_path = tmp_path / "unsorted.log"
+    unsorted_path.write_text("\n".join(lines[len(lines) // 2:] + lines[:len(lines) // 2]))
+    gz_path = tmp_path / "sorted.log.gz"
+    with gzip.open(gz_path, "wt", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    plain_path = tmp_path / "sorted.log"
+    plain_path.write_text("\n".join(lines))
+
+    parser = _parser("2025-07-18T01:00:00", None)
+    assert window_byte_range(unsorted_path, parser) is None
+    assert window_byte_range(gz_path, parser) is None
+    assert window_byte_range(plain_path, _parser(None, None)) is None
+
+
+def test_analyzer_results_unchanged_with_seek(tmp_path, monkeypatch):
+    """ Seeking does not change the analysis results of any backend."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (log_dir / "sorted.log").write_text("\n".join(_sorted_lines()))
+    config_file = tmp_path / "events.txt"
+    config_file.write_text("EVENT --count\nEVENT --level ERROR")
+    window = ("2025-07-18T00:30:00", "2025-07-18T03:00:00")
+
+    def _results(**kwargs):
+        analysis = LogAnalyzer(str(log_dir), str(config_file), *window, **kwargs)._cached_analysis
+        return [(len(matched), [str(e) for e in matched]) for _, matched in analysis]
+
+    seeking = [_results(), _results(streaming=True), _results(columnar=True), _results(backend="process", jobs=2)]
+    monkeypatch.setattr("log_analyzer.streaming.window_byte_range", lambda path, parser: None)
+    full_scan = _results()
+
+    assert full_scan[0][0] == 151 + 21
+    for result in seeking:
+        assert [count for count, _ in result] == [count for count, _ in full_scan]
+        assert result[1] == full_scan[1]
+
+
+def test_jittered_file_is_not_seeked(tmp_path, monkeypatch):
+    """ A locally out-of-order file is scanned in full, so no match near the window edges is lost."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    (path,) = write_dataset(log_dir, LogSpec(lines=20_000, ordering="jittered"))
+    config_file = log_dir / "events.txt"
+    window = ("2025-07-18T00:02:00", "2025-07-18T00:05:00")
+    assert window_byte_range(path, _parser(*window)) is None
+
+    def _counts(**kwargs):
+        analysis = LogAnalyzer(str(log_dir), str(config_file), *window, **kwargs)._cached_analysis
+        return [len(matched) for _, matched in analysis]
+
+    seeking = [_counts(), _counts(streaming=True), _counts(backend="process", jobs=2)]
+    monkeypatch.setattr("log_analyzer.streaming.window_byte_range", lambda path, parser: None)
+    full_scan = _counts()
+    assert sum(full_scan) > 0
+    assert all(counts == full_scan for counts in seeking)
+
+
+def test_sortedness_proof_is_persisted(tmp_path, monkeypatch):
+    """ The sortedness pass runs once per file version; later runs read the proof from the sidecar index."""
+    path = tmp_path / "sorted.log"
+    lines = _sorted_lines()
+    lines.insert(100, "2099-01-01T00:00:00 INFO EVENT future")
+    path.write_text("\n".join(lines) + "\n")
+    parser = _parser("2025-07-18T01:00:00", "2025-07-18T02:10:00")
+    expected = window_byte_range(path, parser)
+    assert expected is not None and file_index.index_path(path).exists()
+
+    def _no_scan(path, block_size=None):
+        raise AssertionError("the file was scanned again")
+    monkeypatch.setattr(file_index, "build_index", _no_scan)
+    assert window_byte_range(path, parser) == expected
+
+    monkeypatch.undo()
+    assert window_byte_range(path, _parser("2025-07-18T01:00:00", None, datetime(2100, 1, 1, tzinfo=TZ))) is None
+    with open(path, "a") as f:
+        f.write("2025-07-18T00:00:00 INFO EVENT late line\n")
+    assert window_byte_range(path, parser) is None
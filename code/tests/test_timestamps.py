@@ -0,0 +1,98 @@
+"""
+Tests for log_analyzer.timestamps, the cached per-run timestamp parser.
+
+Test Overview:
+    - test_parse_matches_validate_and_parse_timestamp: Accepted timestamps are identical to the per-line parser.
+    - test_rejections_keep_original_messages: Malformed, future and too-old timestamps raise the same errors.
+    - test_window_is_inclusive_and_skips_aware_datetime: --from/--to are inclusive, and rejected timestamps
+      never get a tz-aware datetime built for them.
+    - test_results_are_cached_per_timestamp: Repeated timestamp strings are parsed once.
+    - test_bounds_are_fixed_at_creation: "now" is computed once, when the parser is created.
+    - test_fractional_timestamps_are_cached_per_second: Timestamps with .fff / .ffffff fractions share the record
+      of their second and give the same results as parsing them whole, at the window and "now" bounds too.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from log_analyzer.log_entry import LogEntry
+from log_analyzer.timestamps import MAX_PAST_YEARS, TimestampParser, naive_epoch
+
+TZ = ZoneInfo("Asia/Jerusalem")
+
+
+def test_parse_matches_validate_and_parse_timestamp():
+    """ Accepted timestamps are identical to the per-line parser."""
+    parser = TimestampParser(TZ)
+    for ts_str in ["2025-07-17T12:00:00", "2025-07-17T12:00:00.250", "2025-03-28T02:30:00"]:
+        ts = parser.parse(ts_str)
+        assert ts == LogEntry._validate_and_parse_timestamp(ts_str, TZ)
+        assert ts.tzinfo is TZ
+
+
+def test_rejections_keep_original_messages():
+    """ Malformed, future and too-old timestamps raise the same errors."""
+    parser = TimestampParser(TZ)
+    with pytest.raises(ValueError, match="Invalid timestamp format"):
+        parser.parse("2025-13-17T12:00:00")
+
+    future = (datetime.now(TZ) + timedelta(days=1)).isoformat()
+    with pytest.raises(ValueError, match="is in the future"):
+        parser.parse(future)
+
+    old = (datetime.now(TZ) - timedelta(days=365 * (MAX_PAST_YEARS + 1))).isoformat()
+    with pytest.raises(ValueError, match=f"more than {MAX_PAST_YEARS} years"):
+        parser.parse(old)
+
+
+def test_window_is_inclusive_and_skips_aware_datetime():
+    """ --from/--to are inclusive, and rejected timestamps never get a tz-aware datetime built for them."""
+    ts_from = datetime.fromisoformat("2025-07-18T00:00:00").replace(tzinfo=TZ)
+    ts_to = datetime.fromisoformat("2025-07-18T23:59:50").replace(tzinfo=TZ)
+    parser = TimestampParser(TZ, ts_from, ts_to)
+
+    assert parser.parse("2025-07-18T00:00:00") == ts_from
+    assert parser.parse("2025-07-18T23:59:50") == ts_to
+    assert parser.parse("2025-07-17T23:59:59") is None
+    assert parser.parse("2025-07-18T23:59:51") is None
+    assert parser._cache["2025-07-18T23:59:51"][1] is None
+    assert parser.parse_epoch("2025-07-18T23:59:51") == naive_epoch(ts_to) + 1_000_000
+
+
+def test_results_are_cached_per_timestamp():
+    """ Repeated timestamp strings are parsed once."""
+    parser = TimestampParser(TZ)
+    first = parser.parse("2025-07-18T12:00:00")
+    assert parser.parse("2025-07-18T12:00:00") is first
+    assert len(parser._cache) == 1
+
+
+def test_bounds_are_fixed_at_creation():
+    """ "now" is computed once, when the parser is created."""
+    now = datetime.fromisoformat("2025-07-18T12:00:00").replace(tzinfo=TZ)
+    parser = TimestampParser(TZ, now=now)
+    assert parser.parse("2025-07-18T12:00:00") == now
+    with pytest.raises(ValueError, match="is in the future"):
+        parser.parse("2025-07-18T12:00:01")
+
+
+def test_fractional_timestamps_are_cached_per_second():
+    """ Fractional timestamps share the record of their second and give the same results as parsing them whole."""
+    now = datetime.fromisoformat("2025-07-18T12:00:00.500").replace(tzinfo=TZ)
+    window = (datetime.fromisoformat("2025-07-18T11:59:58.250"), datetime.fromisoformat("2025-07-18T12:00:00.100"))
+    parser = TimestampParser(TZ, *window, now=now)
+    stamps = [f"2025-07-18T{second}.{fraction}" for second in ("11:59:57", "11:59:58", "11:59:59", "12:00:00")
+              for fraction in ("000", "249", "250", "999", "099999", "100000", "100001", "500000", "500001")]
+    for ts_str in stamps:
+        whole = TimestampParser(TZ, *window, now=now)
+        assert parser.parse_or_reason(ts_str) == whole.parse_or_reason(ts_str), ts_str
+    assert set(parser._cache) == {"2025-07-18T11:59:57", "2025-07-18T11:59:58", "2025-07-18T11:59:59",
+                                  "2025-07-18T12:00:00"}
+
+    assert parser.parse("2025-07-18T11:59:59.123456") == datetime(2025, 7, 18, 11, 59, 59, 123456, tzinfo=TZ)
+    assert parser.parse_epoch("2025-07-18T11:59:59.500") == naive_epoch(datetime(2025, 7, 18, 11, 59, 59, 500000))
+    assert parser.earliest_future == naive_epoch(datetime(2025, 7, 18, 12, 0, 0, 500001))
+    with pytest.raises(ValueError, match="is in the future"):
+        parser.parse("2025-07-18T12:00:00.500001")
+    with pytest.raises(ValueError, match="Invalid timestamp format"):
+        parser.parse("2025-02-30T12:00:00.123")
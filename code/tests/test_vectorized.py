@@ -0,0 +1,107 @@
+"""
+Tests for log_analyzer.vectorized, the optional NumPy path over columnar batches.
+
+Test Overview:
+    - test_vectorized_modes_match_fallback: The columnar and streaming modes export the same results, and record
+      the same metrics, with NumPy and with the per-row fallback.
+    - test_window_and_rule_masks: The window and rule masks select the rows the per-row checks accept.
+    - test_count_only_rules_build_no_entries: Streaming --count rules without a pattern are answered from their
+      masks, without building a single LogEntry.
+"""
+
+import json
+import re
+from datetime import datetime
+import pytest
+from log_analyzer import vectorized
+from log_analyzer.analyzer import LogAnalyzer
+from log_analyzer.columnar import EntryBatch
+from log_analyzer.event_config import EventConfig
+from log_analyzer.log_entry import DEFAULT_TIMEZONE, LogEntry
+from log_analyzer.timestamps import TimestampParser
+
+LOG_LINES = [
+    "2025-07-18T10:00:00 INFO EVENT Iteration time: 1.5 sec",
+    "2025-07-18T10:00:01 ERROR EVENT request failed",
+    "2025-07-18T09:00:00 INFO EVENT Iteration time: 2.5 sec",
+    "2025-07-18T10:00:02 INFO OTHER Iteration time: 3.5 sec",
+    "not a log line",
+    "2025-07-18T11:00:00 ERROR OTHER disk full",
+    "2999-01-01T00:00:00 INFO EVENT future",
+]
+
+CONFIG = ("EVENT --count\nEVENT --level ERROR\nOTHER --pattern ^Iteration\nEVENT --count --pattern time:\n"
+          "OTHER --bucket 1h")
+
+CONFIGS = [
+    EventConfig(event_type="EVENT", count=True, level=None, pattern=None),
+    EventConfig(event_type="EVENT", count=False, level="ERROR", pattern=None),
+    EventConfig(event_type="OTHER", count=False, level=None, pattern=re.compile(r"^Iteration")),
+    EventConfig(event_type="MISSING", count=True, level=None, pattern=None),
+]
+
+
+def _make_logs(tmp_path):
+    """ Helper writing the log directory and events file."""
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir(parents=True)
+    (log_dir / "a.log").write_text("\n".join(LOG_LINES) + "\n")
+    config_file = tmp_path / "events.txt"
+    config_file.write_text(CONFIG)
+    return str(log_dir), str(config_file)
+
+
+def _export(tmp_path, name, **kwargs):
+    """ Helper exporting an analysis of the logs (from 09:30) to JSON; returns the results and the metric totals."""
+    log_dir, config_file = _make_logs(tmp_path / name)
+    analyzer = LogAnalyzer(log_dir, config_file, ts_from="2025-07-18T09:30:00", collect_metrics=True, **kwargs)
+    analyzer.export_to_json(str(tmp_path / name / "out.json"))
+    return json.loads((tmp_path / name / "out.json").read_text()), analyzer.metrics.totals()
+
+
+@pytest.mark.parametrize("mode", ["columnar", "streaming"])
+def test_vectorized_modes_match_fallback(tmp_path, monkeypatch, mode):
+    """ The columnar and streaming modes give the same results and metrics with NumPy and without."""
+    pytest.importorskip("numpy")
+    results, totals = _export(tmp_path, "numpy", **{mode: True})
+    monkeypatch.setattr("log_analyzer.vectorized.np", None)
+    expected, expected_totals = _export(tmp_path, "fallback", **{mode: True})
+
+    assert results == expected
+    assert [len(group["entries"]) for group in results][1:3] == [1, 1]
+    assert (totals["entries"], totals["rejected"]["out_of_range"]) == (4, 1)
+    for key in ("lines_read", "entries", "rejected"):
+        assert totals[key] == expected_totals[key]
+
+
+def test_window_and_rule_masks():
+    """ The window and rule masks select the rows the per-row checks accept."""
+    np = pytest.importorskip("numpy")
+    ts_from = datetime.fromisoformat("2025-07-18T09:30:00").replace(tzinfo=DEFAULT_TIMEZONE)
+    ts_parser = TimestampParser(DEFAULT_TIMEZONE, ts_from=ts_from)
+    batch = EntryBatch.from_lines(LOG_LINES, ts_parser, window=False)
+    assert len(batch) == 5 and len(EntryBatch.from_lines(LOG_LINES, ts_parser)) == 4
+
+    window = vectorized.window_mask(batch, ts_parser)
+    assert window.tolist() == [True, True, False, True, True]
+    assert vectorized.window_mask(batch, TimestampParser(DEFAULT_TIMEZONE)) is None
+
+    masks = vectorized.rule_masks(CONFIGS, batch, window)
+    assert [np.flatnonzero(mask).tolist() for mask in masks] == [[0, 1], [1], [3, 4], []]
+    assert vectorized.rule_rows(masks[2], batch, CONFIGS[2].pattern.search) == [3]
+    assert [vectorized.count(mask) for mask in masks] == [2, 1, 2, 0]
+    assert [vectorized.count_only(cfg) for cfg in CONFIGS] == [True, False, False, True]
+
+
+def test_count_only_rules_build_no_entries(tmp_path, monkeypatch):
+    """ Streaming --count rules without a pattern are answered from their masks, without building any LogEntry."""
+    pytest.importorskip("numpy")
+    log_dir, config_file = _make_logs(tmp_path)
+    (tmp_path / "events.txt").write_text("EVENT --count\nOTHER --count --level ERROR")
+
+    def _no_entries(*args):
+        raise AssertionError("a LogEntry was built")
+    monkeypatch.setattr(LogEntry, "__init__", _no_entries)
+
+    analyzer = LogAnalyzer(log_dir, config_file, ts_from="2025-07-18T09:30:00", streaming=True)
+    assert [len(matched) for _, matched in analyzer._cached_analysis] == [2, 1]